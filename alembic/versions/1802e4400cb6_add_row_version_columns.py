@@ -0,0 +1,29 @@
+"""add row_version columns for optimistic concurrency
+
+Revision ID: 1802e4400cb6
+Revises: 1701e4400cb5
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '1802e4400cb6'
+down_revision: Union[str, None] = '1701e4400cb5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # physical_devices.version already holds the firmware version, so the
+    # concurrency token is called row_version on both tables
+    op.add_column('plants', sa.Column('row_version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('physical_devices', sa.Column('row_version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('physical_devices', 'row_version')
+    op.drop_column('plants', 'row_version')
@@ -0,0 +1,37 @@
+"""add pending_file_deletions queue and photo_filename index
+
+Revision ID: 1903e4400cb7
+Revises: 1802e4400cb6
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '1903e4400cb7'
+down_revision: Union[str, None] = '1802e4400cb6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('pending_file_deletions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('file_name', sa.String(length=255), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pending_file_deletions_attempts_created_at', 'pending_file_deletions', ['attempts', 'created_at'])
+    # The orphan reconciler looks up bucket listings by photo_filename
+    op.create_index('ix_plants_photo_filename', 'plants', ['photo_filename'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_plants_photo_filename', table_name='plants')
+    op.drop_index('ix_pending_file_deletions_attempts_created_at', table_name='pending_file_deletions')
+    op.drop_table('pending_file_deletions')
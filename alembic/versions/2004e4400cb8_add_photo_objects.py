@@ -0,0 +1,36 @@
+"""add photo_objects reference counts for content-addressed photos
+
+Revision ID: 2004e4400cb8
+Revises: 1903e4400cb7
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '2004e4400cb8'
+down_revision: Union[str, None] = '1903e4400cb7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('photo_objects',
+    sa.Column('file_name', sa.String(length=255), nullable=False),
+    sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('file_name')
+    )
+    # Existing uuid-named photos become tracked objects with their current reference counts
+    op.execute(
+        "INSERT INTO photo_objects (file_name, ref_count, created_at) "
+        "SELECT photo_filename, count(*), now() FROM plants "
+        "WHERE photo_filename IS NOT NULL GROUP BY photo_filename"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('photo_objects')
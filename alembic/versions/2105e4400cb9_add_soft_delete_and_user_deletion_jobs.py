@@ -0,0 +1,51 @@
+"""add deleted_at soft delete columns, live-row partial indexes and user_deletion_jobs
+
+Revision ID: 2105e4400cb9
+Revises: 2004e4400cb8
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '2105e4400cb9'
+down_revision: Union[str, None] = '2004e4400cb8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('plants', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('physical_devices', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    # Live queries filter on deleted_at IS NULL; the purger scans the (small) deleted side
+    op.create_index('ix_plants_user_id_live', 'plants', ['user_id'], postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('ix_plants_deleted_at', 'plants', ['deleted_at'], postgresql_where=sa.text('deleted_at IS NOT NULL'))
+    op.create_index('ix_physical_devices_user_id_live', 'physical_devices', ['user_id'],
+                    postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('ix_physical_devices_deleted_at', 'physical_devices', ['deleted_at'],
+                    postgresql_where=sa.text('deleted_at IS NOT NULL'))
+    # Purging a device deletes its associations by physical_device_id, which the composite PK does not cover
+    op.create_index('ix_plant_physical_devices_physical_device_id', 'plant_physical_devices', ['physical_device_id'])
+    op.create_table('user_deletion_jobs',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.String(length=20), server_default='pending', nullable=False),
+    sa.Column('plants_deleted', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('devices_deleted', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('requested_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_deletion_jobs')
+    op.drop_index('ix_plant_physical_devices_physical_device_id', table_name='plant_physical_devices')
+    op.drop_index('ix_physical_devices_deleted_at', table_name='physical_devices')
+    op.drop_index('ix_physical_devices_user_id_live', table_name='physical_devices')
+    op.drop_index('ix_plants_deleted_at', table_name='plants')
+    op.drop_index('ix_plants_user_id_live', table_name='plants')
+    op.drop_column('physical_devices', 'deleted_at')
+    op.drop_column('plants', 'deleted_at')
@@ -0,0 +1,70 @@
+"""add device_assignment_history, range-partitioned by month on valid_from, with GiST period indexes
+
+Revision ID: 2206e4400cba
+Revises: 2105e4400cb9
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '2206e4400cba'
+down_revision: Union[str, None] = '2105e4400cb9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    # GiST indexes cannot hold a plain uuid column without the btree_gist operator classes
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute("""
+        CREATE TABLE device_assignment_history (
+            id uuid NOT NULL,
+            physical_device_id uuid NOT NULL,
+            plant_id uuid NOT NULL,
+            valid_from timestamp NOT NULL,
+            valid_to timestamp,
+            PRIMARY KEY (id, valid_from),
+            CHECK (valid_to IS NULL OR valid_to >= valid_from)
+        ) PARTITION BY RANGE (valid_from)
+    """)
+    op.execute("CREATE TABLE device_assignment_history_default PARTITION OF device_assignment_history DEFAULT")
+    # Created on the parent, so every partition (including ones added later) gets its own copy
+    op.execute("CREATE INDEX ix_device_assignment_history_device_period ON device_assignment_history "
+               "USING gist (physical_device_id, tsrange(valid_from, valid_to, '[)'))")
+    op.execute("CREATE INDEX ix_device_assignment_history_plant_period ON device_assignment_history "
+               "USING gist (plant_id, tsrange(valid_from, valid_to, '[)'))")
+    op.create_index('ix_device_assignment_history_open', 'device_assignment_history',
+                    ['physical_device_id', 'plant_id'], postgresql_where=sa.text('valid_to IS NULL'))
+
+    # Monthly partitions for the backfill and the next few months; the application adds later ones at startup
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text("SELECT min(assigned_at) FROM plant_physical_devices")).scalar()
+    now = datetime.utcnow()
+    month = datetime((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(datetime(now.year, now.month, 1), 3)
+    while month <= last:
+        op.execute(f"CREATE TABLE device_assignment_history_p{month:%Y%m} PARTITION OF device_assignment_history "
+                   f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')")
+        month = _add_months(month, 1)
+
+    # Current assignments become open periods; earlier ones were never recorded
+    op.execute("""
+        INSERT INTO device_assignment_history (id, physical_device_id, plant_id, valid_from)
+        SELECT gen_random_uuid(), physical_device_id, plant_id, COALESCE(assigned_at, now() AT TIME ZONE 'utc')
+        FROM plant_physical_devices
+    """)
+
+
+def downgrade() -> None:
+    # Dropping the parent drops every partition and index with it
+    op.drop_table('device_assignment_history')
@@ -0,0 +1,27 @@
+"""index device_assignment_history.valid_to so the binding refresher can find periods closed since its watermark
+
+Revision ID: 2408e4400cbc
+Revises: 2307e4400cbb
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '2408e4400cbc'
+down_revision: Union[str, None] = '2307e4400cbb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Created on the parent, so every partition gets its own copy
+    op.create_index('ix_device_assignment_history_valid_to', 'device_assignment_history',
+                    ['valid_to'], postgresql_where=sa.text('valid_to IS NOT NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_device_assignment_history_valid_to', table_name='device_assignment_history')
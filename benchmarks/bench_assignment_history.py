@@ -0,0 +1,93 @@
+"""Latency of "which plant was device X on at T" for a batch of readings: one probe per reading vs one windowed query.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_assignment_history --devices 2000 --periods 24
+
+Seeds `--devices` devices with `--periods` consecutive monthly assignments each (so the
+history spans that many partitions), then resolves `--readings` readings from
+`--batch-devices` devices within one hour, the shape of an analytics ingest batch. Rows
+are removed afterwards.
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from src.adapters.repositories.models import DeviceAssignmentHistory
+from src.adapters.repositories.assignment_history_repository_impl import (AssignmentHistoryRepositoryImpl,
+                                                                          ensure_history_partitions)
+from src.core.services.assignment_history_service import AssignmentHistoryService
+
+def _month_start(month: datetime, back: int) -> datetime:
+    index = month.year * 12 + month.month - 1 - back
+    return datetime(index // 12, index % 12 + 1, 1)
+
+async def _seed(engine, devices: int, periods: int):
+    now = datetime.utcnow()
+    this_month = datetime(now.year, now.month, 1)
+    first = _month_start(this_month, periods - 1)
+    device_ids = [uuid.uuid4() for _ in range(devices)]
+    async with AsyncSession(engine) as session:
+        await ensure_history_partitions(session, first, periods)
+        rows = []
+        for device_id in device_ids:
+            for back in range(periods - 1, -1, -1):
+                valid_from = _month_start(this_month, back)
+                valid_to = _month_start(this_month, back - 1) if back else None
+                rows.append({"id": uuid.uuid4(), "physical_device_id": device_id, "plant_id": uuid.uuid4(),
+                             "valid_from": valid_from, "valid_to": valid_to})
+        for start in range(0, len(rows), 5000):
+            await session.execute(insert(DeviceAssignmentHistory), rows[start:start + 5000])
+        await session.commit()
+    return device_ids, first
+
+async def per_reading(session, lookups):
+    repository = AssignmentHistoryRepositoryImpl(session)
+    return [[period.plant_id for period in await repository.get_periods([device_id], at, at)] for device_id, at in lookups]
+
+async def batched(session, lookups):
+    return await AssignmentHistoryService(AssignmentHistoryRepositoryImpl(session)).get_plants_at_batch(lookups)
+
+async def main(database_url: str, devices: int, periods: int, readings: int, batch_devices: int, repeat: int):
+    engine = create_async_engine(database_url)
+    device_ids, first = await _seed(engine, devices, periods)
+    try:
+        random.seed(1)
+        # A past hour in the middle of the history, so partition pruning has something to skip
+        window_start = first + timedelta(days=30 * (periods // 2), hours=12)
+        sample = random.sample(device_ids, min(batch_devices, len(device_ids)))
+        lookups = [(random.choice(sample), window_start + timedelta(seconds=random.uniform(0, 3600)))
+                   for _ in range(readings)]
+        print(f"{devices * periods} history rows, {readings} readings from {len(sample)} devices")
+        print(f"{'variant':<28}{'best ms':>10}{'per reading us':>16}")
+        answers = []
+        for name, call in [("one probe per reading", per_reading), ("windowed batch query", batched)]:
+            timings = []
+            for _ in range(repeat):
+                async with AsyncSession(engine) as session:
+                    started = time.perf_counter()
+                    result = await call(session, lookups)
+                    timings.append(time.perf_counter() - started)
+            answers.append(result)
+            best = min(timings)
+            print(f"{name:<28}{best * 1000:>10.1f}{best / readings * 1e6:>16.1f}")
+        assert answers[0] == answers[1], "variants disagree"
+    finally:
+        async with AsyncSession(engine) as session:
+            await session.execute(delete(DeviceAssignmentHistory).where(DeviceAssignmentHistory.physical_device_id.in_(device_ids)))
+            await session.commit()
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--devices", type=int, default=2000)
+    parser.add_argument("--periods", type=int, default=24)
+    parser.add_argument("--readings", type=int, default=5000)
+    parser.add_argument("--batch-devices", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.devices, args.periods, args.readings, args.batch_devices, args.repeat))
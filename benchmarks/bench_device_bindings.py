@@ -0,0 +1,42 @@
+"""Lookup throughput of the in-memory device binding index used by the telemetry ingestion path.
+
+    python -m benchmarks.bench_device_bindings --devices 200000 --batch 500
+"""
+import argparse
+import random
+import time
+import uuid
+from src.core.services.device_binding_index import DeviceBindingIndex
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--batches", type=int, default=2_000)
+    args = parser.parse_args()
+
+    user_ids = [uuid.uuid4() for _ in range(max(1, args.devices // 10))]
+    rows = [(uuid.uuid4(), random.choice(user_ids), uuid.uuid4()) for _ in range(args.devices)]
+    device_ids = [row[0] for row in rows]
+
+    index = DeviceBindingIndex()
+    started = time.perf_counter()
+    index.begin_rebuild()
+    index.finish_rebuild(rows)
+    rebuild_s = time.perf_counter() - started
+
+    # One in ten requested ids is unknown so the miss path is exercised too
+    batches = [[random.choice(device_ids) if i % 10 else uuid.uuid4() for i in range(args.batch)]
+               for _ in range(100)]
+    started = time.perf_counter()
+    for i in range(args.batches):
+        index.lookup(batches[i % len(batches)])
+    elapsed = time.perf_counter() - started
+    lookups = args.batches * args.batch
+
+    print(f"rebuild of {args.devices} devices: {rebuild_s * 1000:8.1f} ms")
+    print(f"lookups:                  {lookups / elapsed:12,.0f} device ids/s")
+    print(f"batch of {args.batch}:            {elapsed / args.batches * 1e6:8.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Bytes and CPU per list response for each body encoding and compression.
+
+    python -m benchmarks.bench_encoding --items 1000
+"""
+import argparse
+import time
+import uuid
+import zlib
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from src.adapters.api.compression import brotli, zstandard
+from src.adapters.api.negotiation import msgpack, NegotiatedResponse
+from src.adapters.api.schemas import PlantResponse
+
+def make_payload(items: int):
+    user_id = uuid.uuid4()
+    now = datetime.utcnow()
+    plants = [PlantResponse(id=uuid.uuid4(), user_id=user_id, name=f"Plant {i}", species="Monstera deliciosa",
+                            description="Kitchen window, watered weekly", photo_filename=f"{uuid.uuid4().hex}.webp",
+                            row_version=1, created_at=now, updated_at=now) for i in range(items)]
+    return jsonable_encoder(plants)
+
+def _time_us(fn, rounds: int) -> tuple:
+    started = time.process_time()
+    for _ in range(rounds):
+        result = fn()
+    return result, (time.process_time() - started) / rounds * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    content = make_payload(args.items)
+    bodies = {"json": _time_us(lambda: NegotiatedResponse(content).body, args.rounds)}
+    if msgpack is not None:
+        bodies["msgpack"] = _time_us(lambda: msgpack.packb(content, use_bin_type=True), args.rounds)
+
+    compressors = {"identity": lambda data: data, "gzip-6": lambda data: zlib.compress(data, 6)}
+    if brotli is not None:
+        compressors["br-4"] = lambda data: brotli.compress(data, quality=4)
+    if zstandard is not None:
+        compressors["zstd-3"] = zstandard.ZstdCompressor(level=3).compress
+
+    print(f"{args.items} plants per response\n")
+    print(f"{'body':<10}{'compression':<14}{'bytes':>10}{'encode us':>12}{'compress us':>13}")
+    for body_name, (body, encode_us) in bodies.items():
+        for compression_name, compress in compressors.items():
+            compressed, compress_us = _time_us(lambda: compress(body), args.rounds)
+            print(f"{body_name:<10}{compression_name:<14}{len(compressed):>10}{encode_us:>12.0f}{compress_us:>13.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Memory per idle event stream and fan-out cost of the in-process event broker.
+
+    python -m benchmarks.bench_events --connections 10000 --streams-per-user 1 5 50 --events 2000
+
+Subscriptions stand in for open SSE/WebSocket connections: each one gets the
+broker-side state a real stream holds (its bounded queue) plus a consumer task
+waiting on it, which is what an idle connection costs a worker besides the socket.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from src.core.services.event_broker import EventBroker, UserEvent
+
+async def _consume(subscription, received: list) -> None:
+    try:
+        async for _ in subscription:
+            received[0] += 1
+    except asyncio.CancelledError:
+        pass
+
+async def _idle_memory(connections: int) -> None:
+    broker = EventBroker()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    received = [0]
+    consumers = [asyncio.create_task(_consume(broker.subscribe(uuid.uuid4()), received)) for _ in range(connections)]
+    await asyncio.sleep(0)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"{connections} idle streams: {allocated / 1024 / 1024:.1f} MiB, {allocated / connections:.0f} bytes each\n")
+    for consumer in consumers:
+        consumer.cancel()
+    await asyncio.gather(*consumers)
+
+async def _fan_out(connections: int, streams_per_user: int, events: int) -> str:
+    broker = EventBroker(max_queue=events + 1)
+    users = [uuid.uuid4() for _ in range(max(1, connections // streams_per_user))]
+    received = [0]
+    consumers = [asyncio.create_task(_consume(broker.subscribe(users[n % len(users)]), received))
+                 for n in range(connections)]
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    for n in range(events):
+        broker.publish(users[n % len(users)], UserEvent("plant.updated", uuid.uuid4(), {"name": "Fern"}))
+    publish_seconds = time.perf_counter() - started
+    while received[0] < events * streams_per_user:
+        await asyncio.sleep(0)
+    delivered_seconds = time.perf_counter() - started
+    for consumer in consumers:
+        consumer.cancel()
+    await asyncio.gather(*consumers)
+    return (f"{streams_per_user:>8} {events:>8} {publish_seconds / events * 1e6:>12.1f} "
+            f"{received[0] / delivered_seconds:>14.0f}")
+
+async def run(args) -> None:
+    await _idle_memory(args.connections)
+    print(f"{'streams':>8} {'events':>8} {'publish µs':>12} {'deliveries/s':>14}")
+    for streams_per_user in args.streams_per_user:
+        print(await _fan_out(args.connections, streams_per_user, args.events))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--streams-per-user", type=int, nargs="+", default=[1, 5, 50])
+    parser.add_argument("--events", type=int, default=2000)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Memory profile of the streaming export: RSS while exporting a large number of plant rows.
+
+    python -m benchmarks.bench_export --rows 5000000 --format ndjson
+
+Seeds --rows plants for a throwaway user with one INSERT ... SELECT generate_series,
+streams them through the same generator the /api/v1/export/plants route uses, and
+prints resident memory at every 10% of progress. Flat numbers mean constant memory.
+The seeded rows are deleted afterwards unless --keep is given.
+"""
+import argparse
+import asyncio
+import os
+import resource
+import time
+import uuid
+from sqlalchemy import text
+from src.adapters.api.routers.export import export_body
+from src.config.database import SessionLocal, engine
+
+SEED_SQL = text(
+    "INSERT INTO plants (id, user_id, name, species, description, row_version, created_at, updated_at) "
+    "SELECT gen_random_uuid(), :user_id, 'Plant ' || n, 'Export benchmark', repeat('x', 64), 1, now(), now() "
+    "FROM generate_series(1, :rows) AS n"
+)
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+async def run(rows: int, export_format: str, keep: bool) -> None:
+    user_id = uuid.uuid4()
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.execute(SEED_SQL, {"user_id": user_id, "rows": rows})
+    print(f"seeded {rows:,} rows in {time.perf_counter() - started:.1f}s (user {user_id})")
+
+    try:
+        exported, next_report, sent_bytes = 0, 0.1, 0
+        baseline = _rss_mb()
+        started = time.perf_counter()
+        async for chunk in export_body(SessionLocal, "plants", export_format, user_id):
+            sent_bytes += len(chunk)
+            exported += chunk.count("\n")
+            if exported >= rows * next_report:
+                print(f"{exported / rows:5.0%}  rss {_rss_mb():8.1f} MB")
+                next_report += 0.1
+        elapsed = time.perf_counter() - started
+        print(f"exported {exported:,} lines, {sent_bytes / 2 ** 20:,.0f} MB in {elapsed:.1f}s "
+              f"({exported / elapsed:,.0f} rows/s)")
+        print(f"rss at start {baseline:.1f} MB, peak {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+    finally:
+        if not keep:
+            async with engine.begin() as conn:
+                await conn.execute(text("DELETE FROM plants WHERE user_id = :user_id"), {"user_id": user_id})
+        await engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded rows in place")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.format, args.keep))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Cost of Idempotency-Key handling: first attempt (claim + store) and replayed retry vs a plain create.
+
+    python -m benchmarks.bench_idempotency --calls 2000 --work-ms 5
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_idempotency --database
+
+The create endpoint is simulated by an ASGI app that sleeps `--work-ms` (the database and
+object store work a retry would otherwise repeat). With --database the keys live in the
+idempotency_keys table, as in production; otherwise in the per-worker memory store.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from src.adapters.api.idempotency import IdempotencyMiddleware
+from src.adapters.repositories.memory_repository_impl import InMemoryStore, InMemoryIdempotencyRepository
+
+BODY = json.dumps({"user_id": str(uuid.uuid4()), "name": "Fern", "species": "Nephrolepis"}).encode()
+
+def create_app(work_seconds: float):
+    async def app(scope, receive, send):
+        await receive()
+        await asyncio.sleep(work_seconds)
+        response = json.dumps({"id": str(uuid.uuid4()), "name": "Fern"}).encode()
+        await send({"type": "http.response.start", "status": 201, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": response})
+    return app
+
+async def _noop_send(message):
+    pass
+
+async def _receive():
+    return {"type": "http.request", "body": BODY, "more_body": False}
+
+def _scope(key):
+    headers = [(b"content-type", b"application/json")]
+    if key is not None:
+        headers.append((b"idempotency-key", key.encode()))
+    return {"type": "http", "method": "POST", "path": "/api/v1/plants/", "query_string": b"", "headers": headers}
+
+async def _per_request_ms(app, keys) -> float:
+    started = time.perf_counter()
+    for key in keys:
+        await app(_scope(key), _receive, _noop_send)
+    return (time.perf_counter() - started) / len(keys) * 1000
+
+async def run(calls: int, work_ms: float, database_url):
+    if database_url:
+        from sqlalchemy import delete
+        from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+        from sqlalchemy.orm import sessionmaker
+        from src.adapters.repositories.idempotency_repository_impl import IdempotencyRepositoryImpl
+        from src.adapters.repositories.models import IdempotencyKey
+        engine = create_async_engine(database_url)
+        session_factory = sessionmaker(bind=engine, class_=AsyncSession)
+        repository = IdempotencyRepositoryImpl(session_factory)
+    else:
+        repository = InMemoryIdempotencyRepository(InMemoryStore())
+
+    app = create_app(work_ms / 1000)
+    middleware = IdempotencyMiddleware(app, repository)
+    keys = [f"bench-{uuid.uuid4()}" for _ in range(calls)]
+    try:
+        plain = await _per_request_ms(middleware, [None] * calls)
+        first = await _per_request_ms(middleware, keys)
+        replayed = await _per_request_ms(middleware, keys)
+    finally:
+        if database_url:
+            async with session_factory() as session:
+                await session.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(keys)))
+                await session.commit()
+            await engine.dispose()
+
+    print(f"{'database' if database_url else 'memory'} store, {work_ms:.1f} ms of simulated create work")
+    print(f"plain create (no key)    {plain:8.3f} ms/request")
+    print(f"first attempt with key   {first:8.3f} ms/request  (+{first - plain:.3f} claim and store)")
+    print(f"replayed retry           {replayed:8.3f} ms/request  (create work skipped)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--work-ms", type=float, default=5.0)
+    parser.add_argument("--database", action="store_true", help="store keys in PostgreSQL (DATABASE_URL)")
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.work_ms, os.getenv("DATABASE_URL") if args.database else None))
@@ -0,0 +1,61 @@
+"""Stored bytes per photo and CPU cost per upload for photo normalization.
+
+    python -m benchmarks.bench_image_processing --width 4032 --height 3024 --uploads 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from io import BytesIO
+from PIL import Image, ImageFilter
+from src.adapters.images.pillow_processor import normalize_image, PillowImageProcessor
+
+def make_phone_photo(width: int, height: int) -> bytes:
+    """Noisy, blurred gradient saved like a phone camera JPEG (q95, with EXIF)."""
+    rng = random.Random(0)
+    base = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    noise = Image.frombytes("RGB", (width, height), rng.randbytes(width * height * 3)).filter(ImageFilter.GaussianBlur(2))
+    photo = Image.blend(base, noise, 0.5)
+    exif = Image.Exif()
+    exif[0x010F] = "Benchmark Phone"
+    exif[0x0110] = "Model X"
+    output = BytesIO()
+    photo.save(output, format="JPEG", quality=95, exif=exif)
+    return output.getvalue()
+
+async def _pool_throughput(processor: PillowImageProcessor, data: bytes, uploads: int) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*(processor.process(data) for _ in range(uploads)))
+    return uploads / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=4032)
+    parser.add_argument("--height", type=int, default=3024)
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--max-dimension", type=int, default=2048)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    data = make_phone_photo(args.width, args.height)
+    print(f"input: {args.width}x{args.height} JPEG, {len(data) / 1024:.0f} KiB\n")
+    print(f"{'format':<8}{'quality':>8}{'stored KiB':>12}{'ratio':>8}{'cpu ms/upload':>15}")
+    for output_format, quality in [("WEBP", 80), ("WEBP", 70), ("JPEG", 85), ("JPEG", 75)]:
+        cpu_start = time.process_time()
+        for _ in range(args.uploads):
+            processed = normalize_image(data, output_format, quality, args.max_dimension, 100_000_000)
+        cpu_ms = (time.process_time() - cpu_start) / args.uploads * 1000
+        print(f"{output_format:<8}{quality:>8}{len(processed.data) / 1024:>12.0f}"
+              f"{len(data) / len(processed.data):>7.1f}x{cpu_ms:>15.1f}")
+
+    processor = PillowImageProcessor(max_dimension=args.max_dimension, max_workers=args.workers,
+                                     max_upload_bytes=len(data) + 1, max_pixels=100_000_000)
+    try:
+        rate = asyncio.run(_pool_throughput(processor, data, args.uploads * 2))
+    finally:
+        processor.shutdown()
+    print(f"\nprocess pool ({args.workers} workers): {rate:.1f} uploads/s")
+
+if __name__ == "__main__":
+    main()
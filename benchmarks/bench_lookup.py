@@ -0,0 +1,74 @@
+"""Latency of fetching a list of plants by id: one GET-style query per id vs one `id = ANY(:ids)` lookup.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_lookup --plants 20000 --batch 1000
+
+Seeds `--plants` plants, then resolves `--batch` of them (plus `--unknown` ids that do
+not exist, as a downstream sync holding stale ids would) both ways through the
+repository. Rows are removed afterwards.
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+import uuid
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from src.adapters.repositories.models import Plant as PlantModel
+from src.adapters.repositories.plant_repository_impl import PlantRepositoryImpl
+from src.core.services.plant_service import PlantService
+
+async def _seed(engine, plants: int):
+    user_id = uuid.uuid4()
+    rows = [{"id": uuid.uuid4(), "user_id": user_id, "name": f"Plant {i}", "species": "Species"} for i in range(plants)]
+    async with AsyncSession(engine) as session:
+        for start in range(0, len(rows), 5000):
+            await session.execute(insert(PlantModel), rows[start:start + 5000])
+        await session.commit()
+    return user_id, [row["id"] for row in rows]
+
+async def one_by_one(session, ids):
+    repository = PlantRepositoryImpl(session)
+    plants = [await repository.get_plant_by_id(plant_id) for plant_id in ids]
+    return sorted(plant.id for plant in plants if plant is not None)
+
+async def batched(session, ids):
+    plants, _ = await PlantService(PlantRepositoryImpl(session), None).get_plants_by_ids(ids)
+    return sorted(plant.id for plant in plants)
+
+async def main(database_url: str, plants: int, batch: int, unknown: int, repeat: int):
+    engine = create_async_engine(database_url)
+    user_id, plant_ids = await _seed(engine, plants)
+    try:
+        random.seed(1)
+        ids = random.sample(plant_ids, min(batch, len(plant_ids))) + [uuid.uuid4() for _ in range(unknown)]
+        random.shuffle(ids)
+        print(f"{plants} plants, looking up {len(ids)} ids ({unknown} unknown)")
+        print(f"{'variant':<24}{'best ms':>10}{'per id us':>12}")
+        answers = []
+        for name, call in [("one query per id", one_by_one), ("single ANY(:ids) query", batched)]:
+            timings = []
+            for _ in range(repeat):
+                async with AsyncSession(engine) as session:
+                    started = time.perf_counter()
+                    result = await call(session, ids)
+                    timings.append(time.perf_counter() - started)
+            answers.append(result)
+            best = min(timings)
+            print(f"{name:<24}{best * 1000:>10.1f}{best / len(ids) * 1e6:>12.1f}")
+        assert answers[0] == answers[1], "variants disagree"
+    finally:
+        async with AsyncSession(engine) as session:
+            await session.execute(delete(PlantModel).where(PlantModel.user_id == user_id))
+            await session.commit()
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--plants", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--unknown", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.plants, args.batch, args.unknown, args.repeat))
@@ -0,0 +1,39 @@
+"""Slowdown of a CPU-bound workload while the sampling profiler runs, at several sampling intervals.
+
+    python -m benchmarks.bench_profiler --intervals-ms 10 5 1 --seconds 2
+
+The workload validates and serializes Plant models, roughly what a listing request
+does per row. 'off' is the cost when no profile is running: nothing is hooked in.
+"""
+import argparse
+import time
+import uuid
+from src.adapters.telemetry.profiler import SamplingProfiler
+from src.core.domain.plant import Plant
+
+def _workload(seconds: float) -> int:
+    user_id = uuid.uuid4()
+    deadline = time.perf_counter() + seconds
+    rows = 0
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            Plant(user_id=user_id, name="Fern", species="Nephrolepis").model_dump(mode="json")
+        rows += 100
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--intervals-ms", type=float, nargs="+", default=[10, 5, 1])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    baseline = _workload(args.seconds)
+    print(f"{'interval':>10} {'rows/s':>10} {'slowdown':>9} {'samples':>8}")
+    print(f"{'off':>10} {baseline / args.seconds:>10.0f} {0:>8.1f}% {0:>8}")
+    for interval_ms in args.intervals_ms:
+        with SamplingProfiler(interval_ms / 1000) as profiler:
+            rows = _workload(args.seconds)
+        print(f"{interval_ms:>8.1f}ms {rows / args.seconds:>10.0f} {(1 - rows / baseline) * 100:>8.1f}% {profiler.samples:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Overhead of the rate limiter: bucket operations and the full ASGI middleware hop.
+
+    python -m benchmarks.bench_rate_limiter --calls 200000 --keys 10000
+"""
+import argparse
+import asyncio
+import time
+from src.adapters.api.rate_limit import InMemoryRateLimitBackend, RateLimitMiddleware
+
+async def noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+async def noop_send(message):
+    pass
+
+async def noop_receive():
+    return {"type": "http.request", "body": b""}
+
+def _scopes(keys: int):
+    return [{
+        "type": "http",
+        "method": "GET",
+        "path": f"/api/v1/devices/users/00000000-0000-0000-0000-{i:012d}",
+        "headers": [(b"host", b"bench")],
+        "client": ("10.0.0.1", 1234),
+    } for i in range(keys)]
+
+async def _per_request_us(app, scopes, calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        await app(scopes[i % len(scopes)], noop_receive, noop_send)
+    return (time.perf_counter() - started) / calls * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--keys", type=int, default=10_000)
+    args = parser.parse_args()
+
+    backend = InMemoryRateLimitBackend()
+    started = time.perf_counter()
+    for i in range(args.calls):
+        backend.take(f"user:{i % args.keys}", 1, 1e9, 1e9, time.monotonic())
+    take_us = (time.perf_counter() - started) / args.calls * 1e6
+
+    scopes = _scopes(args.keys)
+    limited = RateLimitMiddleware(noop_app, InMemoryRateLimitBackend(), capacity=1e9, refill_per_second=1e9,
+                                  max_concurrent=20)
+    baseline_us = asyncio.run(_per_request_us(noop_app, scopes, args.calls))
+    limited_us = asyncio.run(_per_request_us(limited, scopes, args.calls))
+
+    print(f"bucket take():           {take_us:8.2f} us/call ({args.keys} keys)")
+    print(f"ASGI app without limiter {baseline_us:8.2f} us/request")
+    print(f"ASGI app with limiter    {limited_us:8.2f} us/request")
+    print(f"limiter overhead         {limited_us - baseline_us:8.2f} us/request")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""CPU and allocations of a large user listing: ORM entities + model_validate vs column rows + model_construct.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_row_mapping --rows 50000 --repeat 5
+
+Seeds one user with `--rows` plants, then loads the listing the old way (full ORM
+entities through the identity map, validated per attribute) and through
+PlantRepositoryImpl.get_plants_by_user_id. Rows are removed afterwards.
+"""
+import argparse
+import asyncio
+import os
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.future import select
+from src.adapters.repositories.models import Plant as PlantModel
+from src.adapters.repositories.plant_repository_impl import PlantRepositoryImpl
+from src.core.domain.plant import Plant as PlantDomain
+
+async def orm_get_plants_by_user_id(session, user_id):
+    result = await session.execute(select(PlantModel).where(PlantModel.user_id == user_id, PlantModel.deleted_at.is_(None)))
+    return [PlantDomain.model_validate(plant) for plant in result.scalars().all()]
+
+async def _seed(engine, rows: int) -> uuid.UUID:
+    user_id = uuid.uuid4()
+    now = datetime.utcnow()
+    async with AsyncSession(engine) as session:
+        for start in range(0, rows, 5000):
+            await session.execute(insert(PlantModel), [
+                {"id": uuid.uuid4(), "user_id": user_id, "name": f"Plant {n}", "species": "Ficus",
+                 "description": "Bench row", "created_at": now, "updated_at": now}
+                for n in range(start, min(start + 5000, rows))
+            ])
+        await session.commit()
+    return user_id
+
+async def _measure(engine, repeat: int, call):
+    cpu = []
+    for _ in range(repeat):
+        async with AsyncSession(engine) as session:
+            started = time.process_time()
+            plants = await call(session)
+            cpu.append(time.process_time() - started)
+    async with AsyncSession(engine) as session:
+        tracemalloc.start()
+        plants = await call(session)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return len(plants), min(cpu), peak
+
+async def main(database_url: str, rows: int, repeat: int):
+    engine = create_async_engine(database_url)
+    user_id = await _seed(engine, rows)
+    try:
+        print(f"{'variant':<32}{'rows':>8}{'cpu ms':>10}{'peak MiB':>10}")
+        results = []
+        for name, call in [("ORM entities + model_validate", lambda s: orm_get_plants_by_user_id(s, user_id)),
+                           ("column rows + model_construct", lambda s: PlantRepositoryImpl(s).get_plants_by_user_id(user_id))]:
+            count, cpu, peak = await _measure(engine, repeat, call)
+            results.append((cpu, peak))
+            print(f"{name:<32}{count:>8}{cpu * 1000:>10.0f}{peak / 1024 / 1024:>10.1f}")
+        (before_cpu, before_peak), (after_cpu, after_peak) = results
+        print(f"{'reduction':<32}{'':>8}{(1 - after_cpu / before_cpu) * 100:>9.1f}%{(1 - after_peak / before_peak) * 100:>9.1f}%")
+    finally:
+        async with AsyncSession(engine) as session:
+            await session.execute(delete(PlantModel).where(PlantModel.user_id == user_id))
+            await session.commit()
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.rows, args.repeat))
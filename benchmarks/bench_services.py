@@ -0,0 +1,64 @@
+"""Service-layer CPU cost per operation on the in-memory repositories, with no database in the loop.
+
+    python -m benchmarks.bench_services --users 1000 --plants-per-user 5 --iterations 20000
+
+PlantService and PhysicalDeviceService run unchanged on top of the in-memory
+repository backend, so the numbers are the cost of the service and domain code
+itself (validation, copies, version checks) that every database-backed request
+pays on top of its queries.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from src.adapters.repositories.memory_repository_impl import (InMemoryStore, InMemoryPlantRepository,
+                                                              InMemoryPhysicalDeviceRepository)
+from src.core.services.plant_service import PlantService
+from src.core.services.physical_device_service import PhysicalDeviceService
+
+async def _timed(label: str, iterations: int, call) -> None:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await call()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed / iterations * 1e6:>10.1f} {iterations / elapsed:>12.0f}")
+
+async def run(args) -> None:
+    store = InMemoryStore()
+    plants = PlantService(InMemoryPlantRepository(store), file_storage=None)
+    devices = PhysicalDeviceService(InMemoryPhysicalDeviceRepository(store))
+    users = [uuid.uuid4() for _ in range(args.users)]
+    started = time.perf_counter()
+    plant_ids = []
+    for user_id in users:
+        for n in range(args.plants_per_user):
+            plant = await plants.create_plant(user_id, f"Plant {n}", "Ficus")
+            device = await devices.create_device(user_id, f"Sensor {n}", category="sensor")
+            await devices.assign_device_to_plant(plant.id, device.id)
+            plant_ids.append((user_id, plant.id, device.id))
+    print(f"seeded {len(plant_ids)} plants and devices in {time.perf_counter() - started:.2f}s\n")
+
+    rng = random.Random(0)
+    pick = lambda: plant_ids[rng.randrange(len(plant_ids))]
+    print(f"{'operation':<28} {'µs/op':>10} {'ops/s':>12}")
+    await _timed("get_plant_by_id", args.iterations, lambda: plants.get_plant_by_id(pick()[1]))
+    await _timed("get_plants_by_user_id", args.iterations, lambda: plants.get_plants_by_user_id(pick()[0]))
+    await _timed("get_devices_by_plant_id", args.iterations, lambda: devices.get_devices_by_plant_id(pick()[1]))
+    await _timed("update_plant (If-Match)", args.iterations,
+                 lambda: _update_if_match(plants, pick()[1]))
+    await _timed("create_plant", args.iterations, lambda: plants.create_plant(pick()[0], "New", "Ficus"))
+
+async def _update_if_match(plants: PlantService, plant_id: uuid.UUID) -> None:
+    plant = await plants.get_plant_by_id(plant_id)
+    await plants.update_plant(plant_id, "Renamed", plant.species, expected_versions=[plant.row_version])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--plants-per-user", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=20000)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Request coalescing under a thundering herd: backend calls and latency with and without single-flight.
+
+    python -m benchmarks.bench_single_flight --concurrency 1 10 50 200 --db-ms 2 --storage-ms 15
+
+Every request reads the same plant and its photo through PlantService. The
+repository and object store are stand-ins that sleep for the given latency and
+allow a limited number of concurrent calls, like a connection pool, so contention
+shows up in the timings.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from src.core.domain.plant import Plant
+from src.core.services.plant_service import PlantService
+from src.core.services.single_flight import SingleFlight
+
+class SlowBackend:
+    def __init__(self, plant: Plant, db_seconds: float, storage_seconds: float, pool_size: int):
+        self.plant = plant
+        self.db_seconds = db_seconds
+        self.storage_seconds = storage_seconds
+        self.db_pool = asyncio.Semaphore(pool_size)
+        self.storage_pool = asyncio.Semaphore(pool_size)
+        self.db_calls = 0
+        self.storage_calls = 0
+
+    async def get_plant_by_id(self, plant_id):
+        async with self.db_pool:
+            self.db_calls += 1
+            await asyncio.sleep(self.db_seconds)
+            return self.plant.model_copy()
+
+    async def read_file(self, file_name):
+        async with self.storage_pool:
+            self.storage_calls += 1
+            await asyncio.sleep(self.storage_seconds)
+            return b"x" * 200_000
+
+async def _burst(concurrency: int, coalesce: bool, args) -> str:
+    plant = Plant(user_id=uuid.uuid4(), name="Dashboard plant", species="Ficus", photo_filename="hash.webp")
+    backend = SlowBackend(plant, args.db_ms / 1000, args.storage_ms / 1000, args.pool_size)
+    flight = SingleFlight() if coalesce else None
+    service = PlantService(backend, backend, single_flight=flight)
+
+    async def request():
+        started = time.perf_counter()
+        await service.get_plant_by_id(plant.id)
+        await service.read_plant_photo(plant.id)
+        return time.perf_counter() - started
+
+    latencies = sorted(await asyncio.gather(*(request() for _ in range(concurrency))))
+    p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+    return (f"{concurrency:>6} {'on' if coalesce else 'off':>6} {backend.db_calls:>9} {backend.storage_calls:>9} "
+            f"{p50 * 1000:>9.1f} {p99 * 1000:>9.1f}")
+
+async def run(args) -> None:
+    print(f"{'conc':>6} {'flight':>6} {'db calls':>9} {'s3 calls':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for concurrency in args.concurrency:
+        for coalesce in (False, True):
+            print(await _burst(concurrency, coalesce, args))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--db-ms", type=float, default=2.0)
+    parser.add_argument("--storage-ms", type=float, default=15.0)
+    parser.add_argument("--pool-size", type=int, default=10, help="concurrent backend calls allowed")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
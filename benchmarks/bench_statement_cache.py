@@ -0,0 +1,83 @@
+"""Per-call CPU cost of get_plant_by_id / get_device_by_id_and_user.
+
+Compares statements rebuilt on every call with no asyncpg prepared-statement
+cache (the previous behaviour) against the repository's prebuilt statements with
+the prepared-statement cache enabled.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_statement_cache --calls 20000
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.future import select
+from src.adapters.repositories.models import Plant as PlantModel, PhysicalDevice as PhysicalDeviceModel
+from src.adapters.repositories.plant_repository_impl import PlantRepositoryImpl
+from src.adapters.repositories.physical_device_repository_impl import PhysicalDeviceRepositoryImpl
+from src.core.domain.plant import Plant as PlantDomain, PhysicalDevice as PhysicalDeviceDomain
+
+async def rebuilt_get_plant_by_id(session, plant_id):
+    result = await session.execute(select(PlantModel).where(PlantModel.id == plant_id))
+    plant = result.scalar_one_or_none()
+    return PlantDomain.model_validate(plant) if plant else None
+
+async def rebuilt_get_device_by_id_and_user(session, device_id, user_id):
+    result = await session.execute(
+        select(PhysicalDeviceModel).where(PhysicalDeviceModel.id == device_id, PhysicalDeviceModel.user_id == user_id)
+    )
+    device = result.scalar_one_or_none()
+    return PhysicalDeviceDomain.model_validate(device) if device else None
+
+async def _seed(engine):
+    user_id, plant_id, device_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    now = datetime.utcnow()
+    async with AsyncSession(engine) as session:
+        session.add(PlantModel(id=plant_id, user_id=user_id, name="Bench", species="Bench", created_at=now, updated_at=now))
+        session.add(PhysicalDeviceModel(id=device_id, user_id=user_id, name="Bench", category="sensor", created_at=now, updated_at=now))
+        await session.commit()
+    return user_id, plant_id, device_id
+
+async def _measure(engine, calls, call):
+    async with AsyncSession(engine) as session:
+        for _ in range(min(calls // 10, 1000)):  # warm caches and the connection
+            await call(session)
+        session.expunge_all()
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        for _ in range(calls):
+            await call(session)
+            session.expunge_all()
+        cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+    return cpu / calls * 1e6, wall / calls * 1e6
+
+async def main(database_url: str, calls: int, cache_size: int):
+    uncached = create_async_engine(database_url, connect_args={"prepared_statement_cache_size": 0})
+    cached = create_async_engine(database_url, connect_args={"prepared_statement_cache_size": cache_size})
+    try:
+        user_id, plant_id, device_id = await _seed(cached)
+        cases = [
+            ("get_plant_by_id", uncached, lambda s: rebuilt_get_plant_by_id(s, plant_id),
+             cached, lambda s: PlantRepositoryImpl(s).get_plant_by_id(plant_id)),
+            ("get_device_by_id_and_user", uncached, lambda s: rebuilt_get_device_by_id_and_user(s, device_id, user_id),
+             cached, lambda s: PhysicalDeviceRepositoryImpl(s).get_device_by_id_and_user(device_id, user_id)),
+        ]
+        print(f"{'method':<28}{'variant':<26}{'cpu us/call':>14}{'wall us/call':>14}")
+        for name, before_engine, before, after_engine, after in cases:
+            before_cpu, before_wall = await _measure(before_engine, calls, before)
+            after_cpu, after_wall = await _measure(after_engine, calls, after)
+            print(f"{name:<28}{'rebuilt, no prepare cache':<26}{before_cpu:>14.1f}{before_wall:>14.1f}")
+            print(f"{name:<28}{'prebuilt, prepare cache':<26}{after_cpu:>14.1f}{after_wall:>14.1f}")
+            print(f"{'':<28}{'cpu reduction':<26}{(1 - after_cpu / before_cpu) * 100:>13.1f}%")
+    finally:
+        await uncached.dispose()
+        await cached.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--cache-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.calls, args.cache_size))
@@ -0,0 +1,55 @@
+"""Throughput of the local FileStorage backends: whole reads, range reads, streamed downloads and writes.
+
+    python -m benchmarks.bench_storage --sizes 64 1024 16384 --iterations 200
+
+Sizes are in KiB. Both backends run the adapter code the API uses, so this
+measures the storage layer itself without a MinIO server or network in the way;
+use it to see how much of a photo request's cost is the object store.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from src.adapters.storage.filesystem_storage import FilesystemStorage
+from src.adapters.storage.memory_storage import MemoryStorage
+from src.adapters.storage.presign import LocalPresigner
+
+async def _timed(iterations: int, call) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await call()
+    return (time.perf_counter() - started) / iterations
+
+async def _drain(storage, file_name: str) -> None:
+    async for _ in await storage.download_file(file_name):
+        pass
+
+async def _measure(name: str, storage, size: int, iterations: int) -> str:
+    data = os.urandom(size)
+    await storage.upload_bytes(data, "object.bin", "application/octet-stream")
+    write = await _timed(iterations, lambda: storage.upload_bytes(data, "object.bin", "application/octet-stream"))
+    read = await _timed(iterations, lambda: storage.read_file("object.bin"))
+    stream = await _timed(iterations, lambda: _drain(storage, "object.bin"))
+    ranged = await _timed(iterations, lambda: storage.read_range("object.bin", size // 2, 64 * 1024))
+    mib = size / (1024 * 1024)
+    return (f"{name:>10} {size // 1024:>8} {mib / write:>10.0f} {mib / read:>10.0f} {mib / stream:>10.0f} "
+            f"{ranged * 1e6:>10.1f}")
+
+async def run(args) -> None:
+    presigner = LocalPresigner(b"bench")
+    print(f"{'backend':>10} {'KiB':>8} {'write MB/s':>10} {'read MB/s':>10} {'strm MB/s':>10} {'range µs':>10}")
+    with tempfile.TemporaryDirectory() as root:
+        backends = {"memory": MemoryStorage(presigner), "filesystem": FilesystemStorage(root, presigner)}
+        for size in args.sizes:
+            for name, storage in backends.items():
+                print(await _measure(name, storage, size * 1024, args.iterations))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 1024, 16384], help="object sizes in KiB")
+    parser.add_argument("--iterations", type=int, default=200)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
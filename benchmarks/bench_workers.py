@@ -0,0 +1,93 @@
+"""RPS and latency of a scenario over HTTP at each gunicorn worker count.
+
+    python -m benchmarks.bench_workers --workers 1,2,4,8 --scenario detail --client-processes 4 --duration 20
+
+Needs the seed manifest (python -m benchmarks.seed) and the service's environment
+(DATABASE_URL and friends). For each count it starts `gunicorn -c gunicorn.conf.py` with
+WEB_CONCURRENCY set, waits for /health, drives it from --client-processes load processes
+(one event loop cannot saturate several workers) and stops it again. The load processes
+share the machine with the server, so compare counts with each other, not with production.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import time
+import httpx
+from benchmarks.drivers import http_client, run_load
+from benchmarks.report import summarize
+from benchmarks.scenarios import SCENARIOS
+
+def _load_process(base_url: str, scenario: str, manifest: dict, concurrency: int, duration: float, warmup: float,
+                  seed: int) -> tuple[list, int, float]:
+    async def load():
+        async with http_client(base_url, concurrency) as client:
+            return await run_load(client, SCENARIOS[scenario], manifest, concurrency, duration, warmup, seed)
+    recorder, elapsed = asyncio.run(load())
+    latencies = [value for values in recorder.latencies.values() for value in values]
+    failures = sum(recorder.errors.values()) + sum(count for statuses in recorder.statuses.values()
+                                                   for status, count in statuses.items() if status >= 500)
+    return latencies, failures, elapsed
+
+def _start_server(workers: int, port: int) -> subprocess.Popen:
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "BIND": f"127.0.0.1:{port}",
+           "RUN_MIGRATIONS_ON_STARTUP": "false", "RATE_LIMIT_ENABLED": "false"}
+    server = subprocess.Popen(["gunicorn", "-c", "gunicorn.conf.py", "src.main:app"], env=env)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {server.returncode}")
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("gunicorn did not become healthy within 60s")
+
+def _stop_server(server: subprocess.Popen) -> None:
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=40)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+def run(worker_counts: list, scenario: str, manifest: dict, port: int, client_processes: int, concurrency: int,
+        duration: float, warmup: float) -> None:
+    print(f"{scenario}: {client_processes} load processes x {concurrency} connections, {duration:.0f}s per run")
+    print(f"{'workers':>8}{'requests':>10}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}{'failed':>8}")
+    for workers in worker_counts:
+        server = _start_server(workers, port)
+        try:
+            with multiprocessing.Pool(client_processes) as pool:
+                results = pool.starmap(_load_process, [
+                    (f"http://127.0.0.1:{port}", scenario, manifest, concurrency, duration, warmup, seed)
+                    for seed in range(client_processes)
+                ])
+        finally:
+            _stop_server(server)
+        latencies = [value for values, _, _ in results for value in values]
+        stats = summarize(latencies, max(elapsed for _, _, elapsed in results))
+        failed = sum(failures for _, failures, _ in results)
+        print(f"{workers:>8}{stats['count']:>10}{stats['rps']:>10.0f}{stats['p50_ms']:>10.1f}"
+              f"{stats['p99_ms']:>10.1f}{failed:>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="detail")
+    parser.add_argument("--manifest", default="benchmarks/results/seed.json")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--client-processes", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--concurrency", type=int, default=32, help="connections per load process")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    args = parser.parse_args()
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    run([int(count) for count in args.workers.split(",")], args.scenario, manifest, args.port,
+        args.client_processes, args.concurrency, args.duration, args.warmup)
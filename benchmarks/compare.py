@@ -0,0 +1,24 @@
+"""Diff two benchmark reports, e.g. from two commits.
+
+    python -m benchmarks.compare benchmarks/results/main.json benchmarks/results/branch.json
+"""
+import argparse
+import json
+from benchmarks.report import compare_reports
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    print(f"baseline:  {baseline['metadata'].get('label')} @ {baseline['metadata'].get('commit')}")
+    print(f"candidate: {candidate['metadata'].get('label')} @ {candidate['metadata'].get('commit')}\n")
+    print(compare_reports(baseline, candidate))
+
+if __name__ == "__main__":
+    main()
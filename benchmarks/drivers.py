@@ -0,0 +1,68 @@
+"""Load drivers: in-process (ASGI transport, no network) and over-HTTP."""
+import asyncio
+import random
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, List
+import httpx
+from benchmarks.scenarios import Scenario
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, operation: str, seconds: float, status: int) -> None:
+        self.latencies[operation].append(seconds)
+        self.statuses[operation][status] += 1
+
+@asynccontextmanager
+async def in_process_client():
+    """Drive the FastAPI app directly; isolates app cost from the network and server.
+
+    ASGITransport does not send lifespan events, so startup and shutdown run here: without
+    them the startup checks, the warmed binding index and the background workers are missing.
+    """
+    from src.main import app
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            yield client
+
+@asynccontextmanager
+async def http_client(base_url: str, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        yield client
+
+async def _worker(client: httpx.AsyncClient, scenario: Scenario, manifest: dict, rng: random.Random,
+                  deadline: float, recorder: Recorder | None) -> None:
+    while time.perf_counter() < deadline:
+        operation = scenario.pick(rng)
+        for method, url, kwargs in operation.build(manifest, rng):
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                await response.aread()
+            except httpx.HTTPError:
+                if recorder is not None:
+                    recorder.errors[operation.name] += 1
+                continue
+            if recorder is not None:
+                recorder.record(operation.name, time.perf_counter() - start, response.status_code)
+
+async def run_load(client: httpx.AsyncClient, scenario: Scenario, manifest: dict, concurrency: int,
+                   duration: float, warmup: float = 0.0, seed: int = 0) -> tuple[Recorder, float]:
+    """Run `concurrency` closed-loop workers for `duration` seconds after a warmup."""
+    rngs = [random.Random(seed + i) for i in range(concurrency)]
+    if warmup > 0:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(_worker(client, scenario, manifest, rng, deadline, None) for rng in rngs))
+
+    recorder = Recorder()
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_worker(client, scenario, manifest, rng, deadline, recorder) for rng in rngs))
+    return recorder, time.perf_counter() - start
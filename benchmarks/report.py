@@ -0,0 +1,86 @@
+"""Latency/throughput summaries and JSON reports that can be diffed across commits."""
+import json
+import math
+import os
+import platform
+import subprocess
+from datetime import datetime
+from typing import List
+from benchmarks.drivers import Recorder
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def summarize(latencies: List[float], elapsed: float) -> dict:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def build_report(recorder: Recorder, elapsed: float, **metadata) -> dict:
+    all_latencies = [value for values in recorder.latencies.values() for value in values]
+    operations = {}
+    for name, latencies in sorted(recorder.latencies.items()):
+        operations[name] = summarize(latencies, elapsed)
+        operations[name]["statuses"] = {str(status): count for status, count in sorted(recorder.statuses[name].items())}
+        operations[name]["errors"] = recorder.errors.get(name, 0)
+    return {
+        "metadata": {
+            "commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "elapsed_s": round(elapsed, 3),
+            **metadata,
+        },
+        "total": summarize(all_latencies, elapsed),
+        "operations": operations,
+    }
+
+def write_report(report: dict, path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+def format_report(report: dict) -> str:
+    lines = [f"{'operation':<22}{'count':>9}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"]
+    rows = list(report["operations"].items()) + [("TOTAL", report["total"])]
+    for name, stats in rows:
+        lines.append(f"{name:<22}{stats['count']:>9}{stats['rps']:>10}{stats['p50_ms']:>10}"
+                     f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+    return "\n".join(lines)
+
+def _delta(baseline: float, candidate: float) -> str:
+    if not baseline:
+        return "n/a"
+    return f"{(candidate - baseline) / baseline * 100:+.1f}%"
+
+def compare_reports(baseline: dict, candidate: dict) -> str:
+    """Side-by-side deltas for every operation present in both reports."""
+    metrics = ["rps", "p50_ms", "p95_ms", "p99_ms"]
+    lines = [f"{'operation':<22}" + "".join(f"{metric:>22}" for metric in metrics)]
+    baseline_ops = dict(baseline["operations"], TOTAL=baseline["total"])
+    candidate_ops = dict(candidate["operations"], TOTAL=candidate["total"])
+    for name in [op for op in baseline_ops if op in candidate_ops]:
+        cells = []
+        for metric in metrics:
+            before, after = baseline_ops[name][metric], candidate_ops[name][metric]
+            cells.append(f"{before:>8}->{after:<8}{_delta(before, after):>6}")
+        lines.append(f"{name:<22}" + "".join(f"{cell:>22}" for cell in cells))
+    return "\n".join(lines)
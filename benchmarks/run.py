@@ -0,0 +1,50 @@
+"""Run a benchmark scenario and write a JSON report.
+
+    python -m benchmarks.run --scenario detail --driver inprocess --concurrency 32 --duration 30
+    python -m benchmarks.run --scenario list --driver http --base-url http://localhost:8003
+"""
+import argparse
+import asyncio
+import json
+import os
+from benchmarks.drivers import in_process_client, http_client, run_load
+from benchmarks.report import build_report, write_report, format_report
+from benchmarks.scenarios import SCENARIOS
+
+async def _run(args, manifest):
+    scenario = SCENARIOS[args.scenario]
+    if args.driver == "inprocess":
+        client_context = in_process_client()
+    else:
+        client_context = http_client(args.base_url, args.concurrency)
+    async with client_context as client:
+        return await run_load(client, scenario, manifest, args.concurrency, args.duration, args.warmup, args.seed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an API benchmark scenario")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), required=True)
+    parser.add_argument("--driver", choices=["inprocess", "http"], default="inprocess")
+    parser.add_argument("--base-url", default="http://localhost:8003")
+    parser.add_argument("--manifest", default="benchmarks/results/seed.json")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--label", default=None)
+    parser.add_argument("--output", default=None, help="defaults to benchmarks/results/<label>.json")
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+
+    recorder, elapsed = asyncio.run(_run(args, manifest))
+    label = args.label or f"{args.scenario}-{args.driver}-c{args.concurrency}"
+    report = build_report(recorder, elapsed, label=label, scenario=args.scenario, driver=args.driver,
+                          concurrency=args.concurrency, duration_s=args.duration)
+    output = args.output or os.path.join("benchmarks", "results", f"{label}.json")
+    write_report(report, output)
+    print(format_report(report))
+    print(f"\nReport written to {output}")
+
+if __name__ == "__main__":
+    main()
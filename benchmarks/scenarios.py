@@ -0,0 +1,93 @@
+"""Benchmark workloads.
+
+A scenario is a list of weighted operations. Each operation receives the seed
+manifest and a random generator and returns the requests to send, in order, as
+``(method, url, request_kwargs)`` tuples; the drivers pick operations by weight
+and time every request individually.
+"""
+import random
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Callable, Dict, List, Tuple
+from PIL import Image
+
+Request = Tuple[str, str, dict]
+
+PHOTO_SIZE = 8  # Small enough not to measure image size, large enough that every photo is distinct
+
+def make_photo(rng: random.Random) -> bytes:
+    """A PNG of random pixels; uploads are stored by content hash, so a repeated image would be deduplicated"""
+    image = Image.frombytes("RGB", (PHOTO_SIZE, PHOTO_SIZE), rng.randbytes(PHOTO_SIZE * PHOTO_SIZE * 3))
+    output = BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+@dataclass
+class Operation:
+    name: str
+    weight: int
+    build: Callable[[dict, random.Random], List[Request]]
+
+@dataclass
+class Scenario:
+    name: str
+    operations: List[Operation]
+
+    def pick(self, rng: random.Random) -> Operation:
+        return rng.choices(self.operations, weights=[op.weight for op in self.operations])[0]
+
+def _user(manifest: dict, rng: random.Random) -> dict:
+    return rng.choice(manifest["users"])
+
+def _user_plants(manifest, rng):
+    return [("GET", f"/api/v1/plants/users/{_user(manifest, rng)['user_id']}", {})]
+
+def _user_devices(manifest, rng):
+    return [("GET", f"/api/v1/devices/users/{_user(manifest, rng)['user_id']}", {})]
+
+def _all_plants(manifest, rng):
+    return [("GET", "/api/v1/plants/", {})]
+
+def _plant_detail(manifest, rng):
+    return [("GET", f"/api/v1/plants/{rng.choice(_user(manifest, rng)['plant_ids'])}", {})]
+
+def _plant_devices(manifest, rng):
+    return [("GET", f"/api/v1/plants/{rng.choice(_user(manifest, rng)['plant_ids'])}/devices", {})]
+
+def _user_device_detail(manifest, rng):
+    user = _user(manifest, rng)
+    return [("GET", f"/api/v1/devices/users/{user['user_id']}/devices/{rng.choice(user['device_ids'])}", {})]
+
+def _assign(manifest, rng):
+    user = _user(manifest, rng)
+    plant_id, device_id = rng.choice(user["plant_ids"]), rng.choice(user["device_ids"])
+    # Seeded plants already hold every device of their owner, so drop and re-add the pair
+    url = f"/api/v1/plants/{plant_id}/devices/{device_id}"
+    return [("DELETE", url, {}), ("POST", url, {})]
+
+def _photo_upload(manifest, rng):
+    plant_id = rng.choice(_user(manifest, rng)["plant_ids"])
+    return [("POST", f"/api/v1/plants/{plant_id}/photo", {"files": {"file": ("bench.png", make_photo(rng), "image/png")}})]
+
+def _photo_download(manifest, rng):
+    return [("GET", f"/api/v1/plants/{rng.choice(_user(manifest, rng)['plant_ids'])}/photo", {})]
+
+SCENARIOS: Dict[str, Scenario] = {
+    "list": Scenario("list", [
+        Operation("user_plants", 5, _user_plants),
+        Operation("user_devices", 5, _user_devices),
+        Operation("all_plants", 1, _all_plants),
+    ]),
+    "detail": Scenario("detail", [
+        Operation("plant_detail", 5, _plant_detail),
+        Operation("plant_devices", 3, _plant_devices),
+        Operation("user_device_detail", 2, _user_device_detail),
+    ]),
+    "assign": Scenario("assign", [
+        Operation("assign_or_remove", 1, _assign),
+    ]),
+    "photo": Scenario("photo", [
+        Operation("photo_upload", 1, _photo_upload),
+        Operation("photo_download", 4, _photo_download),
+    ]),
+}
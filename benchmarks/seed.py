@@ -0,0 +1,72 @@
+"""Seed N users x M plants x K devices for benchmark runs.
+
+    python -m benchmarks.seed --users 100 --plants 20 --devices 5 --output benchmarks/results/seed.json
+
+Each plant gets its user's first K devices assigned. The manifest written to
+--output lists the generated ids and is what the scenarios draw from.
+"""
+import argparse
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.adapters.repositories.models import Plant, PhysicalDevice, PlantPhysicalDevice
+
+BATCH_SIZE = 5000
+
+async def _insert_batches(conn, table, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        await conn.execute(insert(table), rows[start:start + BATCH_SIZE])
+
+async def seed(database_url: str, users: int, plants_per_user: int, devices_per_user: int) -> dict:
+    now = datetime.utcnow()
+    manifest = {"users": []}
+    plant_rows, device_rows, assignment_rows = [], [], []
+    for _ in range(users):
+        user_id = uuid.uuid4()
+        plant_ids = [uuid.uuid4() for _ in range(plants_per_user)]
+        device_ids = [uuid.uuid4() for _ in range(devices_per_user)]
+        plant_rows += [{"id": plant_id, "user_id": user_id, "name": f"Plant {i}", "species": "Benchmark species",
+                        "created_at": now, "updated_at": now} for i, plant_id in enumerate(plant_ids)]
+        device_rows += [{"id": device_id, "user_id": user_id, "name": f"Device {i}", "category": "sensor",
+                         "created_at": now, "updated_at": now} for i, device_id in enumerate(device_ids)]
+        assignment_rows += [{"plant_id": plant_id, "physical_device_id": device_id, "assigned_at": now}
+                            for plant_id in plant_ids for device_id in device_ids]
+        manifest["users"].append({
+            "user_id": str(user_id),
+            "plant_ids": [str(plant_id) for plant_id in plant_ids],
+            "device_ids": [str(device_id) for device_id in device_ids],
+        })
+
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.begin() as conn:
+            await _insert_batches(conn, PhysicalDevice.__table__, device_rows)
+            await _insert_batches(conn, Plant.__table__, plant_rows)
+            await _insert_batches(conn, PlantPhysicalDevice.__table__, assignment_rows)
+    finally:
+        await engine.dispose()
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the database for benchmark runs")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--plants", type=int, default=20, help="plants per user")
+    parser.add_argument("--devices", type=int, default=5, help="devices per user")
+    parser.add_argument("--output", default="benchmarks/results/seed.json")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    manifest = asyncio.run(seed(args.database_url, args.users, args.plants, args.devices))
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(manifest, f)
+    print(f"Seeded {args.users} users x {args.plants} plants x {args.devices} devices -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Production server: N shared-nothing uvicorn workers under gunicorn.
+
+    gunicorn -c gunicorn.conf.py src.main:app
+
+Every value can be overridden through the environment. Migrations are not run here:
+scripts/start.sh applies them once before gunicorn starts the workers.
+
+Workers share nothing but the database. Per-process features therefore only see their
+own worker: an event stream (/users/{id}/events) receives the changes handled by the
+worker it is connected to, and the memory rate-limit backend meters per worker. The
+memory idempotency and file storage backends cannot work across workers at all, so the
+app refuses to start with them when WEB_CONCURRENCY is above 1; set WEB_CONCURRENCY=1
+where complete event streams matter.
+"""
+import math
+import os
+
+def _cpu_count() -> int:
+    """CPUs this container may use: the cgroup v2 quota if one is set, else the affinity mask"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+bind = os.getenv("BIND", f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}")
+# Async workers: one per CPU keeps every core busy without oversubscribing the event loops
+workers = int(os.getenv("WEB_CONCURRENCY", _cpu_count()))
+# uvicorn[standard] brings uvloop and httptools, which the worker's 'auto' loop and http pick up
+worker_class = "uvicorn.workers.UvicornWorker"
+backlog = int(os.getenv("BACKLOG", "2048"))
+keepalive = int(os.getenv("KEEPALIVE_SECONDS", "5"))  # Becomes uvicorn's timeout_keep_alive
+timeout = int(os.getenv("WORKER_TIMEOUT_SECONDS", "60"))  # A worker silent for longer is restarted
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT_SECONDS", "30"))
+# Recycle workers after this many requests (0 disables); the jitter keeps them from restarting together
+max_requests = int(os.getenv("MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "0"))
+accesslog = None  # RequestContextMiddleware writes the access log
+# No preload: each worker opens its own pools and background tasks after the fork;
+# the database-wide jobs run only in the worker holding their advisory lock (BACKGROUND_JOBS_*)
+
+# Workers size their database pools from this, so together they stay within DATABASE_MAX_CONNECTIONS
+os.environ["WEB_CONCURRENCY"] = str(workers)
@@ -0,0 +1,12 @@
+#!/bin/sh
+# Production entrypoint: migrate once, then replace this shell with gunicorn and its workers
+set -e
+
+# Set RUN_MIGRATIONS_ON_STARTUP=false when a separate release job applies migrations
+if [ "${RUN_MIGRATIONS_ON_STARTUP:-true}" != "false" ]; then
+    python -m src.adapters.cli.migrate
+fi
+
+# The workers must not run them again, concurrently
+export RUN_MIGRATIONS_ON_STARTUP=false
+exec gunicorn -c gunicorn.conf.py src.main:app
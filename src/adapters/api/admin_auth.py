@@ -0,0 +1,16 @@
+import hmac
+from typing import Optional
+from fastapi import Header, HTTPException
+from src.config.settings import settings
+
+def admin_token_valid(token: Optional[str]) -> bool:
+    """False whenever ADMIN_TOKEN is unset, so admin-only features are off unless a token is configured"""
+    if not settings.ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode())
+
+async def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not admin_token_valid(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
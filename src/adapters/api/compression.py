@@ -0,0 +1,172 @@
+import zlib
+from typing import Optional, Sequence
+
+try:
+    import brotli
+except ImportError:  # optional: enables 'br'
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: enables 'zstd'
+    zstandard = None
+
+# Bodies that are already compressed (photos, archives) are passed through untouched
+SKIPPED_CONTENT_TYPES = ("image/", "video/", "audio/", "application/octet-stream", "application/zip",
+                         "application/gzip", "application/x-gzip", "text/event-stream")
+
+
+def available_encodings() -> list:
+    """Supported encodings in server preference order."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, available: Sequence[str]) -> Optional[str]:
+    """Pick the encoding with the highest q-value, breaking ties by server preference."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int, zstd_level: int):
+        if encoding == "zstd":
+            compressor = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+            self.compress, self.flush = compressor.compress, compressor.flush
+        elif encoding == "br":
+            compressor = brotli.Compressor(quality=brotli_quality)
+            self.compress, self.flush = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+            self.compress, self.flush = compressor.compress, compressor.flush
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with gzip, brotli or zstd per Accept-Encoding."""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+                 zstd_level: int = 3):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.zstd_level = zstd_level
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept_encoding, self.encodings) if accept_encoding else None
+        if encoding is None:
+            async def send_with_vary(message):
+                # Caches must still key on Accept-Encoding: another client would get this compressed
+                if message["type"] == "http.response.start" and _compressible(message.get("headers", [])):
+                    message = {**message, "headers": _with_vary(message.get("headers", []))}
+                await send(message)
+            await self.app(scope, receive, send_with_vary)
+            return
+        await self.app(scope, receive, _CompressingSender(send, encoding, self))
+
+
+def _compressible(headers) -> bool:
+    values = {name.lower(): value for name, value in headers}
+    content_type = values.get(b"content-type", b"").decode("latin-1")
+    return b"content-encoding" not in values and not content_type.startswith(SKIPPED_CONTENT_TYPES)
+
+
+def _with_vary(headers) -> list:
+    vary = [value for name, value in headers if name.lower() == b"vary"]
+    if any(b"accept-encoding" in value.lower() for value in vary):
+        return list(headers)
+    return [(name, value) for name, value in headers if name.lower() != b"vary"] + \
+        [(b"vary", b", ".join(vary + [b"Accept-Encoding"]))]
+
+
+class _CompressingSender:
+    def __init__(self, send, encoding: str, middleware: CompressionMiddleware):
+        self.send = send
+        self.encoding = encoding
+        self.middleware = middleware
+        self.start_message = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            self.passthrough = not _compressible(message.get("headers", []))
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                self.start_message["headers"] = _with_vary(self.start_message.get("headers", []))
+                await self._flush_start()
+                await self.send(message)
+                return
+            self.compressor = _Compressor(self.encoding, self.middleware.gzip_level,
+                                          self.middleware.brotli_quality, self.middleware.zstd_level)
+            if not more_body:
+                # The whole body is here: compress it in one go and keep an exact content-length
+                data = self.compressor.compress(body) + self.compressor.flush()
+                self._rewrite_headers(self.start_message, len(data))
+                await self._flush_start()
+                await self.send({"type": "http.response.body", "body": data, "more_body": False})
+                return
+            self._rewrite_headers(self.start_message, None)
+            await self._flush_start()
+
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.flush()
+        if data or not more_body:
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _rewrite_headers(self, message, content_length: Optional[int]) -> None:
+        """Compressed headers; a streamed body has no known length, so content-length is dropped."""
+        headers = [(name, value) for name, value in _with_vary(message.get("headers", []))
+                   if name.lower() != b"content-length"]
+        headers.append((b"content-encoding", self.encoding.encode()))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode()))
+        message["headers"] = headers
+
+    async def _flush_start(self) -> None:
+        if self.start_message is not None:
+            await self.send(self.start_message)
+            self.start_message = None
@@ -0,0 +1,43 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, List, Sequence
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+def _json_default(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    return value
+
+async def ndjson_chunks(batches: AsyncIterator[List[dict]]) -> AsyncIterator[str]:
+    """One JSON document per line; each batch of rows becomes a single chunk of the response body"""
+    async for batch in batches:
+        yield "".join(json.dumps(row, default=_json_default, separators=(",", ":")) + "\n" for row in batch)
+
+async def csv_chunks(batches: AsyncIterator[List[dict]], columns: Sequence[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for batch in batches:
+        writer.writerows([_csv_value(row[column]) for column in columns] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header-only output for an empty export
+    if buffer.tell():
+        yield buffer.getvalue()
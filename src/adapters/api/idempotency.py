@@ -0,0 +1,186 @@
+import hashlib
+import json
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+from src.adapters.api.negotiation import JSON_MEDIA_TYPE, preferred_media_type
+from src.adapters.api.rate_limit import client_key, parse_networks
+from src.core.ports.idempotency_repository import IdempotencyRepository
+
+# Creates that must not run twice when a client retries after a lost response
+DEFAULT_IDEMPOTENT_ROUTES = [
+    ("POST", r"^/api/v1/plants/?$"),
+    ("POST", r"^/api/v1/devices/?$"),
+    ("POST", r"^/api/v1/plants/[^/]+/photo$"),
+]
+
+# Everything else about the response is regenerated by the outer middlewares and the server
+REPLAYED_HEADERS = {"content-type", "location", "etag"}
+MAX_KEY_LENGTH = 255
+# Multipart headers and boundaries around an upload, on top of the largest accepted file
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+def scoped_key(client: str, key: str) -> str:
+    """Storage key: each client gets its own Idempotency-Key namespace, so keys never collide across clients"""
+    return hashlib.sha256(f"{client}\0{key}".encode()).hexdigest()
+
+def request_fingerprint(method: str, path: str, query_string: bytes, content_type: str, body: bytes,
+                        media_type: str = JSON_MEDIA_TYPE) -> str:
+    """sha256 identifying the request a key was used for.
+
+    Multipart boundaries are random per attempt in most HTTP clients, so they are
+    removed before hashing; a retried upload of the same file still matches. The
+    negotiated response media type is part of it, since the stored body is encoded in it.
+    """
+    _, _, boundary = content_type.partition("boundary=")
+    if content_type.startswith("multipart/") and boundary:
+        body = body.replace(boundary.split(";")[0].strip().strip('"').encode("latin-1"), b"")
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query_string, media_type.encode()):
+        digest.update(part)
+        digest.update(b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+class IdempotencyMiddleware:
+    """Runs a POST carrying an Idempotency-Key at most once and replays its response to retries.
+
+    The first request claims the key with its fingerprint, runs, and stores a response
+    below 500 until the TTL passes. A retry gets that response back with
+    Idempotent-Replayed: true; a retry arriving while the first attempt still runs
+    gets 409, and reusing a key for a different request gets 422. Server errors and
+    oversized responses release the key so the next retry runs again. The body is
+    buffered for the fingerprint, so one larger than max_request_bytes gets 413.
+
+    Keys are scoped to the caller: its Authorization credential when it sends one, else
+    its address (see rate_limit.client_key). Runs inside ContentNegotiationMiddleware.
+    """
+
+    def __init__(self, app, repository: IdempotencyRepository, ttl_seconds: float = 86400.0,
+                 lock_seconds: float = 60.0, max_response_bytes: int = 64 * 1024,
+                 routes: Optional[List[Tuple[str, str]]] = None, trusted_proxies: Sequence[str] = (),
+                 max_request_bytes: int = 25 * 1024 * 1024 + FORM_OVERHEAD_BYTES):
+        self.app = app
+        self.repository = repository
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.lock_timeout = timedelta(seconds=lock_seconds)
+        self.max_response_bytes = max_response_bytes
+        self.max_request_bytes = max_request_bytes
+        self.routes = [(method, re.compile(pattern))
+                       for method, pattern in (DEFAULT_IDEMPOTENT_ROUTES if routes is None else routes)]
+        self.trusted_proxies = parse_networks(trusted_proxies)
+
+    def applies_to(self, method: str, path: str) -> bool:
+        return any(route_method == method and pattern.match(path) for route_method, pattern in self.routes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.applies_to(scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        key, content_type, credential, content_length = None, "", None, None
+        for name, value in scope["headers"]:
+            if name == b"idempotency-key":
+                key = value.decode("latin-1").strip()
+            elif name == b"content-type":
+                content_type = value.decode("latin-1")
+            elif name == b"authorization":
+                credential = value.decode("latin-1")
+            elif name == b"content-length" and value.isdigit():
+                content_length = int(value)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _reject(send, 400, f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters")
+            return
+
+        # The whole body is needed for the fingerprint before anything runs; it is replayed to the app below
+        too_large = f"Request body exceeds {self.max_request_bytes} bytes"
+        if content_length is not None and content_length > self.max_request_bytes:
+            await _reject(send, 413, too_large)
+            return
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_request_bytes:
+                # Chunked bodies carry no length up front; stop buffering as soon as one passes the cap
+                await _reject(send, 413, too_large)
+                return
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        fingerprint = request_fingerprint(scope["method"], scope["path"], scope.get("query_string", b""),
+                                          content_type, body, preferred_media_type.get())
+        client = f"auth:{credential}" if credential else client_key(scope, self.trusted_proxies)
+        key = scoped_key(client, key)
+
+        now = datetime.utcnow()
+        record = await self.repository.begin(key, fingerprint, now, now + self.ttl, now - self.lock_timeout)
+        if record is not None:
+            if record.fingerprint != fingerprint:
+                await _reject(send, 422, "Idempotency-Key was already used for a different request")
+            elif not record.completed:
+                await _reject(send, 409, "A request with this Idempotency-Key is still in progress", retry_after=1)
+            else:
+                await _replay(send, record.status_code, record.headers, record.body)
+            return
+
+        await self._run_and_store(scope, body, receive, send, key)
+
+    async def _run_and_store(self, scope, body: bytes, receive, send, key: str) -> None:
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status: Optional[int] = None
+        headers: List[Tuple[str, str]] = []
+        captured: List[bytes] = []
+        captured_size = 0
+
+        async def capture_send(message):
+            # Responses still stream to the client as they are produced; only a copy is kept
+            nonlocal status, captured_size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers.extend((name.decode("latin-1").lower(), value.decode("latin-1"))
+                               for name, value in message.get("headers", [])
+                               if name.decode("latin-1").lower() in REPLAYED_HEADERS)
+            elif message["type"] == "http.response.body" and captured_size <= self.max_response_bytes:
+                chunk = message.get("body", b"")
+                captured_size += len(chunk)
+                captured.append(chunk)
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            await self.repository.release(key)
+            raise
+        if status is None or status >= 500 or captured_size > self.max_response_bytes:
+            await self.repository.release(key)
+        else:
+            await self.repository.complete(key, status, headers, b"".join(captured))
+
+async def _replay(send, status: int, headers: List[Tuple[str, str]], body: bytes) -> None:
+    raw_headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+    raw_headers += [(b"content-length", str(len(body)).encode()), (b"idempotent-replayed", b"true")]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
+
+async def _reject(send, status: int, detail: str, retry_after: Optional[int] = None) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    if retry_after is not None:
+        headers.append((b"retry-after", str(retry_after).encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from typing import BinaryIO, Callable, Iterator, Optional, Tuple
+from pydantic import ValidationError
+from src.adapters.api.schemas import PlantCreate, PhysicalDeviceCreate
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+def import_format(filename: Optional[str], requested: Optional[str]) -> str:
+    """Explicit format wins, otherwise the file extension decides; NDJSON is the default"""
+    if requested:
+        return requested
+    return "csv" if (filename or "").lower().endswith(".csv") else "ndjson"
+
+def read_csv_rows(binary_file: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    """(line number, values) per CSV record; empty cells become None and unreadable records a ValueError"""
+    text_file = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text_file)
+        while True:
+            try:
+                values = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                # A malformed record (e.g. an oversized field) is a row error; the reader carries on after it
+                yield reader.line_num, ValueError(f"Unreadable CSV record: {e}")
+                continue
+            yield reader.line_num, {key: value or None for key, value in values.items() if key is not None}
+    finally:
+        # Hand the file back to its owner instead of closing it with the wrapper
+        text_file.detach()
+
+def read_ndjson_rows(binary_file: BinaryIO) -> Iterator[Tuple[int, bytes]]:
+    """(line number, raw line) per non-blank line; lines are parsed during validation so bad JSON is a row error"""
+    for line_number, line in enumerate(binary_file, start=1):
+        if line.strip():
+            yield line_number, line
+
+def _json_object(line: bytes) -> dict:
+    values = json.loads(line)
+    if not isinstance(values, dict):
+        raise ValueError("Row is not a JSON object")
+    return values
+
+def _csv_values(values) -> dict:
+    if isinstance(values, ValueError):
+        raise values
+    return values
+
+def _row_id(values: dict) -> uuid.UUID:
+    # Rows may carry their own id, which makes re-running an import skip what was already loaded
+    row_id = values.get("id")
+    return uuid.UUID(str(row_id)) if row_id else uuid.uuid4()
+
+def _validate(schema, values: dict):
+    try:
+        return schema.model_validate(values)
+    except ValidationError as e:
+        raise ValueError("; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                                   for error in e.errors()))
+
+def plant_record(values: dict) -> tuple:
+    """Validated plant row in ImportRepositoryImpl's PLANT_IMPORT_COLUMNS order"""
+    plant = _validate(PlantCreate, values)
+    now = datetime.utcnow()
+    return (_row_id(values), plant.user_id, plant.name, plant.species, plant.description, 1, now, now)
+
+def device_record(values: dict) -> tuple:
+    """Validated device row in ImportRepositoryImpl's DEVICE_IMPORT_COLUMNS order"""
+    device = _validate(PhysicalDeviceCreate, values)
+    now = datetime.utcnow()
+    return (_row_id(values), device.user_id, device.name, device.description, device.version,
+            device.category.value, 1, now, now)
+
+def import_source(binary_file: BinaryIO, file_format: str,
+                  record: Callable[[dict], tuple]) -> Tuple[Iterator[Tuple[int, object]], Callable[[object], tuple]]:
+    """Row iterator and matching row -> record function for BulkImportService"""
+    if file_format == "csv":
+        return read_csv_rows(binary_file), lambda values: record(_csv_values(values))
+    return read_ndjson_rows(binary_file), lambda line: record(_json_object(line))
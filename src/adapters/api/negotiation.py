@@ -0,0 +1,96 @@
+from contextvars import ContextVar
+from fastapi.responses import JSONResponse
+
+try:
+    import msgpack
+except ImportError:  # optional: enables application/msgpack responses
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_ALIASES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+
+preferred_media_type: ContextVar[str] = ContextVar("preferred_media_type", default=JSON_MEDIA_TYPE)
+
+
+def negotiate_media_type(accept: str) -> str:
+    """MessagePack only when it is available and ranked strictly above JSON in Accept."""
+    if msgpack is None:
+        return JSON_MEDIA_TYPE
+    json_q, msgpack_q = 0.0, 0.0
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if media_type in MSGPACK_ALIASES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            json_q = max(json_q, q)
+    return MSGPACK_MEDIA_TYPE if msgpack_q > json_q else JSON_MEDIA_TYPE
+
+
+class NegotiatedResponse(JSONResponse):
+    """Default response class: JSON, or MessagePack for callers that asked for it."""
+
+    def render(self, content) -> bytes:
+        if preferred_media_type.get() == MSGPACK_MEDIA_TYPE:
+            # init_headers runs after render, so the content-type follows the encoding chosen here
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return msgpack.packb(content, use_bin_type=True)
+        return super().render(content)
+
+
+class ContentNegotiationMiddleware:
+    """Records the preferred response encoding for NegotiatedResponse.
+
+    JSON and MessagePack responses get Vary: Accept, so a shared cache never hands
+    one client's encoding to another.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope["headers"]:
+            if name == b"accept":
+                accept = value.decode("latin-1")
+                break
+        media_type = negotiate_media_type(accept) if "msgpack" in accept else JSON_MEDIA_TYPE
+        token = preferred_media_type.set(media_type)
+
+        async def send_with_vary(message):
+            if message["type"] == "http.response.start" and _negotiable(message.get("headers", [])):
+                message = {**message, "headers": _with_vary_accept(message.get("headers", []))}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_vary)
+        finally:
+            preferred_media_type.reset(token)
+
+
+def _negotiable(headers) -> bool:
+    for name, value in headers:
+        if name.lower() == b"content-type":
+            media_type = value.decode("latin-1").split(";")[0].strip().lower()
+            return media_type == JSON_MEDIA_TYPE or media_type in MSGPACK_ALIASES
+    return False
+
+
+def _with_vary_accept(headers) -> list:
+    vary = [value for name, value in headers if name.lower() == b"vary"]
+    fields = {field.strip().lower() for value in vary for field in value.split(b",")}
+    if b"accept" in fields or b"*" in fields:
+        return list(headers)
+    return [(name, value) for name, value in headers if name.lower() != b"vary"] + \
+        [(b"vary", b", ".join(vary + [b"Accept"]))]
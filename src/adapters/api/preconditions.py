@@ -0,0 +1,33 @@
+import re
+from typing import List, Optional
+from fastapi import HTTPException
+
+# One entity-tag of a comma-separated list, with the separator that follows it
+ENTITY_TAG = re.compile(r'[\s,]*(W/)?"([^"]*)"\s*(?:,|$)')
+
+def etag_for(row_version: int) -> str:
+    return f'"{row_version}"'
+
+def parse_if_match(value: Optional[str]) -> Optional[List[int]]:
+    """Row versions an If-Match header accepts, or None for unconditional writes.
+
+    If-Match compares strongly (RFC 9110 13.1.1), so weak tags never match, and neither
+    do tags this service did not issue; an empty list makes the write fail with 412.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if value == "*":
+        return None
+    versions, position = [], 0
+    while position < len(value):
+        match = ENTITY_TAG.match(value, position)
+        if match is None:
+            raise HTTPException(status_code=400, detail="Invalid If-Match header")
+        weak, opaque = match.groups()
+        if not weak and opaque.isdigit():
+            versions.append(int(opaque))
+        position = match.end()
+    if position == 0:
+        raise HTTPException(status_code=400, detail="Invalid If-Match header")
+    return versions
@@ -0,0 +1,44 @@
+from src.adapters.api.admin_auth import admin_token_valid
+from src.adapters.telemetry.profiler import SamplingProfiler
+
+
+class RequestProfilingMiddleware:
+    """ASGI middleware that profiles single requests sent with `X-Profile: 1` and a valid `X-Admin-Token`.
+
+    The handler's response is replaced by the request's collapsed stacks, with the
+    original status in `X-Profile-Status`. Every worker thread is sampled, so blocking
+    calls pushed to threads show up; other requests served concurrently on the same
+    event loop do as well, so profile on a quiet worker. Only added when
+    PROFILE_REQUESTS_ENABLED is set.
+    """
+
+    def __init__(self, app, interval: float = 0.001):
+        self.app = app
+        self.interval = interval
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        if headers.get(b"x-profile") != b"1" or not admin_token_valid(headers.get(b"x-admin-token", b"").decode("latin-1")):
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def discard(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+
+        with SamplingProfiler(self.interval) as profiler:
+            await self.app(scope, receive, discard)
+        body = profiler.collapsed().encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(body)).encode()),
+                        (b"x-profile-status", str(status[0]).encode()),
+                        (b"x-profile-samples", str(profiler.samples).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,32 @@
+from typing import Optional, Tuple
+from fastapi import HTTPException
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """(start, length) for a single `bytes=` range, None to serve the whole object.
+
+    Multi-range and malformed headers are ignored (RFC 9110 lets servers do that);
+    a well-formed range entirely past the end raises 416.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first == "":
+            suffix = int(last)  # bytes=-N: the final N bytes
+            if suffix <= 0:
+                raise ValueError
+            start, end = max(size - suffix, 0), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if start < 0 or (last and int(last) < start):
+                return None
+    except ValueError:
+        return None
+    if start >= size:
+        raise HTTPException(status_code=416, detail="Requested range not satisfiable",
+                            headers={"Content-Range": f"bytes */{size}"})
+    return start, end - start + 1
+
+def content_range(start: int, length: int, size: int) -> str:
+    return f"bytes {start}-{start + length - 1}/{size}"
@@ -0,0 +1,200 @@
+import ipaddress
+import json
+import math
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# (method, path pattern, cost): full-table listings, exports, imports and photo uploads are the expensive routes
+DEFAULT_ROUTE_COSTS = [
+    ("GET", r"^/api/v1/plants/?$", 10),
+    ("GET", r"^/api/v1/devices/?$", 10),
+    ("GET", r"^/api/v1/export/", 20),
+    ("POST", r"^/api/v1/import/", 20),
+    ("POST", r"^/api/v1/plants/[^/]+/photo$", 5),
+    ("POST", r"^/api/v1/devices/plants-at$", 10),
+    ("POST", r"^/api/v1/plants/lookup$", 10),
+    ("POST", r"^/api/v1/devices/lookup$", 10),
+]
+
+# Streams held open for the life of a page; charged on connect but kept out of the in-flight cap
+DEFAULT_LONG_LIVED_PATHS = [
+    r"^/api/v1/users/[^/]+/events$",
+]
+
+Network = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def acquire(self, key: str, cost: float, capacity: float, refill_per_second: float) -> float:
+        """Take `cost` tokens from the key's bucket; returns 0 on success or the seconds to wait"""
+        pass
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-worker token buckets, least recently used keys are evicted past max_keys."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def take(self, key: str, cost: float, capacity: float, refill_per_second: float, now: float) -> float:
+        tokens, updated_at = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+        retry_after = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / refill_per_second
+        # Re-inserting keeps the dict in least-recently-used order
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            del self._buckets[next(iter(self._buckets))]
+        return retry_after
+
+    async def acquire(self, key: str, cost: float, capacity: float, refill_per_second: float) -> float:
+        return self.take(key, cost, capacity, refill_per_second, time.monotonic())
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Token buckets shared by every worker through Redis (requires the `redis` package)."""
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) * rate)
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+    else
+        retry_after = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+    return tostring(retry_after)
+    """
+
+    def __init__(self, url: Optional[str], prefix: str = "rate-limit:"):
+        if not url:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires RATE_LIMIT_REDIS_URL")
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package")
+        self.client = redis_asyncio.from_url(url)
+        self.prefix = prefix
+        self._script = self.client.register_script(self.SCRIPT)
+
+    async def acquire(self, key: str, cost: float, capacity: float, refill_per_second: float) -> float:
+        result = await self._script(keys=[self.prefix + key], args=[capacity, refill_per_second, cost])
+        return float(result)
+
+
+def parse_networks(networks: Sequence[str]) -> List[Network]:
+    return [ipaddress.ip_network(network.strip(), strict=False) for network in networks if network.strip()]
+
+
+def _trusted(address: str, trusted_proxies: Sequence[Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+def client_key(scope, trusted_proxies: Sequence[Network] = ()) -> str:
+    """Meter by the connecting address, or by the address our trusted proxies saw connect.
+
+    Paths, X-User-Id and a forwarded-for header from anyone else are chosen by the
+    caller, so they never pick the bucket.
+    """
+    client = scope.get("client")
+    peer = client[0] if client else None
+    if peer is None:
+        return "client:unknown"
+    if not _trusted(peer, trusted_proxies):
+        return f"client:{peer}"
+    hops = [hop.strip() for name, value in scope["headers"] if name == b"x-forwarded-for"
+            for hop in value.decode("latin-1").split(",") if hop.strip()]
+    # Each trusted proxy appends the address it saw; the first untrusted hop from the right is the client
+    for hop in reversed(hops):
+        if not _trusted(hop, trusted_proxies):
+            return f"client:{hop}"
+    return f"client:{hops[0] if hops else peer}"
+
+
+class RateLimitMiddleware:
+    """ASGI middleware enforcing a token bucket and an in-flight request cap per client."""
+
+    def __init__(self, app, backend: RateLimitBackend, capacity: float, refill_per_second: float,
+                 max_concurrent: int = 0, route_costs: Optional[List[Tuple[str, str, float]]] = None,
+                 exempt_paths: Tuple[str, ...] = ("/health",), long_lived_paths: Optional[List[str]] = None,
+                 trusted_proxies: Sequence[str] = ()):
+        self.app = app
+        self.backend = backend
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_concurrent = max_concurrent
+        self.route_costs = [(method, re.compile(pattern), cost)
+                            for method, pattern, cost in (DEFAULT_ROUTE_COSTS if route_costs is None else route_costs)]
+        self.exempt_paths = set(exempt_paths)
+        self.long_lived_paths = [re.compile(pattern)
+                                 for pattern in (DEFAULT_LONG_LIVED_PATHS if long_lived_paths is None else long_lived_paths)]
+        self.trusted_proxies = parse_networks(trusted_proxies)
+        self._in_flight: Dict[str, int] = {}
+
+    def cost_for(self, method: str, path: str) -> float:
+        for route_method, pattern, cost in self.route_costs:
+            if route_method == method and pattern.match(path):
+                return cost
+        return 1
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        key = client_key(scope, self.trusted_proxies)
+        retry_after = await self.backend.acquire(key, self.cost_for(scope["method"], scope["path"]),
+                                                 self.capacity, self.refill_per_second)
+        if retry_after > 0:
+            await self._reject(send, "Rate limit exceeded", retry_after)
+            return
+
+        if not self.max_concurrent or any(pattern.match(scope["path"]) for pattern in self.long_lived_paths):
+            await self.app(scope, receive, send)
+            return
+        in_flight = self._in_flight.get(key, 0)
+        if in_flight >= self.max_concurrent:
+            await self._reject(send, "Too many concurrent requests", 1)
+            return
+        self._in_flight[key] = in_flight + 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            remaining = self._in_flight[key] - 1
+            if remaining:
+                self._in_flight[key] = remaining
+            else:
+                del self._in_flight[key]
+
+    async def _reject(self, send, detail: str, retry_after: float) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,47 @@
+import time
+from http.cookies import SimpleCookie
+from src.config.read_replicas import WriteMarker
+
+COOKIE_NAME = "primary_until"
+SCOPE_KEY = "write_marker"
+
+
+class ReadYourWritesMiddleware:
+    """Keeps a client's reads on the primary for a while after it writes, whichever worker serves them.
+
+    A request that commits a write answers with a short-lived cookie holding the time
+    until which the client's reads must skip the replicas. Every worker honours it, which
+    the per-process WriteTracker cannot. The cookie only ever routes its sender's own
+    reads, and a value further out than the window is ignored.
+    """
+
+    def __init__(self, app, window_seconds: float):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        now = time.time()
+        marker = WriteMarker(recent=now < self._primary_until(scope) <= now + self.window_seconds + 1)
+        scope[SCOPE_KEY] = marker
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and marker.wrote:
+                until = int(time.time() + self.window_seconds) + 1
+                cookie = (f"{COOKIE_NAME}={until}; Max-Age={int(self.window_seconds) + 1}; Path=/; "
+                          f"HttpOnly; SameSite=Lax")
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+    @staticmethod
+    def _primary_until(scope) -> float:
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                morsel = SimpleCookie(value.decode("latin-1")).get(COOKIE_NAME)
+                if morsel is not None and morsel.value.isdigit():
+                    return float(morsel.value)
+        return 0.0
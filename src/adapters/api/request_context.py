@@ -0,0 +1,78 @@
+import logging
+import random
+import re
+import time
+import uuid
+from src.adapters.telemetry.tracing import Tracer, request_id
+
+access_logger = logging.getLogger("src.access")
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+REQUEST_ID = re.compile(r"^[\w.:-]{1,128}$")
+
+
+class RequestContextMiddleware:
+    """ASGI middleware giving every request an id, a head-based sampling decision and an access log line.
+
+    The sampling decision is made once, before the handler runs: a W3C `traceparent`
+    from the caller wins, otherwise `trace_sample_rate` of requests are traced. Only
+    traced requests open spans, so instrumented services and repositories cost next to
+    nothing on the rest. Access lines are sampled the same way, except that errors and
+    slow requests are always logged.
+    """
+
+    def __init__(self, app, tracer: Tracer, trace_sample_rate: float = 0.0, access_log_sample_rate: float = 1.0,
+                 slow_request_ms: float = 1000.0):
+        self.app = app
+        self.tracer = tracer
+        self.trace_sample_rate = trace_sample_rate
+        self.access_log_sample_rate = access_log_sample_rate
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming_id, traceparent = None, None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                incoming_id = value.decode("latin-1")
+            elif name == b"traceparent":
+                traceparent = value.decode("latin-1").strip().lower()
+        current_id = incoming_id if incoming_id and REQUEST_ID.match(incoming_id) else uuid.uuid4().hex
+        token = request_id.set(current_id)
+        status = [500]
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-request-id", current_id.encode())]}
+            await send(message)
+
+        parent = TRACEPARENT.match(traceparent) if traceparent else None
+        sampled = bool(int(parent.group(3), 16) & 1) if parent else random.random() < self.trace_sample_rate
+        started = time.perf_counter()
+        try:
+            if not sampled:
+                await self.app(scope, receive, send_with_request_id)
+                return
+            with self.tracer.start_span(f"{scope['method']} {scope['path']}", kind="server",
+                                        trace_id=parent.group(1) if parent else None,
+                                        parent_id=parent.group(2) if parent else None,
+                                        **{"http.method": scope["method"], "http.target": scope["path"],
+                                           "request.id": current_id}) as span:
+                try:
+                    await self.app(scope, receive, send_with_request_id)
+                finally:
+                    route = scope.get("route")
+                    if route is not None and getattr(route, "path", None):
+                        span.name = f"{scope['method']} {route.path}"
+                    span.attributes["http.status_code"] = status[0]
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if status[0] >= 500 or duration_ms >= self.slow_request_ms or sampled or random.random() < self.access_log_sample_rate:
+                access_logger.info("request", extra={"method": scope["method"], "path": scope["path"],
+                                                     "status": status[0], "duration_ms": round(duration_ms, 2),
+                                                     "sampled": sampled})
+            request_id.reset(token)
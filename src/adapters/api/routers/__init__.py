@@ -1 +1 @@
-from . import plants, devices
+from . import plants, devices, admin, users, export, imports, files
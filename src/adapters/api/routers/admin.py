@@ -0,0 +1,54 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from src.adapters.workers.photo_cleanup_worker import photo_cleanup_worker
+from src.core.services.single_flight import read_flights
+from src.core.services.event_broker import event_broker
+from src.adapters.telemetry.tracing import tracer
+from src.adapters.telemetry.profiler import SamplingProfiler
+from src.adapters.api.admin_auth import require_admin_token
+from src.config.settings import settings
+
+# Every admin route needs X-Admin-Token; with ADMIN_TOKEN unset they all answer 404
+router = APIRouter(
+    prefix="/api/v1/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_token)],
+)
+
+@router.get("/photo-cleanup")
+async def get_photo_cleanup_metrics():
+    """Throughput and totals of the background photo deletion worker and orphan reconciler"""
+    return photo_cleanup_worker.metrics.as_dict()
+
+@router.get("/single-flight")
+async def get_single_flight_metrics():
+    """Per lookup kind: calls, executions that reached the database or object store, and coalesced calls"""
+    return read_flights.metrics_dict()
+
+@router.get("/events")
+async def get_event_metrics():
+    """Open event streams in this worker, events published, and slow consumers cut off"""
+    return event_broker.metrics_dict()
+
+@router.get("/tracing")
+async def get_tracing_metrics():
+    """Spans waiting for export, exported, and dropped because the buffer was full"""
+    return tracer.metrics_dict()
+
+_profile_lock = asyncio.Lock()
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def profile_worker(seconds: float = Query(10.0, gt=0, le=settings.PROFILE_MAX_SECONDS),
+                         interval_ms: float = Query(5.0, ge=1, le=1000), include_idle: bool = False):
+    """Sample every thread of this worker for `seconds`; returns collapsed stacks for flamegraph tools"""
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running in this worker")
+    async with _profile_lock:
+        profiler = SamplingProfiler(interval_ms / 1000, include_idle)
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+    return PlainTextResponse(profiler.collapsed(), headers={"X-Profile-Samples": str(profiler.samples)})
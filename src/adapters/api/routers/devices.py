@@ -1,11 +1,23 @@
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.services.physical_device_service import PhysicalDeviceService
-from src.adapters.api.schemas import PhysicalDeviceCreate, PhysicalDeviceUpdate, PhysicalDeviceResponse
-from src.config.database import get_session
+from src.core.services.assignment_history_service import AssignmentHistoryService
+from src.adapters.api.schemas import (PhysicalDeviceCreate, PhysicalDeviceUpdate, PhysicalDeviceResponse,
+                                     DeviceBindingsRequest, DeviceBindingsResponse, DeviceBinding,
+                                     DeviceAssignmentPeriodResponse, PlantsAtRequest, PlantsAtResponse,
+                                     PlantsAtBatchResponse, DeviceLookupRequest, DeviceLookupResponse)
+from src.adapters.api.preconditions import etag_for, parse_if_match
+from src.core.domain.exceptions import VersionConflictError
+from src.core.services.device_binding_index import device_binding_index
+from src.core.services.event_broker import event_broker
+from src.core.services.single_flight import read_flights
+from src.config.settings import settings
+from src.config.database import get_session, get_read_session, get_read_repository_factory
 from src.adapters.repositories.physical_device_repository_impl import PhysicalDeviceRepositoryImpl
+from src.adapters.repositories.assignment_history_repository_impl import AssignmentHistoryRepositoryImpl
 
 router = APIRouter(
     prefix="/api/v1/devices",
@@ -14,23 +26,73 @@ router = APIRouter(
 
 def get_device_service(session: AsyncSession = Depends(get_session)) -> PhysicalDeviceService:
     device_repository = PhysicalDeviceRepositoryImpl(session)
-    return PhysicalDeviceService(device_repository)
+    return PhysicalDeviceService(device_repository,
+                                 device_binding_index if settings.DEVICE_BINDING_INDEX_ENABLED else None,
+                                 event_broker if settings.EVENTS_ENABLED else None)
+
+# Read-only variant, routed to a read replica when one is configured
+def get_device_read_service(request: Request, session: AsyncSession = Depends(get_read_session)) -> PhysicalDeviceService:
+    service = get_device_service(session)
+    # Only clients without a recent write share lookups, so read-your-writes still holds
+    if settings.SINGLE_FLIGHT_ENABLED and session.info.get("read_only"):
+        service.single_flight = read_flights
+        service.flight_repositories = get_read_repository_factory(request, PhysicalDeviceRepositoryImpl)
+    return service
+
+def get_assignment_history_service(session: AsyncSession = Depends(get_read_session)) -> AssignmentHistoryService:
+    return AssignmentHistoryService(AssignmentHistoryRepositoryImpl(session))
 
 @router.post("/", response_model=PhysicalDeviceResponse, status_code=201)
 async def create_device(device: PhysicalDeviceCreate, service: PhysicalDeviceService = Depends(get_device_service)):
     return await service.create_device(device.user_id, device.name, device.description, device.version, device.category)
 
+@router.post("/lookup", response_model=DeviceLookupResponse)
+async def lookup_devices(request: DeviceLookupRequest, service: PhysicalDeviceService = Depends(get_device_read_service)):
+    """Devices for a batch of ids in request order, with unknown or deleted ids listed under missing; one query"""
+    devices, missing = await service.get_devices_by_ids(request.ids)
+    return DeviceLookupResponse(devices=devices, missing=missing)
+
+@router.post("/bindings", response_model=DeviceBindingsResponse)
+async def get_device_bindings(request: DeviceBindingsRequest):
+    """Ownership and plant bindings for a batch of devices, served from memory without touching the database"""
+    if not settings.DEVICE_BINDING_INDEX_ENABLED or not device_binding_index.ready:
+        raise HTTPException(status_code=503, detail="Device binding index is not available")
+    found, missing = device_binding_index.lookup(request.device_ids)
+    bindings = [DeviceBinding(device_id=device_id, user_id=user_id, plant_ids=plant_ids)
+                for device_id, (user_id, plant_ids) in found.items()]
+    return DeviceBindingsResponse(bindings=bindings, missing=missing)
+
+@router.post("/plants-at", response_model=PlantsAtBatchResponse)
+async def get_plants_at_batch(request: PlantsAtRequest,
+                              service: AssignmentHistoryService = Depends(get_assignment_history_service)):
+    """Plants each device was assigned to at each timestamp, in request order; one query for the whole batch"""
+    plant_ids = await service.get_plants_at_batch([(lookup.device_id, lookup.at) for lookup in request.lookups])
+    return PlantsAtBatchResponse(results=[
+        PlantsAtResponse(device_id=lookup.device_id, at=lookup.at, plant_ids=plants)
+        for lookup, plants in zip(request.lookups, plant_ids)
+    ])
+
 @router.get("/", response_model=List[PhysicalDeviceResponse])
-async def get_all_devices(service: PhysicalDeviceService = Depends(get_device_service)):
+async def get_all_devices(service: PhysicalDeviceService = Depends(get_device_read_service)):
     return await service.get_all_devices()
 
 @router.get("/{device_id}", response_model=PhysicalDeviceResponse)
-async def get_device(device_id: uuid.UUID, service: PhysicalDeviceService = Depends(get_device_service)):
+async def get_device(device_id: uuid.UUID, service: PhysicalDeviceService = Depends(get_device_read_service)):
     device = await service.get_device_by_id(device_id)
     if not device:
         raise HTTPException(status_code=404, detail="Device not found")
     return device
 
+@router.get("/{device_id}/history", response_model=List[DeviceAssignmentPeriodResponse])
+async def get_device_history(device_id: uuid.UUID, service: AssignmentHistoryService = Depends(get_assignment_history_service)):
+    """Every plant assignment of the device, oldest first; still-open periods have no valid_to"""
+    return await service.get_device_history(device_id)
+
+@router.get("/{device_id}/plants-at", response_model=PlantsAtResponse)
+async def get_plants_at(device_id: uuid.UUID, at: datetime,
+                        service: AssignmentHistoryService = Depends(get_assignment_history_service)):
+    return PlantsAtResponse(device_id=device_id, at=at, plant_ids=await service.get_plants_at(device_id, at))
+
 @router.put("/{device_id}", response_model=PhysicalDeviceResponse)
 async def update_device(device_id: uuid.UUID, device: PhysicalDeviceUpdate, service: PhysicalDeviceService = Depends(get_device_service)):
     # For now, this endpoint doesn't require user_id (admin endpoint)
@@ -48,17 +110,23 @@ async def delete_device(device_id: uuid.UUID, service: PhysicalDeviceService = D
 
 # User-specific endpoints with ownership validation
 @router.put("/users/{user_id}/devices/{device_id}", response_model=PhysicalDeviceResponse)
-async def update_user_device(user_id: uuid.UUID, device_id: uuid.UUID, device: PhysicalDeviceUpdate, service: PhysicalDeviceService = Depends(get_device_service)):
-    updated_device = await service.update_device(
-        user_id=user_id,
-        device_id=device_id,
-        name=device.name or "",  # Provide default values
-        description=device.description,
-        version=device.version,
-        category=device.category
-    )
+async def update_user_device(user_id: uuid.UUID, device_id: uuid.UUID, device: PhysicalDeviceUpdate, response: Response,
+                             if_match: Optional[str] = Header(None), service: PhysicalDeviceService = Depends(get_device_service)):
+    try:
+        updated_device = await service.update_device(
+            user_id=user_id,
+            device_id=device_id,
+            name=device.name or "",  # Provide default values
+            description=device.description,
+            version=device.version,
+            category=device.category,
+            expected_versions=parse_if_match(if_match)
+        )
+    except VersionConflictError:
+        raise HTTPException(status_code=412, detail="Device was modified by another request")
     if not updated_device:
         raise HTTPException(status_code=404, detail="Device not found or not owned by user")
+    response.headers["ETag"] = etag_for(updated_device.row_version)
     return updated_device
 
 @router.delete("/users/{user_id}/devices/{device_id}", status_code=204)
@@ -68,13 +136,14 @@ async def delete_user_device(user_id: uuid.UUID, device_id: uuid.UUID, service:
         raise HTTPException(status_code=404, detail="Device not found or not owned by user")
 
 @router.get("/users/{user_id}/devices/{device_id}", response_model=PhysicalDeviceResponse)
-async def get_user_device(user_id: uuid.UUID, device_id: uuid.UUID, service: PhysicalDeviceService = Depends(get_device_service)):
+async def get_user_device(user_id: uuid.UUID, device_id: uuid.UUID, response: Response, service: PhysicalDeviceService = Depends(get_device_read_service)):
     device = await service.get_device_by_id_and_user(device_id, user_id)
     if not device:
         raise HTTPException(status_code=404, detail="Device not found or not owned by user")
+    response.headers["ETag"] = etag_for(device.row_version)
     return device
 
 @router.get("/users/{user_id}", response_model=List[PhysicalDeviceResponse])
-async def get_user_devices(user_id: uuid.UUID, service: PhysicalDeviceService = Depends(get_device_service)):
+async def get_user_devices(user_id: uuid.UUID, service: PhysicalDeviceService = Depends(get_device_read_service)):
     """Get all devices owned by a specific user"""
     return await service.get_devices_by_user_id(user_id)
\ No newline at end of file
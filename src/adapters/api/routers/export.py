@@ -0,0 +1,46 @@
+import uuid
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from src.adapters.api.export_formats import ndjson_chunks, csv_chunks, NDJSON_MEDIA_TYPE, CSV_MEDIA_TYPE
+from src.adapters.repositories.export_repository_impl import ExportRepositoryImpl, PLANT_COLUMNS, DEVICE_COLUMNS
+from src.config.database import get_read_session_factory
+
+router = APIRouter(
+    prefix="/api/v1/export",
+    tags=["export"],
+)
+
+EXPORT_FORMAT = Query("ndjson", pattern="^(ndjson|csv)$")
+
+async def export_body(session_factory, resource: str, export_format: str, user_id: Optional[uuid.UUID] = None,
+                      include_devices: bool = False) -> AsyncIterator[str]:
+    """Serialized export of plants or devices, produced batch by batch from a server-side cursor"""
+    async with session_factory() as session:
+        repository = ExportRepositoryImpl(session)
+        if resource == "plants":
+            batches = repository.stream_plants(user_id, include_devices)
+            columns = PLANT_COLUMNS + (("device_ids",) if include_devices else ())
+        else:
+            batches = repository.stream_devices(user_id)
+            columns = DEVICE_COLUMNS
+        chunks = ndjson_chunks(batches) if export_format == "ndjson" else csv_chunks(batches, columns)
+        async for chunk in chunks:
+            yield chunk
+
+def _streaming_response(body: AsyncIterator[str], resource: str, export_format: str) -> StreamingResponse:
+    media_type = NDJSON_MEDIA_TYPE if export_format == "ndjson" else CSV_MEDIA_TYPE
+    return StreamingResponse(body, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{resource}.{export_format}"'})
+
+@router.get("/plants")
+async def export_plants(format: str = EXPORT_FORMAT, user_id: Optional[uuid.UUID] = None,
+                        include_devices: bool = False, session_factory=Depends(get_read_session_factory)):
+    """Stream every live plant (optionally one user's) with constant memory; include_devices adds device_ids"""
+    return _streaming_response(export_body(session_factory, "plants", format, user_id, include_devices),
+                               "plants", format)
+
+@router.get("/devices")
+async def export_devices(format: str = EXPORT_FORMAT, user_id: Optional[uuid.UUID] = None,
+                         session_factory=Depends(get_read_session_factory)):
+    return _streaming_response(export_body(session_factory, "devices", format, user_id), "devices", format)
@@ -0,0 +1,35 @@
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from src.adapters.api.ranges import parse_range, content_range
+from src.adapters.storage.factory import get_file_storage, get_presigner
+from src.config.settings import settings
+
+# Serves the presigned URLs of the local storage backends; MinIO hands out its own
+router = APIRouter(
+    prefix="/api/v1/files",
+    tags=["files"],
+)
+
+@router.get("/{file_name}")
+async def get_file(file_name: str, expires: int = Query(...), signature: str = Query(...),
+                   range: Optional[str] = Header(None)):
+    if settings.FILE_STORAGE_BACKEND == "minio":
+        raise HTTPException(status_code=404, detail="File not found")
+    if not get_presigner().verify(file_name, expires, signature):
+        raise HTTPException(status_code=403, detail="Invalid or expired signature")
+    storage = get_file_storage()
+    try:
+        size = await storage.get_file_size(file_name)
+    except ValueError:
+        size = None
+    if size is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    byte_range = parse_range(range, size)
+    if byte_range is not None:
+        start, length = byte_range
+        return Response(content=await storage.read_range(file_name, start, length), status_code=206,
+                        media_type="application/octet-stream",
+                        headers={"Content-Range": content_range(start, length, size), "Accept-Ranges": "bytes"})
+    return StreamingResponse(await storage.download_file(file_name), media_type="application/octet-stream",
+                             headers={"Content-Length": str(size), "Accept-Ranges": "bytes"})
@@ -0,0 +1,34 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, File, Query, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.services.bulk_import_service import BulkImportService
+from src.adapters.api.import_formats import import_format, import_source, plant_record, device_record
+from src.adapters.api.schemas import ImportReportResponse
+from src.adapters.repositories.import_repository_impl import ImportRepositoryImpl
+from src.config.database import get_session
+from src.config.settings import settings
+
+router = APIRouter(
+    prefix="/api/v1/import",
+    tags=["import"],
+)
+
+IMPORT_FORMAT = Query(None, pattern="^(ndjson|csv)$")
+
+def get_import_service(session: AsyncSession = Depends(get_session)) -> BulkImportService:
+    return BulkImportService(ImportRepositoryImpl(session), settings.IMPORT_BATCH_SIZE, settings.IMPORT_MAX_ERRORS)
+
+@router.post("/plants", response_model=ImportReportResponse)
+async def import_plants(file: UploadFile = File(...), format: Optional[str] = IMPORT_FORMAT,
+                        service: BulkImportService = Depends(get_import_service)):
+    """Bulk-load plants from CSV or NDJSON with COPY; invalid rows are reported by line and skipped"""
+    rows, to_record = import_source(file.file, import_format(file.filename, format), plant_record)
+    report = await service.import_plants(rows, to_record)
+    return report.as_dict()
+
+@router.post("/devices", response_model=ImportReportResponse)
+async def import_devices(file: UploadFile = File(...), format: Optional[str] = IMPORT_FORMAT,
+                         service: BulkImportService = Depends(get_import_service)):
+    rows, to_record = import_source(file.file, import_format(file.filename, format), device_record)
+    report = await service.import_devices(rows, to_record)
+    return report.as_dict()
@@ -1,15 +1,23 @@
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Header, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.services.plant_service import PlantService
 from src.core.services.physical_device_service import PhysicalDeviceService
-from src.adapters.api.schemas import PlantCreate, PlantUpdate, PlantResponse, PhysicalDeviceResponse
-from src.config.database import get_session
+from src.adapters.api.schemas import (PlantCreate, PlantUpdate, PlantResponse, PhysicalDeviceResponse, PlantLookupRequest,
+                                     PlantLookupResponse)
+from src.adapters.api.preconditions import etag_for, parse_if_match
+from src.core.domain.exceptions import VersionConflictError, InvalidImageError, ImageTooLargeError
+from src.config.database import get_session, get_read_session, get_read_repository_factory
 from src.adapters.repositories.plant_repository_impl import PlantRepositoryImpl
 from src.adapters.repositories.physical_device_repository_impl import PhysicalDeviceRepositoryImpl
-from src.adapters.storage.minio_storage import MinioStorage
+from src.adapters.storage.factory import get_file_storage
+from src.adapters.api.ranges import parse_range, content_range
+from src.adapters.images.pillow_processor import image_processor
+from src.core.services.device_binding_index import device_binding_index
+from src.core.services.single_flight import read_flights
+from src.core.services.event_broker import event_broker
+from src.config.settings import settings
 
 router = APIRouter(
     prefix="/api/v1/plants",
@@ -24,38 +32,73 @@ user_router = APIRouter(
 
 def get_plant_service(session: AsyncSession = Depends(get_session)) -> PlantService:
     plant_repository = PlantRepositoryImpl(session)
-    file_storage = MinioStorage()
-    return PlantService(plant_repository, file_storage)
+    file_storage = get_file_storage()
+    return PlantService(plant_repository, file_storage,
+                        image_processor if settings.PHOTO_NORMALIZE_ENABLED else None,
+                        device_binding_index if settings.DEVICE_BINDING_INDEX_ENABLED else None,
+                        events=event_broker if settings.EVENTS_ENABLED else None,
+                        max_upload_bytes=settings.PHOTO_MAX_UPLOAD_BYTES)
 
 def get_device_service(session: AsyncSession = Depends(get_session)) -> PhysicalDeviceService:
     device_repository = PhysicalDeviceRepositoryImpl(session)
-    return PhysicalDeviceService(device_repository)
+    return PhysicalDeviceService(device_repository,
+                                 device_binding_index if settings.DEVICE_BINDING_INDEX_ENABLED else None,
+                                 event_broker if settings.EVENTS_ENABLED else None)
+
+# Read-only variants, routed to a read replica when one is configured
+def get_plant_read_service(request: Request, session: AsyncSession = Depends(get_read_session)) -> PlantService:
+    service = get_plant_service(session)
+    # Only clients without a recent write share lookups, so read-your-writes still holds
+    if settings.SINGLE_FLIGHT_ENABLED and session.info.get("read_only"):
+        service.single_flight = read_flights
+        service.flight_repositories = get_read_repository_factory(request, PlantRepositoryImpl)
+    return service
+
+def get_device_read_service(request: Request, session: AsyncSession = Depends(get_read_session)) -> PhysicalDeviceService:
+    service = get_device_service(session)
+    if settings.SINGLE_FLIGHT_ENABLED and session.info.get("read_only"):
+        service.single_flight = read_flights
+        service.flight_repositories = get_read_repository_factory(request, PhysicalDeviceRepositoryImpl)
+    return service
 
 # User-specific plant endpoints in separate router
 @user_router.get("/{user_id}", response_model=List[PlantResponse])
-async def get_user_plants(user_id: uuid.UUID, service: PlantService = Depends(get_plant_service)):
+async def get_user_plants(user_id: uuid.UUID, service: PlantService = Depends(get_plant_read_service)):
     return await service.get_plants_by_user_id(user_id)
 
 @router.post("/", response_model=PlantResponse, status_code=201)
 async def create_plant(plant: PlantCreate, service: PlantService = Depends(get_plant_service)):
     return await service.create_plant(plant.user_id, plant.name, plant.species, plant.description)
 
+@router.post("/lookup", response_model=PlantLookupResponse)
+async def lookup_plants(request: PlantLookupRequest, service: PlantService = Depends(get_plant_read_service)):
+    """Plants for a batch of ids in request order, with unknown or deleted ids listed under missing; one query"""
+    plants, missing = await service.get_plants_by_ids(request.ids)
+    return PlantLookupResponse(plants=plants, missing=missing)
+
 @router.get("/", response_model=List[PlantResponse])
-async def get_all_plants(service: PlantService = Depends(get_plant_service)):
+async def get_all_plants(service: PlantService = Depends(get_plant_read_service)):
     return await service.get_all_plants()
 
 @router.get("/{plant_id}", response_model=PlantResponse)
-async def get_plant(plant_id: uuid.UUID, service: PlantService = Depends(get_plant_service)):
+async def get_plant(plant_id: uuid.UUID, response: Response, service: PlantService = Depends(get_plant_read_service)):
     plant = await service.get_plant_by_id(plant_id)
     if not plant:
         raise HTTPException(status_code=404, detail="Plant not found")
+    response.headers["ETag"] = etag_for(plant.row_version)
     return plant
 
 @router.put("/{plant_id}", response_model=PlantResponse)
-async def update_plant(plant_id: uuid.UUID, plant: PlantUpdate, service: PlantService = Depends(get_plant_service)):
-    updated_plant = await service.update_plant(plant_id, plant.name, plant.species, plant.description)
+async def update_plant(plant_id: uuid.UUID, plant: PlantUpdate, response: Response,
+                       if_match: Optional[str] = Header(None), service: PlantService = Depends(get_plant_service)):
+    try:
+        updated_plant = await service.update_plant(plant_id, plant.name, plant.species, plant.description,
+                                                   expected_versions=parse_if_match(if_match))
+    except VersionConflictError:
+        raise HTTPException(status_code=412, detail="Plant was modified by another request")
     if not updated_plant:
         raise HTTPException(status_code=404, detail="Plant not found")
+    response.headers["ETag"] = etag_for(updated_plant.row_version)
     return updated_plant
 
 @router.delete("/{plant_id}", status_code=204)
@@ -86,8 +129,8 @@ async def remove_device_from_plant(plant_id: uuid.UUID, device_id: uuid.UUID,
     await device_service.remove_device_from_plant(plant_id, device_id)
 
 @router.get("/{plant_id}/devices", response_model=List[PhysicalDeviceResponse])
-async def get_plant_devices(plant_id: uuid.UUID, plant_service: PlantService = Depends(get_plant_service),
-                           device_service: PhysicalDeviceService = Depends(get_device_service)):
+async def get_plant_devices(plant_id: uuid.UUID, plant_service: PlantService = Depends(get_plant_read_service),
+                           device_service: PhysicalDeviceService = Depends(get_device_read_service)):
     # Verify plant exists
     plant = await plant_service.get_plant_by_id(plant_id)
     if not plant:
@@ -97,17 +140,41 @@ async def get_plant_devices(plant_id: uuid.UUID, plant_service: PlantService = D
 
 @router.post("/{plant_id}/photo", response_model=PlantResponse)
 async def upload_photo(plant_id: uuid.UUID, file: UploadFile = File(...), service: PlantService = Depends(get_plant_service)):
-    plant = await service.upload_plant_photo(plant_id, file)
+    try:
+        plant = await service.upload_plant_photo(plant_id, file)
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidImageError as e:
+        raise HTTPException(status_code=415, detail=str(e))
     if not plant:
         raise HTTPException(status_code=404, detail="Plant not found")
     return plant
 
 @router.get("/{plant_id}/photo")
-async def get_photo(plant_id: uuid.UUID, service: PlantService = Depends(get_plant_service)):
-    photo_stream = await service.get_plant_photo(plant_id)
-    if not photo_stream:
+async def get_photo(plant_id: uuid.UUID, range: Optional[str] = Header(None),
+                    service: PlantService = Depends(get_plant_read_service)):
+    if range:
+        photo = await service.get_plant_photo_size(plant_id)
+        if photo is None:
+            raise HTTPException(status_code=404, detail="Photo not found")
+        file_name, size = photo
+        byte_range = parse_range(range, size)
+        if byte_range is not None:
+            start, length = byte_range
+            return Response(content=await service.read_plant_photo_range(file_name, start, length), status_code=206,
+                            media_type="application/octet-stream",
+                            headers={"Content-Range": content_range(start, length, size), "Accept-Ranges": "bytes"})
+    photo = await service.read_plant_photo(plant_id)
+    if photo is None:
+        raise HTTPException(status_code=404, detail="Photo not found")
+    return Response(content=photo, media_type="application/octet-stream", headers={"Accept-Ranges": "bytes"})
+
+@router.get("/{plant_id}/photo-url")
+async def get_photo_url(plant_id: uuid.UUID, service: PlantService = Depends(get_plant_read_service)):
+    url = await service.get_plant_photo_url(plant_id, settings.PHOTO_URL_EXPIRES_SECONDS)
+    if url is None:
         raise HTTPException(status_code=404, detail="Photo not found")
-    return StreamingResponse(photo_stream, media_type="application/octet-stream")
+    return {"url": url, "expires_in": settings.PHOTO_URL_EXPIRES_SECONDS}
 
 @router.delete("/{plant_id}/photo", response_model=PlantResponse)
 async def delete_photo(plant_id: uuid.UUID, service: PlantService = Depends(get_plant_service)):
@@ -0,0 +1,101 @@
+import asyncio
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.services.data_purge_service import DataPurgeService
+from src.core.services.device_binding_index import device_binding_index
+from src.core.services.event_broker import EventBrokerFullError, Subscription, event_broker
+from src.adapters.api.schemas import UserDeletionJobResponse
+from src.config.database import get_session
+from src.config.settings import settings
+from src.adapters.repositories.plant_repository_impl import PlantRepositoryImpl
+from src.adapters.repositories.physical_device_repository_impl import PhysicalDeviceRepositoryImpl
+from src.adapters.repositories.user_deletion_repository_impl import UserDeletionJobRepositoryImpl
+
+router = APIRouter(
+    prefix="/api/v1/users",
+    tags=["users"],
+)
+
+def get_data_purge_service(session: AsyncSession = Depends(get_session)) -> DataPurgeService:
+    return DataPurgeService(PlantRepositoryImpl(session), PhysicalDeviceRepositoryImpl(session),
+                            UserDeletionJobRepositoryImpl(session),
+                            device_binding_index if settings.DEVICE_BINDING_INDEX_ENABLED else None,
+                            event_broker if settings.EVENTS_ENABLED else None)
+
+@router.delete("/{user_id}/data", response_model=UserDeletionJobResponse, status_code=202)
+async def delete_user_data(user_id: uuid.UUID, service: DataPurgeService = Depends(get_data_purge_service)):
+    """Queue deletion of every plant and device the user owns; the purge worker runs it in batches"""
+    return await service.request_user_deletion(user_id)
+
+@router.get("/{user_id}/data/deletion", response_model=UserDeletionJobResponse)
+async def get_user_data_deletion(user_id: uuid.UUID, service: DataPurgeService = Depends(get_data_purge_service)):
+    job = await service.get_user_deletion(user_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="No deletion requested for this user")
+    return job
+
+async def sse_events(subscription: Subscription, heartbeat_seconds: float):
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                event = await subscription.next(heartbeat_seconds)
+            except StopAsyncIteration:
+                # Cut off for falling behind; the client reconnects and re-reads its listings
+                yield b"event: overflow\ndata: {}\n\n"
+                return
+            if event is None:
+                yield b": keep-alive\n\n"
+            else:
+                yield f"id: {event.id}\nevent: {event.type}\ndata: {event.as_json()}\n\n".encode()
+    finally:
+        subscription.close()
+
+@router.get("/{user_id}/events")
+async def stream_user_events(user_id: uuid.UUID):
+    """Server-Sent Events for every committed change to the user's plants and devices"""
+    if not settings.EVENTS_ENABLED:
+        raise HTTPException(status_code=404, detail="Event streams are disabled")
+    try:
+        subscription = event_broker.subscribe(user_id)
+    except EventBrokerFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return StreamingResponse(sse_events(subscription, settings.EVENTS_HEARTBEAT_SECONDS), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    try:
+        while True:
+            await websocket.receive_text()  # The stream is one-way; anything the client sends is ignored
+    except WebSocketDisconnect:
+        pass
+
+@router.websocket("/{user_id}/events")
+async def user_events_socket(websocket: WebSocket, user_id: uuid.UUID):
+    """The same events as the SSE stream, one JSON message each"""
+    if not settings.EVENTS_ENABLED:
+        await websocket.close(code=1008)
+        return
+    try:
+        subscription = event_broker.subscribe(user_id)
+    except EventBrokerFullError:
+        await websocket.close(code=1013)
+        return
+    await websocket.accept()
+    disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        while not disconnected.done():
+            try:
+                event = await subscription.next(settings.EVENTS_HEARTBEAT_SECONDS)
+            except StopAsyncIteration:
+                await websocket.close(code=1013)  # Try again later: fell too far behind
+                return
+            if event is not None:
+                await websocket.send_text(event.as_json())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        subscription.close()
@@ -1,11 +1,12 @@
 import uuid
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from src.core.domain.plant import PhysicalDeviceCategory
 
+# Lengths mirror the database columns so oversized values fail validation instead of the INSERT/COPY
 class PlantBase(BaseModel):
-    name: str
-    species: str
+    name: str = Field(max_length=100)
+    species: str = Field(max_length=100)
     description: str | None = None
 
 class PlantCreate(PlantBase):
@@ -20,22 +21,30 @@ class PlantResponse(PlantBase):
     id: uuid.UUID
     user_id: uuid.UUID
     photo_filename: str | None = None
+    row_version: int
     created_at: datetime
     updated_at: datetime
 
+class PlantLookupRequest(BaseModel):
+    ids: list[uuid.UUID] = Field(min_length=1, max_length=1000)
+
+class PlantLookupResponse(BaseModel):
+    plants: list[PlantResponse]
+    missing: list[uuid.UUID]
+
 class PhysicalDeviceBase(BaseModel):
-    name: str
+    name: str = Field(max_length=100)
     description: str | None = None
-    version: str | None = None
+    version: str | None = Field(None, max_length=50)
     category: PhysicalDeviceCategory
 
 class PhysicalDeviceCreate(PhysicalDeviceBase):
     user_id: uuid.UUID
 
 class PhysicalDeviceUpdate(BaseModel):
-    name: str | None = None
+    name: str | None = Field(None, max_length=100)
     description: str | None = None
-    version: str | None = None
+    version: str | None = Field(None, max_length=50)
     category: PhysicalDeviceCategory | None = None
 
 class PhysicalDeviceResponse(PhysicalDeviceBase):
@@ -43,5 +52,72 @@ class PhysicalDeviceResponse(PhysicalDeviceBase):
 
     id: uuid.UUID
     user_id: uuid.UUID
+    row_version: int
     created_at: datetime
     updated_at: datetime
+
+class DeviceLookupRequest(BaseModel):
+    ids: list[uuid.UUID] = Field(min_length=1, max_length=1000)
+
+class DeviceLookupResponse(BaseModel):
+    devices: list[PhysicalDeviceResponse]
+    missing: list[uuid.UUID]
+
+class DeviceBindingsRequest(BaseModel):
+    device_ids: list[uuid.UUID] = Field(min_length=1, max_length=1000)
+
+class DeviceBinding(BaseModel):
+    device_id: uuid.UUID
+    user_id: uuid.UUID
+    plant_ids: list[uuid.UUID]
+
+class DeviceBindingsResponse(BaseModel):
+    bindings: list[DeviceBinding]
+    missing: list[uuid.UUID]
+
+class DeviceAssignmentPeriodResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    device_id: uuid.UUID
+    plant_id: uuid.UUID
+    valid_from: datetime
+    valid_to: datetime | None = None
+
+class PlantsAtLookup(BaseModel):
+    device_id: uuid.UUID
+    at: datetime
+
+class PlantsAtRequest(BaseModel):
+    lookups: list[PlantsAtLookup] = Field(min_length=1, max_length=10000)
+
+class PlantsAtResponse(BaseModel):
+    device_id: uuid.UUID
+    at: datetime
+    plant_ids: list[uuid.UUID]
+
+class PlantsAtBatchResponse(BaseModel):
+    results: list[PlantsAtResponse]
+
+class UserDeletionJobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    user_id: uuid.UUID
+    status: str
+    plants_deleted: int
+    devices_deleted: int
+    requested_at: datetime
+    completed_at: datetime | None = None
+
+class ImportRowErrorResponse(BaseModel):
+    line: int
+    error: str
+
+class ImportReportResponse(BaseModel):
+    received: int
+    inserted: int
+    duplicates: int
+    invalid: int
+    batches: int
+    seconds: float
+    rows_per_second: float
+    errors: list[ImportRowErrorResponse]
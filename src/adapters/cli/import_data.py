@@ -0,0 +1,53 @@
+"""Bulk-load plants or devices from a CSV/NDJSON file with the same pipeline as /api/v1/import.
+
+    python -m src.adapters.cli.import_data plants farm-plants.csv
+    python -m src.adapters.cli.import_data devices farm-devices.ndjson --batch-size 10000
+"""
+import argparse
+import asyncio
+import sys
+from src.adapters.api.import_formats import IMPORT_FORMATS, import_format, import_source, plant_record, device_record
+from src.adapters.repositories.import_repository_impl import ImportRepositoryImpl
+from src.config.database import SessionLocal, engine
+from src.config.settings import settings
+from src.core.services.bulk_import_service import BulkImportService, ImportReport
+
+def _print_progress(report: ImportReport) -> None:
+    print(f"\r{report.received:,} rows, {report.inserted:,} inserted, {report.invalid:,} invalid "
+          f"({report.rows_per_second:,.0f} rows/s)", end="", file=sys.stderr, flush=True)
+
+async def run(kind: str, path: str, file_format: str, batch_size: int, max_errors: int) -> ImportReport:
+    try:
+        with open(path, "rb") as binary_file:
+            async with SessionLocal() as session:
+                service = BulkImportService(ImportRepositoryImpl(session), batch_size, max_errors)
+                if kind == "plants":
+                    rows, to_record = import_source(binary_file, file_format, plant_record)
+                    report = await service.import_plants(rows, to_record, _print_progress)
+                else:
+                    rows, to_record = import_source(binary_file, file_format, device_record)
+                    report = await service.import_devices(rows, to_record, _print_progress)
+    finally:
+        await engine.dispose()
+    print(file=sys.stderr)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", choices=("plants", "devices"))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    parser.add_argument("--max-errors", type=int, default=settings.IMPORT_MAX_ERRORS)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.kind, args.path, import_format(args.path, args.format),
+                             args.batch_size, args.max_errors))
+    for error in report.errors:
+        print(f"line {error.line}: {error.error}")
+    print(f"received {report.received:,}, inserted {report.inserted:,}, duplicates {report.duplicates:,}, "
+          f"invalid {report.invalid:,} in {report.seconds:.1f}s ({report.rows_per_second:,.0f} rows/s)")
+    sys.exit(1 if report.invalid else 0)
+
+if __name__ == "__main__":
+    main()
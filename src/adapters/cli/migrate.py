@@ -0,0 +1,34 @@
+"""Apply the Alembic migrations and create the upcoming assignment history partitions.
+
+    python -m src.adapters.cli.migrate
+
+scripts/start.sh runs this once per deploy before the workers start, so N workers
+never race each other through the same DDL.
+"""
+import asyncio
+from datetime import datetime
+from alembic import command
+from alembic.config import Config
+from src.adapters.repositories.assignment_history_repository_impl import ensure_history_partitions
+from src.config.database import SessionLocal, engine
+from src.config.settings import settings
+
+def run_migrations() -> None:
+    command.upgrade(Config("alembic.ini"), "head")
+
+async def ensure_partitions() -> None:
+    async with SessionLocal() as session:
+        await ensure_history_partitions(session, datetime.utcnow(), settings.ASSIGNMENT_HISTORY_PARTITION_MONTHS_AHEAD)
+
+async def _ensure_partitions_and_dispose() -> None:
+    try:
+        await ensure_partitions()
+    finally:
+        await engine.dispose()
+
+def main():
+    run_migrations()
+    asyncio.run(_ensure_partitions_and_dispose())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Optional
+from PIL import Image, ImageOps, UnidentifiedImageError
+from src.config.settings import settings
+from src.core.domain.exceptions import InvalidImageError, ImageTooLargeError
+from src.core.ports.image_processor import ImageProcessor, ProcessedImage
+
+ACCEPTED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF", "BMP", "TIFF", "MPO"}
+OUTPUT_FORMATS = {
+    "WEBP": ("webp", "image/webp"),
+    "JPEG": ("jpg", "image/jpeg"),
+    "PNG": ("png", "image/png"),
+}
+
+def normalize_image(data: bytes, output_format: str, quality: int, max_dimension: int, max_pixels: int) -> ProcessedImage:
+    """Decode, orient, downscale and re-encode without metadata. Runs inside the process pool."""
+    try:
+        with Image.open(BytesIO(data)) as image:
+            # The real format comes from the bytes, not the client's filename or content type
+            if image.format not in ACCEPTED_FORMATS:
+                raise InvalidImageError(f"Unsupported image format: {image.format}")
+            if image.width * image.height > max_pixels:
+                raise ImageTooLargeError(f"Image has more than {max_pixels} pixels")
+            # Let the JPEG decoder scale down while decoding instead of inflating the full image
+            image.draft("RGB", (max_dimension, max_dimension))
+            image.load()
+            image = ImageOps.exif_transpose(image)
+    except Image.DecompressionBombError as e:
+        # Pillow's own pixel ceiling, hit before our max_pixels check: a size problem, not a bad image
+        raise ImageTooLargeError(f"Image has too many pixels: {e}")
+    except (UnidentifiedImageError, OSError) as e:
+        raise InvalidImageError(f"Could not decode image: {e}")
+
+    image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    if output_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    elif image.mode not in ("RGB", "RGBA", "L", "LA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    output = BytesIO()
+    # No exif/icc arguments: the re-encoded file carries no metadata
+    image.save(output, format=output_format, quality=quality, optimize=True)
+    extension, content_type = OUTPUT_FORMATS[output_format]
+    return ProcessedImage(output.getvalue(), extension, content_type, image.width, image.height)
+
+class PillowImageProcessor(ImageProcessor):
+    """Runs normalize_image in a process pool so CPU-heavy decoding stays off the event loop."""
+
+    def __init__(self, output_format: str = "WEBP", quality: int = 80, max_dimension: int = 2048,
+                 max_upload_bytes: int = 25 * 1024 * 1024, max_pixels: int = 50_000_000, max_workers: int = 2):
+        output_format = output_format.upper()
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported photo output format: {output_format}")
+        self.output_format = output_format
+        self.quality = quality
+        self.max_dimension = max_dimension
+        self.max_upload_bytes = max_upload_bytes
+        self.max_pixels = max_pixels
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def process(self, data: bytes) -> ProcessedImage:
+        if len(data) > self.max_upload_bytes:
+            raise ImageTooLargeError(f"Photo exceeds {self.max_upload_bytes} bytes")
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, normalize_image, data, self.output_format,
+                                          self.quality, self.max_dimension, self.max_pixels)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+image_processor = PillowImageProcessor(
+    output_format=settings.PHOTO_OUTPUT_FORMAT,
+    quality=settings.PHOTO_QUALITY,
+    max_dimension=settings.PHOTO_MAX_DIMENSION,
+    max_upload_bytes=settings.PHOTO_MAX_UPLOAD_BYTES,
+    max_pixels=settings.PHOTO_MAX_PIXELS,
+    max_workers=settings.PHOTO_PROCESS_WORKERS,
+)
@@ -0,0 +1,87 @@
+import logging
+import uuid
+from datetime import datetime
+from typing import List
+from sqlalchemy import text, update, bindparam
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from src.core.domain.assignment_history import DeviceAssignmentPeriod
+from src.adapters.repositories.models import DeviceAssignmentHistory
+from src.core.ports.assignment_history_repository import AssignmentHistoryRepository
+
+logger = logging.getLogger(__name__)
+
+_DEVICE_HISTORY = (
+    select(DeviceAssignmentHistory.physical_device_id, DeviceAssignmentHistory.plant_id,
+           DeviceAssignmentHistory.valid_from, DeviceAssignmentHistory.valid_to)
+    .where(DeviceAssignmentHistory.physical_device_id == bindparam("device_id"))
+    .order_by(DeviceAssignmentHistory.valid_from)
+)
+# One nested-loop probe of the GiST (device, period) index per distinct device. The valid_from
+# bound is redundant with the overlap test but lets the planner skip later monthly partitions
+_PERIODS_OVERLAPPING = text("""
+    SELECT h.physical_device_id, h.plant_id, h.valid_from, h.valid_to
+    FROM unnest(CAST(:device_ids AS uuid[])) AS d(device_id)
+    JOIN device_assignment_history h
+      ON h.physical_device_id = d.device_id
+     AND h.valid_from <= CAST(:end AS timestamp)
+     AND tsrange(h.valid_from, h.valid_to, '[)') && tsrange(CAST(:start AS timestamp), CAST(:end AS timestamp), '[]')
+""")
+
+def close_open_assignments(*criteria, at: datetime):
+    """UPDATE ending the open history rows that match criteria; run it in the transaction that ends the assignment"""
+    return (
+        update(DeviceAssignmentHistory)
+        .where(DeviceAssignmentHistory.valid_to.is_(None), *criteria)
+        .values(valid_to=at)
+        .execution_options(synchronize_session=False)
+    )
+
+def _period_from_row(row) -> DeviceAssignmentPeriod:
+    device_id, plant_id, valid_from, valid_to = row
+    return DeviceAssignmentPeriod.model_construct(device_id=device_id, plant_id=plant_id,
+                                                  valid_from=valid_from, valid_to=valid_to)
+
+class AssignmentHistoryRepositoryImpl(AssignmentHistoryRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_device_history(self, device_id: uuid.UUID) -> List[DeviceAssignmentPeriod]:
+        result = await self.session.execute(_DEVICE_HISTORY, {"device_id": device_id})
+        return [_period_from_row(row) for row in result]
+
+    async def get_periods(self, device_ids: List[uuid.UUID], start: datetime, end: datetime) -> List[DeviceAssignmentPeriod]:
+        if not device_ids:
+            return []
+        parameters = {"device_ids": list(dict.fromkeys(device_ids)), "start": start, "end": end}
+        result = await self.session.execute(_PERIODS_OVERLAPPING, parameters)
+        return [_period_from_row(row) for row in result]
+
+def history_partition_name(month: datetime) -> str:
+    return f"device_assignment_history_p{month:%Y%m}"
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+async def ensure_history_partitions(session: AsyncSession, start: datetime, months: int) -> None:
+    """Create the monthly partitions from start's month onwards that do not exist yet.
+
+    Rows outside every monthly partition land in the default one. Once the default
+    partition holds rows for a month, that month can no longer be split out; it is
+    logged and left where it is, which only costs pruning, not correctness.
+    """
+    first = datetime(start.year, start.month, 1)
+    for offset in range(months + 1):
+        month = _add_months(first, offset)
+        try:
+            await session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {history_partition_name(month)} PARTITION OF device_assignment_history "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+            ))
+            await session.commit()
+        except DBAPIError:
+            await session.rollback()
+            logger.warning("Could not create assignment history partition", extra={"month": f"{month:%Y-%m}"},
+                           exc_info=True)
@@ -0,0 +1,49 @@
+import uuid
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from src.adapters.repositories.models import Plant as PlantModel, PhysicalDevice as PhysicalDeviceModel, PlantPhysicalDevice
+from src.core.ports.export_repository import ExportRepository
+
+PLANT_COLUMNS = ("id", "user_id", "name", "species", "description", "photo_filename", "row_version",
+                 "created_at", "updated_at")
+DEVICE_COLUMNS = ("id", "user_id", "name", "description", "version", "category", "row_version",
+                  "created_at", "updated_at")
+
+class ExportRepositoryImpl(ExportRepository):
+    def __init__(self, session: AsyncSession, batch_size: int = 1000):
+        self.session = session
+        self.batch_size = batch_size
+
+    async def stream_plants(self, user_id: Optional[uuid.UUID] = None,
+                            include_device_ids: bool = False) -> AsyncIterator[List[dict]]:
+        columns = [getattr(PlantModel, name) for name in PLANT_COLUMNS]
+        if include_device_ids:
+            device_ids = (
+                select(func.array_agg(PlantPhysicalDevice.physical_device_id))
+                .join(PhysicalDeviceModel, PhysicalDeviceModel.id == PlantPhysicalDevice.physical_device_id)
+                .where(PlantPhysicalDevice.plant_id == PlantModel.id, PhysicalDeviceModel.deleted_at.is_(None))
+                .scalar_subquery()
+            )
+            columns.append(device_ids.label("device_ids"))
+        query = select(*columns).where(PlantModel.deleted_at.is_(None))
+        if user_id is not None:
+            query = query.where(PlantModel.user_id == user_id)
+        async for batch in self._stream(query.order_by(PlantModel.id)):
+            yield batch
+
+    async def stream_devices(self, user_id: Optional[uuid.UUID] = None) -> AsyncIterator[List[dict]]:
+        query = select(*[getattr(PhysicalDeviceModel, name) for name in DEVICE_COLUMNS]).where(
+            PhysicalDeviceModel.deleted_at.is_(None)
+        )
+        if user_id is not None:
+            query = query.where(PhysicalDeviceModel.user_id == user_id)
+        async for batch in self._stream(query.order_by(PhysicalDeviceModel.id)):
+            yield batch
+
+    async def _stream(self, query) -> AsyncIterator[List[dict]]:
+        # Server-side cursor: only one batch of rows is held in memory at a time
+        result = await self.session.stream(query.execution_options(yield_per=self.batch_size))
+        async for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
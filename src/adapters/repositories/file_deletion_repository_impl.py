@@ -0,0 +1,67 @@
+import uuid
+from typing import Dict, List, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+from src.core.domain.file_deletion import PendingFileDeletion as PendingFileDeletionDomain
+from src.adapters.repositories.models import PendingFileDeletion as PendingFileDeletionModel, PhotoObject
+from src.core.ports.file_deletion_repository import FileDeletionRepository
+
+class FileDeletionRepositoryImpl(FileDeletionRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def claim_batch(self, limit: int) -> List[PendingFileDeletionDomain]:
+        # Row locks are held by the open transaction until complete_batch commits;
+        # SKIP LOCKED lets several workers drain the queue concurrently
+        result = await self.session.execute(
+            select(PendingFileDeletionModel)
+            .order_by(PendingFileDeletionModel.attempts, PendingFileDeletionModel.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return [PendingFileDeletionDomain.model_validate(row) for row in result.scalars().all()]
+
+    async def lock_unreferenced_photos(self, file_names: List[str]) -> Tuple[Set[str], Set[str]]:
+        if not file_names:
+            return set(), set()
+        # Every name gets a row to lock, so an uploader re-acquiring one waits until our deletion commits
+        # (and then sees a fresh row) instead of committing a reference to an object we are removing
+        await self.session.execute(
+            insert(PhotoObject)
+            .values([{"file_name": file_name, "ref_count": 0} for file_name in file_names])
+            .on_conflict_do_nothing(index_elements=[PhotoObject.file_name])
+        )
+        result = await self.session.execute(
+            select(PhotoObject.file_name)
+            .where(PhotoObject.file_name.in_(file_names), PhotoObject.ref_count == 0)
+            .with_for_update(skip_locked=True)
+        )
+        locked = set(result.scalars().all())
+        result = await self.session.execute(
+            select(PhotoObject.file_name).where(PhotoObject.file_name.in_(file_names), PhotoObject.ref_count > 0)
+        )
+        return locked, set(file_names) - locked - set(result.scalars().all())
+
+    async def forget_photos(self, file_names: List[str]) -> None:
+        if file_names:
+            await self.session.execute(
+                delete(PhotoObject).where(PhotoObject.file_name.in_(file_names), PhotoObject.ref_count == 0)
+            )
+
+    async def complete_batch(self, done_ids: List[uuid.UUID], failures: Dict[uuid.UUID, str]) -> None:
+        if done_ids:
+            await self.session.execute(
+                delete(PendingFileDeletionModel).where(PendingFileDeletionModel.id.in_(done_ids))
+            )
+        for deletion_id, error in failures.items():
+            await self.session.execute(
+                update(PendingFileDeletionModel)
+                .where(PendingFileDeletionModel.id == deletion_id)
+                .values(attempts=PendingFileDeletionModel.attempts + 1, last_error=error)
+            )
+        await self.session.commit()
+
+    async def release(self) -> None:
+        await self.session.commit()
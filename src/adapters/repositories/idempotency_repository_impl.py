@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.future import select
+from src.core.domain.idempotency import IdempotencyRecord
+from src.adapters.repositories.models import IdempotencyKey
+from src.core.ports.idempotency_repository import IdempotencyRepository
+
+class IdempotencyRepositoryImpl(IdempotencyRepository):
+    """Opens a short session per call: the middleware that uses it runs outside any request-scoped session."""
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    async def begin(self, key: str, fingerprint: str, now: datetime, expires_at: datetime,
+                    stale_before: datetime) -> Optional[IdempotencyRecord]:
+        claim = insert(IdempotencyKey).values(key=key, fingerprint=fingerprint, locked_at=now, expires_at=expires_at)
+        claim = claim.on_conflict_do_update(
+            index_elements=[IdempotencyKey.key],
+            set_={"fingerprint": claim.excluded.fingerprint, "locked_at": claim.excluded.locked_at,
+                  "expires_at": claim.excluded.expires_at, "status_code": None, "response_headers": None,
+                  "response_body": None},
+            where=or_(
+                IdempotencyKey.expires_at < now,
+                and_(IdempotencyKey.status_code.is_(None), IdempotencyKey.locked_at < stale_before,
+                     IdempotencyKey.fingerprint == claim.excluded.fingerprint),
+            ),
+        ).returning(IdempotencyKey.key)
+        async with self.session_factory() as session:
+            # A holder can release the key between our conflict and our read; then just claim again
+            for _ in range(3):
+                claimed = (await session.execute(claim)).scalar_one_or_none()
+                if claimed is not None:
+                    await session.commit()
+                    return None
+                row = (await session.execute(select(IdempotencyKey).where(IdempotencyKey.key == key))).scalar_one_or_none()
+                await session.commit()
+                if row is not None:
+                    return IdempotencyRecord(key=row.key, fingerprint=row.fingerprint, status_code=row.status_code,
+                                             headers=[tuple(header) for header in row.response_headers or []],
+                                             body=row.response_body or b"", locked_at=row.locked_at,
+                                             expires_at=row.expires_at)
+        raise RuntimeError(f"Could not claim idempotency key {key!r}")
+
+    async def complete(self, key: str, status_code: int, headers: List[Tuple[str, str]], body: bytes) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(status_code=status_code, response_headers=[list(header) for header in headers],
+                        response_body=body)
+            )
+            await session.commit()
+
+    async def release(self, key: str) -> None:
+        async with self.session_factory() as session:
+            await session.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key,
+                                                               IdempotencyKey.status_code.is_(None)))
+            await session.commit()
+
+    async def purge_expired(self, now: datetime, limit: int) -> int:
+        batch = (
+            select(IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at < now)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with self.session_factory() as session:
+            result = await session.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(batch)))
+            await session.commit()
+            return result.rowcount
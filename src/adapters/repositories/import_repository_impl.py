@@ -0,0 +1,37 @@
+from typing import List, Sequence
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.ports.import_repository import ImportRepository
+
+PLANT_IMPORT_COLUMNS = ("id", "user_id", "name", "species", "description", "row_version", "created_at", "updated_at")
+DEVICE_IMPORT_COLUMNS = ("id", "user_id", "name", "description", "version", "category", "row_version",
+                         "created_at", "updated_at")
+
+class ImportRepositoryImpl(ImportRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def insert_plants(self, records: List[tuple]) -> int:
+        return await self._copy_and_merge("plants", PLANT_IMPORT_COLUMNS, records)
+
+    async def insert_devices(self, records: List[tuple]) -> int:
+        return await self._copy_and_merge("physical_devices", DEVICE_IMPORT_COLUMNS, records)
+
+    async def _copy_and_merge(self, table: str, columns: Sequence[str], records: List[tuple]) -> int:
+        """COPY the batch into a per-connection staging table, then merge it with one INSERT ... SELECT"""
+        if not records:
+            return 0
+        staging = f"import_staging_{table}"
+        await self.session.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        ))
+        # COPY is only exposed by the asyncpg driver itself; it runs inside the session's open transaction
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(staging, records=records, columns=list(columns))
+        column_list = ", ".join(columns)
+        result = await self.session.execute(text(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging} ON CONFLICT (id) DO NOTHING"
+        ))
+        await self.session.commit()
+        return result.rowcount
@@ -0,0 +1,356 @@
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from src.core.domain.plant import Plant as PlantDomain, PhysicalDevice as PhysicalDeviceDomain, PhysicalDeviceCategory
+from src.core.domain.assignment_history import DeviceAssignmentPeriod
+from src.core.domain.idempotency import IdempotencyRecord
+from src.core.ports.plant_repository import PlantRepository, PhysicalDeviceRepository
+from src.core.ports.assignment_history_repository import AssignmentHistoryRepository
+from src.core.ports.idempotency_repository import IdempotencyRepository
+
+class InMemoryStore:
+    """Rows and indexes shared by the in-memory repositories, mirroring the tables they stand in for.
+
+    Every mutation runs without awaiting, so on one event loop each repository call is
+    atomic the way a committed transaction is. Callers always get copies, never the
+    stored objects, just as each SQLAlchemy query returns fresh domain models.
+    """
+
+    def __init__(self):
+        self.plants: Dict[uuid.UUID, PlantDomain] = {}
+        self.devices: Dict[uuid.UUID, PhysicalDeviceDomain] = {}
+        # Live rows only, like the partial ix_*_user_id_live indexes; dicts keep insertion order
+        self.plants_by_user: Dict[uuid.UUID, Dict[uuid.UUID, None]] = {}
+        self.devices_by_user: Dict[uuid.UUID, Dict[uuid.UUID, None]] = {}
+        self.plant_deleted_at: Dict[uuid.UUID, datetime] = {}
+        self.device_deleted_at: Dict[uuid.UUID, datetime] = {}
+        # plant_physical_devices in both directions, with assigned_at
+        self.devices_by_plant: Dict[uuid.UUID, Dict[uuid.UUID, datetime]] = {}
+        self.plants_by_device: Dict[uuid.UUID, Dict[uuid.UUID, datetime]] = {}
+        self.photo_references: Counter = Counter()
+        self.pending_file_deletions: List[str] = []
+        # device_assignment_history per device, oldest period first
+        self.assignment_history: Dict[uuid.UUID, List[DeviceAssignmentPeriod]] = {}
+        self.idempotency_keys: Dict[str, IdempotencyRecord] = {}
+
+    def unassign(self, plant_id: uuid.UUID, device_id: uuid.UUID) -> None:
+        self.devices_by_plant.get(plant_id, {}).pop(device_id, None)
+        self.plants_by_device.get(device_id, {}).pop(plant_id, None)
+
+    def close_assignments(self, at: datetime, device_ids=None, plant_ids=None) -> None:
+        for device_id, periods in self.assignment_history.items():
+            if device_ids is not None and device_id not in device_ids:
+                continue
+            for index, period in enumerate(periods):
+                if period.valid_to is None and (plant_ids is None or period.plant_id in plant_ids):
+                    periods[index] = period.model_copy(update={"valid_to": at})
+
+    def forget_assignments(self, device_ids=None, plant_ids=None) -> None:
+        for device_id in list(self.assignment_history):
+            if device_ids is not None and device_id in device_ids:
+                del self.assignment_history[device_id]
+            elif plant_ids is not None:
+                self.assignment_history[device_id] = [period for period in self.assignment_history[device_id]
+                                                      if period.plant_id not in plant_ids]
+
+def _index_add(index: Dict[uuid.UUID, Dict[uuid.UUID, None]], key: uuid.UUID, row_id: uuid.UUID) -> None:
+    index.setdefault(key, {})[row_id] = None
+
+def _index_discard(index: Dict[uuid.UUID, Dict[uuid.UUID, None]], key: uuid.UUID, row_id: uuid.UUID) -> None:
+    rows = index.get(key)
+    if rows is not None:
+        rows.pop(row_id, None)
+        if not rows:
+            del index[key]
+
+def _oldest_deleted(deleted_at: Dict[uuid.UUID, datetime], deleted_before: datetime, limit: int) -> List[uuid.UUID]:
+    expired = [(when, row_id) for row_id, when in deleted_at.items() if when < deleted_before]
+    return [row_id for _, row_id in sorted(expired)[:limit]]
+
+class InMemoryPlantRepository(PlantRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def create_plant(self, plant: PlantDomain) -> PlantDomain:
+        if plant.id in self.store.plants:
+            raise ValueError(f"Plant {plant.id} already exists")
+        stored = plant.model_copy()
+        self.store.plants[stored.id] = stored
+        _index_add(self.store.plants_by_user, stored.user_id, stored.id)
+        if stored.photo_filename:
+            self._acquire_photo(stored.photo_filename)
+        return stored.model_copy()
+
+    async def get_plant_by_id(self, plant_id: uuid.UUID) -> Optional[PlantDomain]:
+        plant = self._live(plant_id)
+        return plant.model_copy() if plant else None
+
+    async def get_plants_by_ids(self, plant_ids: List[uuid.UUID]) -> List[PlantDomain]:
+        plants = (self._live(plant_id) for plant_id in set(plant_ids))
+        return [plant.model_copy() for plant in plants if plant is not None]
+
+    async def get_plants_by_user_id(self, user_id: uuid.UUID) -> List[PlantDomain]:
+        return [self.store.plants[plant_id].model_copy() for plant_id in self.store.plants_by_user.get(user_id, ())]
+
+    async def get_all_plants(self) -> List[PlantDomain]:
+        return [plant.model_copy() for plant_id, plant in self.store.plants.items()
+                if plant_id not in self.store.plant_deleted_at]
+
+    async def update_plant(self, plant: PlantDomain) -> PlantDomain:
+        existing_plant = self._live(plant.id)
+        if existing_plant is None:
+            return None
+        if existing_plant.photo_filename != plant.photo_filename:
+            if plant.photo_filename:
+                self._acquire_photo(plant.photo_filename)
+            if existing_plant.photo_filename:
+                self._release_photo(existing_plant.photo_filename)
+        return self._store_update(existing_plant, plant.model_dump(exclude={"id", "row_version", "updated_at"}))
+
+    async def update_plant_if_version(self, plant_id: uuid.UUID, expected_versions: Sequence[int], values: dict) -> Optional[PlantDomain]:
+        existing_plant = self._live(plant_id)
+        if existing_plant is None or existing_plant.row_version not in expected_versions:
+            return None
+        return self._store_update(existing_plant, values)
+
+    async def delete_plant(self, plant_id: uuid.UUID) -> None:
+        plant = self._live(plant_id)
+        if plant is not None:
+            self._soft_delete(plant)
+
+    async def soft_delete_plants_by_user(self, user_id: uuid.UUID, limit: int) -> List[uuid.UUID]:
+        plant_ids = list(self.store.plants_by_user.get(user_id, ()))[:limit]
+        for plant_id in plant_ids:
+            self._soft_delete(self.store.plants[plant_id])
+        return plant_ids
+
+    async def user_has_live_plants(self, user_id: uuid.UUID) -> bool:
+        return bool(self.store.plants_by_user.get(user_id))
+
+    async def purge_deleted_plants(self, deleted_before: datetime, limit: int) -> int:
+        plant_ids = _oldest_deleted(self.store.plant_deleted_at, deleted_before, limit)
+        for plant_id in plant_ids:
+            plant = self.store.plants.pop(plant_id)
+            del self.store.plant_deleted_at[plant_id]
+            if plant.photo_filename:
+                self._release_photo(plant.photo_filename)
+            for device_id in list(self.store.devices_by_plant.get(plant_id, ())):
+                self.store.unassign(plant_id, device_id)
+            self.store.devices_by_plant.pop(plant_id, None)
+        self.store.forget_assignments(plant_ids=set(plant_ids))
+        return len(plant_ids)
+
+    async def get_referenced_photo_filenames(self, file_names: List[str]) -> Set[str]:
+        # Soft-deleted plants still hold their photo until they are purged
+        return {file_name for file_name in file_names if self.store.photo_references[file_name] > 0}
+
+    def _live(self, plant_id: uuid.UUID) -> Optional[PlantDomain]:
+        if plant_id in self.store.plant_deleted_at:
+            return None
+        return self.store.plants.get(plant_id)
+
+    def _store_update(self, existing_plant: PlantDomain, values: dict) -> PlantDomain:
+        if "user_id" in values and values["user_id"] != existing_plant.user_id:
+            _index_discard(self.store.plants_by_user, existing_plant.user_id, existing_plant.id)
+            _index_add(self.store.plants_by_user, values["user_id"], existing_plant.id)
+        updated_plant = existing_plant.model_copy(update={**values, "row_version": existing_plant.row_version + 1,
+                                                          "updated_at": datetime.utcnow()})
+        self.store.plants[updated_plant.id] = updated_plant
+        return updated_plant.model_copy()
+
+    def _soft_delete(self, plant: PlantDomain) -> None:
+        now = datetime.utcnow()
+        self.store.plant_deleted_at[plant.id] = now
+        _index_discard(self.store.plants_by_user, plant.user_id, plant.id)
+        self.store.close_assignments(now, plant_ids={plant.id})
+
+    def _acquire_photo(self, file_name: str) -> None:
+        self.store.photo_references[file_name] += 1
+        self.store.pending_file_deletions = [name for name in self.store.pending_file_deletions if name != file_name]
+
+    def _release_photo(self, file_name: str) -> None:
+        self.store.photo_references[file_name] -= 1
+        if self.store.photo_references[file_name] <= 0:
+            del self.store.photo_references[file_name]
+            self.store.pending_file_deletions.append(file_name)
+
+class InMemoryPhysicalDeviceRepository(PhysicalDeviceRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def create_device(self, device: PhysicalDeviceDomain) -> PhysicalDeviceDomain:
+        if device.id in self.store.devices:
+            raise ValueError(f"Device {device.id} already exists")
+        stored = device.model_copy()
+        self.store.devices[stored.id] = stored
+        _index_add(self.store.devices_by_user, stored.user_id, stored.id)
+        return stored.model_copy()
+
+    async def get_device_by_id(self, device_id: uuid.UUID) -> Optional[PhysicalDeviceDomain]:
+        device = self._live(device_id)
+        return device.model_copy() if device else None
+
+    async def get_devices_by_ids(self, device_ids: List[uuid.UUID]) -> List[PhysicalDeviceDomain]:
+        devices = (self._live(device_id) for device_id in set(device_ids))
+        return [device.model_copy() for device in devices if device is not None]
+
+    async def get_all_devices(self) -> List[PhysicalDeviceDomain]:
+        return [device.model_copy() for device_id, device in self.store.devices.items()
+                if device_id not in self.store.device_deleted_at]
+
+    async def update_device(self, device: PhysicalDeviceDomain) -> PhysicalDeviceDomain:
+        existing_device = self._live(device.id)
+        if existing_device is None:
+            return None
+        return self._store_update(existing_device, device.model_dump(exclude={"id", "row_version", "updated_at"}))
+
+    async def update_device_if_version(self, device_id: uuid.UUID, user_id: uuid.UUID, expected_versions: Sequence[int],
+                                       values: dict) -> Optional[PhysicalDeviceDomain]:
+        existing_device = self._live(device_id)
+        if (existing_device is None or existing_device.user_id != user_id
+                or existing_device.row_version not in expected_versions):
+            return None
+        return self._store_update(existing_device, values)
+
+    async def delete_device(self, device_id: uuid.UUID) -> None:
+        device = self._live(device_id)
+        if device is not None:
+            self._soft_delete(device)
+
+    async def soft_delete_devices_by_user(self, user_id: uuid.UUID, limit: int) -> List[uuid.UUID]:
+        device_ids = list(self.store.devices_by_user.get(user_id, ()))[:limit]
+        for device_id in device_ids:
+            self._soft_delete(self.store.devices[device_id])
+        return device_ids
+
+    async def user_has_live_devices(self, user_id: uuid.UUID) -> bool:
+        return bool(self.store.devices_by_user.get(user_id))
+
+    async def purge_deleted_devices(self, deleted_before: datetime, limit: int) -> int:
+        device_ids = _oldest_deleted(self.store.device_deleted_at, deleted_before, limit)
+        for device_id in device_ids:
+            del self.store.devices[device_id]
+            del self.store.device_deleted_at[device_id]
+            for plant_id in list(self.store.plants_by_device.get(device_id, ())):
+                self.store.unassign(plant_id, device_id)
+            self.store.plants_by_device.pop(device_id, None)
+        self.store.forget_assignments(device_ids=set(device_ids))
+        return len(device_ids)
+
+    async def get_devices_by_plant_id(self, plant_id: uuid.UUID) -> List[PhysicalDeviceDomain]:
+        return [self.store.devices[device_id].model_copy() for device_id in self.store.devices_by_plant.get(plant_id, ())
+                if device_id not in self.store.device_deleted_at]
+
+    async def assign_device_to_plant(self, plant_id: uuid.UUID, device_id: uuid.UUID) -> None:
+        # Same failures as the table's primary key and foreign keys
+        if plant_id not in self.store.plants or device_id not in self.store.devices:
+            raise ValueError(f"Plant {plant_id} or device {device_id} does not exist")
+        if device_id in self.store.devices_by_plant.get(plant_id, ()):
+            raise ValueError(f"Device {device_id} is already assigned to plant {plant_id}")
+        assigned_at = datetime.utcnow()
+        self.store.devices_by_plant.setdefault(plant_id, {})[device_id] = assigned_at
+        self.store.plants_by_device.setdefault(device_id, {})[plant_id] = assigned_at
+        self.store.assignment_history.setdefault(device_id, []).append(
+            DeviceAssignmentPeriod(device_id=device_id, plant_id=plant_id, valid_from=assigned_at)
+        )
+
+    async def remove_device_from_plant(self, plant_id: uuid.UUID, device_id: uuid.UUID) -> None:
+        self.store.unassign(plant_id, device_id)
+        self.store.close_assignments(datetime.utcnow(), device_ids={device_id}, plant_ids={plant_id})
+
+    async def get_devices_by_user_id(self, user_id: uuid.UUID) -> List[PhysicalDeviceDomain]:
+        return [self.store.devices[device_id].model_copy() for device_id in self.store.devices_by_user.get(user_id, ())]
+
+    async def get_device_by_id_and_user(self, device_id: uuid.UUID, user_id: uuid.UUID) -> Optional[PhysicalDeviceDomain]:
+        device = self._live(device_id)
+        return device.model_copy() if device and device.user_id == user_id else None
+
+    async def get_device_bindings(self, since: Optional[datetime] = None) -> List[Tuple[uuid.UUID, uuid.UUID, Optional[uuid.UUID]]]:
+        rows = []
+        for device_id, device in self.store.devices.items():
+            if device_id in self.store.device_deleted_at:
+                continue
+            assignments = [(plant_id, assigned_at) for plant_id, assigned_at in self.store.plants_by_device.get(device_id, {}).items()
+                           if plant_id not in self.store.plant_deleted_at]
+            device_is_new = since is None or device.created_at >= since
+            if not assignments:
+                if device_is_new:
+                    rows.append((device_id, device.user_id, None))
+                continue
+            rows.extend((device_id, device.user_id, plant_id) for plant_id, assigned_at in assignments
+                        if device_is_new or assigned_at >= since)
+        return rows
+
+    async def get_device_unbindings(self, since: datetime) -> Tuple[List[uuid.UUID], List[Tuple[uuid.UUID, uuid.UUID]]]:
+        removed = [device_id for device_id, deleted_at in self.store.device_deleted_at.items() if deleted_at >= since]
+        detached = dict.fromkeys((device_id, period.plant_id) for device_id, periods in self.store.assignment_history.items()
+                                 for period in periods if period.valid_to is not None and period.valid_to >= since)
+        return removed, list(detached)
+
+    def _live(self, device_id: uuid.UUID) -> Optional[PhysicalDeviceDomain]:
+        if device_id in self.store.device_deleted_at:
+            return None
+        return self.store.devices.get(device_id)
+
+    def _store_update(self, existing_device: PhysicalDeviceDomain, values: dict) -> PhysicalDeviceDomain:
+        if "user_id" in values and values["user_id"] != existing_device.user_id:
+            _index_discard(self.store.devices_by_user, existing_device.user_id, existing_device.id)
+            _index_add(self.store.devices_by_user, values["user_id"], existing_device.id)
+        if "category" in values:
+            values = {**values, "category": PhysicalDeviceCategory(values["category"])}
+        updated_device = existing_device.model_copy(update={**values, "row_version": existing_device.row_version + 1,
+                                                            "updated_at": datetime.utcnow()})
+        self.store.devices[updated_device.id] = updated_device
+        return updated_device.model_copy()
+
+    def _soft_delete(self, device: PhysicalDeviceDomain) -> None:
+        now = datetime.utcnow()
+        self.store.device_deleted_at[device.id] = now
+        _index_discard(self.store.devices_by_user, device.user_id, device.id)
+        self.store.close_assignments(now, device_ids={device.id})
+
+class InMemoryAssignmentHistoryRepository(AssignmentHistoryRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def get_device_history(self, device_id: uuid.UUID) -> List[DeviceAssignmentPeriod]:
+        return [period.model_copy() for period in self.store.assignment_history.get(device_id, ())]
+
+    async def get_periods(self, device_ids: List[uuid.UUID], start: datetime, end: datetime) -> List[DeviceAssignmentPeriod]:
+        # Same overlap test as the SQL: [valid_from, valid_to) against the closed window [start, end]
+        return [period.model_copy() for device_id in dict.fromkeys(device_ids)
+                for period in self.store.assignment_history.get(device_id, ())
+                if period.valid_from <= end and (period.valid_to is None or period.valid_to > start)]
+
+
+class InMemoryIdempotencyRepository(IdempotencyRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def begin(self, key: str, fingerprint: str, now: datetime, expires_at: datetime,
+                    stale_before: datetime) -> Optional[IdempotencyRecord]:
+        record = self.store.idempotency_keys.get(key)
+        if record is not None and record.expires_at >= now and not (
+                record.status_code is None and record.locked_at < stale_before and record.fingerprint == fingerprint):
+            return record.model_copy()
+        self.store.idempotency_keys[key] = IdempotencyRecord(key=key, fingerprint=fingerprint, locked_at=now,
+                                                             expires_at=expires_at)
+        return None
+
+    async def complete(self, key: str, status_code: int, headers: List[Tuple[str, str]], body: bytes) -> None:
+        record = self.store.idempotency_keys.get(key)
+        if record is not None:
+            self.store.idempotency_keys[key] = record.model_copy(update={"status_code": status_code,
+                                                                         "headers": list(headers), "body": body})
+
+    async def release(self, key: str) -> None:
+        record = self.store.idempotency_keys.get(key)
+        if record is not None and record.status_code is None:
+            del self.store.idempotency_keys[key]
+
+    async def purge_expired(self, now: datetime, limit: int) -> int:
+        expired = [key for key, record in self.store.idempotency_keys.items() if record.expires_at < now][:limit]
+        for key in expired:
+            del self.store.idempotency_keys[key]
+        return len(expired)
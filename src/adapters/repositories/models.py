@@ -1,7 +1,7 @@
 # app/models.py
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Integer, Index, LargeBinary, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
 
@@ -16,8 +16,15 @@ class PhysicalDevice(Base):
     description = Column(Text)
     version = Column(String(50))
     category = Column(String(20), nullable=False)  # 'microcontroller' or 'sensor'
+    row_version = Column(Integer, nullable=False, default=1, server_default="1")  # Optimistic concurrency token
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deleted_at = Column(DateTime)  # Soft delete marker, the purger removes the row later
+
+    __table_args__ = (
+        Index("ix_physical_devices_user_id_live", "user_id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_physical_devices_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
 
 class Plant(Base):
     __tablename__ = "plants"
@@ -27,13 +34,80 @@ class Plant(Base):
     name = Column(String(100), nullable=False)
     species = Column(String(100))
     description = Column(Text)
-    photo_filename = Column(String(255))
+    photo_filename = Column(String(255), index=True)
+    row_version = Column(Integer, nullable=False, default=1, server_default="1")  # Optimistic concurrency token
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deleted_at = Column(DateTime)  # Soft delete marker, the purger removes the row later
+
+    __table_args__ = (
+        Index("ix_plants_user_id_live", "user_id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_plants_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
 
 class PlantPhysicalDevice(Base):
     __tablename__ = "plant_physical_devices"
 
     plant_id = Column(UUID(as_uuid=True), ForeignKey("plants.id", ondelete="CASCADE"), primary_key=True)
-    physical_device_id = Column(UUID(as_uuid=True), ForeignKey("physical_devices.id", ondelete="CASCADE"), primary_key=True)
+    physical_device_id = Column(UUID(as_uuid=True), ForeignKey("physical_devices.id", ondelete="CASCADE"), primary_key=True, index=True)
     assigned_at = Column(DateTime, default=datetime.utcnow)
+
+class PendingFileDeletion(Base):
+    __tablename__ = "pending_file_deletions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    file_name = Column(String(255), nullable=False)  # Object key awaiting removal from file storage
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class PhotoObject(Base):
+    __tablename__ = "photo_objects"
+
+    file_name = Column(String(255), primary_key=True)  # '<sha256>.<ext>' object key
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")  # Plants pointing at this object
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class UserDeletionJob(Base):
+    __tablename__ = "user_deletion_jobs"
+
+    user_id = Column(UUID(as_uuid=True), primary_key=True)  # One outstanding job per account
+    status = Column(String(20), nullable=False, default="pending", server_default="pending")  # 'pending' or 'completed'
+    plants_deleted = Column(Integer, nullable=False, default=0, server_default="0")
+    devices_deleted = Column(Integer, nullable=False, default=0, server_default="0")
+    requested_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime)
+
+class DeviceAssignmentHistory(Base):
+    __tablename__ = "device_assignment_history"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    physical_device_id = Column(UUID(as_uuid=True), nullable=False)  # No foreign keys: history outlives soft deletes
+    plant_id = Column(UUID(as_uuid=True), nullable=False)
+    valid_from = Column(DateTime, primary_key=True, default=datetime.utcnow)  # Partition key, so part of the PK
+    valid_to = Column(DateTime)  # Exclusive end; NULL while the assignment is open
+
+    __table_args__ = (
+        # Containment / overlap probes per device (and per plant) use btree_gist for the uuid column
+        Index("ix_device_assignment_history_device_period", "physical_device_id",
+              text("tsrange(valid_from, valid_to, '[)')"), postgresql_using="gist"),
+        Index("ix_device_assignment_history_plant_period", "plant_id",
+              text("tsrange(valid_from, valid_to, '[)')"), postgresql_using="gist"),
+        # Unassigning and soft deletes close the open row
+        Index("ix_device_assignment_history_open", "physical_device_id", "plant_id",
+              postgresql_where=text("valid_to IS NULL")),
+        # The binding refresher reads periods closed since its last pass
+        Index("ix_device_assignment_history_valid_to", "valid_to", postgresql_where=text("valid_to IS NOT NULL")),
+        {"postgresql_partition_by": "RANGE (valid_from)"},
+    )
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)  # sha256 of the client identity and its Idempotency-Key
+    fingerprint = Column(String(64), nullable=False)  # sha256 of method, path, query, response media type and body
+    status_code = Column(Integer)  # NULL while the first request is still running
+    response_headers = Column(JSONB)  # [[name, value], ...] replayed to retries
+    response_body = Column(LargeBinary)
+    locked_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)  # The purger deletes rows past this
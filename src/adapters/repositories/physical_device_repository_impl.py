@@ -1,12 +1,37 @@
 import uuid
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import delete, insert
+from sqlalchemy import delete, insert, update, bindparam, or_, any_, exists
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from src.core.domain.plant import PhysicalDevice as PhysicalDeviceDomain
-from src.adapters.repositories.models import PhysicalDevice as PhysicalDeviceModel, PlantPhysicalDevice, Plant as PlantModel
+from src.adapters.repositories.models import (PhysicalDevice as PhysicalDeviceModel, PlantPhysicalDevice, Plant as PlantModel,
+                                              DeviceAssignmentHistory)
+from src.adapters.repositories.assignment_history_repository_impl import close_open_assignments
+from src.adapters.repositories.row_mapping import DEVICE_READ_COLUMNS, device_from_row
 from src.core.ports.plant_repository import PhysicalDeviceRepository
 
+# Built once at import: a reused statement memoizes its cache key, so each call skips
+# straight to SQLAlchemy's compiled cache and asyncpg's prepared statement
+_LIVE_DEVICES = select(*DEVICE_READ_COLUMNS).where(PhysicalDeviceModel.deleted_at.is_(None))
+_DEVICE_BY_ID = _LIVE_DEVICES.where(PhysicalDeviceModel.id == bindparam("device_id"))
+# One array parameter rather than IN (...): the statement text stays the same for any batch size
+_DEVICES_BY_IDS = _LIVE_DEVICES.where(
+    PhysicalDeviceModel.id == any_(bindparam("device_ids", type_=ARRAY(UUID(as_uuid=True))))
+)
+_DEVICES_BY_USER = _LIVE_DEVICES.where(PhysicalDeviceModel.user_id == bindparam("user_id"))
+_USER_HAS_LIVE_DEVICES = select(exists().where(PhysicalDeviceModel.user_id == bindparam("user_id"),
+                                               PhysicalDeviceModel.deleted_at.is_(None)))
+_DEVICE_BY_ID_AND_USER = _DEVICE_BY_ID.where(PhysicalDeviceModel.user_id == bindparam("user_id"))
+_DEVICES_BY_PLANT = _LIVE_DEVICES.join(
+    PlantPhysicalDevice, PhysicalDeviceModel.id == PlantPhysicalDevice.physical_device_id
+).where(PlantPhysicalDevice.plant_id == bindparam("plant_id"))
+_DEVICES_DELETED_SINCE = select(PhysicalDeviceModel.id).where(PhysicalDeviceModel.deleted_at >= bindparam("since"))
+_ASSIGNMENTS_ENDED_SINCE = select(DeviceAssignmentHistory.physical_device_id, DeviceAssignmentHistory.plant_id).where(
+    DeviceAssignmentHistory.valid_to >= bindparam("since")
+).distinct()
+
 class PhysicalDeviceRepositoryImpl(PhysicalDeviceRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -19,48 +44,124 @@ class PhysicalDeviceRepositoryImpl(PhysicalDeviceRepository):
         return PhysicalDeviceDomain.model_validate(new_device)
 
     async def get_device_by_id(self, device_id: uuid.UUID) -> Optional[PhysicalDeviceDomain]:
-        result = await self.session.execute(select(PhysicalDeviceModel).where(PhysicalDeviceModel.id == device_id))
-        device = result.scalar_one_or_none()
-        return PhysicalDeviceDomain.model_validate(device) if device else None
+        row = (await self.session.execute(_DEVICE_BY_ID, {"device_id": device_id})).one_or_none()
+        return device_from_row(row) if row else None
+
+    async def get_devices_by_ids(self, device_ids: List[uuid.UUID]) -> List[PhysicalDeviceDomain]:
+        result = await self.session.execute(_DEVICES_BY_IDS, {"device_ids": list(device_ids)})
+        return [device_from_row(row) for row in result]
 
     async def get_all_devices(self) -> List[PhysicalDeviceDomain]:
-        result = await self.session.execute(select(PhysicalDeviceModel))
-        devices = result.scalars().all()
-        return [PhysicalDeviceDomain.model_validate(device) for device in devices]
+        result = await self.session.execute(_LIVE_DEVICES)
+        return [device_from_row(row) for row in result]
 
     async def update_device(self, device: PhysicalDeviceDomain) -> PhysicalDeviceDomain:
         existing_device = await self.session.get(PhysicalDeviceModel, device.id)
-        if existing_device:
-            for key, value in device.model_dump().items():
+        if existing_device and existing_device.deleted_at is None:
+            for key, value in device.model_dump(exclude={"row_version"}).items():
                 setattr(existing_device, key, value)
+            existing_device.row_version += 1
             await self.session.commit()
             await self.session.refresh(existing_device)
             return PhysicalDeviceDomain.model_validate(existing_device)
         return None
 
+    async def update_device_if_version(self, device_id: uuid.UUID, user_id: uuid.UUID, expected_versions: Sequence[int],
+                                       values: dict) -> Optional[PhysicalDeviceDomain]:
+        """Apply values with a single UPDATE ... WHERE row_version IN (...); None if nothing matched"""
+        result = await self.session.execute(
+            update(PhysicalDeviceModel)
+            .where(
+                PhysicalDeviceModel.id == device_id,
+                PhysicalDeviceModel.user_id == user_id,
+                PhysicalDeviceModel.row_version.in_(expected_versions),
+                PhysicalDeviceModel.deleted_at.is_(None)
+            )
+            .values(**values, row_version=PhysicalDeviceModel.row_version + 1)
+            .returning(PhysicalDeviceModel)
+            .execution_options(synchronize_session=False)
+        )
+        device = result.scalar_one_or_none()
+        updated_device = PhysicalDeviceDomain.model_validate(device) if device else None
+        await self.session.commit()
+        return updated_device
+
     async def delete_device(self, device_id: uuid.UUID) -> None:
-        device = await self.session.get(PhysicalDeviceModel, device_id)
-        if device:
-            await self.session.delete(device)
-            await self.session.commit()
+        # Soft delete only; purge_deleted_devices removes the row and its associations later
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            update(PhysicalDeviceModel)
+            .where(PhysicalDeviceModel.id == device_id, PhysicalDeviceModel.deleted_at.is_(None))
+            .values(deleted_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            await self.session.execute(close_open_assignments(DeviceAssignmentHistory.physical_device_id == device_id, at=now))
+        await self.session.commit()
 
-    async def get_devices_by_plant_id(self, plant_id: uuid.UUID) -> List[PhysicalDeviceDomain]:
-        query = select(PhysicalDeviceModel).join(
-            PlantPhysicalDevice,
-            PhysicalDeviceModel.id == PlantPhysicalDevice.physical_device_id
-        ).where(PlantPhysicalDevice.plant_id == plant_id)
+    async def soft_delete_devices_by_user(self, user_id: uuid.UUID, limit: int) -> List[uuid.UUID]:
+        now = datetime.utcnow()
+        batch = (
+            select(PhysicalDeviceModel.id)
+            .where(PhysicalDeviceModel.user_id == user_id, PhysicalDeviceModel.deleted_at.is_(None))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(PhysicalDeviceModel)
+            .where(PhysicalDeviceModel.id.in_(batch))
+            .values(deleted_at=now)
+            .returning(PhysicalDeviceModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        device_ids = list(result.scalars().all())
+        if device_ids:
+            await self.session.execute(close_open_assignments(DeviceAssignmentHistory.physical_device_id.in_(device_ids), at=now))
+        await self.session.commit()
+        return device_ids
 
-        result = await self.session.execute(query)
-        devices = result.scalars().all()
-        return [PhysicalDeviceDomain.model_validate(device) for device in devices]
+    async def user_has_live_devices(self, user_id: uuid.UUID) -> bool:
+        return (await self.session.execute(_USER_HAS_LIVE_DEVICES, {"user_id": user_id})).scalar()
+
+    async def purge_deleted_devices(self, deleted_before: datetime, limit: int) -> int:
+        result = await self.session.execute(
+            select(PhysicalDeviceModel.id)
+            .where(PhysicalDeviceModel.deleted_at < deleted_before)
+            .order_by(PhysicalDeviceModel.deleted_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        device_ids = list(result.scalars().all())
+        if not device_ids:
+            return 0
+        await self.session.execute(
+            delete(PlantPhysicalDevice).where(PlantPhysicalDevice.physical_device_id.in_(device_ids))
+        )
+        await self.session.execute(
+            delete(DeviceAssignmentHistory).where(DeviceAssignmentHistory.physical_device_id.in_(device_ids))
+        )
+        await self.session.execute(delete(PhysicalDeviceModel).where(PhysicalDeviceModel.id.in_(device_ids)))
+        await self.session.commit()
+        return len(device_ids)
+
+    async def get_devices_by_plant_id(self, plant_id: uuid.UUID) -> List[PhysicalDeviceDomain]:
+        result = await self.session.execute(_DEVICES_BY_PLANT, {"plant_id": plant_id})
+        return [device_from_row(row) for row in result]
 
     async def assign_device_to_plant(self, plant_id: uuid.UUID, device_id: uuid.UUID) -> None:
+        # The history row opens in the same transaction, so both tables always agree
+        now = datetime.utcnow()
         await self.session.execute(
             insert(PlantPhysicalDevice).values(
                 plant_id=plant_id,
-                physical_device_id=device_id
+                physical_device_id=device_id,
+                assigned_at=now
             )
         )
+        await self.session.execute(
+            insert(DeviceAssignmentHistory).values(physical_device_id=device_id, plant_id=plant_id, valid_from=now)
+        )
         await self.session.commit()
 
     async def remove_device_from_plant(self, plant_id: uuid.UUID, device_id: uuid.UUID) -> None:
@@ -70,21 +171,44 @@ class PhysicalDeviceRepositoryImpl(PhysicalDeviceRepository):
                 PlantPhysicalDevice.physical_device_id == device_id
             )
         )
+        await self.session.execute(close_open_assignments(
+            DeviceAssignmentHistory.physical_device_id == device_id,
+            DeviceAssignmentHistory.plant_id == plant_id,
+            at=datetime.utcnow()
+        ))
         await self.session.commit()
 
     async def get_devices_by_user_id(self, user_id: uuid.UUID) -> List[PhysicalDeviceDomain]:
         """Get all devices owned by a specific user"""
-        result = await self.session.execute(select(PhysicalDeviceModel).where(PhysicalDeviceModel.user_id == user_id))
-        devices = result.scalars().all()
-        return [PhysicalDeviceDomain.model_validate(device) for device in devices]
+        result = await self.session.execute(_DEVICES_BY_USER, {"user_id": user_id})
+        return [device_from_row(row) for row in result]
 
     async def get_device_by_id_and_user(self, device_id: uuid.UUID, user_id: uuid.UUID) -> Optional[PhysicalDeviceDomain]:
         """Get a device by ID only if it belongs to the specified user"""
-        result = await self.session.execute(
-            select(PhysicalDeviceModel).where(
-                PhysicalDeviceModel.id == device_id,
-                PhysicalDeviceModel.user_id == user_id
-            )
+        result = await self.session.execute(_DEVICE_BY_ID_AND_USER, {"device_id": device_id, "user_id": user_id})
+        row = result.one_or_none()
+        return device_from_row(row) if row else None
+
+    async def get_device_bindings(self, since: Optional[datetime] = None) -> List[Tuple[uuid.UUID, uuid.UUID, Optional[uuid.UUID]]]:
+        # Bare columns, no ORM entities: this feeds the in-memory binding index
+        # Soft-deleted devices are skipped, and so are associations to soft-deleted plants
+        live_assignments = (
+            select(PlantPhysicalDevice.physical_device_id, PlantPhysicalDevice.plant_id, PlantPhysicalDevice.assigned_at)
+            .join(PlantModel, PlantModel.id == PlantPhysicalDevice.plant_id)
+            .where(PlantModel.deleted_at.is_(None))
+            .subquery()
         )
-        device = result.scalar_one_or_none()
-        return PhysicalDeviceDomain.model_validate(device) if device else None
+        query = select(PhysicalDeviceModel.id, PhysicalDeviceModel.user_id, live_assignments.c.plant_id).outerjoin(
+            live_assignments,
+            PhysicalDeviceModel.id == live_assignments.c.physical_device_id
+        ).where(PhysicalDeviceModel.deleted_at.is_(None))
+        if since is not None:
+            query = query.where(or_(PhysicalDeviceModel.created_at >= since, live_assignments.c.assigned_at >= since))
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def get_device_unbindings(self, since: datetime) -> Tuple[List[uuid.UUID], List[Tuple[uuid.UUID, uuid.UUID]]]:
+        # Unassigning and plant or device soft deletes all close a history period, so that covers every detach
+        removed = (await self.session.execute(_DEVICES_DELETED_SINCE, {"since": since})).scalars().all()
+        detached = await self.session.execute(_ASSIGNMENTS_ENDED_SINCE, {"since": since})
+        return list(removed), [tuple(row) for row in detached.all()]
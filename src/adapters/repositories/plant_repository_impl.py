@@ -1,11 +1,28 @@
 import uuid
-from typing import List, Optional
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional, Sequence, Set
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import update, delete, bindparam, any_, exists
+from sqlalchemy.dialects.postgresql import insert, ARRAY, UUID
 from src.core.domain.plant import Plant as PlantDomain
-from src.adapters.repositories.models import Plant as PlantModel
+from src.adapters.repositories.models import (Plant as PlantModel, PlantPhysicalDevice, PendingFileDeletion, PhotoObject,
+                                              DeviceAssignmentHistory)
+from src.adapters.repositories.assignment_history_repository_impl import close_open_assignments
+from src.adapters.repositories.row_mapping import PLANT_READ_COLUMNS, plant_from_row
 from src.core.ports.plant_repository import PlantRepository
 
+# Built once at import: a reused statement memoizes its cache key, so each call skips
+# straight to SQLAlchemy's compiled cache and asyncpg's prepared statement
+_LIVE_PLANTS = select(*PLANT_READ_COLUMNS).where(PlantModel.deleted_at.is_(None))
+_PLANT_BY_ID = _LIVE_PLANTS.where(PlantModel.id == bindparam("plant_id"))
+_PLANTS_BY_USER = _LIVE_PLANTS.where(PlantModel.user_id == bindparam("user_id"))
+_USER_HAS_LIVE_PLANTS = select(exists().where(PlantModel.user_id == bindparam("user_id"),
+                                              PlantModel.deleted_at.is_(None)))
+# One array parameter rather than IN (...): the statement text stays the same for any batch size
+_PLANTS_BY_IDS = _LIVE_PLANTS.where(PlantModel.id == any_(bindparam("plant_ids", type_=ARRAY(UUID(as_uuid=True)))))
+
 class PlantRepositoryImpl(PlantRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -18,32 +35,140 @@ class PlantRepositoryImpl(PlantRepository):
         return PlantDomain.model_validate(new_plant)
 
     async def get_plant_by_id(self, plant_id: uuid.UUID) -> Optional[PlantDomain]:
-        result = await self.session.execute(select(PlantModel).where(PlantModel.id == plant_id))
-        plant = result.scalar_one_or_none()
-        return PlantDomain.model_validate(plant) if plant else None
+        row = (await self.session.execute(_PLANT_BY_ID, {"plant_id": plant_id})).one_or_none()
+        return plant_from_row(row) if row else None
+
+    async def get_plants_by_ids(self, plant_ids: List[uuid.UUID]) -> List[PlantDomain]:
+        result = await self.session.execute(_PLANTS_BY_IDS, {"plant_ids": list(plant_ids)})
+        return [plant_from_row(row) for row in result]
 
     async def get_plants_by_user_id(self, user_id: uuid.UUID) -> List[PlantDomain]:
-        result = await self.session.execute(select(PlantModel).where(PlantModel.user_id == user_id))
-        plants = result.scalars().all()
-        return [PlantDomain.model_validate(plant) for plant in plants]
+        result = await self.session.execute(_PLANTS_BY_USER, {"user_id": user_id})
+        return [plant_from_row(row) for row in result]
 
     async def get_all_plants(self) -> List[PlantDomain]:
-        result = await self.session.execute(select(PlantModel))
-        plants = result.scalars().all()
-        return [PlantDomain.model_validate(plant) for plant in plants]
+        result = await self.session.execute(_LIVE_PLANTS)
+        return [plant_from_row(row) for row in result]
 
     async def update_plant(self, plant: PlantDomain) -> PlantDomain:
         existing_plant = await self.session.get(PlantModel, plant.id)
-        if existing_plant:
-            for key, value in plant.model_dump().items():
+        if existing_plant and existing_plant.deleted_at is None:
+            if existing_plant.photo_filename != plant.photo_filename:
+                if plant.photo_filename:
+                    await self._acquire_photo(plant.photo_filename)
+                if existing_plant.photo_filename:
+                    await self._release_photo(existing_plant.photo_filename)
+            for key, value in plant.model_dump(exclude={"row_version"}).items():
                 setattr(existing_plant, key, value)
+            existing_plant.row_version += 1
             await self.session.commit()
             await self.session.refresh(existing_plant)
             return PlantDomain.model_validate(existing_plant)
         return None
 
+    async def update_plant_if_version(self, plant_id: uuid.UUID, expected_versions: Sequence[int], values: dict) -> Optional[PlantDomain]:
+        """Apply values with a single UPDATE ... WHERE row_version IN (...); None if nothing matched"""
+        result = await self.session.execute(
+            update(PlantModel)
+            .where(PlantModel.id == plant_id, PlantModel.row_version.in_(expected_versions), PlantModel.deleted_at.is_(None))
+            .values(**values, row_version=PlantModel.row_version + 1)
+            .returning(PlantModel)
+            .execution_options(synchronize_session=False)
+        )
+        plant = result.scalar_one_or_none()
+        updated_plant = PlantDomain.model_validate(plant) if plant else None
+        await self.session.commit()
+        return updated_plant
+
     async def delete_plant(self, plant_id: uuid.UUID) -> None:
-        plant = await self.session.get(PlantModel, plant_id)
-        if plant:
-            await self.session.delete(plant)
-            await self.session.commit()
+        # Soft delete only; associations and the photo reference go when purge_deleted_plants removes the row
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            update(PlantModel)
+            .where(PlantModel.id == plant_id, PlantModel.deleted_at.is_(None))
+            .values(deleted_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            await self.session.execute(close_open_assignments(DeviceAssignmentHistory.plant_id == plant_id, at=now))
+        await self.session.commit()
+
+    async def soft_delete_plants_by_user(self, user_id: uuid.UUID, limit: int) -> List[uuid.UUID]:
+        now = datetime.utcnow()
+        batch = (
+            select(PlantModel.id)
+            .where(PlantModel.user_id == user_id, PlantModel.deleted_at.is_(None))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(PlantModel)
+            .where(PlantModel.id.in_(batch))
+            .values(deleted_at=now)
+            .returning(PlantModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        plant_ids = list(result.scalars().all())
+        if plant_ids:
+            await self.session.execute(close_open_assignments(DeviceAssignmentHistory.plant_id.in_(plant_ids), at=now))
+        await self.session.commit()
+        return plant_ids
+
+    async def user_has_live_plants(self, user_id: uuid.UUID) -> bool:
+        return (await self.session.execute(_USER_HAS_LIVE_PLANTS, {"user_id": user_id})).scalar()
+
+    async def purge_deleted_plants(self, deleted_before: datetime, limit: int) -> int:
+        result = await self.session.execute(
+            select(PlantModel.id, PlantModel.photo_filename)
+            .where(PlantModel.deleted_at < deleted_before)
+            .order_by(PlantModel.deleted_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.all()
+        if not rows:
+            return 0
+        for file_name, references in Counter(photo for _, photo in rows if photo).items():
+            await self._release_photo(file_name, references)
+        plant_ids = [plant_id for plant_id, _ in rows]
+        # Explicit deletes keep each batch's cascade bounded and visible
+        await self.session.execute(delete(PlantPhysicalDevice).where(PlantPhysicalDevice.plant_id.in_(plant_ids)))
+        await self.session.execute(delete(DeviceAssignmentHistory).where(DeviceAssignmentHistory.plant_id.in_(plant_ids)))
+        await self.session.execute(delete(PlantModel).where(PlantModel.id.in_(plant_ids)))
+        await self.session.commit()
+        return len(plant_ids)
+
+    async def get_referenced_photo_filenames(self, file_names: List[str]) -> Set[str]:
+        if not file_names:
+            return set()
+        result = await self.session.execute(
+            select(PlantModel.photo_filename).where(PlantModel.photo_filename.in_(file_names))
+        )
+        return set(result.scalars().all())
+
+    async def _acquire_photo(self, file_name: str) -> None:
+        # The object is in use again, so drop any queued deletion. This comes before the reference row:
+        # the cleanup worker locks queue rows and then reference rows, and taking them in the same order
+        # means we wait for a deletion already in progress instead of deadlocking with it
+        await self.session.execute(delete(PendingFileDeletion).where(PendingFileDeletion.file_name == file_name))
+        await self.session.execute(
+            insert(PhotoObject)
+            .values(file_name=file_name, ref_count=1)
+            .on_conflict_do_update(index_elements=[PhotoObject.file_name], set_={"ref_count": PhotoObject.ref_count + 1})
+        )
+
+    async def _release_photo(self, file_name: str, references: int = 1) -> None:
+        # Queued in the same transaction as the row change once the last reference goes away;
+        # the photo cleanup worker removes the object
+        result = await self.session.execute(
+            update(PhotoObject)
+            .where(PhotoObject.file_name == file_name)
+            .values(ref_count=PhotoObject.ref_count - references)
+            .returning(PhotoObject.ref_count)
+        )
+        ref_count = result.scalar_one_or_none()
+        if ref_count is not None and ref_count > 0:
+            return
+        # The row stays at zero: the cleanup worker deletes it together with the object, under its lock
+        self.session.add(PendingFileDeletion(file_name=file_name))
@@ -0,0 +1,21 @@
+from sqlalchemy import Row
+from src.adapters.repositories.models import Plant as PlantModel, PhysicalDevice as PhysicalDeviceModel
+from src.core.domain.plant import Plant as PlantDomain, PhysicalDevice as PhysicalDeviceDomain, PhysicalDeviceCategory
+
+# Read paths select exactly the domain fields as plain columns: no ORM entities, no identity map,
+# and no per-attribute validation of values the database has already typed
+PLANT_FIELDS = tuple(PlantDomain.model_fields)
+DEVICE_FIELDS = tuple(PhysicalDeviceDomain.model_fields)
+PLANT_READ_COLUMNS = tuple(getattr(PlantModel, name) for name in PLANT_FIELDS)
+DEVICE_READ_COLUMNS = tuple(getattr(PhysicalDeviceModel, name) for name in DEVICE_FIELDS)
+
+_CATEGORIES = {category.value: category for category in PhysicalDeviceCategory}
+_DEVICE_CATEGORY = DEVICE_FIELDS.index("category")
+
+def plant_from_row(row: Row) -> PlantDomain:
+    return PlantDomain.model_construct(**dict(zip(PLANT_FIELDS, row)))
+
+def device_from_row(row: Row) -> PhysicalDeviceDomain:
+    values = dict(zip(DEVICE_FIELDS, row))
+    values["category"] = _CATEGORIES[row[_DEVICE_CATEGORY]]
+    return PhysicalDeviceDomain.model_construct(**values)
@@ -0,0 +1,55 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from src.core.domain.user_deletion import UserDeletionJob as UserDeletionJobDomain
+from src.adapters.repositories.models import UserDeletionJob as UserDeletionJobModel
+from src.core.ports.user_deletion_repository import UserDeletionJobRepository
+
+class UserDeletionJobRepositoryImpl(UserDeletionJobRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def request_deletion(self, user_id: uuid.UUID) -> UserDeletionJobDomain:
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            insert(UserDeletionJobModel)
+            .values(user_id=user_id, status="pending", requested_at=now)
+            .on_conflict_do_update(
+                index_elements=[UserDeletionJobModel.user_id],
+                set_={"status": "pending", "requested_at": now, "completed_at": None}
+            )
+            .returning(UserDeletionJobModel)
+        )
+        job = UserDeletionJobDomain.model_validate(result.scalar_one())
+        await self.session.commit()
+        return job
+
+    async def get_job(self, user_id: uuid.UUID) -> Optional[UserDeletionJobDomain]:
+        job = await self.session.get(UserDeletionJobModel, user_id)
+        return UserDeletionJobDomain.model_validate(job) if job else None
+
+    async def get_pending_jobs(self, limit: int) -> List[UserDeletionJobDomain]:
+        result = await self.session.execute(
+            select(UserDeletionJobModel)
+            .where(UserDeletionJobModel.status == "pending")
+            .order_by(UserDeletionJobModel.requested_at)
+            .limit(limit)
+        )
+        return [UserDeletionJobDomain.model_validate(job) for job in result.scalars().all()]
+
+    async def record_progress(self, user_id: uuid.UUID, plants_deleted: int, devices_deleted: int,
+                              completed: bool) -> None:
+        values = {
+            "plants_deleted": UserDeletionJobModel.plants_deleted + plants_deleted,
+            "devices_deleted": UserDeletionJobModel.devices_deleted + devices_deleted,
+        }
+        if completed:
+            values.update(status="completed", completed_at=datetime.utcnow())
+        await self.session.execute(
+            update(UserDeletionJobModel).where(UserDeletionJobModel.user_id == user_id).values(**values)
+        )
+        await self.session.commit()
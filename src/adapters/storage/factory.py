@@ -0,0 +1,47 @@
+import logging
+import secrets
+from typing import Optional
+from src.config.settings import settings
+from src.core.ports.file_storage import FileStorage
+from src.adapters.storage.presign import LocalPresigner
+
+logger = logging.getLogger(__name__)
+
+_file_storage: Optional[FileStorage] = None
+_presigner: Optional[LocalPresigner] = None
+
+def signing_key() -> bytes:
+    """Key for local presigned URLs; every worker has to verify what the others signed"""
+    if settings.FILE_STORAGE_SIGNING_KEY:
+        return settings.FILE_STORAGE_SIGNING_KEY.encode()
+    if settings.WEB_CONCURRENCY > 1:
+        raise RuntimeError(f"FILE_STORAGE_SIGNING_KEY is required with WEB_CONCURRENCY={settings.WEB_CONCURRENCY}: "
+                           "a URL signed by one worker must verify in the others")
+    logger.warning("FILE_STORAGE_SIGNING_KEY is unset; presigned URLs use a random key and stop working on restart")
+    return secrets.token_bytes(32)
+
+def get_presigner() -> LocalPresigner:
+    global _presigner
+    if _presigner is None:
+        _presigner = LocalPresigner(signing_key(), settings.FILE_STORAGE_PUBLIC_URL)
+    return _presigner
+
+def create_file_storage(backend: str) -> FileStorage:
+    if backend == "memory":
+        from src.adapters.storage.memory_storage import MemoryStorage
+        return MemoryStorage(get_presigner())
+    if backend == "filesystem":
+        from src.adapters.storage.filesystem_storage import FilesystemStorage
+        return FilesystemStorage(settings.FILE_STORAGE_PATH, get_presigner())
+    if backend == "minio":
+        # Imported lazily so the local backends run without the minio package or endpoint
+        from src.adapters.storage.minio_storage import MinioStorage
+        return MinioStorage()
+    raise ValueError(f"Unknown FILE_STORAGE_BACKEND: {backend}")
+
+def get_file_storage() -> FileStorage:
+    """Process-wide storage for the configured backend; the memory backend only works shared."""
+    global _file_storage
+    if _file_storage is None:
+        _file_storage = create_file_storage(settings.FILE_STORAGE_BACKEND)
+    return _file_storage
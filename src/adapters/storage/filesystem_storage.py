@@ -0,0 +1,117 @@
+import asyncio
+import mmap
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import UploadFile
+from src.core.ports.file_storage import FileStorage
+from src.adapters.storage.presign import LocalPresigner
+
+CHUNK_SIZE = 1024 * 1024
+TEMP_PREFIX = ".upload-"
+
+class FilesystemStorage(FileStorage):
+    """Objects as files under one directory. Writes go through a temp file and an atomic rename;
+    reads are served from memory maps, so range reads and streaming avoid extra copies."""
+
+    def __init__(self, root: str, presigner: LocalPresigner):
+        self.root = os.path.abspath(root)
+        self.presigner = presigner
+        os.makedirs(self.root, exist_ok=True)
+
+    async def upload_file(self, file: UploadFile, file_name: str) -> str:
+        await file.seek(0)
+        await asyncio.to_thread(self._write, file_name, lambda target: shutil.copyfileobj(file.file, target, CHUNK_SIZE))
+        return file_name
+
+    async def upload_bytes(self, data: bytes, file_name: str, content_type: str) -> str:
+        await asyncio.to_thread(self._write, file_name, lambda target: target.write(data))
+        return file_name
+
+    async def download_file(self, file_name: str) -> AsyncIterator[bytes]:
+        path = self._path(file_name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(file_name)
+        return self._stream(path)
+
+    async def read_file(self, file_name: str) -> bytes:
+        return await asyncio.to_thread(self._read, file_name, 0, None)
+
+    async def read_range(self, file_name: str, start: int, length: int) -> bytes:
+        return await asyncio.to_thread(self._read, file_name, start, length)
+
+    async def get_file_size(self, file_name: str) -> Optional[int]:
+        try:
+            return os.stat(self._path(file_name)).st_size
+        except FileNotFoundError:
+            return None
+
+    async def presigned_url(self, file_name: str, expires_seconds: int) -> str:
+        return self.presigner.url(file_name, expires_seconds)
+
+    async def delete_file(self, file_name: str) -> None:
+        try:
+            os.remove(self._path(file_name))
+        except FileNotFoundError:
+            pass
+
+    async def file_exists(self, file_name: str) -> bool:
+        return os.path.isfile(self._path(file_name))
+
+    async def delete_files(self, file_names: List[str]) -> Dict[str, str]:
+        errors = {}
+        for file_name in file_names:
+            try:
+                await self.delete_file(file_name)
+            except OSError as e:
+                errors[file_name] = str(e)
+        return errors
+
+    async def list_files(self, start_after: Optional[str] = None, limit: int = 1000) -> List[Tuple[str, datetime]]:
+        def list_page():
+            with os.scandir(self.root) as entries:
+                names = sorted(entry.name for entry in entries
+                               if entry.is_file() and not entry.name.startswith(TEMP_PREFIX)
+                               and (start_after is None or entry.name > start_after))
+            page = []
+            for name in names[:limit]:
+                modified = os.stat(os.path.join(self.root, name)).st_mtime
+                page.append((name, datetime.fromtimestamp(modified, timezone.utc)))
+            return page
+        return await asyncio.to_thread(list_page)
+
+    def _path(self, file_name: str) -> str:
+        # Object keys are flat names; anything that could leave the root is rejected
+        if not file_name or file_name.startswith(".") or os.sep in file_name or (os.altsep and os.altsep in file_name):
+            raise ValueError(f"Invalid object name: {file_name!r}")
+        return os.path.join(self.root, file_name)
+
+    def _write(self, file_name: str, write) -> None:
+        path = self._path(file_name)
+        descriptor, temp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=self.root)
+        try:
+            with os.fdopen(descriptor, "wb") as target:
+                write(target)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _read(self, file_name: str, start: int, length: Optional[int]) -> bytes:
+        with open(self._path(file_name), "rb") as source:
+            size = os.fstat(source.fileno()).st_size
+            if size == 0 or start >= size:
+                return b""
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped[start:size if length is None else start + length]
+
+    async def _stream(self, path: str) -> AsyncIterator[bytes]:
+        with open(path, "rb") as source:
+            size = os.fstat(source.fileno()).st_size
+            if size == 0:
+                return
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(0, size, CHUNK_SIZE):
+                    yield mapped[offset:offset + CHUNK_SIZE]
@@ -0,0 +1,76 @@
+import bisect
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import UploadFile
+from src.core.ports.file_storage import FileStorage
+from src.adapters.storage.presign import LocalPresigner
+
+CHUNK_SIZE = 256 * 1024
+
+class MemoryStorage(FileStorage):
+    """Process-local object store holding every object in a dict; for tests, benchmarks and profiling."""
+
+    def __init__(self, presigner: LocalPresigner):
+        self.presigner = presigner
+        self._objects: Dict[str, Tuple[bytes, datetime]] = {}
+        self._names: List[str] = []  # Sorted keys, so list_files pages like an object store
+
+    async def upload_file(self, file: UploadFile, file_name: str) -> str:
+        await file.seek(0)
+        chunks = []
+        while chunk := await file.read(CHUNK_SIZE):
+            chunks.append(chunk)
+        self._put(file_name, b"".join(chunks))
+        return file_name
+
+    async def upload_bytes(self, data: bytes, file_name: str, content_type: str) -> str:
+        self._put(file_name, bytes(data))
+        return file_name
+
+    async def download_file(self, file_name: str) -> AsyncIterator[bytes]:
+        data = self._get(file_name)
+        return _chunks(memoryview(data))
+
+    async def read_file(self, file_name: str) -> bytes:
+        return self._get(file_name)
+
+    async def read_range(self, file_name: str, start: int, length: int) -> bytes:
+        return self._get(file_name)[start:start + length]
+
+    async def get_file_size(self, file_name: str) -> Optional[int]:
+        entry = self._objects.get(file_name)
+        return len(entry[0]) if entry else None
+
+    async def presigned_url(self, file_name: str, expires_seconds: int) -> str:
+        return self.presigner.url(file_name, expires_seconds)
+
+    async def delete_file(self, file_name: str) -> None:
+        if self._objects.pop(file_name, None) is not None:
+            del self._names[bisect.bisect_left(self._names, file_name)]
+
+    async def file_exists(self, file_name: str) -> bool:
+        return file_name in self._objects
+
+    async def delete_files(self, file_names: List[str]) -> Dict[str, str]:
+        for file_name in file_names:
+            await self.delete_file(file_name)
+        return {}
+
+    async def list_files(self, start_after: Optional[str] = None, limit: int = 1000) -> List[Tuple[str, datetime]]:
+        start = bisect.bisect_right(self._names, start_after) if start_after else 0
+        return [(name, self._objects[name][1]) for name in self._names[start:start + limit]]
+
+    def _put(self, file_name: str, data: bytes) -> None:
+        if file_name not in self._objects:
+            bisect.insort(self._names, file_name)
+        self._objects[file_name] = (data, datetime.now(timezone.utc))
+
+    def _get(self, file_name: str) -> bytes:
+        entry = self._objects.get(file_name)
+        if entry is None:
+            raise FileNotFoundError(file_name)
+        return entry[0]
+
+async def _chunks(view: memoryview) -> AsyncIterator[bytes]:
+    for offset in range(0, len(view), CHUNK_SIZE):
+        yield bytes(view[offset:offset + CHUNK_SIZE])
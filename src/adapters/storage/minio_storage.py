@@ -1,4 +1,10 @@
+import asyncio
+import itertools
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 from minio import Minio
+from minio.error import S3Error
+from minio.deleteobjects import DeleteObject
 from fastapi import UploadFile
 from src.core.ports.file_storage import FileStorage
 from src.config.settings import settings
@@ -6,6 +12,8 @@ from io import BytesIO
 
 class MinioStorage(FileStorage):
     def __init__(self):
+        if not (settings.MINIO_ENDPOINT and settings.MINIO_ACCESS_KEY and settings.MINIO_SECRET_KEY):
+            raise RuntimeError("FILE_STORAGE_BACKEND=minio requires MINIO_ENDPOINT, MINIO_ACCESS_KEY and MINIO_SECRET_KEY")
         self.client = Minio(
             settings.MINIO_ENDPOINT,
             access_key=settings.MINIO_ACCESS_KEY,
@@ -21,19 +29,88 @@ class MinioStorage(FileStorage):
             self.client.make_bucket(self.bucket_name)
 
     async def upload_file(self, file: UploadFile, file_name: str) -> str:
-        content = await file.read()
-        self.client.put_object(
+        # Stream the spooled upload instead of reading it into memory
+        await file.seek(0)
+        await asyncio.to_thread(
+            self.client.put_object,
             self.bucket_name,
             file_name,
-            data=BytesIO(content),
-            length=len(content),
+            data=file.file,
+            length=file.size if file.size is not None else -1,
+            part_size=10 * 1024 * 1024,
             content_type=file.content_type
         )
         return file_name
 
+    async def upload_bytes(self, data: bytes, file_name: str, content_type: str) -> str:
+        await asyncio.to_thread(
+            self.client.put_object,
+            self.bucket_name,
+            file_name,
+            data=BytesIO(data),
+            length=len(data),
+            content_type=content_type
+        )
+        return file_name
+
     async def download_file(self, file_name: str):
-        response = self.client.get_object(self.bucket_name, file_name)
+        response = await asyncio.to_thread(self.client.get_object, self.bucket_name, file_name)
         return response
 
+    async def read_file(self, file_name: str) -> bytes:
+        def read_object():
+            response = self.client.get_object(self.bucket_name, file_name)
+            try:
+                return response.read()
+            finally:
+                response.close()
+                response.release_conn()
+        return await asyncio.to_thread(read_object)
+
+    async def read_range(self, file_name: str, start: int, length: int) -> bytes:
+        def read_object_range():
+            response = self.client.get_object(self.bucket_name, file_name, offset=start, length=length)
+            try:
+                return response.read()
+            finally:
+                response.close()
+                response.release_conn()
+        return await asyncio.to_thread(read_object_range)
+
+    async def get_file_size(self, file_name: str) -> Optional[int]:
+        try:
+            return (await asyncio.to_thread(self.client.stat_object, self.bucket_name, file_name)).size
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return None
+            raise
+
+    async def presigned_url(self, file_name: str, expires_seconds: int) -> str:
+        # The first call may look up the bucket region over the network
+        return await asyncio.to_thread(self.client.presigned_get_object, self.bucket_name, file_name,
+                                       expires=timedelta(seconds=expires_seconds))
+
     async def delete_file(self, file_name: str) -> None:
-        self.client.remove_object(self.bucket_name, file_name)
+        await asyncio.to_thread(self.client.remove_object, self.bucket_name, file_name)
+
+    async def file_exists(self, file_name: str) -> bool:
+        try:
+            await asyncio.to_thread(self.client.stat_object, self.bucket_name, file_name)
+            return True
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return False
+            raise
+
+    async def delete_files(self, file_names: List[str]) -> Dict[str, str]:
+        # Batch operations run in a thread so background cleanup never blocks the event loop
+        def remove_objects():
+            errors = self.client.remove_objects(self.bucket_name, [DeleteObject(name) for name in file_names])
+            return {error.name: error.message for error in errors}
+        return await asyncio.to_thread(remove_objects)
+
+    async def list_files(self, start_after: Optional[str] = None, limit: int = 1000) -> List[Tuple[str, datetime]]:
+        def list_page():
+            objects = self.client.list_objects(self.bucket_name, start_after=start_after)
+            return [(obj.object_name, obj.last_modified) for obj in itertools.islice(objects, limit)]
+        return await asyncio.to_thread(list_page)
@@ -0,0 +1,61 @@
+import json
+import urllib.request
+from typing import List
+from src.adapters.telemetry.tracing import Span
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+def otlp_span(span: Span) -> dict:
+    """One span in the OTLP/JSON encoding collectors accept on /v1/traces"""
+    encoded = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 2 if span.kind == "server" else 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [_attribute(key, value) for key, value in span.attributes.items()],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        encoded["parentSpanId"] = span.parent_id
+    return encoded
+
+def otlp_payload(spans: List[Span], service_name: str) -> dict:
+    return {"resourceSpans": [{
+        "resource": {"attributes": [_attribute("service.name", service_name)]},
+        "scopeSpans": [{"scope": {"name": "src.adapters.telemetry"}, "spans": [otlp_span(span) for span in spans]}],
+    }]}
+
+class FileSpanExporter:
+    """Appends one OTLP/JSON span per line; the file can be replayed into a collector or read with jq"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as target:
+            for span in spans:
+                target.write(json.dumps(otlp_span(span)) + "\n")
+
+class OtlpHttpSpanExporter:
+    """Posts batches to an OpenTelemetry collector's OTLP/HTTP JSON endpoint"""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]) -> None:
+        body = json.dumps(otlp_payload(spans, self.service_name)).encode()
+        request = urllib.request.Request(self.endpoint, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
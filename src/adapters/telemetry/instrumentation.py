@@ -0,0 +1,27 @@
+from src.adapters.telemetry.tracing import Tracer, instrument, tracer as default_tracer
+
+def instrument_layers(tracer: Tracer = default_tracer) -> None:
+    """Wrap the service, repository and file storage methods that sit on request hot paths in spans"""
+    from src.core.services.plant_service import PlantService
+    from src.core.services.physical_device_service import PhysicalDeviceService
+    from src.core.services.assignment_history_service import AssignmentHistoryService
+    from src.adapters.repositories.plant_repository_impl import PlantRepositoryImpl
+    from src.adapters.repositories.physical_device_repository_impl import PhysicalDeviceRepositoryImpl
+    from src.adapters.repositories.import_repository_impl import ImportRepositoryImpl
+    from src.adapters.repositories.assignment_history_repository_impl import AssignmentHistoryRepositoryImpl
+    from src.adapters.storage.memory_storage import MemoryStorage
+    from src.adapters.storage.filesystem_storage import FilesystemStorage
+
+    layers = [
+        (PlantService, "service"), (PhysicalDeviceService, "service"), (AssignmentHistoryService, "service"),
+        (PlantRepositoryImpl, "repository"), (PhysicalDeviceRepositoryImpl, "repository"),
+        (ImportRepositoryImpl, "repository"), (AssignmentHistoryRepositoryImpl, "repository"),
+        (MemoryStorage, "storage"), (FilesystemStorage, "storage"),
+    ]
+    try:
+        from src.adapters.storage.minio_storage import MinioStorage
+        layers.append((MinioStorage, "storage"))
+    except ImportError:  # minio is only needed for FILE_STORAGE_BACKEND=minio
+        pass
+    for cls, layer in layers:
+        instrument(cls, f"{layer}.{cls.__name__}", tracer)
@@ -0,0 +1,139 @@
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str  # 32 hex characters, W3C trace context
+    span_id: str  # 16 hex characters
+    parent_id: Optional[str] = None
+    kind: str = "internal"  # 'server' for the request span
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+# Only set while a sampled request is running; unsampled requests pay a single lookup per instrumented call
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+def new_trace_id() -> str:
+    return os.urandom(16).hex()
+
+def new_span_id() -> str:
+    return os.urandom(8).hex()
+
+class Tracer:
+    """Collects finished spans in a bounded buffer and hands them to an exporter in batches.
+
+    Exporting runs in a thread from a background task, so a slow collector or disk never
+    blocks a request; when the buffer is full the oldest spans are dropped and counted.
+    """
+
+    def __init__(self, exporter=None, max_buffer: int = 10_000, flush_interval: float = 2.0):
+        self.exporter = exporter
+        self.flush_interval = flush_interval
+        self.exported = 0
+        self.dropped = 0
+        self._buffer: Deque[Span] = deque(maxlen=max_buffer)
+        self._task: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def start_span(self, name: str, kind: str = "internal", trace_id: Optional[str] = None,
+                   parent_id: Optional[str] = None, **attributes) -> Iterator[Span]:
+        parent = current_span.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        span = Span(name, trace_id or new_trace_id(), new_span_id(), parent_id, kind, attributes=attributes)
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self._record(span)
+
+    def _record(self, span: Span) -> None:
+        if self.exporter is None:
+            return
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(span)
+
+    async def flush(self) -> None:
+        if not self._buffer or self.exporter is None:
+            return
+        spans: List[Span] = []
+        while self._buffer:
+            spans.append(self._buffer.popleft())
+        await asyncio.to_thread(self.exporter.export, spans)
+        self.exported += len(spans)
+
+    def start(self) -> None:
+        if self._task is None and self.exporter is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Span export failed")
+
+    def metrics_dict(self) -> dict:
+        return {"buffered": len(self._buffer), "exported": self.exported, "dropped": self.dropped}
+
+tracer = Tracer()
+
+def traced(name: str, tracer: Tracer = tracer) -> Callable:
+    """Wrap a coroutine function in a child span; outside a sampled request it is a plain call"""
+    def decorate(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            if current_span.get() is None:
+                return await function(*args, **kwargs)
+            with tracer.start_span(name):
+                return await function(*args, **kwargs)
+        wrapper.__traced__ = True
+        return wrapper
+    return decorate
+
+def instrument(cls: type, prefix: Optional[str] = None, tracer: Tracer = tracer) -> type:
+    """Trace every public coroutine method defined on the class, as `<prefix>.<method>`"""
+    prefix = prefix or cls.__name__
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(attribute) or getattr(attribute, "__traced__", False):
+            continue
+        setattr(cls, name, traced(f"{prefix}.{name}", tracer)(attribute))
+    return cls
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from src.adapters.repositories.plant_repository_impl import PlantRepositoryImpl
+from src.adapters.repositories.physical_device_repository_impl import PhysicalDeviceRepositoryImpl
+from src.adapters.repositories.user_deletion_repository_impl import UserDeletionJobRepositoryImpl
+from src.adapters.repositories.idempotency_repository_impl import IdempotencyRepositoryImpl
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from src.core.services.data_purge_service import DataPurgeService
+from src.core.services.device_binding_index import device_binding_index
+from src.core.services.event_broker import event_broker
+
+logger = logging.getLogger(__name__)
+
+class DataPurgeWorker:
+    """Background task that runs account deletion jobs and purges soft-deleted rows in throttled batches."""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> None:
+        batch_size = settings.PURGE_BATCH_SIZE
+        async with self.session_factory() as session:
+            jobs = await self._build_service(session).get_pending_user_deletions(10)
+        for job in jobs:
+            # One short transaction per batch, with a pause between them so other writers get the locks
+            while True:
+                async with self.session_factory() as session:
+                    completed = await self._build_service(session).delete_user_data_batch(job.user_id, batch_size)
+                if completed:
+                    break
+                await asyncio.sleep(settings.PURGE_THROTTLE_SECONDS)
+
+        deleted_before = datetime.utcnow() - timedelta(seconds=settings.PURGE_RETENTION_SECONDS)
+        while True:
+            async with self.session_factory() as session:
+                purged = await self._build_service(session).purge_deleted(deleted_before, batch_size)
+            if purged < batch_size:
+                break
+            await asyncio.sleep(settings.PURGE_THROTTLE_SECONDS)
+
+        now = datetime.utcnow()
+        while True:
+            async with self.session_factory() as session:
+                purged = await self._build_service(session).purge_expired_idempotency_keys(now, batch_size)
+            if purged < batch_size:
+                break
+            await asyncio.sleep(settings.PURGE_THROTTLE_SECONDS)
+
+    def _build_service(self, session) -> DataPurgeService:
+        return DataPurgeService(PlantRepositoryImpl(session), PhysicalDeviceRepositoryImpl(session),
+                                UserDeletionJobRepositoryImpl(session),
+                                device_binding_index if settings.DEVICE_BINDING_INDEX_ENABLED else None,
+                                event_broker if settings.EVENTS_ENABLED else None,
+                                IdempotencyRepositoryImpl(self.session_factory)
+                                if settings.IDEMPOTENCY_ENABLED and settings.IDEMPOTENCY_BACKEND == "database" else None)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Data purge failed")
+            await asyncio.sleep(settings.PURGE_INTERVAL_SECONDS)
+
+data_purge_worker = DataPurgeWorker()
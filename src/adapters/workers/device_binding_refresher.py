@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from src.adapters.repositories.physical_device_repository_impl import PhysicalDeviceRepositoryImpl
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from src.core.services.device_binding_index import DeviceBindingIndex, device_binding_index
+
+logger = logging.getLogger(__name__)
+
+# Re-read a little before the last watermark so rows committed late are not missed; merging is idempotent
+WATERMARK_OVERLAP = timedelta(seconds=30)
+
+
+class DeviceBindingRefresher:
+    """Warms the device binding index and keeps it in step with writes made by other workers."""
+
+    def __init__(self, index: DeviceBindingIndex = device_binding_index, session_factory=SessionLocal):
+        self.index = index
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+        self._watermark: Optional[datetime] = None
+        self._last_rebuild = 0.0
+
+    async def warm(self) -> None:
+        started_at = datetime.utcnow()
+        self.index.begin_rebuild()
+        try:
+            rows = await self._load()
+        except BaseException:
+            self.index.abort_rebuild()
+            raise
+        self.index.finish_rebuild(rows)
+        self._watermark = started_at - WATERMARK_OVERLAP
+        self._last_rebuild = time.monotonic()
+
+    async def refresh(self) -> None:
+        if self._watermark is None or time.monotonic() - self._last_rebuild >= settings.DEVICE_BINDING_REBUILD_SECONDS:
+            await self.warm()
+            return
+        started_at = datetime.utcnow()
+        self.index.begin_merge()
+        try:
+            rows, removed_devices, detached = await self._load_changes(self._watermark)
+        except BaseException:
+            self.index.abort_merge()
+            raise
+        self.index.merge(rows, removed_devices, detached)
+        self._watermark = started_at - WATERMARK_OVERLAP
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _load(self, since: Optional[datetime] = None):
+        async with self.session_factory() as session:
+            return await PhysicalDeviceRepositoryImpl(session).get_device_bindings(since)
+
+    async def _load_changes(self, since: datetime):
+        async with self.session_factory() as session:
+            repository = PhysicalDeviceRepositoryImpl(session)
+            # Removals first: a binding re-added after they are read still shows up in the additions
+            removed_devices, detached = await repository.get_device_unbindings(since)
+            return await repository.get_device_bindings(since), removed_devices, detached
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.DEVICE_BINDING_REFRESH_SECONDS)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Device binding refresh failed")
+
+
+device_binding_refresher = DeviceBindingRefresher()
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from typing import Optional, Sequence
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncConnection
+from sqlalchemy.pool import NullPool
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_TRY_LOCK = text("SELECT pg_try_advisory_lock(:key)")
+_UNLOCK = text("SELECT pg_advisory_unlock(:key)")
+_PING = text("SELECT 1")
+
+
+class LeaderElection:
+    """Runs the singleton background jobs in one process across every gunicorn worker and replica.
+
+    Each process polls a Postgres session-level advisory lock from a connection of its own;
+    the holder starts the jobs and keeps them while that connection stays up. When the leader
+    exits or loses its connection the server releases the lock, and the next poll elsewhere
+    takes over.
+    """
+
+    def __init__(self, jobs: Sequence, database_url: Optional[str] = None, lock_key: Optional[int] = None,
+                 interval_seconds: Optional[float] = None):
+        self.jobs = list(jobs)  # Anything with start() and async stop()
+        self.database_url = database_url or settings.DATABASE_URL
+        self.lock_key = settings.BACKGROUND_JOBS_LOCK_KEY if lock_key is None else lock_key
+        self.interval_seconds = settings.BACKGROUND_JOBS_ELECTION_SECONDS if interval_seconds is None else interval_seconds
+        self._engine = None
+        self._connection: Optional[AsyncConnection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._connection is not None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._step_down(release=True)
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+    async def run_once(self) -> None:
+        if self._connection is not None:
+            await self._connection.execute(_PING)
+            await self._connection.commit()
+            return
+        if self._engine is None:
+            # Unpooled, so closing the connection really ends the session that holds the lock
+            self._engine = create_async_engine(self.database_url, poolclass=NullPool)
+        connection = await self._engine.connect()
+        try:
+            acquired = (await connection.execute(_TRY_LOCK, {"key": self.lock_key})).scalar()
+            await connection.commit()  # The lock is session-level; don't sit idle in a transaction
+        except BaseException:
+            await connection.close()
+            raise
+        if not acquired:
+            await connection.close()
+            return
+        self._connection = connection
+        logger.info("Elected to run background jobs")
+        for job in self.jobs:
+            job.start()
+
+    async def _step_down(self, release: bool = False) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        for job in self.jobs:
+            await job.stop()
+        try:
+            if release:
+                await connection.execute(_UNLOCK, {"key": self.lock_key})
+                await connection.commit()
+        finally:
+            await connection.close()
+        logger.info("Stopped running background jobs")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # A broken connection has already lost the lock; stop before another process takes over
+                logger.exception("Background job leader election failed")
+                try:
+                    await self._step_down()
+                except Exception:
+                    logger.exception("Stopping background jobs failed")
+            await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from src.adapters.repositories.file_deletion_repository_impl import FileDeletionRepositoryImpl
+from src.adapters.repositories.plant_repository_impl import PlantRepositoryImpl
+from src.adapters.storage.factory import get_file_storage
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from src.core.services.photo_cleanup_service import PhotoCleanupService, PhotoCleanupMetrics
+
+logger = logging.getLogger(__name__)
+
+class PhotoCleanupWorker:
+    """Background task that drains pending photo deletions and periodically reconciles the bucket."""
+
+    def __init__(self, session_factory=SessionLocal, storage_factory=get_file_storage):
+        self.session_factory = session_factory
+        self.storage_factory = storage_factory
+        self.metrics = PhotoCleanupMetrics()
+        self._file_storage = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_reconcile = time.monotonic()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> None:
+        if self._file_storage is None:
+            self._file_storage = self.storage_factory()
+        # Keep draining while batches come back full, one transaction per batch
+        while True:
+            async with self.session_factory() as session:
+                service = self._build_service(session)
+                processed = await service.drain_pending_deletions(settings.PHOTO_CLEANUP_BATCH_SIZE)
+            if processed < settings.PHOTO_CLEANUP_BATCH_SIZE:
+                break
+
+        if time.monotonic() - self._last_reconcile >= settings.PHOTO_RECONCILE_INTERVAL_SECONDS:
+            async with self.session_factory() as session:
+                await self._build_service(session).reconcile_orphans(settings.PHOTO_ORPHAN_GRACE_SECONDS)
+            self._last_reconcile = time.monotonic()
+
+    def _build_service(self, session) -> PhotoCleanupService:
+        return PhotoCleanupService(FileDeletionRepositoryImpl(session), PlantRepositoryImpl(session),
+                                   self._file_storage, self.metrics)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Photo cleanup failed")
+            await asyncio.sleep(settings.PHOTO_CLEANUP_INTERVAL_SECONDS)
+
+photo_cleanup_worker = PhotoCleanupWorker()
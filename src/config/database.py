@@ -1,10 +1,87 @@
+from contextlib import asynccontextmanager
+from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from src.config.settings import settings
+from src.config.read_replicas import ReplicaSelector, RoutingSession, WriteTracker
+from src.adapters.api.rate_limit import client_key, parse_networks
+from src.adapters.api.read_your_writes import SCOPE_KEY
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
+def create_engine(url: str):
+    pool_size, max_overflow = settings.database_pool_limits
+    return create_async_engine(
+        url,
+        echo=settings.DATABASE_ECHO,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        query_cache_size=settings.DATABASE_COMPILED_CACHE_SIZE,
+        connect_args={"prepared_statement_cache_size": settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE},
+    )
 
-async def get_session() -> AsyncSession:
+engine = create_engine(settings.DATABASE_URL)
+read_engines = [create_engine(url) for url in settings.database_read_urls]
+
+replica_selector = ReplicaSelector([read_engine.sync_engine for read_engine in read_engines],
+                                   settings.DATABASE_READ_STRATEGY)
+write_tracker = WriteTracker(settings.DATABASE_READ_STICKY_SECONDS)
+trusted_proxies = parse_networks(settings.rate_limit_trusted_proxies)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession,
+                            sync_session_class=RoutingSession, replicas=replica_selector,
+                            write_tracker=write_tracker)
+
+def get_sticky_key(request: Request) -> str:
+    """Identify the client for read-your-writes stickiness, believing X-Forwarded-For only from trusted proxies."""
+    return client_key(request.scope, trusted_proxies)
+
+def _reads_from_replica(request: Request, sticky_key: str) -> bool:
+    marker = request.scope.get(SCOPE_KEY)
+    return not (marker is not None and marker.recent) and not write_tracker.wrote_recently(sticky_key)
+
+async def get_session(request: Request) -> AsyncSession:
+    async with SessionLocal() as session:
+        session.info["sticky_key"] = get_sticky_key(request)
+        session.info["write_marker"] = request.scope.get(SCOPE_KEY)
+        yield session
+
+async def get_read_session(request: Request) -> AsyncSession:
+    """Session for read-only routes; uses a replica unless the client wrote recently."""
+    sticky_key = get_sticky_key(request)
     async with SessionLocal() as session:
+        session.info["sticky_key"] = sticky_key
+        session.info["read_only"] = _reads_from_replica(request, sticky_key)
         yield session
+
+def get_read_session_factory(request: Request):
+    """Read-only session factory for work that outlives the handler, such as streaming response bodies.
+
+    Dependencies with ``yield`` are torn down before a streamed body is sent, so a
+    streaming route opens its own session from this factory inside the generator.
+    """
+    sticky_key = get_sticky_key(request)
+    read_only = _reads_from_replica(request, sticky_key)
+
+    @asynccontextmanager
+    async def open_session():
+        async with SessionLocal() as session:
+            session.info["sticky_key"] = sticky_key
+            session.info["read_only"] = read_only
+            yield session
+
+    return open_session
+
+def get_read_repository_factory(request: Request, repository_class):
+    """Opens repository_class on a read session of its own, for lookups shared beyond this request.
+
+    Single-flight followers await a call the first request started; if that call used the
+    first request's session, its teardown would close the session under the followers.
+    """
+    open_session = get_read_session_factory(request)
+
+    @asynccontextmanager
+    async def open_repository():
+        async with open_session() as session:
+            yield repository_class(session)
+
+    return open_repository
@@ -0,0 +1,113 @@
+import itertools
+import time
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+
+
+class ReplicaSelector:
+    """Picks one of the read replica engines for a new read-only session."""
+
+    def __init__(self, engines: List[Engine], strategy: str = ROUND_ROBIN):
+        if strategy not in (ROUND_ROBIN, LEAST_CONNECTIONS):
+            raise ValueError(f"Unknown read replica strategy: {strategy}")
+        self.engines = list(engines)
+        self.strategy = strategy
+        self._counter = itertools.count()
+
+    def select(self) -> Optional[Engine]:
+        if not self.engines:
+            return None
+        start = next(self._counter) % len(self.engines)
+        if self.strategy == ROUND_ROBIN:
+            return self.engines[start]
+        # Rotate the starting point so idle replicas share the load on ties
+        rotated = self.engines[start:] + self.engines[:start]
+        return min(rotated, key=_checked_out_connections)
+
+
+def _checked_out_connections(engine: Engine) -> int:
+    pool = engine.pool
+    return pool.checkedout() if hasattr(pool, "checkedout") else 0
+
+
+class WriteTracker:
+    """Remembers which clients wrote recently so their reads stay on the primary."""
+
+    def __init__(self, window_seconds: float, max_keys: int = 10000):
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._last_write: Dict[str, float] = {}
+
+    def record(self, key: str) -> None:
+        now = time.monotonic()
+        if len(self._last_write) >= self.max_keys:
+            self._prune(now)
+        self._last_write[key] = now
+
+    def wrote_recently(self, key: str) -> bool:
+        last_write = self._last_write.get(key)
+        return last_write is not None and time.monotonic() - last_write < self.window_seconds
+
+    def _prune(self, now: float) -> None:
+        expired = [key for key, ts in self._last_write.items() if now - ts >= self.window_seconds]
+        for key in expired:
+            del self._last_write[key]
+        if len(self._last_write) >= self.max_keys:
+            self._last_write.clear()
+
+
+class WriteMarker:
+    """Per-request read-your-writes state, carried between workers by ReadYourWritesMiddleware's cookie."""
+
+    def __init__(self, recent: bool = False):
+        self.recent = recent  # The client wrote within the window, possibly through another worker
+        self.wrote = False  # This request committed a write
+
+
+class RoutingSession(Session):
+    """Session that sends read-only work to a replica and everything else to the primary.
+
+    A session is only routed to a replica when ``info["read_only"]`` is set. Flushes
+    and DML statements always go to the primary, and the chosen replica is pinned
+    for the lifetime of the session so a request never spans several replicas.
+    """
+
+    def __init__(self, *args, replicas: Optional[ReplicaSelector] = None,
+                 write_tracker: Optional[WriteTracker] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.write_tracker = write_tracker
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        is_write = self._flushing or getattr(clause, "is_dml", False)
+        if is_write:
+            self.info["wrote"] = True
+        elif self.info.get("read_only") and self.replicas is not None:
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = self.replicas.select()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_write(session: RoutingSession) -> None:
+    if not session.info.pop("wrote", False):
+        return
+    marker = session.info.get("write_marker")
+    if marker is not None:
+        marker.wrote = True
+    sticky_key = session.info.get("sticky_key")
+    if session.write_tracker is not None and sticky_key:
+        session.write_tracker.record(sticky_key)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_write(session: RoutingSession) -> None:
+    session.info.pop("wrote", None)
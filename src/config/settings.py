@@ -2,9 +2,133 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
-    MINIO_ENDPOINT: str
-    MINIO_ACCESS_KEY: str
-    MINIO_SECRET_KEY: str
+    # Optional comma-separated list of read replica URLs used by GET endpoints
+    DATABASE_READ_URL: str | None = None
+    DATABASE_READ_STRATEGY: str = "round_robin"  # 'round_robin' or 'least_connections'
+    # Reads stay on the primary for this long after a client writes (read-your-writes)
+    DATABASE_READ_STICKY_SECONDS: float = 5.0
+    # asyncpg prepared statements cached per connection (0 disables) and SQLAlchemy's compiled cache size
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    DATABASE_COMPILED_CACHE_SIZE: int = 1200
+    DATABASE_ECHO: bool = False  # Log every SQL statement; for local debugging only
+    # Connection pool per engine and worker process. With DATABASE_MAX_CONNECTIONS set, both are capped so
+    # WEB_CONCURRENCY workers together stay within it; leave headroom below the server's max_connections
+    # for migrations, CLIs and other services
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_MAX_CONNECTIONS: int | None = None
+    WEB_CONCURRENCY: int = 1  # Worker processes; gunicorn.conf.py exports the count it starts
+    RUN_MIGRATIONS_ON_STARTUP: bool = True  # scripts/start.sh migrates once and disables this for its workers
+    # 'minio', or the local 'memory' / 'filesystem' adapters for tests, benchmarks and profiling
+    FILE_STORAGE_BACKEND: str = "minio"
+    FILE_STORAGE_PATH: str = "./data/files"  # Root directory of the filesystem backend
+    # HMAC key for the local backends' presigned URLs; required with several workers (random per process if unset)
+    FILE_STORAGE_SIGNING_KEY: str | None = None
+    FILE_STORAGE_PUBLIC_URL: str = ""  # Prefix for local presigned URLs, e.g. http://localhost:8000
+    PHOTO_URL_EXPIRES_SECONDS: int = 900
+    # Required when FILE_STORAGE_BACKEND is 'minio'
+    MINIO_ENDPOINT: str | None = None
+    MINIO_ACCESS_KEY: str | None = None
+    MINIO_SECRET_KEY: str | None = None
     MINIO_BUCKET_NAME: str = "plant-photos"
+    # Background removal of replaced/deleted photos and orphaned objects
+    PHOTO_CLEANUP_ENABLED: bool = True
+    PHOTO_CLEANUP_INTERVAL_SECONDS: float = 5.0
+    PHOTO_CLEANUP_BATCH_SIZE: int = 500
+    PHOTO_RECONCILE_INTERVAL_SECONDS: float = 3600.0
+    PHOTO_ORPHAN_GRACE_SECONDS: float = 3600.0
+    # Upload normalization: sniff format, strip metadata, cap dimensions and re-encode
+    PHOTO_NORMALIZE_ENABLED: bool = True
+    PHOTO_OUTPUT_FORMAT: str = "WEBP"  # 'WEBP', 'JPEG' or 'PNG'
+    PHOTO_QUALITY: int = 80
+    PHOTO_MAX_DIMENSION: int = 2048
+    PHOTO_MAX_UPLOAD_BYTES: int = 25 * 1024 * 1024
+    PHOTO_MAX_PIXELS: int = 50_000_000
+    PHOTO_PROCESS_WORKERS: int = 2
+    # Per-client token bucket (in cost units; list scans and photo uploads cost more than 1)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_CAPACITY: float = 120.0
+    RATE_LIMIT_REFILL_PER_SECOND: float = 20.0
+    RATE_LIMIT_MAX_CONCURRENT: int = 20  # In-flight requests per client and worker (0 disables)
+    RATE_LIMIT_BACKEND: str = "memory"  # 'memory' (per worker) or 'redis' (shared, needs the redis package)
+    RATE_LIMIT_REDIS_URL: str | None = None
+    # Comma-separated proxy addresses/CIDRs whose X-Forwarded-For is believed; empty uses the peer address.
+    # Also identifies callers for Idempotency-Key scoping
+    RATE_LIMIT_TRUSTED_PROXIES: str = ""
+    # Response compression (zstd/br are used when the zstandard/brotli packages are installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    DEVICE_BINDING_INDEX_ENABLED: bool = True
+    DEVICE_BINDING_REFRESH_SECONDS: float = 5  # Merge bindings created by other workers
+    DEVICE_BINDING_REBUILD_SECONDS: float = 300  # Full reload, picks up deletions made elsewhere
+
+    PURGE_ENABLED: bool = True
+    PURGE_INTERVAL_SECONDS: float = 60
+    PURGE_RETENTION_SECONDS: float = 3600  # How long soft-deleted rows are kept before the purger removes them
+    PURGE_BATCH_SIZE: int = 200
+    PURGE_THROTTLE_SECONDS: float = 0.2  # Pause between batches
+
+    # Photo cleanup and the purger run in one process only, the holder of a Postgres advisory lock
+    BACKGROUND_JOBS_LEADER_ELECTION: bool = True  # False runs them in every process that enables them
+    BACKGROUND_JOBS_ELECTION_SECONDS: float = 10.0  # Followers retry the lock, the leader checks its connection
+    BACKGROUND_JOBS_LOCK_KEY: int = 4207001
+
+    # Monthly device_assignment_history partitions created ahead at startup; later rows fall into the default one
+    ASSIGNMENT_HISTORY_PARTITION_MONTHS_AHEAD: int = 12
+
+    IMPORT_BATCH_SIZE: int = 5000  # Rows per COPY + merge transaction
+    IMPORT_MAX_ERRORS: int = 1000  # Row errors kept in the import report
+
+    SINGLE_FLIGHT_ENABLED: bool = True  # Merge concurrent identical plant and photo reads
+
+    EVENTS_ENABLED: bool = True  # Push plant and device changes over /api/v1/users/{user_id}/events
+    EVENTS_QUEUE_SIZE: int = 100  # Events buffered per connection before a slow consumer is cut off
+    EVENTS_MAX_STREAMS_PER_USER: int = 20  # Open streams per user and worker (0 = unlimited)
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0  # Keeps idle connections alive through proxies
+
+    # Idempotency-Key support on the create endpoints (POST plants, devices and plant photos)
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_BACKEND: str = "database"  # 'database' (shared by all workers) or 'memory' (per worker)
+    IDEMPOTENCY_TTL_SECONDS: float = 86400.0  # How long a key and its stored response are kept
+    IDEMPOTENCY_LOCK_SECONDS: float = 60.0  # An in-progress claim older than this is taken over by a retry
+    IDEMPOTENCY_MAX_RESPONSE_BYTES: int = 64 * 1024  # Larger responses are not stored; their key is released
+
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # 'json' (one object per line) or 'text'
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0  # Share of requests logged; errors, slow and traced requests always are
+    ACCESS_LOG_SLOW_MS: float = 1000.0
+    TRACING_ENABLED: bool = False
+    TRACE_SAMPLE_RATE: float = 0.01  # Head-based: share of requests traced unless the caller's traceparent decides
+    TRACE_EXPORTER: str = "file"  # 'file' (OTLP/JSON lines) or 'otlp' (OTLP/HTTP JSON to a collector)
+    TRACE_FILE_PATH: str = "./traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+
+    ADMIN_TOKEN: str | None = None  # Sent as X-Admin-Token; profiling is unavailable while unset
+    PROFILE_MAX_SECONDS: float = 60.0
+    PROFILE_REQUESTS_ENABLED: bool = False  # Allow per-request profiles via X-Profile: 1 (plus the admin token)
+
+    @property
+    def database_pool_limits(self) -> tuple[int, int]:
+        """(pool_size, max_overflow) for each engine in this worker"""
+        if not self.DATABASE_MAX_CONNECTIONS:
+            return self.DATABASE_POOL_SIZE, self.DATABASE_MAX_OVERFLOW
+        per_worker = max(1, self.DATABASE_MAX_CONNECTIONS // max(1, self.WEB_CONCURRENCY))
+        pool_size = min(self.DATABASE_POOL_SIZE, per_worker)
+        return pool_size, min(self.DATABASE_MAX_OVERFLOW, per_worker - pool_size)
+
+    @property
+    def rate_limit_trusted_proxies(self) -> list[str]:
+        return [proxy.strip() for proxy in self.RATE_LIMIT_TRUSTED_PROXIES.split(",") if proxy.strip()]
+
+    @property
+    def database_read_urls(self) -> list[str]:
+        if not self.DATABASE_READ_URL:
+            return []
+        return [url.strip() for url in self.DATABASE_READ_URL.split(",") if url.strip()]
 
 settings = Settings()
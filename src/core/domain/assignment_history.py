@@ -0,0 +1,15 @@
+import uuid
+from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict
+from datetime import datetime
+
+class DeviceAssignmentPeriod(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    device_id: uuid.UUID
+    plant_id: uuid.UUID
+    valid_from: datetime = Field(default_factory=datetime.utcnow)
+    valid_to: Optional[datetime] = None  # Exclusive end; None while the device is still assigned
+
+    def covers(self, at: datetime) -> bool:
+        return self.valid_from <= at and (self.valid_to is None or at < self.valid_to)
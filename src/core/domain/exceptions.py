@@ -0,0 +1,8 @@
+class VersionConflictError(Exception):
+    """Raised when a conditional update finds a newer row version than expected."""
+
+class InvalidImageError(Exception):
+    """Raised when an uploaded photo is not a supported, decodable image."""
+
+class ImageTooLargeError(InvalidImageError):
+    """Raised when an uploaded photo exceeds the configured byte or pixel limits."""
@@ -0,0 +1,11 @@
+import uuid
+from pydantic import BaseModel, Field, ConfigDict
+from datetime import datetime
+
+class PendingFileDeletion(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    file_name: str  # Object key to remove from file storage
+    attempts: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,18 @@
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field, ConfigDict
+from datetime import datetime
+
+class IdempotencyRecord(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    key: str  # Client-chosen Idempotency-Key
+    fingerprint: str  # sha256 of the request the key was first used for
+    status_code: Optional[int] = None  # None while that request is still running
+    headers: List[Tuple[str, str]] = []  # Response headers replayed to retries
+    body: bytes = b""
+    locked_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
+    @property
+    def completed(self) -> bool:
+        return self.status_code is not None
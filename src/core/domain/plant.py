@@ -16,6 +16,7 @@ class PhysicalDevice(BaseModel):
     description: str | None = None
     version: str | None = None
     category: PhysicalDeviceCategory
+    row_version: int = 1
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -28,5 +29,6 @@ class Plant(BaseModel):
     species: str
     description: str | None = None
     photo_filename: str | None = None
+    row_version: int = 1
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,14 @@
+import uuid
+from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict
+from datetime import datetime
+
+class UserDeletionJob(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    user_id: uuid.UUID
+    status: str = "pending"  # 'pending' or 'completed'
+    plants_deleted: int = 0
+    devices_deleted: int = 0
+    requested_at: datetime = Field(default_factory=datetime.utcnow)
+    completed_at: Optional[datetime] = None
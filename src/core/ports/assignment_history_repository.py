@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+import uuid
+from datetime import datetime
+from typing import List
+from src.core.domain.assignment_history import DeviceAssignmentPeriod
+
+class AssignmentHistoryRepository(ABC):
+    """Read side of the append-only device assignment history; the device and plant repositories write it."""
+
+    @abstractmethod
+    async def get_device_history(self, device_id: uuid.UUID) -> List[DeviceAssignmentPeriod]:
+        """Every period of the device, oldest first"""
+        pass
+
+    @abstractmethod
+    async def get_periods(self, device_ids: List[uuid.UUID], start: datetime, end: datetime) -> List[DeviceAssignmentPeriod]:
+        """Periods of these devices that overlap [start, end], in one round trip"""
+        pass
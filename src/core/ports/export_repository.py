@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+import uuid
+from typing import AsyncIterator, List, Optional
+
+class ExportRepository(ABC):
+    """Bulk reads for exports: rows come back in batches of plain dicts, never as a full list."""
+
+    @abstractmethod
+    def stream_plants(self, user_id: Optional[uuid.UUID] = None,
+                      include_device_ids: bool = False) -> AsyncIterator[List[dict]]:
+        pass
+
+    @abstractmethod
+    def stream_devices(self, user_id: Optional[uuid.UUID] = None) -> AsyncIterator[List[dict]]:
+        pass
@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+import uuid
+from typing import Dict, List, Set, Tuple
+from src.core.domain.file_deletion import PendingFileDeletion
+
+class FileDeletionRepository(ABC):
+    @abstractmethod
+    async def claim_batch(self, limit: int) -> List[PendingFileDeletion]:
+        """Lock up to `limit` pending deletions; they stay claimed until complete_batch"""
+        pass
+
+    @abstractmethod
+    async def lock_unreferenced_photos(self, file_names: List[str]) -> Tuple[Set[str], Set[str]]:
+        """Lock the reference rows of the names no plant holds, until complete_batch; returns (locked, busy).
+        Busy names are being acquired or released by another transaction and must be left alone"""
+        pass
+
+    @abstractmethod
+    async def forget_photos(self, file_names: List[str]) -> None:
+        """Drop the reference rows of objects removed from storage, committed by complete_batch"""
+        pass
+
+    @abstractmethod
+    async def complete_batch(self, done_ids: List[uuid.UUID], failures: Dict[uuid.UUID, str]) -> None:
+        """Settle the claimed deletions and commit, releasing every lock taken since claim_batch"""
+        pass
+
+    @abstractmethod
+    async def release(self) -> None:
+        """Commit without settling any deletion, e.g. after an empty claim or a reconcile page"""
+        pass
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from fastapi import UploadFile
 
 class FileStorage(ABC):
@@ -6,10 +8,48 @@ class FileStorage(ABC):
     async def upload_file(self, file: UploadFile, file_name: str) -> str:
         pass
 
+    @abstractmethod
+    async def upload_bytes(self, data: bytes, file_name: str, content_type: str) -> str:
+        pass
+
     @abstractmethod
     async def download_file(self, file_name: str):
         pass
 
+    @abstractmethod
+    async def read_file(self, file_name: str) -> bytes:
+        """Whole object contents, for small objects whose bytes can be shared between requests"""
+        pass
+
+    @abstractmethod
+    async def read_range(self, file_name: str, start: int, length: int) -> bytes:
+        """`length` bytes starting at offset `start` (fewer at the end of the object)"""
+        pass
+
+    @abstractmethod
+    async def get_file_size(self, file_name: str) -> Optional[int]:
+        """Object size in bytes, None when the object does not exist"""
+        pass
+
+    @abstractmethod
+    async def presigned_url(self, file_name: str, expires_seconds: int) -> str:
+        """Time-limited URL a client can GET the object from without going through the API"""
+        pass
+
     @abstractmethod
     async def delete_file(self, file_name: str) -> None:
         pass
+
+    @abstractmethod
+    async def file_exists(self, file_name: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def delete_files(self, file_names: List[str]) -> Dict[str, str]:
+        """Delete many objects at once; returns {file_name: error} for the ones that failed"""
+        pass
+
+    @abstractmethod
+    async def list_files(self, start_after: Optional[str] = None, limit: int = 1000) -> List[Tuple[str, datetime]]:
+        """One page of (file_name, last_modified) in key order"""
+        pass
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional, Tuple
+from src.core.domain.idempotency import IdempotencyRecord
+
+class IdempotencyRepository(ABC):
+    """Stored Idempotency-Key claims and the responses they produced."""
+
+    @abstractmethod
+    async def begin(self, key: str, fingerprint: str, now: datetime, expires_at: datetime,
+                    stale_before: datetime) -> Optional[IdempotencyRecord]:
+        """Claim the key atomically; None when the caller now owns it, else the record that holds it.
+
+        An expired record, or an in-progress one for the same fingerprint locked before
+        stale_before (its worker died), is taken over as if it did not exist.
+        """
+        pass
+
+    @abstractmethod
+    async def complete(self, key: str, status_code: int, headers: List[Tuple[str, str]], body: bytes) -> None:
+        pass
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Forget a claim whose request failed, so a retry runs it again"""
+        pass
+
+    @abstractmethod
+    async def purge_expired(self, now: datetime, limit: int) -> int:
+        pass
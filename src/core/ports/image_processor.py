@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class ProcessedImage:
+    data: bytes
+    extension: str
+    content_type: str
+    width: int
+    height: int
+
+class ImageProcessor(ABC):
+    @abstractmethod
+    async def process(self, data: bytes) -> ProcessedImage:
+        """Validate and re-encode an uploaded image; raises InvalidImageError"""
+        pass
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+class ImportRepository(ABC):
+    """Bulk loading for imports. Records are tuples in the column order the implementation documents."""
+
+    @abstractmethod
+    async def insert_plants(self, records: List[tuple]) -> int:
+        """Load one batch in its own transaction; rows whose id already exists are skipped. Returns rows inserted"""
+        pass
+
+    @abstractmethod
+    async def insert_devices(self, records: List[tuple]) -> int:
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 import uuid
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Sequence, Set, Tuple
 from src.core.domain.plant import Plant, PhysicalDevice
 
 class PlantRepository(ABC):
@@ -12,6 +13,11 @@ class PlantRepository(ABC):
     async def get_plant_by_id(self, plant_id: uuid.UUID) -> Optional[Plant]:
         pass
 
+    @abstractmethod
+    async def get_plants_by_ids(self, plant_ids: List[uuid.UUID]) -> List[Plant]:
+        """Live plants among `plant_ids` in one round trip, in no particular order; unknown ids are left out"""
+        pass
+
     @abstractmethod
     async def get_plants_by_user_id(self, user_id: uuid.UUID) -> List[Plant]:
         pass
@@ -24,10 +30,34 @@ class PlantRepository(ABC):
     async def update_plant(self, plant: Plant) -> Plant:
         pass
 
+    @abstractmethod
+    async def update_plant_if_version(self, plant_id: uuid.UUID, expected_versions: Sequence[int], values: dict) -> Optional[Plant]:
+        """Apply values only while the row is at one of expected_versions; None if it is not"""
+        pass
+
     @abstractmethod
     async def delete_plant(self, plant_id: uuid.UUID) -> None:
         pass
 
+    @abstractmethod
+    async def get_referenced_photo_filenames(self, file_names: List[str]) -> Set[str]:
+        pass
+
+    @abstractmethod
+    async def soft_delete_plants_by_user(self, user_id: uuid.UUID, limit: int) -> List[uuid.UUID]:
+        """Mark up to `limit` of the user's live plants deleted in one transaction; returns their ids"""
+        pass
+
+    @abstractmethod
+    async def user_has_live_plants(self, user_id: uuid.UUID) -> bool:
+        """Whether any of the user's plants is not soft-deleted yet; never waits on row locks"""
+        pass
+
+    @abstractmethod
+    async def purge_deleted_plants(self, deleted_before: datetime, limit: int) -> int:
+        """Hard-delete up to `limit` plants soft-deleted before the cutoff; returns how many were removed"""
+        pass
+
 class PhysicalDeviceRepository(ABC):
     @abstractmethod
     async def create_device(self, device: PhysicalDevice) -> PhysicalDevice:
@@ -37,6 +67,11 @@ class PhysicalDeviceRepository(ABC):
     async def get_device_by_id(self, device_id: uuid.UUID) -> Optional[PhysicalDevice]:
         pass
 
+    @abstractmethod
+    async def get_devices_by_ids(self, device_ids: List[uuid.UUID]) -> List[PhysicalDevice]:
+        """Live devices among `device_ids` in one round trip, in no particular order; unknown ids are left out"""
+        pass
+
     @abstractmethod
     async def get_all_devices(self) -> List[PhysicalDevice]:
         pass
@@ -45,6 +80,12 @@ class PhysicalDeviceRepository(ABC):
     async def update_device(self, device: PhysicalDevice) -> PhysicalDevice:
         pass
 
+    @abstractmethod
+    async def update_device_if_version(self, device_id: uuid.UUID, user_id: uuid.UUID, expected_versions: Sequence[int],
+                                       values: dict) -> Optional[PhysicalDevice]:
+        """Apply values only while the device is the user's and at one of expected_versions; None otherwise"""
+        pass
+
     @abstractmethod
     async def delete_device(self, device_id: uuid.UUID) -> None:
         pass
@@ -67,4 +108,24 @@ class PhysicalDeviceRepository(ABC):
 
     @abstractmethod
     async def get_device_by_id_and_user(self, device_id: uuid.UUID, user_id: uuid.UUID) -> Optional[PhysicalDevice]:
+        pass
+
+    @abstractmethod
+    async def soft_delete_devices_by_user(self, user_id: uuid.UUID, limit: int) -> List[uuid.UUID]:
+        """Mark up to `limit` of the user's live devices deleted in one transaction; returns their ids"""
+        pass
+
+    @abstractmethod
+    async def user_has_live_devices(self, user_id: uuid.UUID) -> bool:
+        """Whether any of the user's devices is not soft-deleted yet; never waits on row locks"""
+        pass
+
+    @abstractmethod
+    async def purge_deleted_devices(self, deleted_before: datetime, limit: int) -> int:
+        """Hard-delete up to `limit` devices soft-deleted before the cutoff; returns how many were removed"""
+        pass
+
+    @abstractmethod
+    async def get_device_bindings(self, since: Optional[datetime] = None) -> List[Tuple[uuid.UUID, uuid.UUID, Optional[uuid.UUID]]]:
+        """(device_id, user_id, plant_id) rows; only devices or assignments created at or after `since` when given"""
         pass
\ No newline at end of file
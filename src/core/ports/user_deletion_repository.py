@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+import uuid
+from typing import List, Optional
+from src.core.domain.user_deletion import UserDeletionJob
+
+class UserDeletionJobRepository(ABC):
+    @abstractmethod
+    async def request_deletion(self, user_id: uuid.UUID) -> UserDeletionJob:
+        """Create the user's job, or reopen a completed one"""
+        pass
+
+    @abstractmethod
+    async def get_job(self, user_id: uuid.UUID) -> Optional[UserDeletionJob]:
+        pass
+
+    @abstractmethod
+    async def get_pending_jobs(self, limit: int) -> List[UserDeletionJob]:
+        pass
+
+    @abstractmethod
+    async def record_progress(self, user_id: uuid.UUID, plants_deleted: int, devices_deleted: int,
+                              completed: bool) -> None:
+        pass
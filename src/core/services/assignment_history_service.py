@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence, Tuple
+from src.core.domain.assignment_history import DeviceAssignmentPeriod
+from src.core.ports.assignment_history_repository import AssignmentHistoryRepository
+
+class AssignmentHistoryService:
+    """Answers "which plant was this device on at time T" for analytics, one reading or a whole batch at a time."""
+
+    def __init__(self, history_repository: AssignmentHistoryRepository):
+        self.history_repository = history_repository
+
+    async def get_device_history(self, device_id: uuid.UUID) -> List[DeviceAssignmentPeriod]:
+        return await self.history_repository.get_device_history(device_id)
+
+    async def get_plants_at(self, device_id: uuid.UUID, at: datetime) -> List[uuid.UUID]:
+        return (await self.get_plants_at_batch([(device_id, at)]))[0]
+
+    async def get_plants_at_batch(self, lookups: Sequence[Tuple[uuid.UUID, datetime]]) -> List[List[uuid.UUID]]:
+        """Plant ids per (device_id, at) lookup, in input order.
+
+        A batch of readings spans a short window, so one query fetches every period of its
+        devices overlapping that window and each timestamp is resolved here, instead of
+        one containment probe per reading.
+        """
+        if not lookups:
+            return []
+        lookups = [(device_id, _utc(at)) for device_id, at in lookups]
+        timestamps = [at for _, at in lookups]
+        device_ids = list(dict.fromkeys(device_id for device_id, _ in lookups))
+        periods = await self.history_repository.get_periods(device_ids, min(timestamps), max(timestamps))
+        by_device: Dict[uuid.UUID, List[DeviceAssignmentPeriod]] = {}
+        for period in periods:
+            by_device.setdefault(period.device_id, []).append(period)
+        return [[period.plant_id for period in by_device.get(device_id, ()) if period.covers(at)]
+                for device_id, at in lookups]
+
+def _utc(at: datetime) -> datetime:
+    # History is stored as naive UTC, like every other timestamp column
+    return at.astimezone(timezone.utc).replace(tzinfo=None) if at.tzinfo is not None else at
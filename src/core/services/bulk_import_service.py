@@ -0,0 +1,85 @@
+import asyncio
+import time
+from dataclasses import dataclass, field, asdict
+from itertools import islice
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+from src.core.ports.import_repository import ImportRepository
+
+@dataclass
+class ImportRowError:
+    line: int
+    error: str
+
+@dataclass
+class ImportReport:
+    received: int = 0
+    inserted: int = 0
+    duplicates: int = 0  # Valid rows whose id already existed
+    invalid: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    errors: List[ImportRowError] = field(default_factory=list)  # Capped at the service's max_errors
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.received / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "rows_per_second": self.rows_per_second}
+
+class BulkImportService:
+    """Validates parsed rows batch by batch and bulk-loads the valid ones through the import repository.
+
+    Rows arrive as (line number, raw values) and `to_record` turns one into the tuple
+    the repository loads, raising ValueError for a bad row. Reading, parsing and
+    validating a batch run in a worker thread, so only the load itself is on the event
+    loop. Each batch commits on its own, so a failed import keeps what was already
+    loaded and can be re-run when the rows carry their ids.
+    """
+
+    def __init__(self, import_repository: ImportRepository, batch_size: int = 5000, max_errors: int = 1000):
+        self.import_repository = import_repository
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+
+    async def import_plants(self, rows: Iterable[Tuple[int, dict]], to_record: Callable[[dict], tuple],
+                            progress: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+        return await self._import(rows, to_record, self.import_repository.insert_plants, progress)
+
+    async def import_devices(self, rows: Iterable[Tuple[int, dict]], to_record: Callable[[dict], tuple],
+                             progress: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+        return await self._import(rows, to_record, self.import_repository.insert_devices, progress)
+
+    async def _import(self, rows: Iterable[Tuple[int, dict]], to_record: Callable[[dict], tuple],
+                      insert_batch: Callable[[List[tuple]], Awaitable[int]],
+                      progress: Optional[Callable[[ImportReport], None]]) -> ImportReport:
+        report = ImportReport()
+        started = time.perf_counter()
+        rows = iter(rows)
+        while True:
+            received, records, errors = await asyncio.to_thread(self._read_batch, rows, to_record)
+            if not received:
+                break
+            report.invalid += len(errors)
+            report.errors.extend(errors[:self.max_errors - len(report.errors)])
+            inserted = await insert_batch(records)
+            report.received += received
+            report.inserted += inserted
+            report.duplicates += len(records) - inserted
+            report.batches += 1
+            report.seconds = time.perf_counter() - started
+            if progress is not None:
+                progress(report)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _read_batch(self, rows, to_record: Callable[[dict], tuple]) -> Tuple[int, List[tuple], List[ImportRowError]]:
+        """(rows read, valid records, row errors) for the next batch; runs off the event loop"""
+        batch = list(islice(rows, self.batch_size))
+        records, errors = [], []
+        for line, values in batch:
+            try:
+                records.append(to_record(values))
+            except ValueError as e:
+                errors.append(ImportRowError(line=line, error=str(e)))
+        return len(batch), records, errors
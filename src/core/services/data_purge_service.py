@@ -0,0 +1,65 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from src.core.domain.user_deletion import UserDeletionJob
+from src.core.ports.plant_repository import PlantRepository, PhysicalDeviceRepository
+from src.core.ports.user_deletion_repository import UserDeletionJobRepository
+from src.core.ports.idempotency_repository import IdempotencyRepository
+from src.core.services.device_binding_index import DeviceBindingIndex
+from src.core.services.event_broker import EventBroker, UserEvent
+
+class DataPurgeService:
+    """Deletes whole accounts a batch at a time and physically purges soft-deleted rows."""
+
+    def __init__(self, plant_repository: PlantRepository, device_repository: PhysicalDeviceRepository,
+                 job_repository: UserDeletionJobRepository, binding_index: Optional[DeviceBindingIndex] = None,
+                 events: Optional[EventBroker] = None, idempotency_repository: Optional[IdempotencyRepository] = None):
+        self.plant_repository = plant_repository
+        self.device_repository = device_repository
+        self.job_repository = job_repository
+        self.binding_index = binding_index
+        self.events = events
+        self.idempotency_repository = idempotency_repository
+
+    async def request_user_deletion(self, user_id: uuid.UUID) -> UserDeletionJob:
+        return await self.job_repository.request_deletion(user_id)
+
+    async def get_user_deletion(self, user_id: uuid.UUID) -> Optional[UserDeletionJob]:
+        return await self.job_repository.get_job(user_id)
+
+    async def get_pending_user_deletions(self, limit: int) -> List[UserDeletionJob]:
+        return await self.job_repository.get_pending_jobs(limit)
+
+    async def delete_user_data_batch(self, user_id: uuid.UUID, batch_size: int) -> bool:
+        """Soft-delete one batch of the user's plants and devices; True once nothing is left"""
+        plant_ids = await self.plant_repository.soft_delete_plants_by_user(user_id, batch_size)
+        device_ids = await self.device_repository.soft_delete_devices_by_user(user_id, batch_size)
+        # A short batch is not proof: SKIP LOCKED passes over rows a concurrent update holds,
+        # so completion is decided by a separate non-locking look at what is still live
+        completed = (len(plant_ids) < batch_size and len(device_ids) < batch_size
+                     and not await self.plant_repository.user_has_live_plants(user_id)
+                     and not await self.device_repository.user_has_live_devices(user_id))
+        await self.job_repository.record_progress(user_id, len(plant_ids), len(device_ids), completed)
+        if self.binding_index is not None:
+            for device_id in device_ids:
+                self.binding_index.remove_device(device_id)
+            for plant_id in plant_ids:
+                self.binding_index.remove_plant(plant_id)
+        if self.events is not None and (plant_ids or device_ids):
+            # One event per batch: a client listing the user's data just drops these ids
+            self.events.publish(user_id, UserEvent("user.data_deleted", user_id, {
+                "plant_ids": [str(plant_id) for plant_id in plant_ids],
+                "device_ids": [str(device_id) for device_id in device_ids],
+            }))
+        return completed
+
+    async def purge_deleted(self, deleted_before: datetime, batch_size: int) -> int:
+        """Hard-delete one batch of plants and one of devices soft-deleted before the cutoff"""
+        plants = await self.plant_repository.purge_deleted_plants(deleted_before, batch_size)
+        devices = await self.device_repository.purge_deleted_devices(deleted_before, batch_size)
+        return plants + devices
+
+    async def purge_expired_idempotency_keys(self, now: datetime, batch_size: int) -> int:
+        if self.idempotency_repository is None:
+            return 0
+        return await self.idempotency_repository.purge_expired(now, batch_size)
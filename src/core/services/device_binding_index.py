@@ -0,0 +1,129 @@
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+BindingRow = Tuple[uuid.UUID, uuid.UUID, Optional[uuid.UUID]]  # (device_id, user_id, plant_id or None)
+
+
+class DeviceBindingIndex:
+    """In-memory device -> (owner, plants) index answering telemetry authorization lookups.
+
+    Writes made through this worker's services are applied immediately; a background
+    refresher merges other workers' changes and periodically rebuilds the index.
+    Writes that land while a rebuild or merge is loading are journaled and replayed
+    over the loaded rows, so a stale read never undoes them.
+    """
+
+    def __init__(self):
+        self._owners: Dict[uuid.UUID, uuid.UUID] = {}
+        self._plants: Dict[uuid.UUID, Set[uuid.UUID]] = {}
+        self._devices_by_plant: Dict[uuid.UUID, Set[uuid.UUID]] = {}
+        self._journal: Optional[List[tuple]] = None
+        self.ready = False
+        self.loaded_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def lookup(self, device_ids: Iterable[uuid.UUID]) -> Tuple[Dict[uuid.UUID, Tuple[uuid.UUID, List[uuid.UUID]]], List[uuid.UUID]]:
+        owners, plants = self._owners, self._plants
+        found, missing = {}, []
+        for device_id in device_ids:
+            user_id = owners.get(device_id)
+            if user_id is None:
+                missing.append(device_id)
+            else:
+                found[device_id] = (user_id, list(plants.get(device_id, ())))
+        return found, missing
+
+    def begin_rebuild(self) -> None:
+        self._journal = []
+
+    def abort_rebuild(self) -> None:
+        # Journaled writes were also applied to the live index, so dropping the journal is enough
+        self._journal = None
+
+    def finish_rebuild(self, rows: Iterable[BindingRow]) -> None:
+        target = ({}, {}, {})
+        self._apply_rows(target, rows)
+        for operation, args in self._journal or []:
+            getattr(self, operation)(*args, _target=target)
+        self._owners, self._plants, self._devices_by_plant = target
+        self._journal = None
+        self.ready = True
+        self.loaded_at = datetime.utcnow()
+
+    def begin_merge(self) -> None:
+        self._journal = []
+
+    def abort_merge(self) -> None:
+        self._journal = None
+
+    def merge(self, rows: Iterable[BindingRow], removed_devices: Iterable[uuid.UUID] = (),
+              detached: Iterable[Tuple[uuid.UUID, uuid.UUID]] = ()) -> None:
+        """Apply other workers' changes on top of the current index (incremental refresh).
+
+        Removals go before additions, so a device detached and re-attached within the
+        window stays bound; journaled local writes go last, as they are newer than the load.
+        """
+        target = (self._owners, self._plants, self._devices_by_plant)
+        journal, self._journal = self._journal or [], None
+        for device_id in removed_devices:
+            self.remove_device(device_id, _target=target)
+        for device_id, plant_id in detached:
+            self.detach(device_id, plant_id, _target=target)
+        self._apply_rows(target, rows)
+        for operation, args in journal:
+            getattr(self, operation)(*args, _target=target)
+
+    def add_device(self, device_id: uuid.UUID, user_id: uuid.UUID, _target=None) -> None:
+        owners, _, _ = self._target("add_device", (device_id, user_id), _target)
+        owners[device_id] = user_id
+
+    def remove_device(self, device_id: uuid.UUID, _target=None) -> None:
+        owners, plants, devices_by_plant = self._target("remove_device", (device_id,), _target)
+        owners.pop(device_id, None)
+        for plant_id in plants.pop(device_id, ()):
+            _discard(devices_by_plant, plant_id, device_id)
+
+    def attach(self, device_id: uuid.UUID, plant_id: uuid.UUID, _target=None) -> None:
+        _, plants, devices_by_plant = self._target("attach", (device_id, plant_id), _target)
+        plants.setdefault(device_id, set()).add(plant_id)
+        devices_by_plant.setdefault(plant_id, set()).add(device_id)
+
+    def detach(self, device_id: uuid.UUID, plant_id: uuid.UUID, _target=None) -> None:
+        _, plants, devices_by_plant = self._target("detach", (device_id, plant_id), _target)
+        _discard(plants, device_id, plant_id)
+        _discard(devices_by_plant, plant_id, device_id)
+
+    def remove_plant(self, plant_id: uuid.UUID, _target=None) -> None:
+        _, plants, devices_by_plant = self._target("remove_plant", (plant_id,), _target)
+        for device_id in devices_by_plant.pop(plant_id, ()):
+            _discard(plants, device_id, plant_id)
+
+    def _target(self, operation: str, args: tuple, target):
+        if target is not None:
+            return target
+        if self._journal is not None:
+            self._journal.append((operation, args))
+        return self._owners, self._plants, self._devices_by_plant
+
+    @staticmethod
+    def _apply_rows(target, rows: Iterable[BindingRow]) -> None:
+        owners, plants, devices_by_plant = target
+        for device_id, user_id, plant_id in rows:
+            owners[device_id] = user_id
+            if plant_id is not None:
+                plants.setdefault(device_id, set()).add(plant_id)
+                devices_by_plant.setdefault(plant_id, set()).add(device_id)
+
+
+def _discard(mapping: Dict[uuid.UUID, Set[uuid.UUID]], key: uuid.UUID, value: uuid.UUID) -> None:
+    values = mapping.get(key)
+    if values is not None:
+        values.discard(value)
+        if not values:
+            del mapping[key]
+
+
+device_binding_index = DeviceBindingIndex()
@@ -0,0 +1,120 @@
+import asyncio
+import itertools
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+@dataclass
+class UserEvent:
+    type: str  # '<plant|device>.<created|updated|deleted>', 'device.assigned' or 'device.unassigned'
+    resource_id: uuid.UUID
+    data: Dict[str, Any] = field(default_factory=dict)
+    id: int = 0  # Per-process sequence, set on publish
+    occurred_at: datetime = field(default_factory=datetime.utcnow)
+
+    def as_json(self) -> str:
+        return json.dumps({"id": self.id, "type": self.type, "resource_id": str(self.resource_id),
+                           "occurred_at": self.occurred_at.isoformat(), "data": self.data}, default=str)
+
+_OVERFLOW = object()
+
+class Subscription:
+    """One connection's bounded queue. A consumer that falls `max_queue` events behind is cut off
+    rather than buffered without limit; it should reconnect and re-read the listing."""
+
+    def __init__(self, broker: "EventBroker", user_id: uuid.UUID, max_queue: int):
+        self.broker = broker
+        self.user_id = user_id
+        self.overflowed = False
+        self._queue: asyncio.Queue = asyncio.Queue(max_queue + 1)  # One slot reserved for the overflow marker
+        self._max_queue = max_queue
+
+    def offer(self, event: UserEvent) -> bool:
+        if self.overflowed:
+            return False
+        if self._queue.qsize() >= self._max_queue:
+            self.overflowed = True
+            self._queue.put_nowait(_OVERFLOW)
+            return False
+        self._queue.put_nowait(event)
+        return True
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[UserEvent]:
+        """Next event, None on timeout; raises StopAsyncIteration once the consumer has been cut off"""
+        try:
+            event = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is _OVERFLOW:
+            raise StopAsyncIteration
+        return event
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> UserEvent:
+        return await self.next()
+
+class EventBrokerFullError(Exception):
+    pass
+
+class EventBroker:
+    """In-process fan-out of committed plant and device changes to the owner's open connections.
+
+    Services publish after the repository call has committed, so subscribers never see a
+    change that was rolled back. Each worker only reaches the connections it holds itself.
+    """
+
+    def __init__(self, max_queue: int = 100, max_subscriptions_per_user: int = 0):
+        self.max_queue = max_queue
+        self.max_subscriptions_per_user = max_subscriptions_per_user
+        self.published = 0
+        self.dropped = 0  # Slow consumers cut off
+        self._subscriptions: Dict[uuid.UUID, Set[Subscription]] = {}
+        self._sequence = itertools.count(1)
+
+    def subscribe(self, user_id: uuid.UUID) -> Subscription:
+        subscriptions = self._subscriptions.setdefault(user_id, set())
+        if self.max_subscriptions_per_user and len(subscriptions) >= self.max_subscriptions_per_user:
+            raise EventBrokerFullError(f"User {user_id} already has {len(subscriptions)} event streams")
+        subscription = Subscription(self, user_id, self.max_queue)
+        subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id: uuid.UUID, event: UserEvent) -> int:
+        """Queue the event for every subscriber of the user; returns how many received it"""
+        subscriptions = self._subscriptions.get(user_id)
+        if not subscriptions:
+            return 0
+        event.id = next(self._sequence)
+        self.published += 1
+        delivered = 0
+        for subscription in list(subscriptions):
+            if subscription.offer(event):
+                delivered += 1
+            else:
+                self.dropped += 1
+                self.unsubscribe(subscription)
+        return delivered
+
+    @property
+    def subscription_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def metrics_dict(self) -> dict:
+        return {"users": len(self._subscriptions), "subscriptions": self.subscription_count,
+                "published": self.published, "dropped": self.dropped}
+
+event_broker = EventBroker()
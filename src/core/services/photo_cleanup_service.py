@@ -0,0 +1,101 @@
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from src.core.ports.file_deletion_repository import FileDeletionRepository
+from src.core.ports.file_storage import FileStorage
+from src.core.ports.plant_repository import PlantRepository
+
+@dataclass
+class PhotoCleanupMetrics:
+    batches: int = 0
+    deleted: int = 0
+    failed: int = 0
+    skipped_referenced: int = 0
+    last_batch_size: int = 0
+    last_batch_seconds: float = 0.0
+    last_batch_objects_per_second: float = 0.0
+    reconcile_runs: int = 0
+    objects_scanned: int = 0
+    orphans_deleted: int = 0
+    last_reconcile_seconds: float = 0.0
+    last_reconcile_at: Optional[datetime] = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+class PhotoCleanupService:
+    """Drains the pending photo deletion queue and removes orphaned objects from storage."""
+
+    def __init__(self, deletion_repository: FileDeletionRepository, plant_repository: PlantRepository,
+                 file_storage: FileStorage, metrics: PhotoCleanupMetrics):
+        self.deletion_repository = deletion_repository
+        self.plant_repository = plant_repository
+        self.file_storage = file_storage
+        self.metrics = metrics
+
+    async def drain_pending_deletions(self, batch_size: int) -> int:
+        """Delete one batch of queued objects; returns how many queue entries were processed"""
+        started = time.perf_counter()
+        pending = await self.deletion_repository.claim_batch(batch_size)
+        if not pending:
+            await self.deletion_repository.release()
+            return 0
+
+        # A queued name can be referenced again (e.g. a re-uploaded photo); never delete those. Objects are
+        # only removed while their reference row is locked, so a concurrent re-upload waits for us and then
+        # stores the object again; names another transaction is busy with stay queued for the next batch
+        file_names = sorted({deletion.file_name for deletion in pending})
+        locked, busy = await self.deletion_repository.lock_unreferenced_photos(file_names)
+        referenced = await self.plant_repository.get_referenced_photo_filenames(sorted(locked))
+        to_delete = sorted(locked - referenced)
+        errors = await self.file_storage.delete_files(to_delete) if to_delete else {}
+        await self.deletion_repository.forget_photos(sorted(locked - set(errors)))
+
+        done_ids = [deletion.id for deletion in pending
+                    if deletion.file_name not in errors and deletion.file_name not in busy]
+        failures = {deletion.id: errors[deletion.file_name] for deletion in pending if deletion.file_name in errors}
+        await self.deletion_repository.complete_batch(done_ids, failures)
+
+        elapsed = time.perf_counter() - started
+        self.metrics.batches += 1
+        self.metrics.deleted += len(to_delete) - len(errors)
+        self.metrics.failed += len(failures)
+        self.metrics.skipped_referenced += len(file_names) - len(to_delete) - len(busy)
+        self.metrics.last_batch_size = len(pending)
+        self.metrics.last_batch_seconds = elapsed
+        self.metrics.last_batch_objects_per_second = len(pending) / elapsed if elapsed else 0.0
+        return len(pending)
+
+    async def reconcile_orphans(self, grace_seconds: float, page_size: int = 1000) -> int:
+        """Delete stored objects no plant references; objects newer than the grace period are left alone
+        so uploads whose database update has not committed yet are not removed"""
+        started = time.perf_counter()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+        orphans_deleted = 0
+        start_after = None
+        while True:
+            page = await self.file_storage.list_files(start_after=start_after, limit=page_size)
+            if not page:
+                break
+            start_after = page[-1][0]
+            self.metrics.objects_scanned += len(page)
+
+            # An old object can be referenced again by a deduplicated upload without being rewritten,
+            # so its age proves nothing; it is locked exactly as queued deletions are
+            candidates = [name for name, last_modified in page if last_modified < cutoff]
+            locked, _ = await self.deletion_repository.lock_unreferenced_photos(candidates)
+            referenced = await self.plant_repository.get_referenced_photo_filenames(sorted(locked))
+            orphans = sorted(locked - referenced)
+            errors = await self.file_storage.delete_files(orphans) if orphans else {}
+            orphans_deleted += len(orphans) - len(errors)
+            await self.deletion_repository.forget_photos(sorted(locked - set(errors)))
+            await self.deletion_repository.release()
+            if len(page) < page_size:
+                break
+
+        self.metrics.reconcile_runs += 1
+        self.metrics.orphans_deleted += orphans_deleted
+        self.metrics.last_reconcile_seconds = time.perf_counter() - started
+        self.metrics.last_reconcile_at = datetime.utcnow()
+        return orphans_deleted
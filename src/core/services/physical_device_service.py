@@ -1,26 +1,63 @@
 import uuid
-from typing import List, Optional
-from src.core.domain.plant import PhysicalDevice
+from typing import AsyncContextManager, Callable, List, Optional, Sequence, Tuple
+from src.core.domain.plant import PhysicalDevice, PhysicalDeviceCategory
+from src.core.domain.exceptions import VersionConflictError
 from src.core.ports.plant_repository import PhysicalDeviceRepository
+from src.core.services.device_binding_index import DeviceBindingIndex
+from src.core.services.single_flight import SingleFlight
+from src.core.services.event_broker import EventBroker, UserEvent
 
 class PhysicalDeviceService:
-    def __init__(self, device_repository: PhysicalDeviceRepository):
+    def __init__(self, device_repository: PhysicalDeviceRepository, binding_index: Optional[DeviceBindingIndex] = None,
+                 events: Optional[EventBroker] = None, single_flight: Optional[SingleFlight] = None,
+                 flight_repositories: Optional[Callable[[], AsyncContextManager[PhysicalDeviceRepository]]] = None):
         self.device_repository = device_repository
+        self.binding_index = binding_index
+        self.events = events
+        self.single_flight = single_flight
+        self.flight_repositories = flight_repositories
 
     async def create_device(self, user_id: uuid.UUID, name: str, description: Optional[str] = None,
                           version: Optional[str] = None, category: str = "microcontroller") -> PhysicalDevice:
         device = PhysicalDevice(user_id=user_id, name=name, description=description, version=version, category=category)
-        return await self.device_repository.create_device(device)
+        device = await self.device_repository.create_device(device)
+        if self.binding_index is not None:
+            self.binding_index.add_device(device.id, device.user_id)
+        return self._changed("device.created", device)
 
     async def get_device_by_id(self, device_id: uuid.UUID) -> Optional[PhysicalDevice]:
         return await self.device_repository.get_device_by_id(device_id)
 
+    async def get_devices_by_ids(self, device_ids: List[uuid.UUID]) -> Tuple[List[PhysicalDevice], List[uuid.UUID]]:
+        """(devices in request order, ids that are unknown or deleted); duplicates are answered once"""
+        wanted = list(dict.fromkeys(device_ids))
+        key = tuple(sorted(wanted))
+        devices = await self._coalesce("devices_by_ids", key, lambda repository: repository.get_devices_by_ids(wanted),
+                                       copy=lambda found: [device.model_copy() for device in found])
+        by_id = {device.id: device for device in devices}
+        missing = [device_id for device_id in wanted if device_id not in by_id]
+        return [by_id[device_id] for device_id in wanted if device_id in by_id], missing
+
     async def get_all_devices(self) -> List[PhysicalDevice]:
         return await self.device_repository.get_all_devices()
 
     async def update_device(self, user_id: uuid.UUID, device_id: uuid.UUID, name: str,
                           description: Optional[str] = None, version: Optional[str] = None,
-                          category: Optional[str] = None) -> Optional[PhysicalDevice]:
+                          category: Optional[str] = None, expected_versions: Optional[Sequence[int]] = None) -> Optional[PhysicalDevice]:
+        if expected_versions is not None:
+            values = {"name": name}
+            if description is not None:
+                values["description"] = description
+            if version is not None:
+                values["version"] = version
+            if category is not None:
+                values["category"] = PhysicalDeviceCategory(category).value
+            device = await self.device_repository.update_device_if_version(device_id, user_id, expected_versions, values)
+            # Only a failed conditional update pays for the extra read that tells 404 from 412
+            if device is None and await self.device_repository.get_device_by_id_and_user(device_id, user_id):
+                raise VersionConflictError(f"Device {device_id} is not at any of versions {list(expected_versions)}")
+            return self._changed("device.updated", device)
+
         device = await self.device_repository.get_device_by_id_and_user(device_id, user_id)
         if device:
             device.name = name
@@ -30,24 +67,34 @@ class PhysicalDeviceService:
                 device.version = version
             if category is not None:
                 device.category = category
-            return await self.device_repository.update_device(device)
+            return self._changed("device.updated", await self.device_repository.update_device(device))
         return None
 
     async def delete_device(self, user_id: uuid.UUID, device_id: uuid.UUID) -> None:
         # Verify ownership before deletion
         device = await self.device_repository.get_device_by_id_and_user(device_id, user_id)
         if device:
-            return await self.device_repository.delete_device(device_id)
+            await self.device_repository.delete_device(device_id)
+            if self.binding_index is not None:
+                self.binding_index.remove_device(device_id)
+            if self.events is not None:
+                self.events.publish(user_id, UserEvent("device.deleted", device_id))
         return None
 
     async def get_devices_by_plant_id(self, plant_id: uuid.UUID) -> List[PhysicalDevice]:
         return await self.device_repository.get_devices_by_plant_id(plant_id)
 
     async def assign_device_to_plant(self, plant_id: uuid.UUID, device_id: uuid.UUID) -> None:
-        return await self.device_repository.assign_device_to_plant(plant_id, device_id)
+        await self.device_repository.assign_device_to_plant(plant_id, device_id)
+        if self.binding_index is not None:
+            self.binding_index.attach(device_id, plant_id)
+        await self._publish_assignment("device.assigned", plant_id, device_id)
 
     async def remove_device_from_plant(self, plant_id: uuid.UUID, device_id: uuid.UUID) -> None:
-        return await self.device_repository.remove_device_from_plant(plant_id, device_id)
+        await self.device_repository.remove_device_from_plant(plant_id, device_id)
+        if self.binding_index is not None:
+            self.binding_index.detach(device_id, plant_id)
+        await self._publish_assignment("device.unassigned", plant_id, device_id)
 
     async def get_devices_by_user_id(self, user_id: uuid.UUID) -> List[PhysicalDevice]:
         """Get all devices owned by a specific user"""
@@ -55,4 +102,35 @@ class PhysicalDeviceService:
 
     async def get_device_by_id_and_user(self, device_id: uuid.UUID, user_id: uuid.UUID) -> Optional[PhysicalDevice]:
         """Get a device by ID only if it belongs to the specified user"""
-        return await self.device_repository.get_device_by_id_and_user(device_id, user_id)
\ No newline at end of file
+        return await self.device_repository.get_device_by_id_and_user(device_id, user_id)
+
+    async def _coalesce(self, kind: str, key, call, copy=None):
+        if self.single_flight is None:
+            return await call(self.device_repository)
+        return await self.single_flight.do(kind, key, lambda: self._call_in_flight(call), copy)
+
+    async def _call_in_flight(self, call):
+        # A shared call outlives the request that started it, so it must not run on that request's session
+        if self.flight_repositories is None:
+            return await call(self.device_repository)
+        async with self.flight_repositories() as repository:
+            return await call(repository)
+
+    def _changed(self, event_type: str, device: Optional[PhysicalDevice]) -> Optional[PhysicalDevice]:
+        # Called once the repository has committed, so a rolled-back change is never announced
+        if self.events is not None and device is not None:
+            self.events.publish(device.user_id, UserEvent(event_type, device.id, device.model_dump(mode="json")))
+        return device
+
+    async def _publish_assignment(self, event_type: str, plant_id: uuid.UUID, device_id: uuid.UUID) -> None:
+        if self.events is None:
+            return
+        # The owner comes from the binding index when it is warm, saving a read per assignment
+        if self.binding_index is not None and self.binding_index.ready:
+            found, _ = self.binding_index.lookup([device_id])
+            user_id = found[device_id][0] if device_id in found else None
+        else:
+            device = await self.device_repository.get_device_by_id(device_id)
+            user_id = device.user_id if device else None
+        if user_id is not None:
+            self.events.publish(user_id, UserEvent(event_type, device_id, {"plant_id": str(plant_id)}))
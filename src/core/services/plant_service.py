@@ -1,21 +1,48 @@
+import hashlib
 import uuid
-from typing import List, Optional
+from typing import AsyncContextManager, Callable, List, Optional, Sequence, Tuple
 from src.core.domain.plant import Plant
+from src.core.domain.exceptions import VersionConflictError, ImageTooLargeError
 from src.core.ports.plant_repository import PlantRepository
 from src.core.ports.file_storage import FileStorage
+from src.core.ports.image_processor import ImageProcessor
+from src.core.services.device_binding_index import DeviceBindingIndex
+from src.core.services.single_flight import SingleFlight
+from src.core.services.event_broker import EventBroker, UserEvent
 from fastapi import UploadFile
 
 class PlantService:
-    def __init__(self, plant_repository: PlantRepository, file_storage: FileStorage):
+    def __init__(self, plant_repository: PlantRepository, file_storage: FileStorage,
+                 image_processor: Optional[ImageProcessor] = None, binding_index: Optional[DeviceBindingIndex] = None,
+                 single_flight: Optional[SingleFlight] = None, events: Optional[EventBroker] = None,
+                 max_upload_bytes: Optional[int] = None,
+                 flight_repositories: Optional[Callable[[], AsyncContextManager[PlantRepository]]] = None):
         self.plant_repository = plant_repository
         self.file_storage = file_storage
+        self.image_processor = image_processor
+        self.binding_index = binding_index
+        self.single_flight = single_flight
+        self.events = events
+        self.max_upload_bytes = max_upload_bytes
+        self.flight_repositories = flight_repositories
 
     async def create_plant(self, user_id: uuid.UUID, name: str, species: str, description: Optional[str] = None) -> Plant:
         plant = Plant(user_id=user_id, name=name, species=species, description=description)
-        return await self.plant_repository.create_plant(plant)
+        return self._changed("plant.created", await self.plant_repository.create_plant(plant))
 
     async def get_plant_by_id(self, plant_id: uuid.UUID) -> Optional[Plant]:
-        return await self.plant_repository.get_plant_by_id(plant_id)
+        return await self._coalesce("plant_by_id", plant_id, lambda repository: repository.get_plant_by_id(plant_id),
+                                    copy=lambda plant: plant.model_copy())
+
+    async def get_plants_by_ids(self, plant_ids: List[uuid.UUID]) -> Tuple[List[Plant], List[uuid.UUID]]:
+        """(plants in request order, ids that are unknown or deleted); duplicates are answered once"""
+        wanted = list(dict.fromkeys(plant_ids))
+        key = tuple(sorted(wanted))
+        plants = await self._coalesce("plants_by_ids", key, lambda repository: repository.get_plants_by_ids(wanted),
+                                      copy=lambda found: [plant.model_copy() for plant in found])
+        by_id = {plant.id: plant for plant in plants}
+        missing = [plant_id for plant_id in wanted if plant_id not in by_id]
+        return [by_id[plant_id] for plant_id in wanted if plant_id in by_id], missing
 
     async def get_plants_by_user_id(self, user_id: uuid.UUID) -> List[Plant]:
         return await self.plant_repository.get_plants_by_user_id(user_id)
@@ -23,45 +50,134 @@ class PlantService:
     async def get_all_plants(self) -> List[Plant]:
         return await self.plant_repository.get_all_plants()
 
-    async def update_plant(self, plant_id: uuid.UUID, name: str, species: str, description: Optional[str] = None) -> Optional[Plant]:
+    async def update_plant(self, plant_id: uuid.UUID, name: str, species: str, description: Optional[str] = None,
+                           expected_versions: Optional[Sequence[int]] = None) -> Optional[Plant]:
+        if expected_versions is not None:
+            values = {"name": name, "species": species, "description": description}
+            plant = await self.plant_repository.update_plant_if_version(plant_id, expected_versions, values)
+            # Only a failed conditional update pays for the extra read that tells 404 from 412
+            if plant is None and await self.plant_repository.get_plant_by_id(plant_id):
+                raise VersionConflictError(f"Plant {plant_id} is not at any of versions {list(expected_versions)}")
+            return self._changed("plant.updated", plant)
+
         plant = await self.plant_repository.get_plant_by_id(plant_id)
         if plant:
             plant.name = name
             plant.species = species
             plant.description = description
-            return await self.plant_repository.update_plant(plant)
+            return self._changed("plant.updated", await self.plant_repository.update_plant(plant))
         return None
 
     async def delete_plant(self, plant_id: uuid.UUID) -> None:
-        plant = await self.plant_repository.get_plant_by_id(plant_id)
-        if plant and plant.photo_filename:
-            await self.file_storage.delete_file(plant.photo_filename)
+        # Subscribers are keyed by owner, which only a read can tell us
+        plant = await self.plant_repository.get_plant_by_id(plant_id) if self.events is not None else None
+        # The repository queues the photo for removal in the same transaction
         await self.plant_repository.delete_plant(plant_id)
+        if self.binding_index is not None:
+            self.binding_index.remove_plant(plant_id)
+        if plant is not None:
+            self.events.publish(plant.user_id, UserEvent("plant.deleted", plant_id))
 
     async def upload_plant_photo(self, plant_id: uuid.UUID, file: UploadFile) -> Optional[Plant]:
         plant = await self.plant_repository.get_plant_by_id(plant_id)
         if plant:
-            if plant.photo_filename:
-                await self.file_storage.delete_file(plant.photo_filename)
-            
-            file_extension = file.filename.split('.')[-1]
-            photo_filename = f"{uuid.uuid4()}.{file_extension}"
-            
-            await self.file_storage.upload_file(file, photo_filename)
+            # Content-addressed key: identical images share one stored object
+            image = None
+            if self.image_processor is not None:
+                image = await self.image_processor.process(await self._read_upload(file))
+                photo_filename = f"{hashlib.sha256(image.data).hexdigest()}.{image.extension}"
+            else:
+                content_hash = await self._hash_upload(file)
+                file_extension = file.filename.split('.')[-1].lower()
+                photo_filename = f"{content_hash}.{file_extension}"
+            if photo_filename == plant.photo_filename:
+                return plant
+
+            uploaded = False
+            if not await self.file_storage.file_exists(photo_filename):
+                await self._store_photo(file, image, photo_filename)
+                uploaded = True
             plant.photo_filename = photo_filename
-            return await self.plant_repository.update_plant(plant)
+            updated = await self.plant_repository.update_plant(plant)
+            # Once our reference has committed the cleanup worker leaves the object alone, but it may have
+            # removed it between the existence check above and that commit
+            if updated is not None and not uploaded and not await self.file_storage.file_exists(photo_filename):
+                await self._store_photo(file, image, photo_filename)
+            return self._changed("plant.updated", updated)
         return None
 
-    async def get_plant_photo(self, plant_id: uuid.UUID):
-        plant = await self.plant_repository.get_plant_by_id(plant_id)
+    async def _store_photo(self, file: UploadFile, image, photo_filename: str) -> None:
+        if image is not None:
+            await self.file_storage.upload_bytes(image.data, photo_filename, image.content_type)
+        else:
+            await self.file_storage.upload_file(file, photo_filename)
+
+    async def _read_upload(self, file: UploadFile) -> bytes:
+        if self.max_upload_bytes is None:
+            return await file.read()
+        # One byte past the limit is enough to refuse the upload without buffering the rest of it
+        data = await file.read(self.max_upload_bytes + 1)
+        if len(data) > self.max_upload_bytes:
+            raise ImageTooLargeError(f"Photo exceeds {self.max_upload_bytes} bytes")
+        return data
+
+    async def _hash_upload(self, file: UploadFile, chunk_size: int = 1024 * 1024) -> str:
+        digest = hashlib.sha256()
+        size = 0
+        while chunk := await file.read(chunk_size):
+            size += len(chunk)
+            if self.max_upload_bytes is not None and size > self.max_upload_bytes:
+                raise ImageTooLargeError(f"Photo exceeds {self.max_upload_bytes} bytes")
+            digest.update(chunk)
+        await file.seek(0)
+        return digest.hexdigest()
+
+    async def read_plant_photo(self, plant_id: uuid.UUID) -> Optional[bytes]:
+        plant = await self.get_plant_by_id(plant_id)
         if plant and plant.photo_filename:
-            return await self.file_storage.download_file(plant.photo_filename)
+            # Keys are content hashes, so concurrent readers of the same image share one fetch
+            file_name = plant.photo_filename
+            return await self._coalesce("photo", file_name, lambda _: self.file_storage.read_file(file_name))
         return None
 
+    async def get_plant_photo_size(self, plant_id: uuid.UUID) -> Optional[Tuple[str, int]]:
+        """(file_name, size) of the plant's photo, so a range can be read without fetching the whole object"""
+        plant = await self.get_plant_by_id(plant_id)
+        if plant and plant.photo_filename:
+            size = await self.file_storage.get_file_size(plant.photo_filename)
+            return (plant.photo_filename, size) if size is not None else None
+        return None
+
+    async def read_plant_photo_range(self, file_name: str, start: int, length: int) -> bytes:
+        return await self.file_storage.read_range(file_name, start, length)
+
+    async def get_plant_photo_url(self, plant_id: uuid.UUID, expires_seconds: int) -> Optional[str]:
+        plant = await self.get_plant_by_id(plant_id)
+        if plant and plant.photo_filename:
+            return await self.file_storage.presigned_url(plant.photo_filename, expires_seconds)
+        return None
+
+    def _changed(self, event_type: str, plant: Optional[Plant]) -> Optional[Plant]:
+        # Called once the repository has committed, so a rolled-back change is never announced
+        if self.events is not None and plant is not None:
+            self.events.publish(plant.user_id, UserEvent(event_type, plant.id, plant.model_dump(mode="json")))
+        return plant
+
+    async def _coalesce(self, kind: str, key, call, copy=None):
+        if self.single_flight is None:
+            return await call(self.plant_repository)
+        return await self.single_flight.do(kind, key, lambda: self._call_in_flight(call), copy)
+
+    async def _call_in_flight(self, call):
+        # A shared call outlives the request that started it, so it must not run on that request's session
+        if self.flight_repositories is None:
+            return await call(self.plant_repository)
+        async with self.flight_repositories() as repository:
+            return await call(repository)
+
     async def delete_plant_photo(self, plant_id: uuid.UUID) -> Optional[Plant]:
         plant = await self.plant_repository.get_plant_by_id(plant_id)
         if plant and plant.photo_filename:
-            await self.file_storage.delete_file(plant.photo_filename)
             plant.photo_filename = None
-            return await self.plant_repository.update_plant(plant)
+            return self._changed("plant.updated", await self.plant_repository.update_plant(plant))
         return None
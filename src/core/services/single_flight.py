@@ -0,0 +1,55 @@
+import asyncio
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+@dataclass
+class SingleFlightMetrics:
+    calls: int = 0
+    executions: int = 0  # Calls that actually reached the database / object store
+    coalesced: int = 0  # Calls that joined a call already in flight
+    failures: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+class SingleFlight:
+    """Merges concurrent identical lookups into one in-flight call per worker process.
+
+    The first caller for a key starts the call as a task; callers arriving while it
+    runs await the same task. The task is shielded, so a caller that goes away does
+    not cancel the lookup for the others. Mutable results should pass `copy` so every
+    follower gets its own object. Results are never kept once the call finishes: this
+    merges concurrent work, it is not a cache.
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, SingleFlightMetrics] = {}
+        self._in_flight: Dict[Tuple[str, Hashable], asyncio.Task] = {}
+
+    async def do(self, kind: str, key: Hashable, call: Callable[[], Awaitable[Any]],
+                 copy: Optional[Callable[[Any], Any]] = None) -> Any:
+        metrics = self.metrics.setdefault(kind, SingleFlightMetrics())
+        metrics.calls += 1
+        flight_key = (kind, key)
+        task = self._in_flight.get(flight_key)
+        if task is not None:
+            metrics.coalesced += 1
+            result = await asyncio.shield(task)
+            return copy(result) if copy is not None and result is not None else result
+
+        metrics.executions += 1
+        task = asyncio.ensure_future(call())
+        self._in_flight[flight_key] = task
+        task.add_done_callback(lambda done: self._finish(flight_key, done, metrics))
+        return await asyncio.shield(task)
+
+    def metrics_dict(self) -> dict:
+        return {kind: metrics.as_dict() for kind, metrics in self.metrics.items()}
+
+    def _finish(self, flight_key: Tuple[str, Hashable], task: asyncio.Task, metrics: SingleFlightMetrics) -> None:
+        if self._in_flight.get(flight_key) is task:
+            del self._in_flight[flight_key]
+        if task.cancelled() or task.exception() is not None:
+            metrics.failures += 1
+
+read_flights = SingleFlight()
@@ -1,32 +1,157 @@
 from fastapi import FastAPI
-from src.adapters.api.routers import plants, devices
-from alembic.config import Config
-from alembic import command
+from src.adapters.api.routers import plants, devices, admin, users, export, imports, files
+from src.adapters.workers.photo_cleanup_worker import photo_cleanup_worker
+from src.adapters.workers.device_binding_refresher import device_binding_refresher
+from src.adapters.workers.data_purge_worker import data_purge_worker
+from src.adapters.workers.leader_election import LeaderElection
+from src.adapters.images.pillow_processor import image_processor
+from src.adapters.storage.factory import get_file_storage
+from src.core.services.event_broker import event_broker
+from src.config.settings import settings
+from src.adapters.cli.migrate import run_migrations, ensure_partitions
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-def run_migrations():
-    """Run Alembic migrations automatically on startup"""
-    alembic_cfg = Config("alembic.ini")
-    command.upgrade(alembic_cfg, "head")
+from src.adapters.api.rate_limit import RateLimitMiddleware, InMemoryRateLimitBackend, RedisRateLimitBackend
+from src.adapters.api.compression import CompressionMiddleware
+from src.adapters.api.negotiation import NegotiatedResponse, ContentNegotiationMiddleware
+from src.adapters.api.request_context import RequestContextMiddleware
+from src.adapters.api.read_your_writes import ReadYourWritesMiddleware
+from src.adapters.api.profiling import RequestProfilingMiddleware
+from src.adapters.api.idempotency import IdempotencyMiddleware, FORM_OVERHEAD_BYTES
+from src.adapters.repositories.idempotency_repository_impl import IdempotencyRepositoryImpl
+from src.adapters.repositories.memory_repository_impl import InMemoryStore, InMemoryIdempotencyRepository
+from src.config.database import SessionLocal
+from src.adapters.telemetry.log_format import configure_logging
+from src.adapters.telemetry.tracing import tracer
+from src.adapters.telemetry.exporters import FileSpanExporter, OtlpHttpSpanExporter
+from src.adapters.telemetry.instrumentation import instrument_layers
+import logging
+
+configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
+logger = logging.getLogger(__name__)
+
+if settings.TRACING_ENABLED:
+    if settings.TRACE_EXPORTER == "otlp":
+        tracer.exporter = OtlpHttpSpanExporter(settings.TRACE_OTLP_ENDPOINT, "user-plant-management")
+    else:
+        tracer.exporter = FileSpanExporter(settings.TRACE_FILE_PATH)
+    instrument_layers(tracer)
+
+def check_worker_topology(config=settings) -> None:
+    """Refuse per-process state that breaks under several workers; warn about features that degrade there"""
+    if config.WEB_CONCURRENCY <= 1:
+        return
+    broken = []
+    if config.IDEMPOTENCY_ENABLED and config.IDEMPOTENCY_BACKEND == "memory":
+        broken.append("IDEMPOTENCY_BACKEND=memory")
+    if config.FILE_STORAGE_BACKEND == "memory":
+        broken.append("FILE_STORAGE_BACKEND=memory")
+    if broken:
+        raise RuntimeError(f"{', '.join(broken)} keeps its state inside one process and cannot run with "
+                           f"WEB_CONCURRENCY={config.WEB_CONCURRENCY}; use a shared backend or a single worker")
+    if config.EVENTS_ENABLED:
+        logger.warning("EVENTS_ENABLED with %d workers: an event stream only receives changes handled by the "
+                       "worker it is connected to; run a single worker for complete streams", config.WEB_CONCURRENCY)
+    if config.RATE_LIMIT_ENABLED and config.RATE_LIMIT_BACKEND == "memory":
+        logger.warning("RATE_LIMIT_BACKEND=memory with %d workers: each worker meters clients on its own, so the "
+                       "effective limit is that many times higher", config.WEB_CONCURRENCY)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Run Alembic migrations automatically on startup
-    try:
-        run_migrations()
-        print("✅ Database migrations completed successfully")
-    except Exception as e:
-        print(f"❌ Migration failed: {e}")
-        raise e  # Fail startup if migrations fail
+    check_worker_topology()
+    if settings.FILE_STORAGE_BACKEND != "minio":
+        get_file_storage()  # Fails now rather than on the first upload when local URLs have no shared signing key
+    # Single-process runs migrate here; scripts/start.sh migrates once and turns this off for its workers
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        try:
+            run_migrations()
+            await ensure_partitions()
+            logger.info("Database migrations completed successfully")
+        except Exception:
+            logger.exception("Migration failed")
+            raise  # Fail startup if migrations fail
+    # Cleanup and purging are database-wide, so only the elected process runs them
+    singleton_jobs = [job for job, enabled in [(photo_cleanup_worker, settings.PHOTO_CLEANUP_ENABLED),
+                                               (data_purge_worker, settings.PURGE_ENABLED)] if enabled]
+    leader_election = LeaderElection(singleton_jobs) if settings.BACKGROUND_JOBS_LEADER_ELECTION else None
+    if leader_election is not None:
+        leader_election.start()
+    else:
+        for job in singleton_jobs:
+            job.start()
+    # The binding index lives in each worker's memory, so every worker keeps its own refreshed
+    if settings.DEVICE_BINDING_INDEX_ENABLED:
+        await device_binding_refresher.warm()
+        logger.info("Device binding index warmed", extra={"devices": len(device_binding_refresher.index)})
+        device_binding_refresher.start()
+    event_broker.max_queue = settings.EVENTS_QUEUE_SIZE
+    event_broker.max_subscriptions_per_user = settings.EVENTS_MAX_STREAMS_PER_USER
+    tracer.start()
     yield
+    await tracer.stop()
+    if leader_election is not None:
+        await leader_election.stop()
+    await data_purge_worker.stop()
+    await device_binding_refresher.stop()
+    await photo_cleanup_worker.stop()
+    image_processor.shutdown()
 
 app = FastAPI(
     title="Rootly User Plant Management Service",
     description="Service for managing user plants, physical devices, and their associations.",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=NegotiatedResponse
 )
 
+# Innermost, so a per-request profile covers the route and little else
+if settings.PROFILE_REQUESTS_ENABLED:
+    app.add_middleware(RequestProfilingMiddleware)
+# Inside compression, so stored responses are the uncompressed bodies and replays are negotiated again
+if settings.IDEMPOTENCY_ENABLED:
+    if settings.IDEMPOTENCY_BACKEND == "memory":
+        idempotency_repository = InMemoryIdempotencyRepository(InMemoryStore())
+    else:
+        idempotency_repository = IdempotencyRepositoryImpl(SessionLocal)
+    app.add_middleware(
+        IdempotencyMiddleware,
+        repository=idempotency_repository,
+        ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+        lock_seconds=settings.IDEMPOTENCY_LOCK_SECONDS,
+        max_response_bytes=settings.IDEMPOTENCY_MAX_RESPONSE_BYTES,
+        trusted_proxies=settings.rate_limit_trusted_proxies,
+        # The largest body a covered route accepts is a photo upload
+        max_request_bytes=settings.PHOTO_MAX_UPLOAD_BYTES + FORM_OVERHEAD_BYTES,
+    )
+app.add_middleware(ContentNegotiationMiddleware)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+    )
+
+# Carries "this client just wrote" to every worker, so reads after a write skip the replicas
+if settings.database_read_urls:
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=settings.DATABASE_READ_STICKY_SECONDS)
+
+# Inside CORS, so 429 responses still carry Access-Control-Allow-Origin and browsers can read Retry-After
+if settings.RATE_LIMIT_ENABLED:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        rate_limit_backend = RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL)
+    else:
+        rate_limit_backend = InMemoryRateLimitBackend()
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=rate_limit_backend,
+        capacity=settings.RATE_LIMIT_CAPACITY,
+        refill_per_second=settings.RATE_LIMIT_REFILL_PER_SECOND,
+        max_concurrent=settings.RATE_LIMIT_MAX_CONCURRENT,
+        trusted_proxies=settings.rate_limit_trusted_proxies,
+    )
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -36,9 +161,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so rejected and failed requests are logged and traced too
+app.add_middleware(
+    RequestContextMiddleware,
+    tracer=tracer,
+    trace_sample_rate=settings.TRACE_SAMPLE_RATE if settings.TRACING_ENABLED else 0.0,
+    access_log_sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    slow_request_ms=settings.ACCESS_LOG_SLOW_MS,
+)
+
 app.include_router(plants.router)
 app.include_router(plants.user_router)
 app.include_router(devices.router)
+app.include_router(admin.router)
+app.include_router(users.router)
+app.include_router(export.router)
+app.include_router(imports.router)
+app.include_router(files.router)
 
 @app.get("/health")
 def health_check():
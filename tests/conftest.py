@@ -1,9 +1,17 @@
 import pytest
+from collections import Counter
+from contextvars import ContextVar
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 import os
 
+# The whole suite runs from one client address; keep the limiter out of functional tests
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+# Photos go to the in-process store, so the suite does not need a MinIO server
+os.environ.setdefault("FILE_STORAGE_BACKEND", "memory")
+
 # Global variables for lazy initialization
 _engine = None
 _SessionLocal = None
@@ -60,14 +68,152 @@ async def test_db():
 async def client(test_db):
     """Function-scoped fixture to create test client for each test."""
     from src.main import app
-    from src.config.database import get_session
+    from src.config.database import get_session, get_read_session, get_read_session_factory
     from httpx import ASGITransport
     
-    # Override the database session dependency
+    # Override the database session dependencies (reads share the test database)
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
+    app.dependency_overrides[get_read_session_factory] = lambda: get_test_engine()[1]
     
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
     
     # Clean up overrides after test
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def memory_store():
+    from src.adapters.repositories.memory_repository_impl import InMemoryStore
+    return InMemoryStore()
+
+@pytest.fixture(scope="function")
+async def memory_client(memory_store):
+    """Client whose plant and device endpoints run on the in-memory repositories; needs no database."""
+    from src.main import app
+    from src.adapters.api.routers import plants, devices
+    from src.adapters.repositories.memory_repository_impl import (InMemoryPlantRepository, InMemoryPhysicalDeviceRepository,
+                                                                  InMemoryAssignmentHistoryRepository)
+    from src.adapters.storage.factory import get_file_storage
+    from src.core.services.plant_service import PlantService
+    from src.core.services.physical_device_service import PhysicalDeviceService
+    from src.core.services.assignment_history_service import AssignmentHistoryService
+    from httpx import ASGITransport
+
+    def plant_service():
+        return PlantService(InMemoryPlantRepository(memory_store), get_file_storage())
+
+    def device_service():
+        return PhysicalDeviceService(InMemoryPhysicalDeviceRepository(memory_store))
+
+    for dependency in (plants.get_plant_service, plants.get_plant_read_service):
+        app.dependency_overrides[dependency] = plant_service
+    for dependency in (plants.get_device_service, plants.get_device_read_service,
+                       devices.get_device_service, devices.get_device_read_service):
+        app.dependency_overrides[dependency] = device_service
+    app.dependency_overrides[devices.get_assignment_history_service] = lambda: AssignmentHistoryService(
+        InMemoryAssignmentHistoryRepository(memory_store))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+    app.dependency_overrides.clear()
+
+
+class RequestQueries:
+    """SQL statements issued while serving a single HTTP request."""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int = 2) -> dict:
+        """Identical statements run `threshold`+ times in one request (the N+1 signature)."""
+        counts = Counter(self.statements)
+        return {statement: n for statement, n in counts.items() if n >= threshold}
+
+    def __str__(self) -> str:
+        return f"{self.method} {self.path}: {self.count} queries"
+
+
+class QueryCounter:
+    """Records the statements each client request sends through the test engine.
+
+    The request being served is kept in a context variable, so concurrent requests
+    (e.g. under asyncio.gather) each count their own statements.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self._current: ContextVar[RequestQueries | None] = ContextVar("current_request_queries", default=None)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        current = self._current.get()
+        if current is not None:
+            current.statements.append(statement)
+
+    async def on_request(self, request):
+        current = RequestQueries(request.method, request.url.path)
+        self._current.set(current)
+        self.requests.append(current)
+
+    async def on_response(self, response):
+        self._current.set(None)
+
+    def for_path(self, path: str, method: str | None = None) -> list:
+        return [r for r in self.requests if r.path == path and (method is None or r.method == method)]
+
+    def assert_max_queries(self, max_queries: int, path: str | None = None, method: str | None = None) -> None:
+        requests = self.requests if path is None else self.for_path(path, method)
+        over_budget = [r for r in requests if r.count > max_queries]
+        assert not over_budget, f"Query budget of {max_queries} exceeded:\n" + "\n".join(
+            f"  {r}\n" + "\n".join(f"    {statement}" for statement in r.statements) for r in over_budget
+        )
+
+    def assert_no_n_plus_one(self, threshold: int = 2) -> None:
+        offenders = [(r, r.repeated(threshold)) for r in self.requests if r.repeated(threshold)]
+        assert not offenders, "Repeated identical statements (possible N+1):\n" + "\n".join(
+            f"  {r}\n" + "\n".join(f"    {n}x {statement}" for statement, n in repeated.items())
+            for r, repeated in offenders
+        )
+
+
+_query_report = []
+
+@pytest.fixture(scope="function")
+async def query_counter(client, request):
+    """Count SQL statements per client request.
+
+    Tests can assert budgets directly (``query_counter.assert_max_queries(2, path=...)``)
+    or mark themselves with ``@pytest.mark.max_queries(n)`` to cap every request they make.
+    Repeated identical statements within one request are reported in the terminal summary.
+    """
+    engine, _ = get_test_engine()
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter.before_cursor_execute)
+    client.event_hooks = {"request": [counter.on_request], "response": [counter.on_response]}
+    try:
+        yield counter
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter.before_cursor_execute)
+        client.event_hooks = {"request": [], "response": []}
+        _query_report.extend((request.node.nodeid, r) for r in counter.requests)
+
+    marker = request.node.get_closest_marker("max_queries")
+    if marker is not None:
+        counter.assert_max_queries(marker.args[0])
+
+def pytest_terminal_summary(terminalreporter):
+    if not _query_report:
+        return
+    terminalreporter.section("SQL statements per request")
+    for nodeid, queries in _query_report:
+        terminalreporter.write_line(f"{queries.count:>4}  {queries.method} {queries.path}  ({nodeid})")
+        for statement, n in queries.repeated().items():
+            terminalreporter.write_line(f"      possible N+1: {n}x {' '.join(statement.split())[:120]}")
@@ -1,5 +1,6 @@
 import pytest
 import uuid
+from datetime import datetime, timedelta
 from httpx import AsyncClient
 
 @pytest.mark.asyncio
@@ -197,3 +198,79 @@ async def test_user_can_manage_own_devices(client: AsyncClient):
     # Device should be gone
     response = await client.get(f"/api/v1/devices/users/{user_id}/devices/{device_id}")
     assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_update_user_device_with_stale_if_match(client: AsyncClient):
+    user_id = str(uuid.uuid4())
+    create_response = await client.post("/api/v1/devices/", json={
+        "user_id": user_id,
+        "name": "Versioned Device",
+        "category": "sensor"
+    })
+    device_id = create_response.json()["id"]
+    etag = f'"{create_response.json()["row_version"]}"'
+
+    first = await client.put(f"/api/v1/devices/users/{user_id}/devices/{device_id}", json={"name": "Web Edit"}, headers={"If-Match": etag})
+    assert first.status_code == 200
+
+    second = await client.put(f"/api/v1/devices/users/{user_id}/devices/{device_id}", json={"name": "Mobile Edit"}, headers={"If-Match": etag})
+    assert second.status_code == 412
+
+@pytest.mark.asyncio
+async def test_device_bindings_batch_lookup(client: AsyncClient):
+    from src.core.services.device_binding_index import device_binding_index
+    # The test transport skips the lifespan warm-up; start from an empty, ready index
+    device_binding_index.begin_rebuild()
+    device_binding_index.finish_rebuild([])
+
+    user_id = str(uuid.uuid4())
+    device = (await client.post("/api/v1/devices/", json={
+        "user_id": user_id, "name": "Soil Probe", "category": "sensor"
+    })).json()
+    plant = (await client.post("/api/v1/plants/", json={
+        "user_id": user_id, "name": "Fern", "species": "Nephrolepis exaltata"
+    })).json()
+    await client.post(f"/api/v1/plants/{plant['id']}/devices/{device['id']}")
+
+    unknown_id = str(uuid.uuid4())
+    response = await client.post("/api/v1/devices/bindings", json={"device_ids": [device["id"], unknown_id]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["bindings"] == [{"device_id": device["id"], "user_id": user_id, "plant_ids": [plant["id"]]}]
+    assert data["missing"] == [unknown_id]
+
+@pytest.mark.asyncio
+async def test_device_plants_at_single_and_batch(client):
+    user_id = str(uuid.uuid4())
+    plant = (await client.post("/api/v1/plants/", json={"user_id": user_id, "name": "Fern", "species": "Nephrolepis"})).json()
+    device = (await client.post("/api/v1/devices/", json={"user_id": user_id, "name": "Probe", "category": "sensor"})).json()
+    before = datetime.utcnow() - timedelta(minutes=1)
+    assert (await client.post(f"/api/v1/plants/{plant['id']}/devices/{device['id']}")).status_code == 201
+    during = datetime.utcnow() + timedelta(seconds=1)
+
+    history = (await client.get(f"/api/v1/devices/{device['id']}/history")).json()
+    assert [(period["plant_id"], period["valid_to"]) for period in history] == [(plant["id"], None)]
+
+    response = await client.get(f"/api/v1/devices/{device['id']}/plants-at", params={"at": during.isoformat()})
+    assert response.status_code == 200
+    assert response.json()["plant_ids"] == [plant["id"]]
+
+    lookups = [{"device_id": device["id"], "at": at.isoformat()} for at in (before, during)]
+    lookups.append({"device_id": str(uuid.uuid4()), "at": during.isoformat()})
+    response = await client.post("/api/v1/devices/plants-at", json={"lookups": lookups})
+    assert response.status_code == 200
+    assert [result["plant_ids"] for result in response.json()["results"]] == [[], [plant["id"]], []]
+
+@pytest.mark.asyncio
+async def test_lookup_devices_by_ids(client: AsyncClient):
+    user_id = str(uuid.uuid4())
+    device = (await client.post("/api/v1/devices/", json={
+        "user_id": user_id, "name": "Soil Probe", "category": "sensor"
+    })).json()
+
+    unknown_id = str(uuid.uuid4())
+    response = await client.post("/api/v1/devices/lookup", json={"ids": [unknown_id, device["id"], device["id"]]})
+    assert response.status_code == 200
+    data = response.json()
+    assert [found["id"] for found in data["devices"]] == [device["id"]]
+    assert data["missing"] == [unknown_id]
@@ -0,0 +1,37 @@
+import pytest
+import csv
+import io
+import json
+import uuid
+from httpx import AsyncClient
+
+@pytest.mark.asyncio
+async def test_export_user_plants_ndjson_with_devices(client: AsyncClient):
+    user_id = str(uuid.uuid4())
+    plant = (await client.post("/api/v1/plants/", json={"user_id": user_id, "name": "Mint", "species": "Mentha"})).json()
+    device = (await client.post("/api/v1/devices/", json={"user_id": user_id, "name": "Probe", "category": "sensor"})).json()
+    await client.post(f"/api/v1/plants/{plant['id']}/devices/{device['id']}")
+
+    response = await client.get("/api/v1/export/plants", params={"user_id": user_id, "include_devices": "true"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [plant["id"]]
+    assert rows[0]["device_ids"] == [device["id"]]
+
+@pytest.mark.asyncio
+async def test_export_user_devices_csv(client: AsyncClient):
+    user_id = str(uuid.uuid4())
+    for name in ("Probe A", "Probe B"):
+        await client.post("/api/v1/devices/", json={"user_id": user_id, "name": name, "category": "sensor"})
+
+    response = await client.get("/api/v1/export/devices", params={"user_id": user_id, "format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert sorted(row["name"] for row in rows) == ["Probe A", "Probe B"]
+
+@pytest.mark.asyncio
+async def test_export_rejects_unknown_format(client: AsyncClient):
+    response = await client.get("/api/v1/export/plants", params={"format": "xml"})
+    assert response.status_code == 422
@@ -0,0 +1,34 @@
+import pytest
+import uuid
+from httpx import AsyncClient
+
+@pytest.mark.asyncio
+async def test_import_plants_csv_reports_invalid_rows(client: AsyncClient):
+    user_id = str(uuid.uuid4())
+    csv_data = (
+        "user_id,name,species\n"
+        f"{user_id},Basil,Ocimum basilicum\n"
+        f"{user_id},,Missing name\n"
+        f"{user_id},Thyme,Thymus vulgaris\n"
+    )
+
+    response = await client.post("/api/v1/import/plants", files={"file": ("plants.csv", csv_data, "text/csv")})
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["received"], report["inserted"], report["invalid"]) == (3, 2, 1)
+    assert report["errors"][0]["line"] == 3
+
+    plants = (await client.get(f"/api/v1/plants/users/{user_id}")).json()
+    assert sorted(plant["name"] for plant in plants) == ["Basil", "Thyme"]
+
+@pytest.mark.asyncio
+async def test_import_devices_ndjson_is_idempotent_with_ids(client: AsyncClient):
+    user_id, device_id = str(uuid.uuid4()), str(uuid.uuid4())
+    ndjson_data = f'{{"id": "{device_id}", "user_id": "{user_id}", "name": "Probe", "category": "sensor"}}\n'
+
+    first = await client.post("/api/v1/import/devices", files={"file": ("devices.ndjson", ndjson_data)})
+    second = await client.post("/api/v1/import/devices", files={"file": ("devices.ndjson", ndjson_data)})
+
+    assert first.json()["inserted"] == 1
+    assert second.json()["inserted"] == 0
+    assert second.json()["duplicates"] == 1
@@ -0,0 +1,36 @@
+import pytest
+from src.adapters.workers.leader_election import LeaderElection
+from tests.conftest import get_test_engine
+
+class Job:
+    def __init__(self):
+        self.running = False
+
+    def start(self):
+        self.running = True
+
+    async def stop(self):
+        self.running = False
+
+@pytest.mark.asyncio
+async def test_only_one_process_runs_the_jobs_and_another_takes_over(test_db):
+    engine, _ = get_test_engine()
+    url = engine.url.render_as_string(hide_password=False)
+    first_job, second_job = Job(), Job()
+    first = LeaderElection([first_job], url, lock_key=4207999)
+    second = LeaderElection([second_job], url, lock_key=4207999)
+    try:
+        await first.run_once()
+        await second.run_once()
+        assert (first.is_leader, first_job.running) == (True, True)
+        assert (second.is_leader, second_job.running) == (False, False)
+
+        await first.run_once()  # The leader only checks its connection
+        await first.stop()
+        assert not first_job.running
+
+        await second.run_once()
+        assert (second.is_leader, second_job.running) == (True, True)
+    finally:
+        await first.stop()
+        await second.stop()
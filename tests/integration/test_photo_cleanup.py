@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+import uuid
+from sqlalchemy import select
+from src.core.domain.plant import Plant
+from src.adapters.repositories.models import PhotoObject, PendingFileDeletion
+from src.adapters.repositories.plant_repository_impl import PlantRepositoryImpl
+from src.adapters.repositories.file_deletion_repository_impl import FileDeletionRepositoryImpl
+from tests.conftest import get_test_engine
+
+@pytest.mark.asyncio
+async def test_reacquiring_a_photo_waits_for_the_deletion_in_progress(test_db):
+    _, SessionLocal = get_test_engine()
+    file_name = f"{uuid.uuid4().hex}.webp"
+    user_id = uuid.uuid4()
+    async with SessionLocal() as session:
+        plants = PlantRepositoryImpl(session)
+        first = await plants.create_plant(Plant(user_id=user_id, name="Fern", species="Nephrolepis"))
+        second = await plants.create_plant(Plant(user_id=user_id, name="Ivy", species="Hedera"))
+        first.photo_filename = file_name
+        await plants.update_plant(first)
+        first.photo_filename = None
+        await plants.update_plant(first)  # Last reference gone: the object is queued for deletion
+
+    async with SessionLocal() as worker_session, SessionLocal() as upload_session:
+        deletions = FileDeletionRepositoryImpl(worker_session)
+        pending = [deletion for deletion in await deletions.claim_batch(1000) if deletion.file_name == file_name]
+        locked, busy = await deletions.lock_unreferenced_photos([file_name])
+        assert (locked, busy) == ({file_name}, set())
+
+        # A deduplicated upload of the same image tries to reference the object while it is being deleted
+        second.photo_filename = file_name
+        reacquire = asyncio.create_task(PlantRepositoryImpl(upload_session).update_plant(second))
+        await asyncio.sleep(0.2)
+        assert not reacquire.done()
+
+        await deletions.forget_photos([file_name])
+        await deletions.complete_batch([deletion.id for deletion in pending], {})
+        assert (await reacquire).photo_filename == file_name
+
+    async with SessionLocal() as session:
+        ref_count = (await session.execute(
+            select(PhotoObject.ref_count).where(PhotoObject.file_name == file_name))).scalar_one()
+        queued = (await session.execute(
+            select(PendingFileDeletion.id).where(PendingFileDeletion.file_name == file_name))).all()
+    # The reference landed after the deletion, on a fresh row; the uploader re-checks storage and restores it
+    assert ref_count == 1
+    assert queued == []
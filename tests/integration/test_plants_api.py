@@ -140,3 +140,85 @@ async def test_remove_device_from_plant(client: AsyncClient):
     assert devices_response.status_code == 200
     devices_data = devices_response.json()
     assert len(devices_data) == 0
+
+@pytest.mark.asyncio
+async def test_update_plant_with_stale_if_match(client: AsyncClient):
+    user_id = str(uuid.uuid4())
+    create_response = await client.post("/api/v1/plants/", json={"user_id": user_id, "name": "Versioned Plant", "species": "Species"})
+    plant_id = create_response.json()["id"]
+
+    get_response = await client.get(f"/api/v1/plants/{plant_id}")
+    etag = get_response.headers["ETag"]
+
+    first = await client.put(f"/api/v1/plants/{plant_id}", json={"name": "Web Edit", "species": "Species"}, headers={"If-Match": etag})
+    assert first.status_code == 200
+    assert first.headers["ETag"] != etag
+
+    second = await client.put(f"/api/v1/plants/{plant_id}", json={"name": "Mobile Edit", "species": "Species"}, headers={"If-Match": etag})
+    assert second.status_code == 412
+
+    response = await client.get(f"/api/v1/plants/{plant_id}")
+    assert response.json()["name"] == "Web Edit"
+
+@pytest.mark.asyncio
+async def test_photo_range_and_presigned_url(client: AsyncClient):
+    from io import BytesIO
+    from urllib.parse import urlsplit
+    from PIL import Image
+    image = BytesIO()
+    Image.new("RGB", (64, 64), color=(40, 120, 60)).save(image, format="PNG")
+    create_response = await client.post("/api/v1/plants/", json={"user_id": str(uuid.uuid4()), "name": "Fern", "species": "Nephrolepis"})
+    plant_id = create_response.json()["id"]
+    upload_response = await client.post(f"/api/v1/plants/{plant_id}/photo",
+                                        files={"file": ("fern.png", image.getvalue(), "image/png")})
+    assert upload_response.status_code == 200
+
+    photo = (await client.get(f"/api/v1/plants/{plant_id}/photo")).content
+    partial = await client.get(f"/api/v1/plants/{plant_id}/photo", headers={"Range": "bytes=0-9"})
+    assert partial.status_code == 206
+    assert partial.content == photo[:10]
+    assert partial.headers["content-range"] == f"bytes 0-9/{len(photo)}"
+    unsatisfiable = await client.get(f"/api/v1/plants/{plant_id}/photo", headers={"Range": f"bytes={len(photo)}-"})
+    assert unsatisfiable.status_code == 416
+
+    url = urlsplit((await client.get(f"/api/v1/plants/{plant_id}/photo-url")).json()["url"])
+    signed_response = await client.get(f"{url.path}?{url.query}")
+    assert signed_response.status_code == 200
+    assert signed_response.content == photo
+    tampered_query = url.query.rsplit("signature=", 1)[0] + "signature=" + "0" * 64
+    tampered_response = await client.get(f"{url.path}?{tampered_query}")
+    assert tampered_response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_create_plant_retry_with_idempotency_key(client: AsyncClient):
+    user_id = str(uuid.uuid4())
+    payload = {"user_id": user_id, "name": "Fern", "species": "Nephrolepis"}
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    first = await client.post("/api/v1/plants/", json=payload, headers=headers)
+    retry = await client.post("/api/v1/plants/", json=payload, headers=headers)
+    assert first.status_code == retry.status_code == 201
+    assert retry.json()["id"] == first.json()["id"]
+    assert retry.headers["idempotent-replayed"] == "true"
+
+    mismatch = await client.post("/api/v1/plants/", json={**payload, "name": "Ivy"}, headers=headers)
+    assert mismatch.status_code == 422
+    response = await client.get(f"/api/v1/plants/users/{user_id}")
+    assert [plant["name"] for plant in response.json()] == ["Fern"]
+
+@pytest.mark.asyncio
+async def test_lookup_plants_by_ids(client: AsyncClient):
+    user_id = str(uuid.uuid4())
+    fern = (await client.post("/api/v1/plants/", json={"user_id": user_id, "name": "Fern", "species": "Nephrolepis"})).json()
+    ivy = (await client.post("/api/v1/plants/", json={"user_id": user_id, "name": "Ivy", "species": "Hedera"})).json()
+    gone = (await client.post("/api/v1/plants/", json={"user_id": user_id, "name": "Gone", "species": "Species"})).json()
+    await client.delete(f"/api/v1/plants/{gone['id']}")
+
+    unknown_id = str(uuid.uuid4())
+    response = await client.post("/api/v1/plants/lookup", json={"ids": [ivy["id"], unknown_id, fern["id"], gone["id"]]})
+    assert response.status_code == 200
+    data = response.json()
+    assert [plant["name"] for plant in data["plants"]] == ["Ivy", "Fern"]
+    assert data["missing"] == [unknown_id, gone["id"]]
+
+    assert (await client.post("/api/v1/plants/lookup", json={"ids": []})).status_code == 422
@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+import uuid
+from httpx import AsyncClient
+
+async def create_plant_with_device(client: AsyncClient):
+    user_id = str(uuid.uuid4())
+    plant_response = await client.post("/api/v1/plants/", json={"user_id": user_id, "name": "Budget Plant", "species": "Species"})
+    device_response = await client.post("/api/v1/devices/", json={"user_id": user_id, "name": "Budget Device", "category": "sensor"})
+    return user_id, plant_response.json()["id"], device_response.json()["id"]
+
+@pytest.mark.asyncio
+async def test_plant_devices_query_budget(client: AsyncClient, query_counter):
+    user_id, plant_id, device_id = await create_plant_with_device(client)
+    await client.post(f"/api/v1/plants/{plant_id}/devices/{device_id}")
+
+    response = await client.get(f"/api/v1/plants/{plant_id}/devices")
+    assert response.status_code == 200
+
+    query_counter.assert_max_queries(2, path=f"/api/v1/plants/{plant_id}/devices", method="GET")
+    query_counter.assert_max_queries(3, path=f"/api/v1/plants/{plant_id}/devices/{device_id}", method="POST")
+
+@pytest.mark.asyncio
+@pytest.mark.max_queries(1)
+async def test_detail_endpoints_single_query(client: AsyncClient, query_counter):
+    user_id, plant_id, device_id = await create_plant_with_device(client)
+    query_counter.requests.clear()
+
+    assert (await client.get(f"/api/v1/plants/{plant_id}")).status_code == 200
+    assert (await client.get(f"/api/v1/devices/users/{user_id}/devices/{device_id}")).status_code == 200
+
+@pytest.mark.asyncio
+async def test_user_listings_have_no_n_plus_one(client: AsyncClient, query_counter):
+    user_id, plant_id, device_id = await create_plant_with_device(client)
+    for i in range(3):
+        await client.post("/api/v1/plants/", json={"user_id": user_id, "name": f"Extra {i}", "species": "Species"})
+    query_counter.requests.clear()
+
+    await client.get(f"/api/v1/plants/users/{user_id}")
+    await client.get(f"/api/v1/devices/users/{user_id}")
+
+    query_counter.assert_no_n_plus_one()
+    query_counter.assert_max_queries(1)
+
+@pytest.mark.asyncio
+async def test_lookup_endpoints_single_query(client: AsyncClient, query_counter):
+    user_id, plant_id, device_id = await create_plant_with_device(client)
+    ids = [str(uuid.uuid4()) for _ in range(50)]
+
+    assert (await client.post("/api/v1/plants/lookup", json={"ids": [plant_id, *ids]})).status_code == 200
+    assert (await client.post("/api/v1/devices/lookup", json={"ids": [device_id, *ids]})).status_code == 200
+
+    query_counter.assert_max_queries(1, path="/api/v1/plants/lookup", method="POST")
+    query_counter.assert_max_queries(1, path="/api/v1/devices/lookup", method="POST")
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_count_their_own_queries(client: AsyncClient, query_counter):
+    user_id, plant_id, device_id = await create_plant_with_device(client)
+    query_counter.requests.clear()
+
+    await asyncio.gather(client.get(f"/api/v1/plants/{plant_id}"),
+                         client.get(f"/api/v1/devices/users/{user_id}/devices/{device_id}"))
+
+    assert [r.count for r in query_counter.requests] == [1, 1]
@@ -0,0 +1,36 @@
+import os
+import uuid
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+# Requires a primary and a replica, e.g. `docker compose -f docker-compose.replicas.yml up -d`
+# with DATABASE_URL pointing at the primary and DATABASE_READ_URL at the replica.
+pytestmark = pytest.mark.skipif(not os.getenv("DATABASE_READ_URL"), reason="DATABASE_READ_URL not configured")
+
+@pytest.fixture
+async def replica_client():
+    from src.main import app
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+@pytest.mark.asyncio
+async def test_read_session_uses_replica_without_recent_writes():
+    from src.config.database import SessionLocal, engine
+
+    async with SessionLocal() as session:
+        session.info["read_only"] = True
+        bind = session.sync_session.get_bind()
+
+    assert bind is not engine.sync_engine
+
+@pytest.mark.asyncio
+async def test_read_your_writes_after_create(replica_client: AsyncClient):
+    user_id = str(uuid.uuid4())
+    create_response = await replica_client.post("/api/v1/plants/", json={"user_id": user_id, "name": "Replica Plant", "species": "Species"})
+    assert create_response.status_code == 201
+    plant_id = create_response.json()["id"]
+
+    # Served by the primary because this client has just written
+    response = await replica_client.get(f"/api/v1/plants/{plant_id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Replica Plant"
@@ -0,0 +1,212 @@
+"""The same scenarios against the SQLAlchemy and in-memory repositories, so the fast backend stays faithful."""
+import pytest
+import uuid
+from datetime import datetime, timedelta
+from src.core.domain.plant import Plant, PhysicalDevice
+
+@pytest.fixture(params=["sqlalchemy", "memory"])
+async def repositories(request):
+    if request.param == "memory":
+        from src.adapters.repositories.memory_repository_impl import (InMemoryStore, InMemoryPlantRepository,
+                                                                      InMemoryPhysicalDeviceRepository)
+        store = InMemoryStore()
+        yield InMemoryPlantRepository(store), InMemoryPhysicalDeviceRepository(store)
+        return
+    from src.adapters.repositories.plant_repository_impl import PlantRepositoryImpl
+    from src.adapters.repositories.physical_device_repository_impl import PhysicalDeviceRepositoryImpl
+    from tests.conftest import get_test_engine
+    request.getfixturevalue("test_db")
+    _, SessionLocal = get_test_engine()
+    async with SessionLocal() as session:
+        yield PlantRepositoryImpl(session), PhysicalDeviceRepositoryImpl(session)
+
+@pytest.fixture(params=["sqlalchemy", "memory"])
+async def history_repositories(request):
+    if request.param == "memory":
+        from src.adapters.repositories.memory_repository_impl import (InMemoryStore, InMemoryPlantRepository,
+                                                                      InMemoryPhysicalDeviceRepository,
+                                                                      InMemoryAssignmentHistoryRepository)
+        store = InMemoryStore()
+        yield InMemoryPlantRepository(store), InMemoryPhysicalDeviceRepository(store), InMemoryAssignmentHistoryRepository(store)
+        return
+    from src.adapters.repositories.plant_repository_impl import PlantRepositoryImpl
+    from src.adapters.repositories.physical_device_repository_impl import PhysicalDeviceRepositoryImpl
+    from src.adapters.repositories.assignment_history_repository_impl import AssignmentHistoryRepositoryImpl
+    from tests.conftest import get_test_engine
+    request.getfixturevalue("test_db")
+    _, SessionLocal = get_test_engine()
+    async with SessionLocal() as session:
+        yield PlantRepositoryImpl(session), PhysicalDeviceRepositoryImpl(session), AssignmentHistoryRepositoryImpl(session)
+
+def _device(user_id, name="Sensor"):
+    return PhysicalDevice(user_id=user_id, name=name, category="sensor")
+
+@pytest.mark.asyncio
+async def test_plant_lifecycle(repositories):
+    plants, _ = repositories
+    user_id = uuid.uuid4()
+    plant = await plants.create_plant(Plant(user_id=user_id, name="Fern", species="Nephrolepis"))
+    await plants.create_plant(Plant(user_id=user_id, name="Ivy", species="Hedera"))
+
+    assert (await plants.get_plant_by_id(plant.id)).name == "Fern"
+    assert sorted(p.name for p in await plants.get_plants_by_user_id(user_id)) == ["Fern", "Ivy"]
+
+    plant.name = "Boston fern"
+    updated = await plants.update_plant(plant)
+    assert (updated.name, updated.row_version) == ("Boston fern", 2)
+
+    assert await plants.update_plant_if_version(plant.id, [1], {"name": "Stale"}) is None
+    updated = await plants.update_plant_if_version(plant.id, [2, 5], {"name": "Sword fern"})
+    assert (updated.name, updated.row_version) == ("Sword fern", 3)
+
+    await plants.delete_plant(plant.id)
+    assert await plants.get_plant_by_id(plant.id) is None
+    assert [p.name for p in await plants.get_plants_by_user_id(user_id)] == ["Ivy"]
+    assert await plants.update_plant_if_version(plant.id, [3], {"name": "Ghost"}) is None
+
+@pytest.mark.asyncio
+async def test_photo_references_survive_until_purge(repositories):
+    plants, _ = repositories
+    file_name = f"{uuid.uuid4().hex}.webp"
+    plant = await plants.create_plant(Plant(user_id=uuid.uuid4(), name="Fern", species="Nephrolepis"))
+    plant.photo_filename = file_name
+    await plants.update_plant(plant)
+
+    await plants.delete_plant(plant.id)
+    assert await plants.get_referenced_photo_filenames([file_name, "other.webp"]) == {file_name}
+
+    assert await plants.purge_deleted_plants(datetime.utcnow() + timedelta(seconds=1), limit=1000) >= 1
+    assert await plants.get_referenced_photo_filenames([file_name]) == set()
+
+@pytest.mark.asyncio
+async def test_device_ownership_and_assignments(repositories):
+    plants, devices = repositories
+    user_id, other_user_id = uuid.uuid4(), uuid.uuid4()
+    plant = await plants.create_plant(Plant(user_id=user_id, name="Fern", species="Nephrolepis"))
+    device = await devices.create_device(_device(user_id))
+    spare = await devices.create_device(_device(user_id, "Spare"))
+
+    assert await devices.get_device_by_id_and_user(device.id, other_user_id) is None
+    assert await devices.update_device_if_version(device.id, other_user_id, [1], {"name": "Stolen"}) is None
+    updated = await devices.update_device_if_version(device.id, user_id, [1], {"name": "Probe", "category": "microcontroller"})
+    assert (updated.name, updated.category.value, updated.row_version) == ("Probe", "microcontroller", 2)
+
+    await devices.assign_device_to_plant(plant.id, device.id)
+    await devices.assign_device_to_plant(plant.id, spare.id)
+    assert sorted(d.name for d in await devices.get_devices_by_plant_id(plant.id)) == ["Probe", "Spare"]
+    await devices.remove_device_from_plant(plant.id, spare.id)
+    assert [d.name for d in await devices.get_devices_by_plant_id(plant.id)] == ["Probe"]
+
+    await devices.delete_device(device.id)
+    assert await devices.get_devices_by_plant_id(plant.id) == []
+    assert [d.name for d in await devices.get_devices_by_user_id(user_id)] == ["Spare"]
+
+@pytest.mark.asyncio
+async def test_device_bindings_skip_deleted_rows(repositories):
+    plants, devices = repositories
+    user_id = uuid.uuid4()
+    plant = await plants.create_plant(Plant(user_id=user_id, name="Fern", species="Nephrolepis"))
+    gone_plant = await plants.create_plant(Plant(user_id=user_id, name="Ivy", species="Hedera"))
+    device = await devices.create_device(_device(user_id))
+    await devices.assign_device_to_plant(plant.id, device.id)
+    await devices.assign_device_to_plant(gone_plant.id, device.id)
+    await plants.delete_plant(gone_plant.id)
+
+    bindings = [row for row in await devices.get_device_bindings() if row[0] == device.id]
+    assert bindings == [(device.id, user_id, plant.id)]
+    future = datetime.utcnow() + timedelta(minutes=5)
+    assert [row for row in await devices.get_device_bindings(future) if row[0] == device.id] == []
+
+@pytest.mark.asyncio
+async def test_device_unbindings_report_deleted_devices_and_ended_assignments(repositories):
+    plants, devices = repositories
+    user_id = uuid.uuid4()
+    since = datetime.utcnow() - timedelta(seconds=1)
+    plant = await plants.create_plant(Plant(user_id=user_id, name="Fern", species="Nephrolepis"))
+    gone_plant = await plants.create_plant(Plant(user_id=user_id, name="Ivy", species="Hedera"))
+    device = await devices.create_device(_device(user_id))
+    gone_device = await devices.create_device(_device(user_id))
+    await devices.assign_device_to_plant(plant.id, device.id)
+    await devices.assign_device_to_plant(gone_plant.id, device.id)
+    await devices.remove_device_from_plant(plant.id, device.id)
+    await plants.delete_plant(gone_plant.id)
+    await devices.delete_device(gone_device.id)
+
+    removed, detached = await devices.get_device_unbindings(since)
+    assert gone_device.id in removed and device.id not in removed
+    assert {pair for pair in detached if pair[0] == device.id} == {(device.id, plant.id), (device.id, gone_plant.id)}
+    future = datetime.utcnow() + timedelta(minutes=5)
+    assert await devices.get_device_unbindings(future) == ([], [])
+
+@pytest.mark.asyncio
+async def test_lookup_by_ids_skips_unknown_and_deleted(repositories):
+    plants, devices = repositories
+    user_id = uuid.uuid4()
+    fern = await plants.create_plant(Plant(user_id=user_id, name="Fern", species="Nephrolepis"))
+    ivy = await plants.create_plant(Plant(user_id=user_id, name="Ivy", species="Hedera"))
+    device = await devices.create_device(_device(user_id))
+    gone = await devices.create_device(_device(user_id, "Gone"))
+    await plants.delete_plant(ivy.id)
+    await devices.delete_device(gone.id)
+
+    found = await plants.get_plants_by_ids([fern.id, ivy.id, uuid.uuid4(), fern.id])
+    assert [p.name for p in found] == ["Fern"]
+    assert [d.name for d in await devices.get_devices_by_ids([gone.id, device.id, uuid.uuid4()])] == ["Sensor"]
+
+@pytest.mark.asyncio
+async def test_user_data_soft_delete_and_purge(repositories):
+    plants, devices = repositories
+    user_id = uuid.uuid4()
+    for name in ["A", "B", "C"]:
+        await plants.create_plant(Plant(user_id=user_id, name=name, species="Species"))
+        await devices.create_device(_device(user_id, name))
+
+    assert len(await plants.soft_delete_plants_by_user(user_id, limit=2)) == 2
+    assert await plants.user_has_live_plants(user_id)
+    assert len(await plants.soft_delete_plants_by_user(user_id, limit=2)) == 1
+    assert not await plants.user_has_live_plants(user_id)
+    assert await plants.soft_delete_plants_by_user(user_id, limit=2) == []
+    assert len(await devices.soft_delete_devices_by_user(user_id, limit=10)) == 3
+    assert not await devices.user_has_live_devices(user_id)
+    assert await plants.get_plants_by_user_id(user_id) == []
+    assert await devices.get_devices_by_user_id(user_id) == []
+
+    assert await devices.purge_deleted_devices(datetime.utcnow() - timedelta(hours=1), limit=1000) == 0
+    assert await devices.purge_deleted_devices(datetime.utcnow() + timedelta(seconds=1), limit=1000) >= 3
+
+@pytest.mark.asyncio
+async def test_assignment_history_records_closed_and_open_periods(history_repositories):
+    plants, devices, history = history_repositories
+    user_id = uuid.uuid4()
+    fern = await plants.create_plant(Plant(user_id=user_id, name="Fern", species="Nephrolepis"))
+    ivy = await plants.create_plant(Plant(user_id=user_id, name="Ivy", species="Hedera"))
+    device = await devices.create_device(_device(user_id))
+
+    await devices.assign_device_to_plant(fern.id, device.id)
+    await devices.remove_device_from_plant(fern.id, device.id)
+    await devices.assign_device_to_plant(ivy.id, device.id)
+
+    periods = await history.get_device_history(device.id)
+    assert [period.plant_id for period in periods] == [fern.id, ivy.id]
+    assert periods[0].valid_to is not None and periods[1].valid_to is None
+    at_fern = periods[0].valid_from
+    assert [p.plant_id for p in await history.get_periods([device.id], at_fern, at_fern)] == [fern.id]
+    now = datetime.utcnow() + timedelta(seconds=1)
+    assert [p.plant_id for p in await history.get_periods([device.id, device.id], now, now)] == [ivy.id]
+
+    await plants.delete_plant(ivy.id)
+    assert all(period.valid_to is not None for period in await history.get_device_history(device.id))
+    await devices.delete_device(device.id)
+    assert await devices.purge_deleted_devices(datetime.utcnow() + timedelta(seconds=1), limit=1000) >= 1
+    assert await history.get_device_history(device.id) == []
+
+@pytest.mark.asyncio
+async def test_memory_client_serves_plant_and_device_endpoints(memory_client, memory_store):
+    user_id = str(uuid.uuid4())
+    plant = (await memory_client.post("/api/v1/plants/", json={"user_id": user_id, "name": "Fern", "species": "Nephrolepis"})).json()
+    device = (await memory_client.post("/api/v1/devices/", json={"user_id": user_id, "name": "Probe", "category": "sensor"})).json()
+
+    assert (await memory_client.post(f"/api/v1/plants/{plant['id']}/devices/{device['id']}")).status_code == 201
+    response = await memory_client.get(f"/api/v1/plants/{plant['id']}/devices")
+    assert [d["name"] for d in response.json()] == ["Probe"]
+    assert len(memory_store.plants) == 1
@@ -0,0 +1,31 @@
+import pytest
+import uuid
+from httpx import AsyncClient
+
+@pytest.mark.asyncio
+async def test_delete_user_data_queues_job(client: AsyncClient):
+    user_id = str(uuid.uuid4())
+    await client.post("/api/v1/plants/", json={"user_id": user_id, "name": "Aloe", "species": "Aloe vera"})
+
+    response = await client.delete(f"/api/v1/users/{user_id}/data")
+    assert response.status_code == 202
+    assert response.json()["status"] == "pending"
+
+    status_response = await client.get(f"/api/v1/users/{user_id}/data/deletion")
+    assert status_response.status_code == 200
+    assert status_response.json()["user_id"] == user_id
+
+@pytest.mark.asyncio
+async def test_user_data_deletion_status_not_found(client: AsyncClient):
+    response = await client.get(f"/api/v1/users/{uuid.uuid4()}/data/deletion")
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_soft_deleted_plant_is_hidden_from_listings(client: AsyncClient):
+    user_id = str(uuid.uuid4())
+    plant = (await client.post("/api/v1/plants/", json={"user_id": user_id, "name": "Ivy", "species": "Hedera helix"})).json()
+
+    await client.delete(f"/api/v1/plants/{plant['id']}")
+
+    assert (await client.get(f"/api/v1/plants/{plant['id']}")).status_code == 404
+    assert (await client.get(f"/api/v1/plants/users/{user_id}")).json() == []
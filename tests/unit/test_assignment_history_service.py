@@ -0,0 +1,53 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from src.core.domain.assignment_history import DeviceAssignmentPeriod
+from src.core.services.assignment_history_service import AssignmentHistoryService
+
+T0 = datetime(2026, 3, 1, 12, 0)
+
+@pytest.fixture
+def mock_history_repository():
+    return AsyncMock()
+
+@pytest.fixture
+def history_service(mock_history_repository):
+    return AssignmentHistoryService(mock_history_repository)
+
+def test_period_is_half_open():
+    period = DeviceAssignmentPeriod(device_id=uuid.uuid4(), plant_id=uuid.uuid4(), valid_from=T0,
+                                    valid_to=T0 + timedelta(hours=1))
+    assert period.covers(T0)
+    assert not period.covers(T0 + timedelta(hours=1))
+    assert not period.covers(T0 - timedelta(microseconds=1))
+    assert DeviceAssignmentPeriod(device_id=uuid.uuid4(), plant_id=uuid.uuid4(), valid_from=T0).covers(T0 + timedelta(days=900))
+
+@pytest.mark.asyncio
+async def test_batch_fetches_once_and_resolves_each_lookup(history_service, mock_history_repository):
+    device, other = uuid.uuid4(), uuid.uuid4()
+    fern, ivy = uuid.uuid4(), uuid.uuid4()
+    mock_history_repository.get_periods.return_value = [
+        DeviceAssignmentPeriod(device_id=device, plant_id=fern, valid_from=T0, valid_to=T0 + timedelta(hours=1)),
+        DeviceAssignmentPeriod(device_id=device, plant_id=ivy, valid_from=T0 + timedelta(hours=1)),
+    ]
+    lookups = [(device, T0 + timedelta(minutes=30)), (other, T0), (device, T0 + timedelta(hours=2)), (device, T0)]
+
+    assert await history_service.get_plants_at_batch(lookups) == [[fern], [], [ivy], [fern]]
+    mock_history_repository.get_periods.assert_called_once_with([device, other], T0, T0 + timedelta(hours=2))
+
+@pytest.mark.asyncio
+async def test_aware_timestamps_are_compared_as_utc(history_service, mock_history_repository):
+    device, plant = uuid.uuid4(), uuid.uuid4()
+    mock_history_repository.get_periods.return_value = [
+        DeviceAssignmentPeriod(device_id=device, plant_id=plant, valid_from=T0, valid_to=T0 + timedelta(hours=1)),
+    ]
+    local = (T0 + timedelta(minutes=10)).replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=2)))
+
+    assert await history_service.get_plants_at(device, local) == [plant]
+    mock_history_repository.get_periods.assert_called_once_with([device], T0 + timedelta(minutes=10), T0 + timedelta(minutes=10))
+
+@pytest.mark.asyncio
+async def test_empty_batch_skips_the_repository(history_service, mock_history_repository):
+    assert await history_service.get_plants_at_batch([]) == []
+    mock_history_repository.get_periods.assert_not_called()
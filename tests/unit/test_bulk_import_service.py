@@ -0,0 +1,61 @@
+import pytest
+import threading
+from unittest.mock import AsyncMock
+from src.core.services.bulk_import_service import BulkImportService
+
+def _to_record(values: dict) -> tuple:
+    if not values.get("name"):
+        raise ValueError("name: Field required")
+    return (values["name"],)
+
+@pytest.fixture
+def mock_import_repository():
+    repository = AsyncMock()
+    repository.insert_plants.side_effect = lambda records: len(records)
+    return repository
+
+@pytest.mark.asyncio
+async def test_import_loads_valid_rows_in_batches_and_reports_errors(mock_import_repository):
+    service = BulkImportService(mock_import_repository, batch_size=2)
+    rows = [(2, {"name": "a"}), (3, {}), (4, {"name": "b"}), (5, {"name": "c"})]
+    progress = []
+
+    report = await service.import_plants(rows, _to_record, lambda r: progress.append(r.received))
+
+    assert [call.args[0] for call in mock_import_repository.insert_plants.call_args_list] == [[("a",)], [("b",), ("c",)]]
+    assert (report.received, report.inserted, report.invalid, report.batches) == (4, 3, 1, 2)
+    assert [(error.line, error.error) for error in report.errors] == [(3, "name: Field required")]
+    assert progress == [2, 4]
+
+@pytest.mark.asyncio
+async def test_import_counts_skipped_existing_rows_as_duplicates(mock_import_repository):
+    mock_import_repository.insert_plants.side_effect = lambda records: len(records) - 1
+    service = BulkImportService(mock_import_repository)
+
+    report = await service.import_plants([(1, {"name": "a"}), (2, {"name": "b"})], _to_record)
+
+    assert report.inserted == 1
+    assert report.duplicates == 1
+
+@pytest.mark.asyncio
+async def test_import_caps_reported_errors(mock_import_repository):
+    service = BulkImportService(mock_import_repository, max_errors=2)
+
+    report = await service.import_plants([(line, {}) for line in range(5)], _to_record)
+
+    assert report.invalid == 5
+    assert len(report.errors) == 2
+
+@pytest.mark.asyncio
+async def test_rows_are_parsed_and_validated_off_the_event_loop(mock_import_repository):
+    validated_on = set()
+
+    def to_record(values: dict) -> tuple:
+        validated_on.add(threading.get_ident())
+        return (values["name"],)
+
+    report = await BulkImportService(mock_import_repository, batch_size=2).import_plants(
+        [(2, {"name": "a"}), (3, {"name": "b"}), (4, {"name": "c"})], to_record)
+
+    assert report.inserted == 3
+    assert threading.get_ident() not in validated_on
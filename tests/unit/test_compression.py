@@ -0,0 +1,93 @@
+import gzip
+import json
+import pytest
+from httpx import AsyncClient, ASGITransport
+from src.adapters.api.compression import CompressionMiddleware, negotiate_encoding
+from src.adapters.api.negotiation import ContentNegotiationMiddleware, negotiate_media_type, msgpack
+
+LARGE_JSON = json.dumps([{"name": f"Plant {i}", "species": "Ficus"} for i in range(200)]).encode()
+
+def make_app(body: bytes, content_type: bytes):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+    return CompressionMiddleware(app, minimum_size=1024)
+
+def test_negotiate_encoding_honours_q_values_and_server_order():
+    available = ["zstd", "br", "gzip"]
+    assert negotiate_encoding("gzip, br", available) == "br"
+    assert negotiate_encoding("br;q=0.5, gzip", available) == "gzip"
+    assert negotiate_encoding("*", available) == "zstd"
+    assert negotiate_encoding("gzip;q=0, identity", available) is None
+
+@pytest.mark.asyncio
+async def test_large_json_is_gzipped():
+    async with AsyncClient(transport=ASGITransport(app=make_app(LARGE_JSON, b"application/json")), base_url="http://test") as client:
+        response = await client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(LARGE_JSON)
+    assert response.content == LARGE_JSON  # httpx decodes gzip transparently
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body,content_type", [
+    (b"{}", b"application/json"),
+    (gzip.compress(LARGE_JSON), b"image/webp"),
+])
+async def test_small_and_already_compressed_bodies_are_untouched(body, content_type):
+    async with AsyncClient(transport=ASGITransport(app=make_app(body, content_type)), base_url="http://test") as client:
+        response = await client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.content == body
+
+@pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+def test_msgpack_only_when_preferred_over_json():
+    assert negotiate_media_type("application/msgpack") == "application/msgpack"
+    assert negotiate_media_type("application/json, application/msgpack;q=0.5") == "application/json"
+    assert negotiate_media_type("application/x-msgpack, */*;q=0.1") == "application/msgpack"
+
+@pytest.mark.asyncio
+async def test_streamed_body_drops_content_length_and_every_path_varies():
+    async def streaming_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        for start in range(0, len(LARGE_JSON), 1000):
+            await send({"type": "http.response.body", "body": LARGE_JSON[start:start + 1000], "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    app = CompressionMiddleware(streaming_app, minimum_size=1024)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        streamed = await client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert streamed.headers["content-encoding"] == "gzip"
+    assert "content-length" not in streamed.headers
+    assert streamed.content == LARGE_JSON
+
+    for body, accept_encoding in [(LARGE_JSON, "identity"), (b"{}", "gzip")]:
+        async with AsyncClient(transport=ASGITransport(app=make_app(body, b"application/json")),
+                               base_url="http://test") as client:
+            response = await client.get("/", headers={"Accept-Encoding": accept_encoding})
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+@pytest.mark.asyncio
+async def test_negotiated_responses_vary_on_accept():
+    def negotiated_app(body: bytes, content_type: bytes):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200,
+                        "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]})
+            await send({"type": "http.response.body", "body": body})
+        return CompressionMiddleware(ContentNegotiationMiddleware(app), minimum_size=1024)
+
+    async with AsyncClient(transport=ASGITransport(app=negotiated_app(LARGE_JSON, b"application/json")),
+                           base_url="http://test") as client:
+        compressed = await client.get("/", headers={"Accept-Encoding": "gzip", "Accept": "application/msgpack"})
+        plain = await client.get("/", headers={"Accept-Encoding": "identity"})
+    assert compressed.headers["vary"] == "Accept, Accept-Encoding"
+    assert plain.headers["vary"] == "Accept, Accept-Encoding"
+
+    async with AsyncClient(transport=ASGITransport(app=negotiated_app(b"PNG", b"image/png")),
+                           base_url="http://test") as client:
+        photo = await client.get("/")
+    assert "vary" not in photo.headers
@@ -0,0 +1,90 @@
+import pytest
+import uuid
+from datetime import datetime
+from unittest.mock import AsyncMock
+from src.core.services.data_purge_service import DataPurgeService
+from src.core.services.device_binding_index import DeviceBindingIndex
+
+@pytest.fixture
+def mock_plant_repository():
+    repository = AsyncMock()
+    repository.user_has_live_plants.return_value = False
+    return repository
+
+@pytest.fixture
+def mock_device_repository():
+    repository = AsyncMock()
+    repository.user_has_live_devices.return_value = False
+    return repository
+
+@pytest.fixture
+def mock_job_repository():
+    return AsyncMock()
+
+@pytest.fixture
+def purge_service(mock_plant_repository, mock_device_repository, mock_job_repository):
+    return DataPurgeService(mock_plant_repository, mock_device_repository, mock_job_repository)
+
+@pytest.mark.asyncio
+async def test_user_deletion_batch_continues_while_batches_are_full(purge_service, mock_plant_repository,
+                                                                    mock_device_repository, mock_job_repository):
+    user_id = uuid.uuid4()
+    mock_plant_repository.soft_delete_plants_by_user.return_value = [uuid.uuid4(), uuid.uuid4()]
+    mock_device_repository.soft_delete_devices_by_user.return_value = [uuid.uuid4()]
+
+    completed = await purge_service.delete_user_data_batch(user_id, batch_size=2)
+
+    assert completed is False
+    mock_job_repository.record_progress.assert_called_once_with(user_id, 2, 1, False)
+
+@pytest.mark.asyncio
+async def test_user_deletion_batch_completes_and_updates_binding_index(mock_plant_repository, mock_device_repository,
+                                                                       mock_job_repository):
+    user_id, device_id, plant_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    index = DeviceBindingIndex()
+    index.begin_rebuild()
+    index.finish_rebuild([(device_id, user_id, plant_id)])
+    mock_plant_repository.soft_delete_plants_by_user.return_value = [plant_id]
+    mock_device_repository.soft_delete_devices_by_user.return_value = [device_id]
+    service = DataPurgeService(mock_plant_repository, mock_device_repository, mock_job_repository, index)
+
+    completed = await service.delete_user_data_batch(user_id, batch_size=100)
+
+    assert completed is True
+    mock_job_repository.record_progress.assert_called_once_with(user_id, 1, 1, True)
+    assert index.lookup([device_id]) == ({}, [device_id])
+
+@pytest.mark.asyncio
+async def test_short_batch_does_not_complete_while_locked_rows_remain(purge_service, mock_plant_repository,
+                                                                     mock_device_repository, mock_job_repository):
+    user_id = uuid.uuid4()
+    # A concurrent update holds the user's other plant, so SKIP LOCKED returned a short batch
+    mock_plant_repository.soft_delete_plants_by_user.return_value = [uuid.uuid4()]
+    mock_device_repository.soft_delete_devices_by_user.return_value = []
+    mock_plant_repository.user_has_live_plants.return_value = True
+
+    assert await purge_service.delete_user_data_batch(user_id, batch_size=100) is False
+    mock_job_repository.record_progress.assert_called_once_with(user_id, 1, 0, False)
+
+@pytest.mark.asyncio
+async def test_purge_deleted_purges_plants_and_devices(purge_service, mock_plant_repository, mock_device_repository):
+    cutoff = datetime.utcnow()
+    mock_plant_repository.purge_deleted_plants.return_value = 3
+    mock_device_repository.purge_deleted_devices.return_value = 2
+
+    assert await purge_service.purge_deleted(cutoff, 50) == 5
+    mock_plant_repository.purge_deleted_plants.assert_called_once_with(cutoff, 50)
+    mock_device_repository.purge_deleted_devices.assert_called_once_with(cutoff, 50)
+
+@pytest.mark.asyncio
+async def test_expired_idempotency_keys_are_purged_when_a_repository_is_configured(
+        purge_service, mock_plant_repository, mock_device_repository, mock_job_repository):
+    now = datetime.utcnow()
+    assert await purge_service.purge_expired_idempotency_keys(now, 50) == 0
+
+    idempotency_repository = AsyncMock()
+    idempotency_repository.purge_expired.return_value = 7
+    service = DataPurgeService(mock_plant_repository, mock_device_repository, mock_job_repository,
+                               idempotency_repository=idempotency_repository)
+    assert await service.purge_expired_idempotency_keys(now, 50) == 7
+    idempotency_repository.purge_expired.assert_called_once_with(now, 50)
@@ -0,0 +1,91 @@
+import uuid
+from src.core.services.device_binding_index import DeviceBindingIndex
+
+def test_lookup_returns_owner_plants_and_missing_ids():
+    index = DeviceBindingIndex()
+    device_id, user_id, plant_a, plant_b = (uuid.uuid4() for _ in range(4))
+    unbound_device = uuid.uuid4()
+    index.begin_rebuild()
+    index.finish_rebuild([(device_id, user_id, plant_a), (device_id, user_id, plant_b), (unbound_device, user_id, None)])
+
+    unknown = uuid.uuid4()
+    found, missing = index.lookup([device_id, unbound_device, unknown])
+
+    assert index.ready
+    assert found[device_id][0] == user_id
+    assert set(found[device_id][1]) == {plant_a, plant_b}
+    assert found[unbound_device] == (user_id, [])
+    assert missing == [unknown]
+
+def test_write_through_updates_index():
+    index = DeviceBindingIndex()
+    device_id, user_id, plant_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    index.add_device(device_id, user_id)
+    index.attach(device_id, plant_id)
+    assert index.lookup([device_id])[0][device_id] == (user_id, [plant_id])
+
+    index.detach(device_id, plant_id)
+    assert index.lookup([device_id])[0][device_id] == (user_id, [])
+
+    index.attach(device_id, plant_id)
+    index.remove_plant(plant_id)
+    assert index.lookup([device_id])[0][device_id] == (user_id, [])
+
+    index.remove_device(device_id)
+    assert index.lookup([device_id]) == ({}, [device_id])
+
+def test_writes_during_rebuild_are_replayed_onto_new_snapshot():
+    index = DeviceBindingIndex()
+    stale_device, new_device, user_id, plant_id = (uuid.uuid4() for _ in range(4))
+
+    index.begin_rebuild()
+    # Snapshot was read before these writes landed
+    index.add_device(new_device, user_id)
+    index.attach(new_device, plant_id)
+    index.remove_device(stale_device)
+    index.finish_rebuild([(stale_device, user_id, None)])
+
+    found, missing = index.lookup([new_device, stale_device])
+    assert found == {new_device: (user_id, [plant_id])}
+    assert missing == [stale_device]
+
+def test_merge_adds_rows_on_top_of_index():
+    index = DeviceBindingIndex()
+    device_id, user_id, plant_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    index.begin_rebuild()
+    index.finish_rebuild([(device_id, user_id, None)])
+
+    index.merge([(device_id, user_id, plant_id)])
+
+    assert index.lookup([device_id])[0][device_id] == (user_id, [plant_id])
+
+def test_merge_applies_removals_before_additions():
+    index = DeviceBindingIndex()
+    gone_device, moved_device, user_id, plant_a, plant_b = (uuid.uuid4() for _ in range(5))
+    index.begin_rebuild()
+    index.finish_rebuild([(gone_device, user_id, plant_a), (moved_device, user_id, plant_a), (moved_device, user_id, plant_b)])
+
+    # moved_device left plant_b, left plant_a and came back to it within the window
+    index.merge([(moved_device, user_id, plant_a)], removed_devices=[gone_device],
+                detached=[(moved_device, plant_a), (moved_device, plant_b)])
+
+    found, missing = index.lookup([gone_device, moved_device])
+    assert found == {moved_device: (user_id, [plant_a])}
+    assert missing == [gone_device]
+
+def test_writes_during_merge_win_over_the_loaded_rows():
+    index = DeviceBindingIndex()
+    device_id, user_id, plant_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    index.begin_rebuild()
+    index.finish_rebuild([(device_id, user_id, plant_id)])
+
+    index.begin_merge()
+    # The load read the assignment before this worker removed it
+    index.detach(device_id, plant_id)
+    index.merge([(device_id, user_id, plant_id)])
+
+    assert index.lookup([device_id])[0][device_id] == (user_id, [])
+    index.detach(device_id, plant_id)
+    index.merge([])  # The journal is gone once a merge has replayed it
+    assert index.lookup([device_id])[0][device_id] == (user_id, [])
@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+import uuid
+from unittest.mock import AsyncMock
+from src.core.domain.plant import Plant
+from src.core.services.event_broker import EventBroker, EventBrokerFullError, UserEvent
+from src.core.services.plant_service import PlantService
+
+@pytest.mark.asyncio
+async def test_events_fan_out_to_the_owners_subscribers_only():
+    broker = EventBroker()
+    user_id, other_user_id = uuid.uuid4(), uuid.uuid4()
+    tabs = [broker.subscribe(user_id) for _ in range(3)]
+    other = broker.subscribe(other_user_id)
+
+    assert broker.publish(user_id, UserEvent("plant.created", uuid.uuid4())) == 3
+
+    events = [await tab.next(timeout=1) for tab in tabs]
+    assert {event.type for event in events} == {"plant.created"}
+    assert events[0] is events[1]  # one object shared by every subscriber
+    assert await other.next(timeout=0.01) is None
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_cut_off_without_affecting_others():
+    broker = EventBroker(max_queue=2)
+    user_id = uuid.uuid4()
+    slow, fast = broker.subscribe(user_id), broker.subscribe(user_id)
+
+    for n in range(3):
+        broker.publish(user_id, UserEvent("device.updated", uuid.uuid4(), {"n": n}))
+        await fast.next(timeout=1)
+
+    assert slow.overflowed
+    assert [(await slow.next()).data["n"] for _ in range(2)] == [0, 1]
+    with pytest.raises(StopAsyncIteration):
+        await slow.next()
+    assert broker.subscription_count == 1
+    assert broker.metrics_dict()["dropped"] == 1
+
+def test_streams_per_user_are_capped():
+    broker = EventBroker(max_subscriptions_per_user=2)
+    user_id = uuid.uuid4()
+    first = broker.subscribe(user_id)
+    broker.subscribe(user_id)
+    with pytest.raises(EventBrokerFullError):
+        broker.subscribe(user_id)
+    first.close()
+    broker.subscribe(user_id)
+
+@pytest.mark.asyncio
+async def test_ten_thousand_idle_connections():
+    broker = EventBroker()
+    users = [uuid.uuid4() for _ in range(2_000)]
+    subscriptions = [broker.subscribe(users[n % len(users)]) for n in range(10_000)]
+    assert broker.subscription_count == 10_000
+
+    assert broker.publish(users[0], UserEvent("plant.updated", uuid.uuid4())) == 5
+    waiting = [asyncio.ensure_future(subscription.next()) for subscription in subscriptions[:5 * len(users):len(users)]]
+    assert all(event.type == "plant.updated" for event in await asyncio.gather(*waiting))
+
+    for subscription in subscriptions:
+        subscription.close()
+    assert broker.metrics_dict()["users"] == 0
+
+@pytest.mark.asyncio
+async def test_plant_service_publishes_after_the_repository_commits():
+    broker = EventBroker()
+    user_id = uuid.uuid4()
+    subscription = broker.subscribe(user_id)
+    repository = AsyncMock()
+    repository.create_plant.side_effect = lambda plant: plant
+    service = PlantService(repository, AsyncMock(), events=broker)
+
+    plant = await service.create_plant(user_id, "Fern", "Nephrolepis")
+    repository.get_plant_by_id.return_value = plant
+    await service.delete_plant(plant.id)
+
+    created, deleted = await subscription.next(timeout=1), await subscription.next(timeout=1)
+    assert (created.type, created.resource_id, created.data["name"]) == ("plant.created", plant.id, "Fern")
+    assert (deleted.type, deleted.resource_id) == ("plant.deleted", plant.id)
+
+@pytest.mark.asyncio
+async def test_failed_write_publishes_nothing():
+    broker = EventBroker()
+    user_id = uuid.uuid4()
+    subscription = broker.subscribe(user_id)
+    repository = AsyncMock()
+    repository.create_plant.side_effect = RuntimeError("connection lost")
+
+    with pytest.raises(RuntimeError):
+        await PlantService(repository, AsyncMock(), events=broker).create_plant(user_id, "Fern", "Nephrolepis")
+    assert await subscription.next(timeout=0.01) is None
+
+@pytest.mark.asyncio
+async def test_sse_stream_frames_events_and_ends_on_overflow():
+    from src.adapters.api.routers.users import sse_events
+    broker = EventBroker(max_queue=1)
+    user_id = uuid.uuid4()
+    subscription = broker.subscribe(user_id)
+    broker.publish(user_id, UserEvent("plant.deleted", uuid.uuid4()))
+    broker.publish(user_id, UserEvent("plant.deleted", uuid.uuid4()))
+
+    frames = [frame async for frame in sse_events(subscription, heartbeat_seconds=1)]
+
+    assert frames[0].startswith(b"retry:")
+    assert frames[1].startswith(b"id: 1\nevent: plant.deleted\ndata: {")
+    assert frames[-1] == b"event: overflow\ndata: {}\n\n"
+    assert broker.subscription_count == 0
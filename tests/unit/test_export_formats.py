@@ -0,0 +1,47 @@
+import pytest
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from src.adapters.api.export_formats import ndjson_chunks, csv_chunks
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+ROW = {"id": uuid.UUID(int=1), "name": "Basil", "description": None, "created_at": datetime(2024, 5, 1, 12, 0),
+       "device_ids": [uuid.UUID(int=2), uuid.UUID(int=3)]}
+
+@pytest.mark.asyncio
+async def test_ndjson_emits_one_chunk_per_batch():
+    chunks = await _collect(ndjson_chunks(_batches([ROW, ROW], [ROW])))
+
+    assert len(chunks) == 2
+    lines = "".join(chunks).splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[0]) == {
+        "id": str(uuid.UUID(int=1)), "name": "Basil", "description": None, "created_at": "2024-05-01T12:00:00",
+        "device_ids": [str(uuid.UUID(int=2)), str(uuid.UUID(int=3))],
+    }
+
+@pytest.mark.asyncio
+async def test_csv_writes_header_once_and_flattens_values():
+    columns = ("id", "name", "description", "created_at", "device_ids")
+    chunks = await _collect(csv_chunks(_batches([ROW], [ROW]), columns))
+
+    assert len(chunks) == 2
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == list(columns)
+    assert rows[1] == [str(uuid.UUID(int=1)), "Basil", "", "2024-05-01T12:00:00",
+                       f"{uuid.UUID(int=2)} {uuid.UUID(int=3)}"]
+    assert len(rows) == 3
+
+@pytest.mark.asyncio
+async def test_csv_empty_export_is_header_only():
+    chunks = await _collect(csv_chunks(_batches(), ("id", "name")))
+
+    assert "".join(chunks) == "id,name\r\n"
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta
+from httpx import AsyncClient, ASGITransport
+from src.adapters.api.idempotency import IdempotencyMiddleware, request_fingerprint
+from src.adapters.repositories.memory_repository_impl import InMemoryStore, InMemoryIdempotencyRepository
+
+class CreateApp:
+    """Stands in for a create endpoint: counts executions and answers with the running count."""
+
+    def __init__(self, status: int = 201):
+        self.status = status
+        self.calls = 0
+        self.release = None
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        message = await receive()
+        if self.release is not None:
+            await self.release.wait()
+        body = json.dumps({"call": self.calls, "received": len(message["body"])}).encode()
+        await send({"type": "http.response.start", "status": self.status,
+                    "headers": [(b"content-type", b"application/json"), (b"x-internal", b"1")]})
+        await send({"type": "http.response.body", "body": body})
+
+@pytest.fixture
+def store():
+    return InMemoryStore()
+
+def make_client(app, store, client=("127.0.0.1", 123), **options):
+    middleware = IdempotencyMiddleware(app, InMemoryIdempotencyRepository(store), **options)
+    return AsyncClient(transport=ASGITransport(app=middleware, client=client), base_url="http://test")
+
+@pytest.mark.asyncio
+async def test_retry_replays_the_first_response(store):
+    app = CreateApp()
+    async with make_client(app, store) as client:
+        first = await client.post("/api/v1/plants/", json={"name": "Fern"}, headers={"Idempotency-Key": "k1"})
+        retry = await client.post("/api/v1/plants/", json={"name": "Fern"}, headers={"Idempotency-Key": "k1"})
+
+    assert app.calls == 1
+    assert (retry.status_code, retry.json()) == (201, first.json())
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.headers["content-type"] == "application/json"
+    assert "x-internal" not in retry.headers
+
+@pytest.mark.asyncio
+async def test_requests_without_a_key_or_off_route_always_run(store):
+    app = CreateApp()
+    async with make_client(app, store) as client:
+        await client.post("/api/v1/plants/", json={})
+        await client.post("/api/v1/plants/", json={})
+        await client.put("/api/v1/plants/x", json={}, headers={"Idempotency-Key": "k1"})
+        await client.put("/api/v1/plants/x", json={}, headers={"Idempotency-Key": "k1"})
+
+    assert app.calls == 4
+    assert store.idempotency_keys == {}
+
+@pytest.mark.asyncio
+async def test_key_reused_for_a_different_request_is_rejected(store):
+    app = CreateApp()
+    async with make_client(app, store) as client:
+        await client.post("/api/v1/plants/", json={"name": "Fern"}, headers={"Idempotency-Key": "k1"})
+        response = await client.post("/api/v1/plants/", json={"name": "Ivy"}, headers={"Idempotency-Key": "k1"})
+
+    assert response.status_code == 422
+    assert app.calls == 1
+
+@pytest.mark.asyncio
+async def test_oversized_keyed_upload_is_refused_before_it_is_buffered(store):
+    app = CreateApp()
+    async with make_client(app, store, max_request_bytes=1024) as client:
+        declared = await client.post("/api/v1/plants/p/photo", files={"file": ("a.png", b"x" * 2048)},
+                                     headers={"Idempotency-Key": "k1"})
+
+        async def chunked():
+            for _ in range(4):
+                yield b"x" * 512
+        streamed = await client.post("/api/v1/plants/p/photo", content=chunked(),
+                                     headers={"Idempotency-Key": "k2", "Content-Type": "application/octet-stream"})
+
+    assert (declared.status_code, streamed.status_code) == (413, 413)
+    assert app.calls == 0
+    assert store.idempotency_keys == {}
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_to_the_client(store):
+    app = CreateApp()
+    async with make_client(app, store, client=("10.0.0.1", 1)) as first, \
+            make_client(app, store, client=("10.0.0.2", 1)) as second:
+        await first.post("/api/v1/plants/", json={"name": "Fern"}, headers={"Idempotency-Key": "k1"})
+        # Another client picking the same key gets its own request run, not the first client's response
+        other = await second.post("/api/v1/plants/", json={"name": "Ivy"}, headers={"Idempotency-Key": "k1"})
+        # A credential is a steadier identity than the address, which can change between retries
+        token = {"Idempotency-Key": "k2", "Authorization": "Bearer t"}
+        await first.post("/api/v1/plants/", json={"name": "Moss"}, headers=token)
+        moved = await second.post("/api/v1/plants/", json={"name": "Moss"}, headers=token)
+
+    assert other.status_code == 201 and other.json()["call"] == 2
+    assert moved.headers["idempotent-replayed"] == "true"
+    assert app.calls == 3
+
+@pytest.mark.asyncio
+async def test_retry_during_the_first_attempt_gets_409(store):
+    app = CreateApp()
+    app.release = asyncio.Event()
+    async with make_client(app, store) as client:
+        first = asyncio.create_task(client.post("/api/v1/devices/", json={}, headers={"Idempotency-Key": "k1"}))
+        while app.calls == 0:
+            await asyncio.sleep(0)
+        retry = await client.post("/api/v1/devices/", json={}, headers={"Idempotency-Key": "k1"})
+        app.release.set()
+        assert (await first).status_code == 201
+
+    assert retry.status_code == 409
+    assert retry.headers["retry-after"] == "1"
+    assert app.calls == 1
+
+@pytest.mark.asyncio
+async def test_server_errors_release_the_key(store):
+    app = CreateApp(status=503)
+    async with make_client(app, store) as client:
+        await client.post("/api/v1/plants/", json={}, headers={"Idempotency-Key": "k1"})
+        app.status = 201
+        response = await client.post("/api/v1/plants/", json={}, headers={"Idempotency-Key": "k1"})
+
+    assert (response.status_code, response.json()["call"]) == (201, 2)
+    assert "idempotent-replayed" not in response.headers
+
+@pytest.mark.asyncio
+async def test_expired_and_stale_claims_are_taken_over(store):
+    repository = InMemoryIdempotencyRepository(store)
+    now = datetime.utcnow()
+    assert await repository.begin("k1", "a", now, now + timedelta(hours=1), now - timedelta(minutes=1)) is None
+    held = await repository.begin("k1", "a", now, now + timedelta(hours=1), now - timedelta(minutes=1))
+    assert held is not None and not held.completed
+
+    later = now + timedelta(minutes=5)
+    assert await repository.begin("k1", "b", later, later + timedelta(hours=1), later - timedelta(minutes=1)) is not None
+    assert await repository.begin("k1", "a", later, later + timedelta(hours=1), later - timedelta(minutes=1)) is None
+
+    await repository.complete("k1", 201, [], b"{}")
+    expired = now + timedelta(hours=2)
+    assert await repository.begin("k1", "b", expired, expired + timedelta(hours=1), expired) is None
+    assert await repository.purge_expired(expired + timedelta(hours=2), limit=10) == 1
+
+def test_multipart_boundary_does_not_change_the_fingerprint():
+    def upload(boundary: str) -> bytes:
+        return (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.jpg\"\r\n\r\n"
+                f"JPEGDATA\r\n--{boundary}--\r\n").encode()
+
+    first = request_fingerprint("POST", "/api/v1/plants/p/photo", b"", "multipart/form-data; boundary=aaa111",
+                                upload("aaa111"))
+    retry = request_fingerprint("POST", "/api/v1/plants/p/photo", b"", "multipart/form-data; boundary=bbb222",
+                                upload("bbb222"))
+    other_path = request_fingerprint("POST", "/api/v1/plants/q/photo", b"", "multipart/form-data; boundary=aaa111",
+                                     upload("aaa111"))
+    assert first == retry
+    assert first != other_path
+
+def test_negotiated_media_type_is_part_of_the_fingerprint():
+    as_json = request_fingerprint("POST", "/api/v1/plants/", b"", "application/json", b"{}", "application/json")
+    as_msgpack = request_fingerprint("POST", "/api/v1/plants/", b"", "application/json", b"{}", "application/msgpack")
+    assert as_json != as_msgpack
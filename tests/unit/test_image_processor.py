@@ -0,0 +1,39 @@
+import pytest
+from io import BytesIO
+from PIL import Image
+from src.adapters.images.pillow_processor import normalize_image
+from src.core.domain.exceptions import InvalidImageError, ImageTooLargeError
+
+def make_jpeg(width: int, height: int) -> bytes:
+    image = Image.new("RGB", (width, height), color=(40, 120, 60))
+    exif = Image.Exif()
+    exif[0x010F] = "Phone Maker"  # Make
+    exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+    output = BytesIO()
+    image.save(output, format="JPEG", quality=95, exif=exif)
+    return output.getvalue()
+
+def test_normalize_caps_dimensions_and_strips_metadata():
+    processed = normalize_image(make_jpeg(4000, 3000), "WEBP", 80, 1024, 50_000_000)
+
+    assert processed.extension == "webp"
+    assert processed.content_type == "image/webp"
+    # EXIF orientation is applied before the metadata is dropped
+    assert (processed.width, processed.height) == (768, 1024)
+    with Image.open(BytesIO(processed.data)) as stored:
+        assert stored.format == "WEBP"
+        assert not stored.getexif()
+
+def test_normalize_rejects_non_images():
+    with pytest.raises(InvalidImageError):
+        normalize_image(b"<?php echo 'not a photo'; ?>", "WEBP", 80, 1024, 50_000_000)
+
+def test_normalize_rejects_too_many_pixels():
+    with pytest.raises(ImageTooLargeError):
+        normalize_image(make_jpeg(400, 300), "JPEG", 80, 1024, 1000)
+
+def test_decompression_bomb_is_too_large_not_invalid(monkeypatch):
+    # Pillow refuses images over twice MAX_IMAGE_PIXELS while opening them
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+    with pytest.raises(ImageTooLargeError):
+        normalize_image(make_jpeg(400, 300), "JPEG", 80, 1024, 50_000_000)
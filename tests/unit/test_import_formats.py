@@ -0,0 +1,52 @@
+import csv
+import io
+import uuid
+import pytest
+from src.adapters.api.import_formats import import_format, import_source, plant_record, device_record
+
+USER_ID = str(uuid.uuid4())
+
+def test_csv_rows_validate_into_plant_records():
+    data = io.BytesIO(f"user_id,name,species,description\n{USER_ID},Basil,Ocimum basilicum,\n".encode())
+    rows, to_record = import_source(data, "csv", plant_record)
+
+    (line, values), = list(rows)
+    record = to_record(values)
+
+    assert line == 2
+    assert record[1:5] == (uuid.UUID(USER_ID), "Basil", "Ocimum basilicum", None)
+    assert not data.closed
+
+def test_ndjson_bad_json_and_invalid_rows_raise_value_error():
+    data = io.BytesIO(b'{"user_id": "' + USER_ID.encode() + b'", "name": "Probe", "category": "sensor"}\n\nnot json\n'
+                      b'{"user_id": "' + USER_ID.encode() + b'", "name": "Probe", "category": "toaster"}\n')
+    rows, to_record = import_source(data, "ndjson", device_record)
+    rows = list(rows)
+
+    assert [line for line, _ in rows] == [1, 3, 4]
+    assert to_record(rows[0][1])[5] == "sensor"
+    with pytest.raises(ValueError):
+        to_record(rows[1][1])
+    with pytest.raises(ValueError, match="category"):
+        to_record(rows[2][1])
+
+def test_unreadable_csv_record_is_a_row_error():
+    oversized = "x" * (csv.field_size_limit() + 1)
+    data = io.BytesIO(f"user_id,name,species\n{USER_ID},{oversized},Species\n{USER_ID},Basil,Ocimum\n".encode())
+    rows, to_record = import_source(data, "csv", plant_record)
+    rows = list(rows)
+
+    with pytest.raises(ValueError, match="Unreadable CSV record"):
+        to_record(rows[0][1])
+    assert to_record(rows[1][1])[2] == "Basil"
+
+def test_row_id_is_kept_when_supplied():
+    row_id = uuid.uuid4()
+    record = plant_record({"id": str(row_id), "user_id": USER_ID, "name": "Fern", "species": "Nephrolepis"})
+
+    assert record[0] == row_id
+
+def test_import_format_defaults_to_extension():
+    assert import_format("plants.CSV", None) == "csv"
+    assert import_format("plants.ndjson", None) == "ndjson"
+    assert import_format("plants.csv", "ndjson") == "ndjson"
@@ -0,0 +1,91 @@
+import pytest
+from fastapi import HTTPException
+from src.adapters.api.ranges import parse_range
+from src.adapters.storage.filesystem_storage import FilesystemStorage
+from src.adapters.storage.memory_storage import MemoryStorage
+from src.adapters.storage.presign import LocalPresigner
+from src.adapters.storage.factory import signing_key
+from src.config.settings import settings
+
+@pytest.fixture(params=["memory", "filesystem"])
+def storage(request, tmp_path):
+    presigner = LocalPresigner(b"test-key", "http://testserver")
+    if request.param == "memory":
+        return MemoryStorage(presigner)
+    return FilesystemStorage(str(tmp_path), presigner)
+
+async def _collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+@pytest.mark.asyncio
+async def test_round_trip_range_reads_and_size(storage):
+    data = bytes(range(256)) * 4096  # 1 MiB, spans several stream chunks
+    await storage.upload_bytes(data, "photo.webp", "image/webp")
+
+    assert await storage.file_exists("photo.webp")
+    assert await storage.get_file_size("photo.webp") == len(data)
+    assert await storage.read_file("photo.webp") == data
+    assert await storage.read_range("photo.webp", 1000, 10) == data[1000:1010]
+    assert await storage.read_range("photo.webp", len(data) - 4, 100) == data[-4:]
+    assert await _collect(await storage.download_file("photo.webp")) == data
+    assert await storage.get_file_size("missing.webp") is None
+
+@pytest.mark.asyncio
+async def test_list_pages_in_key_order_and_delete(storage):
+    for name in ["c.png", "a.png", "b.png"]:
+        await storage.upload_bytes(b"x", name, "image/png")
+
+    assert [name for name, _ in await storage.list_files(limit=2)] == ["a.png", "b.png"]
+    assert [name for name, _ in await storage.list_files(start_after="b.png")] == ["c.png"]
+    assert all(modified.tzinfo is not None for _, modified in await storage.list_files())
+
+    assert await storage.delete_files(["a.png", "missing.png"]) == {}
+    assert [name for name, _ in await storage.list_files()] == ["b.png", "c.png"]
+
+@pytest.mark.asyncio
+async def test_missing_object_raises(storage):
+    with pytest.raises(FileNotFoundError):
+        await storage.read_file("missing.png")
+
+@pytest.mark.asyncio
+async def test_filesystem_rejects_names_outside_root(tmp_path):
+    storage = FilesystemStorage(str(tmp_path / "files"), LocalPresigner(b"test-key"))
+    for name in ["../escape.png", ".hidden", "dir/photo.png"]:
+        with pytest.raises(ValueError):
+            await storage.upload_bytes(b"x", name, "image/png")
+
+def test_presigned_urls_verify_only_unmodified_and_unexpired():
+    presigner = LocalPresigner(b"test-key", "http://testserver")
+    expires = 4102444800  # 2100-01-01
+    signature = presigner.signature("photo.webp", expires)
+
+    assert presigner.url("photo.webp", 60).startswith("http://testserver/api/v1/files/photo.webp?expires=")
+    assert presigner.verify("photo.webp", expires, signature)
+    assert not presigner.verify("other.webp", expires, signature)
+    assert not presigner.verify("photo.webp", expires + 1, signature)
+    assert not LocalPresigner(b"other-key").verify("photo.webp", expires, signature)
+    assert not presigner.verify("photo.webp", 1, presigner.signature("photo.webp", 1))
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 10)
+    assert parse_range("bytes=90-", 100) == (90, 10)
+    assert parse_range("bytes=-5", 100) == (95, 5)
+    assert parse_range("bytes=50-500", 100) == (50, 50)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    assert parse_range("items=0-1", 100) is None
+    with pytest.raises(HTTPException) as error:
+        parse_range("bytes=100-", 100)
+    assert error.value.status_code == 416
+
+def test_signing_key_must_be_shared_by_several_workers(monkeypatch):
+    monkeypatch.setattr(settings, "FILE_STORAGE_SIGNING_KEY", None)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    with pytest.raises(RuntimeError, match="FILE_STORAGE_SIGNING_KEY is required"):
+        signing_key()
+
+    monkeypatch.setattr(settings, "FILE_STORAGE_SIGNING_KEY", "shared")
+    assert signing_key() == b"shared"
+    monkeypatch.setattr(settings, "FILE_STORAGE_SIGNING_KEY", None)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 1)
+    assert len(signing_key()) == 32
@@ -0,0 +1,105 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from src.core.domain.file_deletion import PendingFileDeletion
+from src.core.services.photo_cleanup_service import PhotoCleanupService, PhotoCleanupMetrics
+
+@pytest.fixture
+def mock_deletion_repository():
+    repository = AsyncMock()
+    # Every name is unreferenced and free to lock unless a test says otherwise
+    repository.lock_unreferenced_photos.side_effect = lambda file_names: (set(file_names), set())
+    return repository
+
+@pytest.fixture
+def mock_plant_repository():
+    repository = AsyncMock()
+    repository.get_referenced_photo_filenames.return_value = set()
+    return repository
+
+@pytest.fixture
+def mock_file_storage():
+    storage = AsyncMock()
+    storage.delete_files.return_value = {}
+    return storage
+
+@pytest.fixture
+def cleanup_service(mock_deletion_repository, mock_plant_repository, mock_file_storage):
+    return PhotoCleanupService(mock_deletion_repository, mock_plant_repository, mock_file_storage, PhotoCleanupMetrics())
+
+@pytest.mark.asyncio
+async def test_drain_deletes_batch_and_records_failures(cleanup_service, mock_deletion_repository, mock_file_storage):
+    ok, broken = PendingFileDeletion(file_name="a.jpg"), PendingFileDeletion(file_name="b.jpg")
+    mock_deletion_repository.claim_batch.return_value = [ok, broken]
+    mock_file_storage.delete_files.return_value = {"b.jpg": "AccessDenied"}
+
+    processed = await cleanup_service.drain_pending_deletions(batch_size=10)
+
+    assert processed == 2
+    mock_file_storage.delete_files.assert_called_once_with(["a.jpg", "b.jpg"])
+    mock_deletion_repository.complete_batch.assert_called_once_with([ok.id], {broken.id: "AccessDenied"})
+    assert cleanup_service.metrics.deleted == 1
+    assert cleanup_service.metrics.failed == 1
+
+@pytest.mark.asyncio
+async def test_drain_skips_names_that_are_referenced_again(cleanup_service, mock_deletion_repository,
+                                                          mock_plant_repository, mock_file_storage):
+    pending = PendingFileDeletion(file_name="reused.jpg")
+    mock_deletion_repository.claim_batch.return_value = [pending]
+    mock_plant_repository.get_referenced_photo_filenames.return_value = {"reused.jpg"}
+
+    await cleanup_service.drain_pending_deletions(batch_size=10)
+
+    mock_file_storage.delete_files.assert_not_called()
+    mock_deletion_repository.complete_batch.assert_called_once_with([pending.id], {})
+
+@pytest.mark.asyncio
+async def test_reconcile_removes_only_old_unreferenced_objects(cleanup_service, mock_plant_repository, mock_file_storage):
+    old = datetime.now(timezone.utc) - timedelta(days=1)
+    new = datetime.now(timezone.utc)
+    mock_file_storage.list_files.side_effect = [[("kept.jpg", old), ("orphan.jpg", old), ("uploading.jpg", new)]]
+    mock_plant_repository.get_referenced_photo_filenames.return_value = {"kept.jpg"}
+
+    deleted = await cleanup_service.reconcile_orphans(grace_seconds=3600)
+
+    assert deleted == 1
+    mock_file_storage.delete_files.assert_called_once_with(["orphan.jpg"])
+    assert cleanup_service.metrics.objects_scanned == 3
+
+@pytest.mark.asyncio
+async def test_drain_leaves_names_busy_in_another_transaction_queued(cleanup_service, mock_deletion_repository,
+                                                                     mock_file_storage):
+    free, busy = PendingFileDeletion(file_name="free.jpg"), PendingFileDeletion(file_name="reuploading.jpg")
+    mock_deletion_repository.claim_batch.return_value = [free, busy]
+    # An upload holds the reference row of reuploading.jpg while it re-acquires the object
+    mock_deletion_repository.lock_unreferenced_photos.side_effect = None
+    mock_deletion_repository.lock_unreferenced_photos.return_value = ({"free.jpg"}, {"reuploading.jpg"})
+
+    await cleanup_service.drain_pending_deletions(batch_size=10)
+
+    mock_file_storage.delete_files.assert_called_once_with(["free.jpg"])
+    mock_deletion_repository.forget_photos.assert_called_once_with(["free.jpg"])
+    mock_deletion_repository.complete_batch.assert_called_once_with([free.id], {})
+
+@pytest.mark.asyncio
+async def test_reconcile_spares_old_objects_that_are_referenced_again(cleanup_service, mock_deletion_repository,
+                                                                      mock_file_storage):
+    old = datetime.now(timezone.utc) - timedelta(days=1)
+    mock_file_storage.list_files.side_effect = [[("reused.jpg", old), ("orphan.jpg", old)]]
+    # reused.jpg keeps its old last_modified, but a deduplicated upload now holds a reference to it
+    mock_deletion_repository.lock_unreferenced_photos.side_effect = None
+    mock_deletion_repository.lock_unreferenced_photos.return_value = ({"orphan.jpg"}, set())
+
+    assert await cleanup_service.reconcile_orphans(grace_seconds=3600) == 1
+    mock_file_storage.delete_files.assert_called_once_with(["orphan.jpg"])
+    mock_deletion_repository.release.assert_awaited_once()
+    mock_deletion_repository.complete_batch.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_empty_queue_releases_its_claim(cleanup_service, mock_deletion_repository):
+    mock_deletion_repository.claim_batch.return_value = []
+
+    assert await cleanup_service.drain_pending_deletions(batch_size=10) == 0
+    mock_deletion_repository.release.assert_awaited_once()
+    mock_deletion_repository.complete_batch.assert_not_called()
@@ -40,3 +40,16 @@ async def test_remove_device_from_plant_service(device_service, mock_device_repo
     await device_service.remove_device_from_plant(plant_id, device_id)
 
     mock_device_repository.remove_device_from_plant.assert_called_once_with(plant_id, device_id)
+
+@pytest.mark.asyncio
+async def test_get_devices_by_ids_keeps_request_order_and_reports_missing(device_service, mock_device_repository):
+    user_id = uuid.uuid4()
+    probe = PhysicalDevice(user_id=user_id, name="Probe", category="sensor")
+    relay = PhysicalDevice(user_id=user_id, name="Relay", category="microcontroller")
+    unknown = uuid.uuid4()
+    mock_device_repository.get_devices_by_ids.return_value = [probe, relay]
+
+    devices, missing = await device_service.get_devices_by_ids([unknown, relay.id, probe.id])
+
+    assert [device.name for device in devices] == ["Relay", "Probe"]
+    assert missing == [unknown]
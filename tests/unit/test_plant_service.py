@@ -1,8 +1,13 @@
+import asyncio
+from contextlib import asynccontextmanager
+import hashlib
 import pytest
 import uuid
 from unittest.mock import MagicMock, AsyncMock
 from src.core.services.plant_service import PlantService
 from src.core.domain.plant import Plant
+from src.core.domain.exceptions import VersionConflictError, ImageTooLargeError
+from src.core.services.single_flight import SingleFlight
 
 @pytest.fixture
 def mock_plant_repository():
@@ -51,6 +56,169 @@ async def test_delete_plant_with_photo_service(plant_service, mock_plant_reposit
 
     await plant_service.delete_plant(plant_id)
 
-    mock_plant_repository.get_plant_by_id.assert_called_with(plant_id)
-    mock_file_storage.delete_file.assert_called_with("test.jpg")
+    # The photo is queued for deletion by the repository, not removed inline
+    mock_file_storage.delete_file.assert_not_called()
     mock_plant_repository.delete_plant.assert_called_with(plant_id)
+
+@pytest.mark.asyncio
+async def test_update_plant_version_conflict_service(plant_service, mock_plant_repository):
+    plant_id = uuid.uuid4()
+    mock_plant_repository.update_plant_if_version.return_value = None
+    mock_plant_repository.get_plant_by_id.return_value = Plant(id=plant_id, user_id=uuid.uuid4(), name="Plant", species="Species", row_version=3)
+
+    with pytest.raises(VersionConflictError):
+        await plant_service.update_plant(plant_id, "New Name", "Species", expected_versions=[2])
+
+    mock_plant_repository.update_plant_if_version.assert_called_once_with(
+        plant_id, [2], {"name": "New Name", "species": "Species", "description": None}
+    )
+    mock_plant_repository.update_plant.assert_not_called()
+
+def make_upload(content: bytes, filename: str = "photo.JPG"):
+    upload = MagicMock()
+    upload.filename = filename
+    upload.read = AsyncMock(side_effect=[content, b""])
+    upload.seek = AsyncMock()
+    return upload
+
+@pytest.mark.asyncio
+async def test_upload_plant_photo_uses_content_hash_key(plant_service, mock_plant_repository, mock_file_storage):
+    plant = Plant(user_id=uuid.uuid4(), name="Test Plant", species="Test Species")
+    mock_plant_repository.get_plant_by_id.return_value = plant
+    mock_file_storage.file_exists.return_value = False
+    upload = make_upload(b"image bytes")
+
+    await plant_service.upload_plant_photo(plant.id, upload)
+
+    expected_name = f"{hashlib.sha256(b'image bytes').hexdigest()}.jpg"
+    mock_file_storage.upload_file.assert_called_once_with(upload, expected_name)
+    assert mock_plant_repository.update_plant.call_args.args[0].photo_filename == expected_name
+
+@pytest.mark.asyncio
+async def test_upload_plant_photo_skips_existing_object(plant_service, mock_plant_repository, mock_file_storage):
+    plant = Plant(user_id=uuid.uuid4(), name="Test Plant", species="Test Species")
+    mock_plant_repository.get_plant_by_id.return_value = plant
+    mock_file_storage.file_exists.return_value = True
+
+    await plant_service.upload_plant_photo(plant.id, make_upload(b"already stored"))
+
+    mock_file_storage.upload_file.assert_not_called()
+    mock_plant_repository.update_plant.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_upload_restores_object_removed_by_cleanup_before_the_reference_committed(
+        plant_service, mock_plant_repository, mock_file_storage):
+    plant = Plant(user_id=uuid.uuid4(), name="Test Plant", species="Test Species")
+    mock_plant_repository.get_plant_by_id.return_value = plant
+    # Present when checked, deleted by the cleanup worker before update_plant committed the reference
+    mock_file_storage.file_exists.side_effect = [True, False]
+    upload = make_upload(b"reused image")
+
+    await plant_service.upload_plant_photo(plant.id, upload)
+
+    expected_name = f"{hashlib.sha256(b'reused image').hexdigest()}.jpg"
+    mock_plant_repository.update_plant.assert_awaited_once()
+    mock_file_storage.upload_file.assert_called_once_with(upload, expected_name)
+
+@pytest.mark.asyncio
+async def test_oversized_upload_is_refused_after_reading_one_byte_past_the_limit(mock_plant_repository, mock_file_storage):
+    plant = Plant(user_id=uuid.uuid4(), name="Test Plant", species="Test Species")
+    mock_plant_repository.get_plant_by_id.return_value = plant
+    image_processor = AsyncMock()
+    service = PlantService(mock_plant_repository, mock_file_storage, image_processor, max_upload_bytes=10)
+    upload = make_upload(b"x" * 11)
+
+    with pytest.raises(ImageTooLargeError):
+        await service.upload_plant_photo(plant.id, upload)
+    upload.read.assert_awaited_once_with(11)
+    image_processor.process.assert_not_called()
+
+    # Without normalization the upload is hashed in chunks; the limit applies there too
+    service = PlantService(mock_plant_repository, mock_file_storage, max_upload_bytes=10)
+    with pytest.raises(ImageTooLargeError):
+        await service.upload_plant_photo(plant.id, make_upload(b"x" * 11))
+    mock_plant_repository.update_plant.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_concurrent_photo_reads_share_one_lookup_and_fetch(mock_plant_repository, mock_file_storage):
+    plant = Plant(user_id=uuid.uuid4(), name="Fern", species="Nephrolepis", photo_filename="abc.webp")
+
+    async def get_plant(plant_id):
+        await asyncio.sleep(0.01)
+        return plant
+
+    async def read_file(file_name):
+        await asyncio.sleep(0.01)
+        return b"image-bytes"
+
+    mock_plant_repository.get_plant_by_id.side_effect = get_plant
+    mock_file_storage.read_file.side_effect = read_file
+    service = PlantService(mock_plant_repository, mock_file_storage, single_flight=SingleFlight())
+
+    photos = await asyncio.gather(*(service.read_plant_photo(plant.id) for _ in range(20)))
+
+    assert photos == [b"image-bytes"] * 20
+    assert mock_plant_repository.get_plant_by_id.await_count == 1
+    mock_file_storage.read_file.assert_awaited_once_with("abc.webp")
+
+@pytest.mark.asyncio
+async def test_get_plants_by_ids_keeps_request_order_and_reports_missing(plant_service, mock_plant_repository):
+    fern = Plant(user_id=uuid.uuid4(), name="Fern", species="Nephrolepis")
+    ivy = Plant(user_id=uuid.uuid4(), name="Ivy", species="Hedera")
+    unknown = uuid.uuid4()
+    mock_plant_repository.get_plants_by_ids.return_value = [fern, ivy]
+
+    plants, missing = await plant_service.get_plants_by_ids([ivy.id, unknown, fern.id, ivy.id])
+
+    assert [plant.name for plant in plants] == ["Ivy", "Fern"]
+    assert missing == [unknown]
+    mock_plant_repository.get_plants_by_ids.assert_awaited_once_with([ivy.id, unknown, fern.id])
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_of_the_same_ids_share_one_query(mock_plant_repository, mock_file_storage):
+    plant = Plant(user_id=uuid.uuid4(), name="Fern", species="Nephrolepis")
+
+    async def get_plants(plant_ids):
+        await asyncio.sleep(0.01)
+        return [plant]
+
+    mock_plant_repository.get_plants_by_ids.side_effect = get_plants
+    service = PlantService(mock_plant_repository, mock_file_storage, single_flight=SingleFlight())
+    unknown = uuid.uuid4()
+
+    results = await asyncio.gather(*(service.get_plants_by_ids([plant.id, unknown]) for _ in range(5)),
+                                   service.get_plants_by_ids([unknown, plant.id]))
+
+    assert all(([p.id for p in plants], missing) == ([plant.id], [unknown]) for plants, missing in results[:5])
+    assert mock_plant_repository.get_plants_by_ids.await_count == 1
+    assert len({id(plants[0]) for plants, _ in results}) == len(results)
+
+@pytest.mark.asyncio
+async def test_shared_lookup_runs_on_a_repository_the_flight_owns(mock_plant_repository, mock_file_storage):
+    plant = Plant(user_id=uuid.uuid4(), name="Fern", species="Nephrolepis")
+    flight_repository = AsyncMock()
+    opened = []
+
+    async def get_plants(plant_ids):
+        await asyncio.sleep(0.01)
+        return [plant]
+
+    @asynccontextmanager
+    async def flight_repositories():
+        opened.append(True)
+        yield flight_repository
+
+    flight_repository.get_plants_by_ids.side_effect = get_plants
+    service = PlantService(mock_plant_repository, mock_file_storage, single_flight=SingleFlight(),
+                           flight_repositories=flight_repositories)
+
+    leader = asyncio.create_task(service.get_plants_by_ids([plant.id]))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(service.get_plants_by_ids([plant.id]))
+    await asyncio.sleep(0)
+    leader.cancel()  # The first request goes away and its session with it
+
+    plants, missing = await follower
+    assert [p.id for p in plants] == [plant.id] and missing == []
+    assert opened == [True]
+    mock_plant_repository.get_plants_by_ids.assert_not_awaited()
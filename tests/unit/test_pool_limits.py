@@ -0,0 +1,17 @@
+from src.config.settings import Settings
+
+def _settings(**values):
+    return Settings(DATABASE_URL="postgresql+asyncpg://user:pass@db/app", **values)
+
+def test_pool_defaults_apply_without_a_connection_budget():
+    assert _settings(DATABASE_POOL_SIZE=5, DATABASE_MAX_OVERFLOW=10, WEB_CONCURRENCY=8).database_pool_limits == (5, 10)
+
+def test_workers_share_the_connection_budget():
+    settings = _settings(DATABASE_POOL_SIZE=5, DATABASE_MAX_OVERFLOW=10, DATABASE_MAX_CONNECTIONS=80, WEB_CONCURRENCY=8)
+    pool_size, max_overflow = settings.database_pool_limits
+    assert (pool_size, max_overflow) == (5, 5)
+    assert (pool_size + max_overflow) * 8 <= 80
+
+def test_every_worker_keeps_at_least_one_connection():
+    settings = _settings(DATABASE_POOL_SIZE=5, DATABASE_MAX_OVERFLOW=10, DATABASE_MAX_CONNECTIONS=4, WEB_CONCURRENCY=16)
+    assert settings.database_pool_limits == (1, 0)
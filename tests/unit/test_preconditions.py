@@ -0,0 +1,21 @@
+import pytest
+from fastapi import HTTPException
+from src.adapters.api.preconditions import parse_if_match
+
+def test_if_match_accepts_a_list_of_strong_tags():
+    assert parse_if_match('"3"') == [3]
+    assert parse_if_match('"3", "4"') == [3, 4]
+    assert parse_if_match('"3","4" ,') == [3, 4]
+    assert parse_if_match("*") is None
+    assert parse_if_match(None) is None
+
+def test_weak_and_foreign_tags_never_match():
+    assert parse_if_match('W/"3"') == []
+    assert parse_if_match('W/"3", "4"') == [4]
+    assert parse_if_match('"abc"') == []
+
+@pytest.mark.parametrize("value", ["3", "", '"3" "4"', '"3', 'W/3'])
+def test_malformed_if_match_is_a_bad_request(value):
+    with pytest.raises(HTTPException) as error:
+        parse_if_match(value)
+    assert error.value.status_code == 400
@@ -0,0 +1,69 @@
+import threading
+import time
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+from src.adapters.api.routers import admin
+from src.adapters.api.profiling import RequestProfilingMiddleware
+from src.adapters.telemetry.profiler import SamplingProfiler
+from src.config.settings import settings
+
+def busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+def test_samples_busy_threads_as_collapsed_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+    worker.start()
+    try:
+        with SamplingProfiler(interval=0.001) as profiler:
+            time.sleep(0.2)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert profiler.samples > 5
+    busy = [line for line in profiler.collapsed().splitlines() if line.startswith("busy;")]
+    assert busy and all("busy_loop (" in line for line in busy)
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in busy)
+
+async def _ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 201, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+async def _call(headers):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await RequestProfilingMiddleware(_ok)({"type": "http", "headers": headers}, None, send)
+    return messages[0]
+
+@pytest.mark.asyncio
+async def test_request_profiling_needs_the_header_and_admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+
+    assert (await _call([(b"x-profile", b"1")]))["status"] == 201
+    assert (await _call([(b"x-profile", b"1"), (b"x-admin-token", b"wrong")]))["status"] == 201
+
+    profiled = await _call([(b"x-profile", b"1"), (b"x-admin-token", b"secret")])
+    headers = dict(profiled["headers"])
+    assert profiled["status"] == 200
+    assert headers[b"x-profile-status"] == b"201"
+    assert headers[b"content-type"].startswith(b"text/plain")
+
+@pytest.mark.asyncio
+async def test_every_admin_endpoint_needs_the_admin_token(monkeypatch):
+    app = FastAPI()
+    app.include_router(admin.router)
+    paths = ["/api/v1/admin/photo-cleanup", "/api/v1/admin/single-flight", "/api/v1/admin/events", "/api/v1/admin/tracing"]
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", None)
+        assert {(await client.get(path)).status_code for path in paths} == {404}
+
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+        assert {(await client.get(path)).status_code for path in paths} == {401}
+        assert {(await client.get(path, headers={"X-Admin-Token": "wrong"})).status_code for path in paths} == {401}
+        assert {(await client.get(path, headers={"X-Admin-Token": "secret"})).status_code for path in paths} == {200}
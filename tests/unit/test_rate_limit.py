@@ -0,0 +1,59 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+from src.adapters.api.rate_limit import (InMemoryRateLimitBackend, RateLimitMiddleware, RedisRateLimitBackend,
+                                        client_key, parse_networks)
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+def make_client(**kwargs):
+    app = RateLimitMiddleware(ok_app, InMemoryRateLimitBackend(), **kwargs)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+def test_bucket_refills_over_time():
+    backend = InMemoryRateLimitBackend()
+
+    assert backend.take("k", 5, capacity=5, refill_per_second=1, now=0.0) == 0
+    assert backend.take("k", 2, capacity=5, refill_per_second=1, now=0.5) == pytest.approx(1.5)
+    assert backend.take("k", 2, capacity=5, refill_per_second=1, now=2.5) == 0
+
+def test_backend_evicts_least_recently_used_keys():
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    for key in ["a", "b", "a", "c"]:
+        backend.take(key, 1, capacity=5, refill_per_second=1, now=0.0)
+
+    assert set(backend._buckets) == {"a", "c"}
+
+def test_client_key_ignores_caller_supplied_identity():
+    scope = {"path": "/api/v1/devices/users/8d5f7c5e-2b7a-4c1e-9a43-0b0b7f0e8a11", "client": ("10.0.0.1", 1),
+             "headers": [(b"x-user-id", b"someone-else"), (b"x-forwarded-for", b"203.0.113.9")]}
+    assert client_key(scope) == "client:10.0.0.1"
+    assert client_key({"path": "/api/v1/plants/", "headers": [], "client": None}) == "client:unknown"
+
+def test_client_key_believes_forwarded_for_only_from_trusted_proxies():
+    proxies = parse_networks(["10.0.0.0/8"])
+    forwarded = [(b"x-forwarded-for", b"198.51.100.7, 203.0.113.9, 10.0.0.2")]
+    assert client_key({"path": "/", "headers": forwarded, "client": ("10.0.0.1", 1)}, proxies) == "client:203.0.113.9"
+    assert client_key({"path": "/", "headers": forwarded, "client": ("192.0.2.1", 1)}, proxies) == "client:192.0.2.1"
+
+def test_redis_backend_requires_a_url():
+    with pytest.raises(RuntimeError, match="RATE_LIMIT_REDIS_URL"):
+        RedisRateLimitBackend(None)
+
+@pytest.mark.asyncio
+async def test_expensive_routes_exhaust_the_bucket_sooner():
+    async with make_client(capacity=20, refill_per_second=0.001) as client:
+        assert (await client.get("/api/v1/plants/")).status_code == 200
+        assert (await client.get("/api/v1/plants/")).status_code == 200
+        response = await client.get("/api/v1/plants/")
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+@pytest.mark.asyncio
+async def test_health_is_not_metered():
+    async with make_client(capacity=1, refill_per_second=0.001) as client:
+        statuses = [(await client.get("/health")).status_code for _ in range(5)]
+
+    assert statuses == [200] * 5
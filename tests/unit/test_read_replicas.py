@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import MagicMock
+from httpx import AsyncClient, ASGITransport
+from src.adapters.api.read_your_writes import ReadYourWritesMiddleware, SCOPE_KEY
+from src.config.read_replicas import ReplicaSelector, WriteTracker, LEAST_CONNECTIONS
+
+def make_engine(checked_out=0):
+    engine = MagicMock()
+    engine.pool.checkedout.return_value = checked_out
+    return engine
+
+def test_round_robin_cycles_through_replicas():
+    replicas = [make_engine(), make_engine()]
+    selector = ReplicaSelector(replicas)
+
+    picks = [selector.select() for _ in range(4)]
+
+    assert picks == [replicas[0], replicas[1], replicas[0], replicas[1]]
+
+def test_least_connections_prefers_idle_replica():
+    busy, idle = make_engine(checked_out=5), make_engine(checked_out=1)
+    selector = ReplicaSelector([busy, idle], LEAST_CONNECTIONS)
+
+    assert all(selector.select() is idle for _ in range(3))
+
+def test_selector_without_replicas_returns_none():
+    assert ReplicaSelector([]).select() is None
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        ReplicaSelector([make_engine()], "random")
+
+def test_write_tracker_sticks_within_window(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.config.read_replicas.time.monotonic", lambda: now[0])
+    tracker = WriteTracker(window_seconds=5)
+
+    tracker.record("10.0.0.1")
+
+    assert tracker.wrote_recently("10.0.0.1")
+    assert not tracker.wrote_recently("10.0.0.2")
+    now[0] += 6
+    assert not tracker.wrote_recently("10.0.0.1")
+
+@pytest.mark.asyncio
+async def test_write_marker_cookie_sends_reads_on_any_worker_to_the_primary():
+    async def app(scope, receive, send):
+        marker = scope[SCOPE_KEY]
+        if scope["method"] == "POST":
+            marker.wrote = True  # What the session's after_commit hook records
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"primary" if marker.recent else b"replica"})
+
+    # Two middleware instances stand in for two workers that share nothing
+    writer, reader = ReadYourWritesMiddleware(app, 5), ReadYourWritesMiddleware(app, 5)
+    async with AsyncClient(transport=ASGITransport(app=writer), base_url="http://test") as client:
+        assert (await client.get("/")).text == "replica"
+        wrote = await client.post("/")
+    cookie = wrote.headers["set-cookie"].split(";")[0]
+    async with AsyncClient(transport=ASGITransport(app=reader), base_url="http://test") as client:
+        assert (await client.get("/", headers={"Cookie": cookie})).text == "primary"
+        # A forged far-future marker is ignored rather than pinning the client to the primary
+        assert (await client.get("/", headers={"Cookie": "primary_until=99999999999"})).text == "replica"
@@ -0,0 +1,22 @@
+import uuid
+from datetime import datetime
+from src.adapters.repositories.row_mapping import (DEVICE_FIELDS, PLANT_FIELDS, device_from_row, plant_from_row)
+from src.core.domain.plant import Plant, PhysicalDevice, PhysicalDeviceCategory
+
+def test_plant_rows_map_to_the_same_model_as_validation():
+    plant = Plant(user_id=uuid.uuid4(), name="Fern", species="Nephrolepis", photo_filename="a.webp", row_version=3)
+    row = tuple(getattr(plant, name) for name in PLANT_FIELDS)
+
+    mapped = plant_from_row(row)
+
+    assert mapped == plant
+    assert mapped.model_dump(mode="json") == plant.model_dump(mode="json")
+
+def test_device_rows_turn_the_stored_category_string_into_the_enum():
+    device = PhysicalDevice(user_id=uuid.uuid4(), name="Probe", category="sensor", created_at=datetime(2024, 5, 1))
+    row = tuple(device.category.value if name == "category" else getattr(device, name) for name in DEVICE_FIELDS)
+
+    mapped = device_from_row(row)
+
+    assert mapped.category is PhysicalDeviceCategory.SENSOR
+    assert mapped == device
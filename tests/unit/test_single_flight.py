@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from src.core.services.single_flight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_for_same_key_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def lookup():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"name": "Basil"}
+
+    results = await asyncio.gather(*(flight.do("plant", 1, lookup, copy=dict) for _ in range(10)))
+
+    assert calls == 1
+    assert all(result == {"name": "Basil"} for result in results)
+    assert len({id(result) for result in results}) == 10  # followers got copies
+    assert flight.metrics["plant"].as_dict() == {"calls": 10, "executions": 1, "coalesced": 9, "failures": 0}
+
+@pytest.mark.asyncio
+async def test_different_keys_and_sequential_calls_are_not_merged():
+    flight = SingleFlight()
+
+    async def lookup(value):
+        await asyncio.sleep(0)
+        return value
+
+    assert await asyncio.gather(flight.do("plant", 1, lambda: lookup(1)), flight.do("plant", 2, lambda: lookup(2))) == [1, 2]
+    assert await flight.do("plant", 1, lambda: lookup(3)) == 3
+    assert flight.metrics["plant"].executions == 3
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter_and_are_not_remembered():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database unavailable")
+
+    results = await asyncio.gather(*(flight.do("plant", 1, failing) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.metrics["plant"].failures == 1
+
+    async def working():
+        return "ok"
+    assert await flight.do("plant", 1, working) == "ok"
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_followers():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def lookup():
+        await release.wait()
+        return "done"
+
+    leader = asyncio.ensure_future(flight.do("photo", "a.webp", lookup))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("photo", "a.webp", lookup))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    assert await follower == "done"
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import logging
+import pytest
+from src.adapters.api.request_context import RequestContextMiddleware
+from src.adapters.telemetry.exporters import otlp_payload
+from src.adapters.telemetry.log_format import JsonFormatter, RequestContextFilter
+from src.adapters.telemetry.tracing import Tracer, current_span, instrument, request_id
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+class Repository:
+    async def get(self, value):
+        await asyncio.sleep(0)
+        return value
+
+    async def fail(self):
+        raise ValueError("boom")
+
+@pytest.fixture
+def tracer():
+    return Tracer(ListExporter())
+
+@pytest.mark.asyncio
+async def test_instrumented_calls_are_child_spans_of_a_sampled_request(tracer):
+    instrument(Repository, "repository.Repository", tracer)
+    repository = Repository()
+
+    assert await repository.get(1) == 1  # no request span: nothing recorded
+    with tracer.start_span("GET /plants", kind="server") as root:
+        await repository.get(2)
+        with pytest.raises(ValueError):
+            await repository.fail()
+    await tracer.flush()
+
+    get, fail, request = tracer.exporter.spans
+    assert [get.name, fail.name, request.name] == ["repository.Repository.get", "repository.Repository.fail", "GET /plants"]
+    assert get.parent_id == fail.parent_id == root.span_id
+    assert get.trace_id == root.trace_id
+    assert fail.error == "ValueError: boom" and get.error is None
+    assert current_span.get() is None
+
+def test_buffer_is_bounded(tracer):
+    tracer = Tracer(ListExporter(), max_buffer=2)
+    for _ in range(3):
+        with tracer.start_span("work"):
+            pass
+    assert tracer.metrics_dict() == {"buffered": 2, "exported": 0, "dropped": 1}
+
+def test_otlp_payload_encoding(tracer):
+    with tracer.start_span("GET /plants", kind="server", **{"http.status_code": 200}):
+        pass
+    span = otlp_payload(list(tracer._buffer), "test")["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert span["kind"] == 2 and span["status"] == {"code": 1} and "parentSpanId" not in span
+    assert span["attributes"] == [{"key": "http.status_code", "value": {"intValue": "200"}}]
+
+def test_json_log_lines_carry_the_request_id():
+    record = logging.LogRecord("src.access", logging.INFO, __file__, 1, "request", None, None)
+    record.status = 200
+    token = request_id.set("abc123")
+    try:
+        RequestContextFilter().filter(record)
+    finally:
+        request_id.reset(token)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["request_id"] == "abc123" and entry["status"] == 200 and entry["message"] == "request"
+
+async def _call(middleware, headers=()):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/plants/", "headers": list(headers)}
+    await middleware(scope, None, send)
+    return dict(messages[0]["headers"])
+
+async def _ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"[]"})
+
+@pytest.mark.asyncio
+async def test_middleware_sampling_follows_the_rate_or_the_callers_traceparent(tracer):
+    unsampled = RequestContextMiddleware(_ok, tracer, trace_sample_rate=0.0)
+    headers = await _call(unsampled, [(b"x-request-id", b"req-1")])
+    assert headers[b"x-request-id"] == b"req-1"
+    assert len(tracer._buffer) == 0
+
+    traceparent = b"00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+    await _call(unsampled, [(b"traceparent", traceparent)])
+    await _call(RequestContextMiddleware(_ok, tracer, trace_sample_rate=1.0))
+    await tracer.flush()
+    joined, sampled = tracer.exporter.spans
+    assert (joined.trace_id, joined.parent_id) == ("0af7651916cd43dd8448eb211c80319c", "b7ad6b7169203331")
+    assert sampled.attributes["http.status_code"] == 200 and sampled.parent_id is None
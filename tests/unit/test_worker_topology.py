@@ -0,0 +1,19 @@
+import logging
+import pytest
+from types import SimpleNamespace
+from src.main import check_worker_topology
+
+def config(**overrides):
+    values = dict(WEB_CONCURRENCY=4, IDEMPOTENCY_ENABLED=True, IDEMPOTENCY_BACKEND="database",
+                  FILE_STORAGE_BACKEND="minio", EVENTS_ENABLED=False, RATE_LIMIT_ENABLED=True, RATE_LIMIT_BACKEND="redis")
+    return SimpleNamespace(**{**values, **overrides})
+
+def test_per_process_backends_refuse_several_workers():
+    with pytest.raises(RuntimeError, match="IDEMPOTENCY_BACKEND=memory, FILE_STORAGE_BACKEND=memory"):
+        check_worker_topology(config(IDEMPOTENCY_BACKEND="memory", FILE_STORAGE_BACKEND="memory"))
+    check_worker_topology(config(WEB_CONCURRENCY=1, IDEMPOTENCY_BACKEND="memory", FILE_STORAGE_BACKEND="memory"))
+
+def test_worker_local_event_streams_are_warned_about(caplog):
+    with caplog.at_level(logging.WARNING):
+        check_worker_topology(config(EVENTS_ENABLED=True))
+    assert "only receives changes handled by the worker" in caplog.text